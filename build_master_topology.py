@@ -28,11 +28,13 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+MASTER_TOPOLOGY_FILE = Path('persistent_data/master_topology.json')
 
-def build_master_topology():
-    """Build master topology from all individual topology files"""
 
-    topology_dir = Path('persistent_data/topology')
+def collect_master_topology(topology_dir=Path('persistent_data/topology')):
+    """Merge all individual topology files into one master topology dict (None if none found)"""
+
+    topology_dir = Path(topology_dir)
 
     if not topology_dir.exists():
         logger.error(f"Topology directory not found: {topology_dir}")
@@ -97,8 +99,12 @@ def build_master_topology():
     if error_count > 0:
         logger.warning(f"Errors: {error_count} applications")
 
-    # Save master topology
-    output_file = Path('persistent_data/master_topology.json')
+    return master_topology
+
+
+def write_master_topology(master_topology, output_file=MASTER_TOPOLOGY_FILE):
+    """Save master topology JSON"""
+    output_file = Path(output_file)
 
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(master_topology, f, indent=2, ensure_ascii=False)
@@ -110,6 +116,14 @@ def build_master_topology():
     return output_file
 
 
+def build_master_topology():
+    """Build master topology from all individual topology files"""
+    master_topology = collect_master_topology()
+    if master_topology is None:
+        return None
+    return write_master_topology(master_topology)
+
+
 def main():
     """Main execution"""
     print()
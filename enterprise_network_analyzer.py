@@ -572,11 +572,13 @@ class EnsembleNetworkModel:
         embeddings = node_features.copy()
         n_nodes = len(node_features)
         
-        # Normalize adjacency matrix
-        adj_with_self = adj_matrix + np.eye(n_nodes)
-        D = np.diag(np.sum(adj_with_self, axis=1))
-        D_inv_sqrt = np.linalg.inv(np.sqrt(D + 1e-6))
-        A_norm = D_inv_sqrt @ adj_with_self @ D_inv_sqrt
+        # Normalize adjacency matrix (sparse: dense numpy input is converted,
+        # scipy.sparse input is never densified)
+        from scipy import sparse
+        adj_with_self = sparse.csr_matrix(adj_matrix, dtype=np.float64) + sparse.identity(n_nodes, format='csr')
+        degrees = np.asarray(adj_with_self.sum(axis=1)).ravel()
+        D_inv_sqrt = sparse.diags(1.0 / np.sqrt(degrees + 1e-6))
+        A_norm = (D_inv_sqrt @ adj_with_self @ D_inv_sqrt).tocsr()
         
         # Forward pass through GNN layers
         for layer in self.gnn_model['layers']:
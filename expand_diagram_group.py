@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Expand aggregated groups of a level-of-detail diagram
+
+Diagrams over the node/edge budget are written with a drill-down manifest
+(<diagram>.lod.json). This renders the sub-diagram of selected groups on
+demand, next to the manifest in <diagram>.lod/.
+
+Usage:
+    python expand_diagram_group.py outputs_final/diagrams/ACDA_diagram.lod.json --list
+    python expand_diagram_group.py outputs_final/diagrams/ACDA_diagram.lod.json G3 G7 --html
+"""
+import sys
+
+# Force UTF-8 encoding (Windows fix) - MUST BE FIRST!
+if sys.platform == 'win32':
+    import codecs
+    if hasattr(sys.stdout, 'buffer'):
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    if hasattr(sys.stderr, 'buffer'):
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from diagram_lod import expand_group, load_manifest
+from html_templates import write_page
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Expand aggregated groups of a level-of-detail diagram')
+    parser.add_argument('manifest', type=Path, help='Drill-down manifest (<diagram>.lod.json)')
+    parser.add_argument('groups', nargs='*', help='Group IDs to expand (e.g. G3 G3_1)')
+    parser.add_argument('--all', action='store_true', help='Expand every group of the main diagram')
+    parser.add_argument('--list', action='store_true', help='List groups and exit')
+    parser.add_argument('--html', action='store_true', help='Also write an interactive HTML page per sub-diagram')
+    parser.add_argument('--force', action='store_true', help='Regenerate sub-diagrams that already exist')
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.manifest)
+    groups = manifest['groups']
+
+    if args.list or not (args.groups or args.all):
+        print(f"{manifest['diagram']}: level '{manifest['level']}', {len(groups)} groups")
+        for group_id, group in groups.items():
+            parent = f" (in {group['parent']})" if group.get('parent') else ''
+            print(f"  {group_id:<10} {group['key']:<40} {len(group['members']):>6} {manifest['unit']} "
+                  f"{group['flows']:>8} flows{parent}")
+        return
+
+    group_ids = [group_id for group_id, group in groups.items() if not group.get('parent')] if args.all else args.groups
+    failed = 0
+    for group_id in group_ids:
+        try:
+            mmd_path = expand_group(args.manifest, group_id, force=args.force)
+        except KeyError as e:
+            print(f"[ERROR] {e}")
+            failed += 1
+            continue
+
+        print(f"[OK] {group_id}: {mmd_path}")
+        if args.html:
+            group = load_manifest(args.manifest)['groups'][group_id]  # Reloaded: expanding adds sub-groups
+            title = f"{manifest['diagram']} - {group['key']}"
+            html_path = write_page('network_diagram', mmd_path.with_suffix('.html'), title,
+                                   fields={'title': title},
+                                   diagrams={'main': mmd_path.read_text(encoding='utf-8')})
+            print(f"     {html_path}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
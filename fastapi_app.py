@@ -16,6 +16,7 @@ Version: 2.0 (FastAPI)
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -179,6 +180,29 @@ async def health_check():
     }
 
 
+@app.get("/api/models/metrics")
+async def get_model_metrics():
+    """Load-time metrics from the warm model worker (src/core/model_registry.py --serve)"""
+    # Socket round trips to the worker block - keep them off the event loop
+    return await run_in_threadpool(_read_model_worker_metrics)
+
+
+def _read_model_worker_metrics() -> Dict:
+    from core.model_registry import ModelWorkerClient
+
+    client = ModelWorkerClient()
+    try:
+        if not client.ping():
+            raise HTTPException(status_code=503, detail="Model worker not running")
+        return {
+            "worker": f"{client.address[0]}:{client.address[1]}",
+            "models": client.metrics(),
+            "timestamp": datetime.now().isoformat()
+        }
+    finally:
+        client.close()
+
+
 @app.get("/api/applications")
 async def get_applications(zone: Optional[str] = None):
     """Get list of all applications with their metadata
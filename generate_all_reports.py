@@ -19,7 +19,6 @@ Version: 1.0
 import sys
 import os
 import subprocess
-import tempfile
 import shutil
 import argparse
 
@@ -37,6 +36,7 @@ import csv
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 
 # Add src to path
@@ -47,6 +47,17 @@ from diagrams import MermaidDiagramGenerator
 from docx_generator import SolutionsArchitectureDocument
 from utils.hostname_resolver import HostnameResolver
 from persistence import create_persistence_manager
+from mermaid_renderer import get_render_pool, render_mermaid_file
+from utils.build_cache import ArtifactCache, MANIFEST_NAME
+from orchestration.app_pool import run_per_app
+from html_templates import TEMPLATE_SOURCES
+
+# Generator code that diagram/document contents depend on (part of each build key)
+SRC_DIR = Path(__file__).parent / 'src'
+DIAGRAM_SOURCES = [Path(__file__), SRC_DIR / 'diagrams.py', SRC_DIR / 'diagram_lod.py', SRC_DIR / 'utils' / 'hostname_resolver.py',
+                   *TEMPLATE_SOURCES]
+DOCX_SOURCES = [SRC_DIR / 'app_docx_generator.py']
+PNG_OPTIONS = {'width': 4800, 'height': 3600, 'scale': 4, 'theme': 'neutral', 'background': 'transparent'}
 
 # Setup logging
 log_file = Path('logs') / f'report_generation_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
@@ -75,7 +86,6 @@ class MockZone:
 
 # Add these imports at the top with the other imports
 import subprocess
-import tempfile
 import shutil
 
 # Add these functions after the imports section, before setup_zones()
@@ -163,67 +173,27 @@ def generate_png_from_mmd(mmd_path, mmdc_cmd):
         bool: True if successful, False otherwise
     """
     try:
-        # Read and clean mermaid content
-        with open(mmd_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract graph content (remove markdown code fences if present)
-        lines = content.split('\n')
-        graph_lines = []
-        in_graph = False
-        
-        for line in lines:
-            if line.strip().startswith('```mermaid'):
-                in_graph = True
-                continue
-            elif line.strip() == '```':
-                in_graph = False
-                break
-            elif in_graph or (not line.strip().startswith('```')):
-                graph_lines.append(line)
-        
-        clean_content = '\n'.join(graph_lines).strip()
-        
-        # Write to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', 
-                                        delete=False, encoding='utf-8') as tmp:
-            tmp.write(clean_content)
-            tmp_path = tmp.name
-        
-        # Generate PNG with high resolution (scale=4 for 300+ DPI equivalent)
-        png_path = mmd_path.with_suffix('.png')
-        # Use puppeteer config to disable sandboxing for customer environments
-        puppeteer_config = Path(__file__).parent / 'puppeteer-config.json'
-        result = subprocess.run(
-            [mmdc_cmd, '-i', tmp_path, '-o', str(png_path),
-             '-p', str(puppeteer_config),
-             '-w', '4800', '-H', '3600', '-s', '4', '-t', 'neutral', '-b', 'transparent'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        # Clean up temp file
-        Path(tmp_path).unlink()
-        
-        if result.returncode == 0:
-            return True
-        else:
-            logger.debug(f"mmdc error for {mmd_path.name}: {result.stderr[:100]}")
-            return False
+        # Warm render workers shared by all diagrams; puppeteer config disables
+        # sandboxing for customer environments
+        get_render_pool(mmdc=mmdc_cmd, puppeteer_config=Path(__file__).parent / 'puppeteer-config.json')
+
+        # High resolution (scale=4 for 300+ DPI equivalent)
+        return render_mermaid_file(mmd_path, mmd_path.with_suffix('.png'), timeout=30, **PNG_OPTIONS)
             
     except Exception as e:
         logger.debug(f"Failed to generate PNG for {mmd_path.name}: {e}")
         return False
 
 
-def generate_pngs_for_all_diagrams(diagrams_dir, mmdc_cmd):
+def generate_pngs_for_all_diagrams(diagrams_dir, mmdc_cmd, cache=None):
     """
     Generate PNG files for all .mmd diagrams
     
     Args:
         diagrams_dir: Directory containing .mmd files
         mmdc_cmd: Path to mmdc command
+        cache: ArtifactCache used to skip PNGs whose .mmd is unchanged
+               (without one, existing PNGs are skipped)
     
     Returns:
         dict: Statistics about PNG generation
@@ -253,25 +223,41 @@ def generate_pngs_for_all_diagrams(diagrams_dir, mmdc_cmd):
     print(f"\nGenerating {len(mmd_files)} PNG diagrams...")
     print()
     
+    pending = []
+    keys = {}
     for i, mmd_file in enumerate(sorted(mmd_files), 1):
         app_id = mmd_file.stem.replace('_diagram', '')
         
-        # Check if PNG already exists
+        # Skip PNGs rendered from the same .mmd content with the same options
         png_file = mmd_file.with_suffix('.png')
-        if png_file.exists():
-            print(f"[{i}/{len(mmd_files)}] {app_id} [SKIP - exists]")
+        if cache is not None:
+            keys[app_id] = cache.key(mmd_file, PNG_OPTIONS)
+            up_to_date = cache.is_fresh(f'report-png/{app_id}', keys[app_id])
+        else:
+            up_to_date = png_file.exists()
+        if up_to_date:
+            print(f"[{i}/{len(mmd_files)}] {app_id} [SKIP - up to date]")
             stats['skipped'] += 1
             continue
-        
-        # Generate PNG
-        print(f"[{i}/{len(mmd_files)}] {app_id}...", end=' ', flush=True)
-        
-        if generate_png_from_mmd(mmd_file, mmdc_cmd):
-            stats['success'] += 1
-            print("[PNG [OK]]")
-        else:
-            stats['failed'] += 1
-            print("[PNG [ERROR]]")
+        pending.append((i, app_id, mmd_file))
+    
+    # Render concurrently, one diagram per warm render worker
+    pool = get_render_pool(mmdc=mmdc_cmd, puppeteer_config=Path(__file__).parent / 'puppeteer-config.json')
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        futures = {
+            executor.submit(generate_png_from_mmd, mmd_file, mmdc_cmd): (i, app_id, mmd_file)
+            for i, app_id, mmd_file in pending
+        }
+        for future in as_completed(futures):
+            i, app_id, mmd_file = futures[future]
+            if future.result():
+                if cache is not None:
+                    cache.record(f'report-png/{app_id}', keys[app_id], [mmd_file.with_suffix('.png')])
+                stats['success'] += 1
+                print(f"[{i}/{len(mmd_files)}] {app_id} [PNG [OK]]")
+            else:
+                stats['failed'] += 1
+                print(f"[{i}/{len(mmd_files)}] {app_id} [PNG [ERROR]]")
     
     print()
     logger.info(f"PNG Generation Results:")
@@ -486,6 +472,51 @@ def generate_app_word_document(app_id, flow_records, topology_data, zones, outpu
         return False, None
 
 
+def build_architecture_docx(item, output_dir):
+    """
+    Worker task: write the architecture Word document for one application
+
+    Args:
+        item: (app_id, png_file, docx_key)
+        output_dir: Output directory for {app_id}_architecture.docx
+
+    Returns:
+        Path to the document
+    """
+    from app_docx_generator import generate_application_document
+
+    app_id, png_file, _ = item
+    docx_path = Path(output_dir) / f"{app_id}_architecture.docx"
+    generate_application_document(
+        app_name=app_id,
+        png_path=str(png_file),
+        output_path=str(docx_path)
+    )
+    return docx_path
+
+
+def generate_architecture_docx(app_id, png_file, output_dir, cache):
+    """
+    Generate the architecture Word document for one application from its PNG
+
+    Args:
+        app_id: Application ID
+        png_file: Rendered diagram PNG
+        output_dir: Output directory for {app_id}_architecture.docx
+        cache: ArtifactCache (document is skipped when PNG and generator are unchanged)
+
+    Returns:
+        'ok' or 'up_to_date'
+    """
+    docx_key = cache.key(Path(png_file), DOCX_SOURCES)
+    if cache.is_fresh(f'architecture-docx/{app_id}', docx_key):
+        return 'up_to_date'
+
+    docx_path = build_architecture_docx((app_id, png_file, docx_key), output_dir)
+    cache.record(f'architecture-docx/{app_id}', docx_key, [docx_path])
+    return 'ok'
+
+
 def generate_lucidchart_export(all_records, zones, output_dir):
     """Generate Lucidchart CSV exports"""
     try:
@@ -533,6 +564,173 @@ def generate_lucidchart_export(all_records, zones, output_dir):
         return False
 
 
+def process_app(item, shared):
+    """
+    Load flows and generate the .mmd/.html diagram for one application
+
+    Runs in a worker process (see orchestration.app_pool); the parent
+    records the build cache, zones and statistics from the returned status.
+
+    Args:
+        item: (index, app_dir, diagram_fresh)
+        shared: Read-only settings - total_apps, zones, hostname_resolver,
+            output_diagrams, skip_diagrams, skip_docx
+
+    Returns:
+        Dict with app_id, flow_records, diagram ('skipped', 'up_to_date',
+        'ok', 'failed' or None) and docx_failed
+    """
+    i, app_dir, diagram_fresh = item
+    app_id = app_dir.name
+    result = {'app_id': app_id, 'flow_records': [], 'diagram': None, 'docx_failed': False}
+
+    print(f"\n{'='*80}")
+    print(f"[{i}/{shared['total_apps']}] Processing: {app_id}")
+    print(f"{'='*80}")
+
+    # Load flow records with filtering disabled
+    flow_records = load_flow_records(app_dir, shared['hostname_resolver'], filter_nonexistent=False)
+
+    # ===================================================================
+    # DEBUG 1: Check what load_flow_records returned
+    # ===================================================================
+    print(f"\nDEBUG 1: After load_flow_records")
+    print(f"  Records loaded: {len(flow_records)}")
+
+    if not flow_records:
+        print("[SKIP - No flows after loading]")
+        result['diagram'] = 'skipped'
+        return result
+
+    # ===================================================================
+    # DEBUG 2: Inspect first record
+    # ===================================================================
+    if flow_records:
+        r = flow_records[0]
+        print(f"\nDEBUG 2: Sample record")
+        print(f"  {r.src_ip} -> {r.dst_ip}")
+        print(f"  Protocol: {r.protocol}")
+        print(f"  Port: {r.port if hasattr(r, 'port') else 'N/A'}")
+        print(f"  App name: {r.app_name}")
+        print(f"  Has bytes: {hasattr(r, 'bytes')}")
+        if hasattr(r, 'bytes'):
+            print(f"  Bytes: {r.bytes}")
+
+    # Returned to the parent (Lucidchart export, zone membership)
+    result['flow_records'] = flow_records
+
+    # Load topology data
+    topology_data = load_topology_data(app_id)
+
+    # Generate diagram (unless skipped)
+    if not shared['skip_diagrams']:
+        output_diagrams = shared['output_diagrams']
+        mmd_path = output_diagrams / f"{app_id}_diagram.mmd"
+
+        if diagram_fresh:
+            # flows.csv and generator code unchanged since the last build
+            result['diagram'] = 'up_to_date'
+            print(f"\n[OK] [DIAG UP TO DATE]")
+        else:
+            # ===================================================================
+            # DEBUG 3: Before creating diagram generator
+            # ===================================================================
+            print(f"\nDEBUG 3: Creating MermaidDiagramGenerator")
+            print(f"  Input records: {len(flow_records)}")
+
+            # Generate diagram
+            try:
+                diagram_gen = MermaidDiagramGenerator(
+                    flow_records=flow_records,
+                    zones=shared['zones'],
+                    hostname_resolver=shared['hostname_resolver']
+                )
+
+                # ===================================================================
+                # DEBUG 4: After diagram generator init
+                # ===================================================================
+                print(f"\nDEBUG 4: After MermaidDiagramGenerator.__init__")
+                print(f"  Generator.records: {len(diagram_gen.records)}")
+
+                if len(diagram_gen.records) == 0:
+                    print("  [WARNING] WARNING: All records filtered out in MermaidDiagramGenerator!")
+                    print("  Check diagrams.py __init__ lines 42-51 for filtering logic")
+
+                # ===================================================================
+                # DEBUG 5: Before generate_app_diagram
+                # ===================================================================
+                print(f"\nDEBUG 5: Calling generate_app_diagram")
+                print(f"  App name: {app_id}")
+                print(f"  Output path: {mmd_path}")
+
+                content = diagram_gen.generate_app_diagram(app_id, str(mmd_path))
+
+                # ===================================================================
+                # DEBUG 6: After generate_app_diagram
+                # ===================================================================
+                print(f"\nDEBUG 6: After generate_app_diagram")
+                print(f"  Content length: {len(content)} chars")
+                print(f"  File exists: {mmd_path.exists()}")
+                if mmd_path.exists():
+                    with open(mmd_path, 'r') as f:
+                        lines = f.readlines()
+                    print(f"  File lines: {len(lines)}")
+                    print(f"  Has nodes: {'Application Components' in ''.join(lines)}")
+                    print(f"  Has flows: {'Traffic Flows' in ''.join(lines)}")
+
+                if len(content) > 0 and mmd_path.exists():
+                    result['diagram'] = 'ok'
+                    print(f"\n[OK] [DIAG SUCCESS]")
+                else:
+                    result['diagram'] = 'failed'
+                    print(f"\n[ERROR] [DIAG FAILED]")
+
+            except Exception as e:
+                print(f"\n[ERROR] [DIAG EXCEPTION]: {e}")
+                import traceback
+                traceback.print_exc(file=sys.stdout)
+                result['diagram'] = 'failed'
+
+        diagram_success = result['diagram'] in ('ok', 'up_to_date')
+
+        # ===================================================================
+        # WORD DOCUMENT GENERATION (Architecture Document)
+        # ===================================================================
+        if not shared['skip_docx'] and diagram_success:
+            print("\n[DOCX]...", end=' ', flush=True)
+
+            # Architecture document goes to /architecture subfolder
+            arch_output = Path('outputs_final/word_reports/architecture')
+            arch_output.mkdir(parents=True, exist_ok=True)
+
+            try:
+                # Import the generator
+                from app_docx_generator import generate_application_document
+
+                # Word doc generation will happen AFTER PNG generation completes
+                print("[DEFER - After PNG]")
+
+            except Exception as e:
+                logger.error(f"Word doc setup failed for {app_id}: {e}")
+                result['docx_failed'] = True
+                print("[FAILED]")
+        elif not shared['skip_docx']:
+            print("\n[DOCX SKIP - No diagram]")
+        else:
+            print("\n[DOCX SKIP - Flag set]")
+
+        # Show zone
+        if topology_data:
+            zone = topology_data.get('security_zone', 'UNKNOWN')
+            print(f"Zone: [{zone}]")
+        else:
+            print(f"Zone: [NO_TOPOLOGY]")
+
+        print(f"{'='*80}\n")
+
+    return result
+
+
 def main():
     """Main execution"""
 
@@ -555,6 +753,10 @@ def main():
                        help='Skip Word document generation (faster)')
     parser.add_argument('--skip-diagrams', action='store_true',
                        help='Skip diagram generation (Mermaid/HTML/PNG) - only generate documentation')
+    parser.add_argument('--force', action='store_true',
+                       help='Rebuild all outputs, even those whose inputs are unchanged')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for per-app diagrams (default: NETSEG_REPORT_WORKERS or CPU count)')
     parser.add_argument(
         '--apps',
         type=str,
@@ -571,6 +773,9 @@ def main():
     output_diagrams.mkdir(parents=True, exist_ok=True)
     output_reports.mkdir(parents=True, exist_ok=True)
 
+    # Incremental builds: only apps whose inputs changed are regenerated
+    cache = ArtifactCache(output_diagrams / MANIFEST_NAME, force=args.force)
+
     # Find mmdc early
     mmdc_cmd = find_mmdc()
 
@@ -622,7 +827,8 @@ def main():
         'diagrams_failed': 0,
         'docx_success': 0,
         'docx_failed': 0,
-        'skipped': 0
+        'skipped': 0,
+        'up_to_date': 0
     }
 
     all_flow_records = []
@@ -635,163 +841,66 @@ def main():
     # ========================================================================
     # MAIN PROCESSING LOOP WITH DEBUG
     # ========================================================================
+    # Diagram freshness is checked here; workers only build stale diagrams
+    work = []
+    diagram_keys = {}
     for i, app_dir in enumerate(sorted(app_dirs), 1):
-        app_id = app_dir.name
-
-        print(f"\n{'='*80}")
-        print(f"[{i}/{total_apps}] Processing: {app_id}")
-        print(f"{'='*80}")
+        diagram_fresh = False
+        if not args.skip_diagrams:
+            diagram_keys[app_dir.name] = cache.key(app_dir / 'flows.csv', DIAGRAM_SOURCES)
+            diagram_fresh = cache.is_fresh(f'diagram/{app_dir.name}', diagram_keys[app_dir.name])
+        work.append((i, app_dir, diagram_fresh))
+
+    shared = {
+        'total_apps': total_apps,
+        'zones': zones,
+        'hostname_resolver': hostname_resolver,
+        'output_diagrams': output_diagrams,
+        'skip_diagrams': args.skip_diagrams,
+        'skip_docx': args.skip_docx,
+    }
 
-        # Load flow records with filtering disabled
-        flow_records = load_flow_records(app_dir, hostname_resolver, filter_nonexistent=False)
+    def collect(task_result):
+        """Merge one app's result (called in app order)"""
+        if not task_result.ok:
+            logger.error(f"[ERROR] {task_result.item[1].name}: {task_result.error}")
+            stats['diagrams_failed'] += 1
+            return
 
-        # ===================================================================
-        # DEBUG 1: Check what load_flow_records returned
-        # ===================================================================
-        print(f"\nDEBUG 1: After load_flow_records")
-        print(f"  Records loaded: {len(flow_records)}")
-        
-        if not flow_records:
-            print("[SKIP - No flows after loading]")
+        result = task_result.value
+        app_id = result['app_id']
+        if result['diagram'] == 'skipped':
             stats['skipped'] += 1
-            continue
-
-        # ===================================================================
-        # DEBUG 2: Inspect first record
-        # ===================================================================
-        if flow_records:
-            r = flow_records[0]
-            print(f"\nDEBUG 2: Sample record")
-            print(f"  {r.src_ip} -> {r.dst_ip}")
-            print(f"  Protocol: {r.protocol}")
-            print(f"  Port: {r.port if hasattr(r, 'port') else 'N/A'}")
-            print(f"  App name: {r.app_name}")
-            print(f"  Has bytes: {hasattr(r, 'bytes')}")
-            if hasattr(r, 'bytes'):
-                print(f"  Bytes: {r.bytes}")
+            return
 
         # Add to global list
-        all_flow_records.extend(flow_records)
+        all_flow_records.extend(result['flow_records'])
 
         # Infer zones from IPs
-        for record in flow_records:
+        for record in result['flow_records']:
             infer_zone_from_ip(record.src_ip, zones)
             infer_zone_from_ip(record.dst_ip, zones)
 
-        # Load topology data
-        topology_data = load_topology_data(app_id)
-
-        # Generate diagram (unless skipped)
-        diagram_success = False
-        if not args.skip_diagrams:
-            # ===================================================================
-            # DEBUG 3: Before creating diagram generator
-            # ===================================================================
-            print(f"\nDEBUG 3: Creating MermaidDiagramGenerator")
-            print(f"  Input records: {len(flow_records)}")
-
-            # Generate diagram
-            try:
-                diagram_gen = MermaidDiagramGenerator(
-                    flow_records=flow_records,
-                    zones=zones,
-                    hostname_resolver=hostname_resolver
-                )
-
-                # ===================================================================
-                # DEBUG 4: After diagram generator init
-                # ===================================================================
-                print(f"\nDEBUG 4: After MermaidDiagramGenerator.__init__")
-                print(f"  Generator.records: {len(diagram_gen.records)}")
-
-                if len(diagram_gen.records) == 0:
-                    print("  [WARNING] WARNING: All records filtered out in MermaidDiagramGenerator!")
-                    print("  Check diagrams.py __init__ lines 42-51 for filtering logic")
-
-                mmd_path = output_diagrams / f"{app_id}_diagram.mmd"
-
-                # ===================================================================
-                # DEBUG 5: Before generate_app_diagram
-                # ===================================================================
-                print(f"\nDEBUG 5: Calling generate_app_diagram")
-                print(f"  App name: {app_id}")
-                print(f"  Output path: {mmd_path}")
-
-                content = diagram_gen.generate_app_diagram(app_id, str(mmd_path))
-
-                # ===================================================================
-                # DEBUG 6: After generate_app_diagram
-                # ===================================================================
-                print(f"\nDEBUG 6: After generate_app_diagram")
-                print(f"  Content length: {len(content)} chars")
-                print(f"  File exists: {mmd_path.exists()}")
-                if mmd_path.exists():
-                    with open(mmd_path, 'r') as f:
-                        lines = f.readlines()
-                    print(f"  File lines: {len(lines)}")
-                    print(f"  Has nodes: {'Application Components' in ''.join(lines)}")
-                    print(f"  Has flows: {'Traffic Flows' in ''.join(lines)}")
-
-                diagram_success = len(content) > 0 and mmd_path.exists()
-                if diagram_success:
-                    stats['diagrams_success'] += 1
-                    print(f"\n[OK] [DIAG SUCCESS]")
-                else:
-                    stats['diagrams_failed'] += 1
-                    print(f"\n[ERROR] [DIAG FAILED]")
-                    
-            except Exception as e:
-                print(f"\n[ERROR] [DIAG EXCEPTION]: {e}")
-                import traceback
-                traceback.print_exc()
-                stats['diagrams_failed'] += 1
-                diagram_success = False
+        if result['diagram'] == 'up_to_date':
+            stats['up_to_date'] += 1
+        elif result['diagram'] == 'ok':
+            mmd_path = output_diagrams / f"{app_id}_diagram.mmd"
+            cache.record(f'diagram/{app_id}', diagram_keys[app_id], [mmd_path, mmd_path.with_suffix('.html')])
+            stats['diagrams_success'] += 1
+        elif result['diagram'] == 'failed':
+            stats['diagrams_failed'] += 1
 
-            # ===================================================================
-            # WORD DOCUMENT GENERATION (Architecture Document)
-            # ===================================================================
-            if not args.skip_docx and diagram_success:
-                print("\n[DOCX]...", end=' ', flush=True)
-                
-                # Architecture document goes to /architecture subfolder
-                arch_output = Path('outputs_final/word_reports/architecture')
-                arch_output.mkdir(parents=True, exist_ok=True)
-                
-                docx_path = arch_output / f"{app_id}_architecture.docx"
-                
-                try:
-                    # Import the generator
-                    from app_docx_generator import generate_application_document
-                    
-                    # Check if PNG exists (will be generated later by PNG batch)
-                    # For now, we'll use the mmd diagram
-                    # Word doc generation will happen AFTER PNG generation completes
-                    
-                    # We'll generate this later after PNGs are created
-                    print("[DEFER - After PNG]")
-                    
-                except Exception as e:
-                    logger.error(f"Word doc setup failed for {app_id}: {e}")
-                    stats['docx_failed'] += 1
-                    print("[FAILED]")
-            elif not args.skip_docx:
-                print("\n[DOCX SKIP - No diagram]")
-            else:
-                print("\n[DOCX SKIP - Flag set]")
+        if result['docx_failed']:
+            stats['docx_failed'] += 1
 
-            # Show zone
-            if topology_data:
-                zone = topology_data.get('security_zone', 'UNKNOWN')
-                print(f"Zone: [{zone}]")
-            else:
-                print(f"Zone: [NO_TOPOLOGY]")
+    run_per_app(process_app, work, shared=shared, workers=args.workers, on_result=collect)
 
-            print(f"{'='*80}\n")
     # ========================================================================
     # PNG GENERATION
     # ========================================================================
     if not args.skip_diagrams:
-        png_stats = generate_pngs_for_all_diagrams(output_diagrams, mmdc_cmd)
+        png_stats = generate_pngs_for_all_diagrams(output_diagrams, mmdc_cmd, cache)
+        cache.save()
     else:
         png_stats = {'total': 0, 'success': 0, 'failed': 0, 'skipped': 0}
 
@@ -804,32 +913,36 @@ def main():
         print("GENERATING WORD DOCUMENTS (Architecture)")
         print("=" * 80)
 
-        from app_docx_generator import generate_application_document
-
         arch_output = Path('outputs_final/word_reports/architecture')
         arch_output.mkdir(parents=True, exist_ok=True)
 
         # Find all PNG diagrams
         png_files = list(output_diagrams.glob('*_diagram.png'))
 
-        for png_file in png_files:
+        # Up-to-date documents are skipped here; the rest are built in workers
+        pending = []
+        for png_file in sorted(png_files):
             app_id = png_file.stem.replace('_diagram', '')
-            docx_path = arch_output / f"{app_id}_architecture.docx"
-
-            print(f"  {app_id}...", end=' ', flush=True)
+            docx_key = cache.key(png_file, DOCX_SOURCES)
+            if cache.is_fresh(f'architecture-docx/{app_id}', docx_key):
+                stats['up_to_date'] += 1
+                print(f"  {app_id}... [UP TO DATE]")
+                continue
+            pending.append((app_id, png_file, docx_key))
 
-            try:
-                generate_application_document(
-                    app_name=app_id,
-                    png_path=str(png_file),
-                    output_path=str(docx_path)
-                )
+        def collect_docx(task_result):
+            app_id, _, docx_key = task_result.item
+            if task_result.ok:
+                cache.record(f'architecture-docx/{app_id}', docx_key, [task_result.value])
                 stats['docx_success'] += 1
-                print("[OK]")
-            except Exception as e:
-                logger.error(f"Failed: {e}")
+                print(f"  {app_id}... [OK]")
+            else:
+                logger.error(f"Failed: {task_result.error}")
                 stats['docx_failed'] += 1
-                print("[FAILED]")
+                print(f"  {app_id}... [FAILED]")
+
+        run_per_app(build_architecture_docx, pending, shared=arch_output,
+                    workers=args.workers, on_result=collect_docx)
 
     print()
     print("=" * 80)
@@ -838,6 +951,7 @@ def main():
 
     # Generate Lucidchart exports
     lucid_success = generate_lucidchart_export(all_flow_records, zones, output_diagrams)
+    cache.save()
 
     # ========================================================================
     # FINAL SUMMARY
@@ -849,6 +963,7 @@ def main():
     print()
     print(f"Total applications: {stats['total']}")
     print(f"  Skipped (no flows): {stats['skipped']}")
+    print(f"  Up to date (diagrams + docs reused): {stats['up_to_date']}")
     print()
     print("Diagrams:")
     print(f"  [OK] Success: {stats['diagrams_success']}")
@@ -36,8 +36,15 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List
-import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+from src.diagram_lod import DiagramBudget, LodEdge, LodNode, LodPartition, aggregate, clear_manifest, render_view, write_manifest
+from src.html_templates import TEMPLATE_SOURCES, get_bundle, render_page
+from src.mermaid_renderer import get_render_pool, render_mermaid_file
+from src.orchestration.app_pool import run_per_app
+from src.upstream_index import UpstreamIndex, endpoint_labels
+from src.utils.build_cache import ArtifactCache, MANIFEST_NAME
 
 logging.basicConfig(
     level=logging.INFO,
@@ -46,6 +53,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Outputs built from other apps' flows as well as the app's own
+CROSS_APP_OUTPUTS = ('upstream_mermaid', 'fullflow_mermaid', 'fullflow_lod', 'architecture_mermaid', 'html')
+
 
 class CompleteReportGenerator:
     """
@@ -53,10 +63,16 @@ class CompleteReportGenerator:
     """
 
     def __init__(self, apps_dir: str = 'persistent_data/applications',
-                 output_dir: str = 'outputs'):
+                 output_dir: str = 'outputs', force: bool = False):
         self.apps_dir = Path(apps_dir)
         self.output_dir = Path(output_dir)
 
+        # Apps whose inputs are unchanged since the last run are skipped
+        self.cache = ArtifactCache(self.output_dir / MANIFEST_NAME, force=force)
+
+        # Who-sends-to-whom across all apps (built on first use)
+        self._upstream_index = None
+
         # Create output subdirectories
         self.diagrams_dir = self.output_dir / 'diagrams'
         self.html_dir = self.output_dir / 'html'
@@ -74,13 +90,43 @@ class CompleteReportGenerator:
         logger.info(f"  Apps directory: {self.apps_dir}")
         logger.info(f"  Output directory: {self.output_dir}")
 
-    def generate_for_app(self, app_id: str, flows_df: pd.DataFrame) -> Dict:
+    def __getstate__(self):
+        # Worker processes get the generator without the build cache (the
+        # parent checks freshness and records results)
+        state = self.__dict__.copy()
+        state['cache'] = None
+        return state
+
+    @property
+    def upstream_index(self) -> UpstreamIndex:
+        """Reverse-dependency index over all apps' flows.csv (read once per run)"""
+        if self._upstream_index is None:
+            self._upstream_index = UpstreamIndex.from_apps_dir(self.apps_dir)
+        return self._upstream_index
+
+    @staticmethod
+    def _format_endpoints(endpoints: List[str]) -> str:
+        """First 2 'IP (hostname)' entries plus a count of the rest"""
+        text = '<br/>'.join(endpoints[:2])
+        if len(endpoints) > 2:
+            text += f"<br/>... (+{len(endpoints) - 2} more)"
+        return text
+
+    def generate_for_app(self, app_id: str, flows_df: pd.DataFrame,
+                         app_outputs: bool = True, cross_app_outputs: bool = True,
+                         render_images: bool = True) -> Dict:
         """
         Generate complete report package for one application
 
         Args:
             app_id: Application ID
             flows_df: Enriched DataFrame (18 columns)
+            app_outputs: Generate outputs that depend only on this app's flows
+                (downstream diagram, PNG, SVG, DOCX, JSON)
+            cross_app_outputs: Generate outputs that also read other apps' flows
+                (upstream, full flow and architecture diagrams, interactive HTML)
+            render_images: Render PNG/SVG with the app outputs (False when the
+                caller renders them separately via _render_app_images)
 
         Returns:
             Dict with paths to generated files
@@ -90,12 +136,30 @@ class CompleteReportGenerator:
         outputs = {}
 
         # 1. Generate DOWNSTREAM diagram (what this app depends on)
-        downstream_mermaid = self._generate_mermaid_diagram(app_id, flows_df)
         mmd_file = self.mmd_dir / f"{app_id}_downstream.mmd"
-        with open(mmd_file, 'w', encoding='utf-8') as f:
-            f.write(downstream_mermaid)
-        outputs['downstream_mermaid'] = str(mmd_file)
-        logger.info(f"  [OK] Downstream Mermaid: {mmd_file.name}")
+        if app_outputs:
+            downstream_mermaid = self._generate_mermaid_diagram(app_id, flows_df)
+            with open(mmd_file, 'w', encoding='utf-8') as f:
+                f.write(downstream_mermaid)
+            outputs['downstream_mermaid'] = str(mmd_file)
+            logger.info(f"  [OK] Downstream Mermaid: {mmd_file.name}")
+        elif cross_app_outputs:
+            downstream_mermaid = mmd_file.read_text(encoding='utf-8')
+
+        if cross_app_outputs:
+            outputs.update(self._generate_cross_app_outputs(app_id, flows_df, downstream_mermaid))
+
+        if app_outputs:
+            if render_images:
+                outputs.update(self._render_app_images(app_id, mmd_file))
+            outputs.update(self._generate_app_outputs(app_id, flows_df))
+
+        logger.info(f"[{app_id}] Complete! Generated {len(outputs)} outputs")
+        return outputs
+
+    def _generate_cross_app_outputs(self, app_id: str, flows_df: pd.DataFrame, downstream_mermaid: str) -> Dict:
+        """Generate the diagrams and HTML that include other applications' flows"""
+        outputs = {}
 
         # 2. Generate UPSTREAM diagram (who depends on this app)
         upstream_mermaid = self._generate_upstream_diagram(app_id)
@@ -112,6 +176,9 @@ class CompleteReportGenerator:
             f.write(fullflow_mermaid)
         outputs['fullflow_mermaid'] = str(fullflow_mmd_file)
         logger.info(f"  [OK] Full Flow Mermaid: {fullflow_mmd_file.name}")
+        fullflow_manifest = self._fullflow_manifest_path(app_id)
+        if fullflow_manifest.exists():
+            outputs['fullflow_lod'] = str(fullflow_manifest)
 
         # 3.5 Generate ARCHITECTURE diagram (Professional tier-based layout for Word docs)
         architecture_mermaid = self._generate_architecture_diagram(app_id, flows_df)
@@ -124,11 +191,18 @@ class CompleteReportGenerator:
         # 4. Generate Interactive HTML with ALL FOUR diagrams
         html_content = self._generate_interactive_html(app_id, downstream_mermaid, upstream_mermaid, fullflow_mermaid, architecture_mermaid, flows_df)
         html_file = self.html_dir / f"{app_id}_application_diagram.html"
+        get_bundle('application_report').publish(self.html_dir)
         with open(html_file, 'w', encoding='utf-8') as f:
             f.write(html_content)
         outputs['html'] = str(html_file)
         logger.info(f"  [OK] Interactive HTML: {html_file.name}")
 
+        return outputs
+
+    def _render_app_images(self, app_id: str, mmd_file: Path) -> Dict:
+        """Render the downstream diagram to PNG and SVG"""
+        outputs = {}
+
         # 3. Generate PNG (if mmdc available)
         png_file = self.png_dir / f"{app_id}_architecture.png"
         if self._generate_png_from_mermaid(mmd_file, png_file):
@@ -143,6 +217,12 @@ class CompleteReportGenerator:
             outputs['svg'] = str(svg_file)
             logger.info(f"  [OK] SVG diagram: {svg_file.name}")
 
+        return outputs
+
+    def _generate_app_outputs(self, app_id: str, flows_df: pd.DataFrame) -> Dict:
+        """Generate the documents and exports built from this application's flows only"""
+        outputs = {}
+
         # 5. Generate Architecture DOCX
         arch_docx = self.docx_dir / f"{app_id}_architecture.docx"
         self._generate_architecture_docx(app_id, flows_df, arch_docx)
@@ -161,7 +241,6 @@ class CompleteReportGenerator:
         outputs['segmentation_json'] = str(seg_json)
         logger.info(f"  [OK] Segmentation JSON: {seg_json.name}")
 
-        logger.info(f"[{app_id}] Complete! Generated {len(outputs)} outputs")
         return outputs
 
     def _generate_mermaid_diagram(self, app_id: str, flows_df: pd.DataFrame) -> str:
@@ -256,24 +335,8 @@ class CompleteReportGenerator:
             server_types[server_type].append({'ip': ip, 'hostname': hostname})
 
         # Get upstream applications
-        all_flows = []
-        for app_dir in self.apps_dir.iterdir():
-            if not app_dir.is_dir():
-                continue
-            flows_csv = app_dir / 'flows.csv'
-            if flows_csv.exists():
-                try:
-                    df = pd.read_csv(flows_csv)
-                    all_flows.append(df)
-                except:
-                    continue
-
-        upstream_apps = []
-        if all_flows:
-            all_flows_df = pd.concat(all_flows, ignore_index=True)
-            upstream_flows = all_flows_df[all_flows_df['Dest App'] == app_id]
-            if len(upstream_flows) > 0:
-                upstream_apps = sorted(upstream_flows['App'].unique())
+        upstream = self.upstream_index.get(app_id)
+        upstream_apps = list(upstream.sources) if upstream else []
 
         # Get downstream applications
         outbound_data = flows_df[flows_df['Flow Direction'] == 'outbound']
@@ -285,8 +348,7 @@ class CompleteReportGenerator:
         if upstream_apps:
             mermaid += "    subgraph UPSTREAM[\"⬆️ UPSTREAM SOURCES\"]\n"
             for idx, src_app in enumerate(upstream_apps[:5]):  # Limit to 5 for page fit
-                app_flows = upstream_flows[upstream_flows['App'] == src_app]
-                flow_count = len(app_flows)
+                flow_count = upstream.sources[src_app].flows
                 mermaid += f"        UP{idx}[\"{src_app}<br/>{flow_count} flows\"]:::upstream\n"
             if len(upstream_apps) > 5:
                 mermaid += f"        UP_MORE[\"... +{len(upstream_apps) - 5} more apps\"]:::upstream\n"
@@ -630,58 +692,32 @@ class CompleteReportGenerator:
 
     def _generate_fullflow_diagram(self, app_id: str, flows_df: pd.DataFrame) -> str:
         """Generate FULL FLOW: Source Apps → Our App → Destination Apps (End-to-End)"""
-        # Load ALL flows from ALL applications to get upstream
-        all_flows = []
-        for app_dir in self.apps_dir.iterdir():
-            if not app_dir.is_dir():
-                continue
-            flows_csv = app_dir / 'flows.csv'
-            if flows_csv.exists():
-                try:
-                    df = pd.read_csv(flows_csv)
-                    all_flows.append(df)
-                except:
-                    continue
+        # Upstream apps from the cross-app index
+        upstream = self.upstream_index.get(app_id)
+        upstream_sources = list(upstream.sources.values()) if upstream else []
+
+        # Level of detail: more peer apps than one diagram can show
+        budget = DiagramBudget.from_env()
+        peer_apps = len(upstream_sources) + flows_df.loc[flows_df['Flow Direction'] == 'outbound', 'Dest App'].nunique()
+        if not budget.fits(peer_apps + 2, peer_apps + 1):
+            return self._generate_fullflow_lod(app_id, flows_df, upstream_sources, budget)
+        clear_manifest(self._fullflow_manifest_path(app_id))
 
         mermaid = "graph LR\n"
         mermaid += f"    %% FULL FLOW: Source Apps → {app_id} → Destination Apps\n\n"
 
         # UPSTREAM: Who sends TO us
-        if all_flows:
-            all_flows_df = pd.concat(all_flows, ignore_index=True)
-            upstream_flows = all_flows_df[all_flows_df['Dest App'] == app_id]
-
-            if len(upstream_flows) > 0:
-                source_apps = sorted(upstream_flows['App'].unique())
-                for idx, source_app in enumerate(source_apps):
-                    app_flows = upstream_flows[upstream_flows['App'] == source_app]
-                    server_count = app_flows['Source IP'].nunique()
-                    flow_count = len(app_flows)
-                    vmware_count = app_flows[app_flows.get('Source Is VMware', False) == True]['Source IP'].nunique() if 'Source Is VMware' in app_flows.columns else 0
-
-                    # Build IP (hostname) format
-                    src_ip_hostname_list = []
-                    for _, row in app_flows[['Source IP', 'Source Hostname']].drop_duplicates().iterrows():
-                        ip = row['Source IP']
-                        hostname = row.get('Source Hostname', ip)
-                        if hostname and hostname != ip and hostname != 'Unknown':
-                            src_ip_hostname_list.append(f"{ip} ({hostname})")
-                        else:
-                            src_ip_hostname_list.append(ip)
-
-                    # Show first 2 entries
-                    src_str = '<br/>'.join(src_ip_hostname_list[:2])
-                    if len(src_ip_hostname_list) > 2:
-                        src_str += f"<br/>... (+{len(src_ip_hostname_list) - 2} more)"
-
-                    app_node = f"SRC_APP_{idx}"
-                    vmware_text = f" | {vmware_count} VMware" if vmware_count > 0 else ""
-                    label = f"<b>{source_app}</b><br/>{src_str}<br/>{server_count} Servers | {flow_count} Flows{vmware_text}"
-
-                    if vmware_count > 0:
-                        mermaid += f"    {app_node}[(\"{label}\")]:::upstream\n"
-                    else:
-                        mermaid += f"    {app_node}[\"{label}\"]:::upstream\n"
+        for idx, source in enumerate(upstream_sources):
+            src_str = self._format_endpoints(source.endpoints)
+
+            app_node = f"SRC_APP_{idx}"
+            vmware_text = f" | {source.vmware_servers} VMware" if source.vmware_servers > 0 else ""
+            label = f"<b>{source.app}</b><br/>{src_str}<br/>{source.servers} Servers | {source.flows} Flows{vmware_text}"
+
+            if source.vmware_servers > 0:
+                mermaid += f"    {app_node}[(\"{label}\")]:::upstream\n"
+            else:
+                mermaid += f"    {app_node}[\"{label}\"]:::upstream\n"
 
         # CENTER: THIS application with IP (hostname)
         source_servers = flows_df['Source IP'].nunique()
@@ -706,13 +742,10 @@ class CompleteReportGenerator:
         mermaid += f"\n    CENTER[\"{center_label}\"]:::centerapp\n\n"
 
         # Connect upstream TO center with flow-based edge styling
-        if all_flows and len(upstream_flows) > 0:
-            for idx, source_app in enumerate(source_apps):
-                app_flows = upstream_flows[upstream_flows['App'] == source_app]
-                flow_count = len(app_flows)
-                edge_style = self._get_edge_style(flow_count)
-                app_node = f"SRC_APP_{idx}"
-                mermaid += f"    {app_node} {edge_style}|{flow_count}| CENTER\n"
+        for idx, source in enumerate(upstream_sources):
+            edge_style = self._get_edge_style(source.flows)
+            app_node = f"SRC_APP_{idx}"
+            mermaid += f"    {app_node} {edge_style}|{source.flows}| CENTER\n"
 
         # DOWNSTREAM: Where we send
         outbound_data = flows_df[flows_df['Flow Direction'] == 'outbound']
@@ -791,106 +824,132 @@ class CompleteReportGenerator:
 
         return mermaid
 
+    def _fullflow_manifest_path(self, app_id: str) -> Path:
+        """Drill-down manifest of an aggregated FULL FLOW diagram"""
+        return self.mmd_dir / f"{app_id}_fullflow.lod.json"
+
+    @staticmethod
+    def _volume_band(flow_count: int) -> str:
+        """Traffic volume band (same bands as _get_edge_style)"""
+        if flow_count < 10:
+            return 'Light traffic (under 10 flows)'
+        elif flow_count <= 100:
+            return 'Medium traffic (10-100 flows)'
+        return 'Heavy traffic (over 100 flows)'
+
+    def _generate_fullflow_lod(self, app_id: str, flows_df: pd.DataFrame, upstream_sources: List,
+                               budget: DiagramBudget) -> str:
+        """
+        FULL FLOW for apps with more peer apps than the diagram budget
+
+        The busiest peer apps of each direction keep their own node; the rest
+        are grouped by traffic volume band. Groups drill down via the
+        .lod.json manifest (expand_diagram_group.py).
+        """
+        # CENTER, EXTERNAL and up to three band groups per direction
+        keep = max(1, (budget.max_nodes - 8) // 2)
+        nodes = []
+        edges = []
+
+        ranked = sorted(enumerate(upstream_sources), key=lambda item: -item[1].flows)
+        for rank, (idx, source) in enumerate(ranked):
+            app_node = f"SRC_APP_{idx}"
+            vmware_text = f" | {source.vmware_servers} VMware" if source.vmware_servers > 0 else ""
+            label = f"<b>{source.app}</b><br/>{self._format_endpoints(source.endpoints)}<br/>{source.servers} Servers | {source.flows} Flows{vmware_text}"
+            key = source.app if rank < keep else self._volume_band(source.flows)
+            nodes.append(LodNode(app_node, label, 'upstream', {'volume': key}, 'upstream', source.flows))
+            edges.append(LodEdge(app_node, 'CENTER', source.flows))
+
+        center_str = self._format_endpoints(endpoint_labels(flows_df, 'Source IP', 'Source Hostname'))
+        center_label = f"<b>{app_id} (CENTER)</b><br/>{center_str}<br/>{flows_df['Source IP'].nunique()} Servers | {len(flows_df)} Flows"
+        nodes.append(LodNode('CENTER', center_label, '', style='centerapp', flows=len(flows_df), pinned=True))
+
+        outbound_data = flows_df[flows_df['Flow Direction'] == 'outbound']
+        dest_apps = []
+        for dest_app, app_data in outbound_data.groupby('Dest App'):
+            app_vmware = app_data['Dest Is VMware'].sum() if 'Dest Is VMware' in app_data.columns else 0
+            dest_apps.append((dest_app, app_data['Source IP'].count(), app_data['Dest IP'].nunique(), app_vmware, app_data))
+
+        ranks = {dest_app: rank for rank, (dest_app, flow_count, *_) in
+                 enumerate(sorted(dest_apps, key=lambda item: -item[1]))}
+        for idx, (dest_app, flow_count, server_count, app_vmware, app_data) in enumerate(dest_apps):
+            dest_node = f"DEST_APP_{idx}"
+            dest_str = self._format_endpoints(endpoint_labels(app_data, 'Dest IP', 'Dest Hostname'))
+            vmware_text = f" | {app_vmware} VMware" if app_vmware > 0 else ""
+            label = f"<b>{dest_app}</b><br/>{dest_str}<br/>{server_count} Servers | {flow_count} Flows{vmware_text}"
+            key = dest_app if ranks[dest_app] < keep else self._volume_band(flow_count)
+            nodes.append(LodNode(dest_node, label, 'downstream', {'volume': key}, 'downstream', int(flow_count)))
+            edges.append(LodEdge('CENTER', dest_node, int(flow_count)))
+
+        external_data = flows_df[flows_df['Flow Direction'] == 'external']
+        if len(external_data) > 0:
+            ext_str = self._format_endpoints(endpoint_labels(external_data, 'Dest IP', 'Dest Hostname'))
+            external_label = f"<b>External / Internet</b><br/>{ext_str}<br/>{external_data['Dest IP'].nunique()} Destinations | {len(external_data)} Flows"
+            nodes.append(LodNode('EXTERNAL', external_label, '', style='external', flows=len(external_data), pinned=True))
+            edges.append(LodEdge('CENTER', 'EXTERNAL', len(external_data)))
+
+        view = aggregate(nodes, edges, ('volume',), budget, unit='apps')
+        logger.info(f"  Full flow level of detail: {len(upstream_sources)} source + {len(dest_apps)} destination apps "
+                    f"-> {len(view.drawn())} nodes ({len(view.groups)} groups)")
+
+        partitions = {
+            'upstream': LodPartition('SOURCE_APPS', 'Source Apps', 'upstream'),
+            'downstream': LodPartition('DEST_APPS', 'Destination Apps', 'downstream'),
+        }
+        class_defs = [
+            "classDef centerapp fill:#4CAF50,stroke:#2E7D32,stroke-width:2px,color:#fff",
+            "classDef upstream fill:#2196F3,stroke:#1565C0,stroke-width:1.5px,color:#fff",
+            "classDef downstream fill:#9C27B0,stroke:#6A1B9A,stroke-width:1.5px,color:#fff",
+            "classDef external fill:#F44336,stroke:#C62828,stroke-width:1.5px,color:#fff",
+        ]
+        write_manifest(view, self._fullflow_manifest_path(app_id), f"{app_id}_fullflow.mmd", partitions, 'LR', class_defs)
+        return render_view(view, partitions, 'LR', title=f"FULL FLOW: Source Apps → {app_id} → Destination Apps",
+                           class_defs=class_defs)
+
     def _generate_upstream_diagram(self, app_id: str) -> str:
         """Generate UPSTREAM diagram - CLASSIC AGGREGATED VIEW (who depends on THIS app)"""
-        # Load ALL flows from ALL applications
-        all_flows = []
-        for app_dir in self.apps_dir.iterdir():
-            if not app_dir.is_dir():
-                continue
-            flows_csv = app_dir / 'flows.csv'
-            if flows_csv.exists():
-                try:
-                    df = pd.read_csv(flows_csv)
-                    all_flows.append(df)
-                except:
-                    continue
-
-        if not all_flows:
+        upstream_index = self.upstream_index
+        if len(upstream_index) == 0:
             return f"graph LR\n    NO_DATA[\"No upstream dependencies found\"]"
 
-        all_flows_df = pd.concat(all_flows, ignore_index=True)
-
-        # Find flows where THIS app is the DESTINATION (upstream = who sends TO us)
-        upstream_flows = all_flows_df[all_flows_df['Dest App'] == app_id]
+        # Apps that send data TO this app (upstream = who sends TO us)
+        upstream = upstream_index.get(app_id)
 
-        if len(upstream_flows) == 0:
+        if upstream is None:
             return f"graph LR\n    NO_UPSTREAM[\"No upstream dependencies found<br/>No other applications send data to {app_id}\"]"
 
         # Build CLASSIC aggregated diagram
         mermaid = "graph LR\n"
         mermaid += f"    %% UPSTREAM: Who sends data TO {app_id}\n\n"
 
-        # Group by source application and count
-        source_apps = sorted(upstream_flows['App'].unique())
-
-        for idx, source_app in enumerate(source_apps):
-            app_flows = upstream_flows[upstream_flows['App'] == source_app]
-
-            # Count stats
-            server_count = app_flows['Source IP'].nunique()
-            flow_count = len(app_flows)
-            vmware_count = app_flows[app_flows.get('Source Is VMware', False) == True]['Source IP'].nunique() if 'Source Is VMware' in app_flows.columns else 0
-
-            # Build IP (hostname) format for source IPs
-            src_ip_hostname_list = []
-            for _, row in app_flows[['Source IP', 'Source Hostname']].drop_duplicates().iterrows():
-                ip = row['Source IP']
-                hostname = row.get('Source Hostname', ip)
-                if hostname and hostname != ip and hostname != 'Unknown':
-                    src_ip_hostname_list.append(f"{ip} ({hostname})")
-                else:
-                    src_ip_hostname_list.append(ip)
-
-            # Show first 2 entries
-            src_str = '<br/>'.join(src_ip_hostname_list[:2])
-            if len(src_ip_hostname_list) > 2:
-                src_str += f"<br/>... (+{len(src_ip_hostname_list) - 2} more)"
+        # One aggregated node per source application
+        for idx, source in enumerate(upstream.sources.values()):
+            src_str = self._format_endpoints(source.endpoints)
 
             # Create aggregated node
             app_node = f"SRC_APP_{idx}"
-            vmware_text = f" | {vmware_count} VMware" if vmware_count > 0 else ""
-            label = f"<b>{source_app}</b><br/>{src_str}<br/>{server_count} Servers | {flow_count} Flows{vmware_text}"
+            vmware_text = f" | {source.vmware_servers} VMware" if source.vmware_servers > 0 else ""
+            label = f"<b>{source.app}</b><br/>{src_str}<br/>{source.servers} Servers | {source.flows} Flows{vmware_text}"
 
-            if vmware_count > 0:
+            if source.vmware_servers > 0:
                 mermaid += f"    {app_node}[(\"{label}\")]:::vmware\n"
             else:
                 mermaid += f"    {app_node}[\"{label}\"]:::sourceapp\n"
 
         # Add THIS application as target (aggregated) with IP (hostname)
-        dest_server_count = upstream_flows['Dest IP'].nunique()
-        dest_flow_count = len(upstream_flows)
-        dest_vmware = upstream_flows[upstream_flows.get('Dest Is VMware', False) == True]['Dest IP'].nunique() if 'Dest Is VMware' in upstream_flows.columns else 0
-
-        # Build IP (hostname) format for target IPs
-        dest_ip_hostname_list = []
-        for _, row in upstream_flows[['Dest IP', 'Dest Hostname']].drop_duplicates().iterrows():
-            ip = row['Dest IP']
-            hostname = row.get('Dest Hostname', ip)
-            if hostname and hostname != ip and hostname != 'Unknown':
-                dest_ip_hostname_list.append(f"{ip} ({hostname})")
-            else:
-                dest_ip_hostname_list.append(ip)
+        dest_str = self._format_endpoints(upstream.endpoints)
+        vmware_text = f" | {upstream.vmware_servers} VMware" if upstream.vmware_servers > 0 else ""
+        target_label = f"<b>{app_id} (TARGET)</b><br/>{dest_str}<br/>{upstream.servers} Servers | {upstream.flows} Flows{vmware_text}"
 
-        # Show first 2 entries
-        dest_str = '<br/>'.join(dest_ip_hostname_list[:2])
-        if len(dest_ip_hostname_list) > 2:
-            dest_str += f"<br/>... (+{len(dest_ip_hostname_list) - 2} more)"
-
-        vmware_text = f" | {dest_vmware} VMware" if dest_vmware > 0 else ""
-        target_label = f"<b>{app_id} (TARGET)</b><br/>{dest_str}<br/>{dest_server_count} Servers | {dest_flow_count} Flows{vmware_text}"
-
-        if dest_vmware > 0:
+        if upstream.vmware_servers > 0:
             mermaid += f"    TARGET[(\"{target_label}\")]:::targetapp\n\n"
         else:
             mermaid += f"    TARGET[\"{target_label}\"]:::targetapp\n\n"
 
         # Connect source apps TO this app with flow counts
-        for idx, source_app in enumerate(source_apps):
-            app_flows = upstream_flows[upstream_flows['App'] == source_app]
-            flow_count = len(app_flows)
+        for idx, source in enumerate(upstream.sources.values()):
             app_node = f"SRC_APP_{idx}"
-            mermaid += f"    {app_node} -->|{flow_count}| TARGET\n"
+            mermaid += f"    {app_node} -->|{source.flows}| TARGET\n"
 
         # Add styles
         mermaid += "\n    %% Styles\n"
@@ -914,7 +973,6 @@ class CompleteReportGenerator:
         dest_apps = flows_df[flows_df['Dest App'].notna()]['Dest App'].nunique()
 
         # Build detailed data for modal popups (ALL IPs/hostnames with server types)
-        import json
         node_details = {}
 
         # Source node (this app) - with server type detection
@@ -1068,736 +1126,37 @@ class CompleteReportGenerator:
                 'items': ext_servers
             }
 
-        node_details_json = json.dumps(node_details, indent=2)
-
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{app_id} - Application Architecture</title>
-    <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-
-        .header {{
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-
-        .header h1 {{
-            font-size: 2.5em;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-
-        .header .subtitle {{
-            font-size: 1.2em;
-            opacity: 0.9;
-        }}
-
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
-            gap: 10px;
-            padding: 20px 30px;
-            background: #f8f9fa;
-        }}
-
-        .stat-card {{
-            background: white;
-            padding: 12px 15px;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            text-align: center;
-            transition: transform 0.2s;
-        }}
-
-        .stat-card:hover {{
-            transform: translateY(-3px);
-            box-shadow: 0 4px 15px rgba(0,0,0,0.12);
-        }}
-
-        .stat-card .value {{
-            font-size: 1.8em;
-            font-weight: bold;
-            color: #2a5298;
-            margin-bottom: 3px;
-        }}
-
-        .stat-card .label {{
-            color: #666;
-            font-size: 0.75em;
-            line-height: 1.2;
-        }}
-
-        .controls {{
-            padding: 20px 30px;
-            background: #fff;
-            border-bottom: 2px solid #e0e0e0;
-            display: flex;
-            gap: 15px;
-            flex-wrap: wrap;
-            align-items: center;
-        }}
-
-        .btn {{
-            padding: 10px 20px;
-            border: none;
-            border-radius: 5px;
-            cursor: pointer;
-            font-size: 14px;
-            transition: all 0.3s;
-            font-weight: 500;
-        }}
-
-        .btn-primary {{
-            background: #2a5298;
-            color: white;
-        }}
-
-        .btn-primary:hover {{
-            background: #1e3c72;
-            transform: scale(1.05);
-        }}
-
-        .btn-secondary {{
-            background: #6c757d;
-            color: white;
-        }}
-
-        .btn-secondary:hover {{
-            background: #5a6268;
-        }}
-
-        .btn-toggle {{
-            padding: 12px 24px;
-            border: 2px solid #2a5298;
-            background: white;
-            color: #2a5298;
-            font-weight: 600;
-            border-radius: 5px;
-            cursor: pointer;
-            font-size: 15px;
-            transition: all 0.3s;
-        }}
-
-        .btn-toggle:hover {{
-            background: #e3f2fd;
-        }}
-
-        .btn-toggle.active {{
-            background: #2a5298;
-            color: white;
-        }}
-
-        .toggle-section {{
-            padding: 20px 30px;
-            background: #f8f9fa;
-            border-bottom: 2px solid #e0e0e0;
-            display: flex;
-            gap: 10px;
-            justify-content: center;
-            flex-wrap: wrap;
-        }}
-
-        .diagram-container {{
-            padding: 30px;
-            background: white;
-            overflow-x: auto;
-            overflow-y: hidden;
-            width: 100%;
-        }}
-
-        .diagram-view {{
-            min-height: 600px;
-            background: white;
-            width: 100%;
-            overflow: visible;
-        }}
-
-        .diagram-view .mermaid {{
-            width: 100%;
-            max-width: 100%;
-            overflow: visible;
-        }}
-
-        .diagram-view .mermaid svg {{
-            max-width: 100% !important;
-            height: auto !important;
-        }}
-
-        .diagram-view.hidden {{
-            display: none;
-        }}
-
-        /* Professional uniform box sizing for Mermaid */
-        #diagram svg .node rect,
-        #diagram svg .node circle,
-        #diagram svg .node ellipse,
-        #diagram svg .node polygon,
-        #diagram svg .node path {{
-            min-width: 180px !important;
-            min-height: 80px !important;
-        }}
-
-        .mermaid svg {{
-            max-width: 100%;
-            height: auto;
-        }}
-
-        /* Uniform node sizing */
-        .mermaid .node {{
-            min-width: 200px !important;
-            text-align: center !important;
-        }}
-
-        .mermaid .nodeLabel {{
-            padding: 15px 20px !important;
-            line-height: 1.4 !important;
-        }}
-
-        /* Uniform text sizing */
-        .mermaid text {{
-            font-size: 14px !important;
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif !important;
-        }}
-
-        .legend {{
-            padding: 15px 30px;
-            background: #f8f9fa;
-            border-top: 2px solid #e0e0e0;
-        }}
-
-        .legend h3 {{
-            color: #2a5298;
-            margin-bottom: 10px;
-            font-size: 1.1em;
-        }}
-
-        .legend-items {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-            gap: 8px;
-        }}
-
-        .legend-item {{
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            font-size: 0.85em;
-        }}
-
-        .legend-color {{
-            width: 20px;
-            height: 20px;
-            border-radius: 4px;
-            border: 2px solid #ddd;
-            flex-shrink: 0;
-        }}
-
-        .footer {{
-            padding: 20px 30px;
-            background: #2a5298;
-            color: white;
-            text-align: center;
-        }}
-
-        @media print {{
-            body {{
-                background: white;
-            }}
-            .controls, .stats {{
-                display: none;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <!-- Modal for showing all IPs/hostnames -->
-    <div id="detailsModal" style="display: none; position: fixed; z-index: 10000; left: 0; top: 0; width: 100%; height: 100%; overflow: auto; background-color: rgba(0,0,0,0.6);">
-        <div style="background-color: white; margin: 5% auto; padding: 0; border-radius: 10px; width: 80%; max-width: 800px; box-shadow: 0 5px 30px rgba(0,0,0,0.3);">
-            <div style="background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%); color: white; padding: 20px; border-radius: 10px 10px 0 0; display: flex; justify-content: space-between; align-items: center;">
-                <h2 id="modalTitle" style="margin: 0; font-size: 1.5em;">Server Details</h2>
-                <span onclick="closeModal()" style="cursor: pointer; font-size: 28px; font-weight: bold;">&times;</span>
-            </div>
-            <div id="modalContent" style="padding: 30px;">
-                <!-- Content will be populated by JavaScript -->
-            </div>
-        </div>
-    </div>
-
-    <div class="container">
-        <div class="header">
-            <h1>{app_id}</h1>
-            <div class="subtitle">Application Architecture & Dependencies</div>
-            <div class="subtitle">Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</div>
-        </div>
-
-        <div class="stats">
-            <div class="stat-card">
-                <div class="value">{total_flows}</div>
-                <div class="label">Total Flows</div>
-            </div>
-            <div class="stat-card">
-                <div class="value">{internal_flows}</div>
-                <div class="label">Internal Flows</div>
-            </div>
-            <div class="stat-card">
-                <div class="value">{outbound_flows}</div>
-                <div class="label">Outbound to Apps</div>
-            </div>
-            <div class="stat-card">
-                <div class="value">{external_flows}</div>
-                <div class="label">External Flows</div>
-            </div>
-            <div class="stat-card">
-                <div class="value">{dest_apps}</div>
-                <div class="label">Destination Apps</div>
-            </div>
-            <div class="stat-card">
-                <div class="value">{vmware_sources + vmware_dests}</div>
-                <div class="label">VMware Instances</div>
-            </div>
-            <div class="stat-card">
-                <div class="value">{failed_dns}</div>
-                <div class="label">Failed DNS (RED)</div>
-            </div>
-        </div>
-
-        <div class="toggle-section">
-            <button class="btn-toggle active" onclick="showView('architecture')" id="btn-architecture">
-                🏗️ Architecture (Tier-Based)
-            </button>
-            <button class="btn-toggle" onclick="showView('fullflow')" id="btn-fullflow">
-                🔄 Full Flow (End-to-End)
-            </button>
-            <button class="btn-toggle" onclick="showView('upstream')" id="btn-upstream">
-                ⬆️ Upstream Only
-            </button>
-            <button class="btn-toggle" onclick="showView('downstream')" id="btn-downstream">
-                ⬇️ Downstream Only
-            </button>
-        </div>
-
-        <div class="controls">
-            <button class="btn btn-primary" onclick="zoomIn()">🔍 Zoom In</button>
-            <button class="btn btn-primary" onclick="zoomOut()">🔍 Zoom Out</button>
-            <button class="btn btn-primary" onclick="resetZoom()">↺ Reset</button>
-            <button class="btn btn-secondary" onclick="window.print()">🖨️ Print</button>
-            <button class="btn btn-secondary" onclick="downloadSVG()">⬇️ Download SVG</button>
-            <button class="btn btn-secondary" onclick="downloadPNG()">⬇️ Download PNG</button>
-        </div>
-
-        <div class="diagram-container">
-            <div id="view-architecture" class="diagram-view" style="display: block;">
-                <div style="text-align: center; padding: 20px 0; background: linear-gradient(135deg, #4CAF50 0%, #2E7D32 100%); border-radius: 8px; margin-bottom: 20px;">
-                    <h3 style="color: #fff; margin: 0;">🏗️ ARCHITECTURE: {app_id} Vertical Tier-Based Layout (Optimized for Large Deployments)</h3>
-                </div>
-                <div class="mermaid">
-{architecture_mermaid}
-                </div>
-            </div>
-
-            <div id="view-fullflow" class="diagram-view" style="display: block;">
-                <div style="text-align: center; padding: 20px 0; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 8px; margin-bottom: 20px;">
-                    <h3 style="color: #fff; margin: 0;">🔄 FULL FLOW: Source Apps → {app_id} → Destination Apps</h3>
-                </div>
-                <div class="mermaid">
-{fullflow_mermaid}
-                </div>
-            </div>
-
-            <div id="view-upstream" class="diagram-view" style="display: block;">
-                <div style="text-align: center; padding: 20px 0; background: #e3f2fd; border-radius: 8px; margin-bottom: 20px;">
-                    <h3 style="color: #2a5298; margin: 0;">⬆️ UPSTREAM ONLY: Who Sends Data TO {app_id}</h3>
-                </div>
-                <div class="mermaid">
-{upstream_mermaid}
-                </div>
-            </div>
-
-            <div id="view-downstream" class="diagram-view" style="display: block;">
-                <div style="text-align: center; padding: 20px 0; background: #fff3e0; border-radius: 8px; margin-bottom: 20px;">
-                    <h3 style="color: #2a5298; margin: 0;">⬇️ DOWNSTREAM ONLY: Where {app_id} Sends Data</h3>
-                </div>
-                <div class="mermaid">
-{downstream_mermaid}
-                </div>
-            </div>
-        </div>
-
-        <div class="legend">
-            <h3>Legend</h3>
-            <div class="legend-items">
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #4CAF50; border-color: #2E7D32;"></div>
-                    <span>Source Application</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #E3F2FD; border-color: #1976D2;"></div>
-                    <span>Normal Server</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #FF9800; border-color: #E65100;"></div>
-                    <span>VMware/ESXi Server</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #FFF; border: 4px solid #F44336;"></div>
-                    <span>Load Balancer (F5/ALB)</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #F44336; border-color: #C62828;"></div>
-                    <span>External/Internet</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #F1F8E9; border-color: #689F38;"></div>
-                    <span>Internal Communication</span>
-                </div>
-                <div class="legend-item">
-                    <div class="legend-color" style="background: #FCE4EC; border-color: #C2185B;"></div>
-                    <span>External/Internet</span>
-                </div>
-            </div>
-        </div>
-
-        <div class="footer">
-            &copy; {datetime.now().year} Enterprise Security Team | Network Segmentation Analysis
-        </div>
-    </div>
-
-    <script>
-        mermaid.initialize({{
-            startOnLoad: true,
-            theme: 'default',
-            securityLevel: 'loose',
-            themeVariables: {{
-                fontSize: '13px',
-                fontFamily: 'Inter, -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif',
-                primaryColor: '#fff',
-                primaryTextColor: '#000',
-                lineColor: '#333',
-                edgeLabelBackground: '#ffffff'
-            }},
-            flowchart: {{
-                nodeSpacing: 50,
-                rankSpacing: 80,
-                padding: 15,
-                useMaxWidth: true,
-                htmlLabels: true,
-                curve: 'basis'
-            }}
-        }});
-
-        let currentZoom = 1;
-        let currentView = 'architecture';
-
-        // After Mermaid renders, hide the non-active views
-        window.addEventListener('load', function() {{
-            setTimeout(function() {{
-                document.getElementById('view-fullflow').style.display = 'none';
-                document.getElementById('view-upstream').style.display = 'none';
-                document.getElementById('view-downstream').style.display = 'none';
-            }}, 500);
-        }});
-
-        function showView(view) {{
-            // Hide all views
-            document.getElementById('view-architecture').style.display = 'none';
-            document.getElementById('view-fullflow').style.display = 'none';
-            document.getElementById('view-upstream').style.display = 'none';
-            document.getElementById('view-downstream').style.display = 'none';
-
-            // Remove active from all buttons
-            document.getElementById('btn-architecture').classList.remove('active');
-            document.getElementById('btn-fullflow').classList.remove('active');
-            document.getElementById('btn-upstream').classList.remove('active');
-            document.getElementById('btn-downstream').classList.remove('active');
-
-            // Show selected view
-            document.getElementById('view-' + view).style.display = 'block';
-            document.getElementById('btn-' + view).classList.add('active');
-
-            currentView = view;
-            resetZoom();
-        }}
-
-        function zoomIn() {{
-            currentZoom += 0.1;
-            const activeView = document.getElementById('view-' + currentView);
-            if (activeView) {{
-                activeView.style.transform = `scale(${{currentZoom}})`;
-            }}
-        }}
-
-        function zoomOut() {{
-            currentZoom = Math.max(0.5, currentZoom - 0.1);
-            const activeView = document.getElementById('view-' + currentView);
-            if (activeView) {{
-                activeView.style.transform = `scale(${{currentZoom}})`;
-            }}
-        }}
-
-        function resetZoom() {{
-            currentZoom = 1;
-            const activeView = document.getElementById('view-' + currentView);
-            if (activeView) {{
-                activeView.style.transform = 'scale(1)';
-            }}
-        }}
-
-        function downloadSVG() {{
-            const svg = document.querySelector('#diagram svg');
-            if (svg) {{
-                const svgData = new XMLSerializer().serializeToString(svg);
-                const blob = new Blob([svgData], {{ type: 'image/svg+xml' }});
-                const url = URL.createObjectURL(blob);
-                const a = document.createElement('a');
-                a.href = url;
-                a.download = '{app_id}_architecture.svg';
-                a.click();
-            }}
-        }}
-
-        function downloadPNG() {{
-            const svg = document.querySelector('#diagram svg');
-            if (svg) {{
-                const canvas = document.createElement('canvas');
-                const ctx = canvas.getContext('2d');
-                const img = new Image();
-                const svgData = new XMLSerializer().serializeToString(svg);
-                const blob = new Blob([svgData], {{ type: 'image/svg+xml' }});
-                const url = URL.createObjectURL(blob);
-
-                img.onload = function() {{
-                    canvas.width = img.width * 2;
-                    canvas.height = img.height * 2;
-                    ctx.drawImage(img, 0, 0, canvas.width, canvas.height);
-                    canvas.toBlob(function(blob) {{
-                        const pngUrl = URL.createObjectURL(blob);
-                        const a = document.createElement('a');
-                        a.href = pngUrl;
-                        a.download = '{app_id}_architecture.png';
-                        a.click();
-                    }});
-                }};
-                img.src = url;
-            }}
-        }}
-
-        // Node details data for modal popups
-        const nodeDetails = {node_details_json};
-
-        // Add click handlers to all diagram nodes
-        window.addEventListener('load', function() {{
-            setTimeout(function() {{
-                // Get all node elements from Mermaid diagrams
-                const nodes = document.querySelectorAll('.node');
-                nodes.forEach(function(node) {{
-                    // Make nodes clickable if they have "+X more"
-                    const label = node.querySelector('.nodeLabel');
-                    if (label && label.textContent.includes('(+')) {{
-                        node.style.cursor = 'pointer';
-                        node.addEventListener('click', function(e) {{
-                            e.stopPropagation();
-                            showNodeDetails(node);
-                        }});
-                    }}
-                }});
-            }}, 1000);
-        }});
-
-        function showNodeDetails(node) {{
-            const label = node.querySelector('.nodeLabel');
-            if (!label) return;
-
-            const text = label.textContent;
-
-            // Try to determine which node this is
-            let nodeKey = null;
-            let details = null;
-
-            // Check if it's SOURCE
-            if (text.includes('{app_id}') && text.includes('Servers')) {{
-                nodeKey = 'SOURCE';
-                details = nodeDetails.SOURCE;
-            }}
-            // Check for destination apps
-            else {{
-                for (let key in nodeDetails) {{
-                    if (key.startsWith('DEST_')) {{
-                        const appName = key.replace('DEST_', '');
-                        if (text.includes(appName)) {{
-                            details = nodeDetails[key];
-                            break;
-                        }}
-                    }}
-                }}
-            }}
-            // Check for EXTERNAL
-            if (!details && (text.includes('External') || text.includes('Internet'))) {{
-                details = nodeDetails.EXTERNAL;
-            }}
-
-            if (details) {{
-                showModal(details.title, details.items);
-            }}
-        }}
-
-        function showModal(title, items) {{
-            const modal = document.getElementById('detailsModal');
-            const modalTitle = document.getElementById('modalTitle');
-            const modalContent = document.getElementById('modalContent');
-
-            modalTitle.textContent = title;
-
-            // Server type icons/emojis
-            const typeIcons = {{
-                'Web': '🌐',
-                'Database': '🗄️',
-                'App': '⚙️',
-                'DNS': '🔍',
-                'Mail': '📧',
-                'File': '📁',
-                'Domain Controller': '👑',
-                'Cache': '💾',
-                'Message Queue': '📨',
-                'Monitoring': '📊',
-                'Backup': '💿',
-                'General': '🖥️'
-            }};
-
-            // Build the list with server types
-            let html = '<div style="max-height: 500px; overflow-y: auto;">';
-            html += '<table style="width: 100%; border-collapse: collapse;">';
-            html += '<tr style="background: #2a5298; color: white;">';
-            html += '<th style="padding: 10px; text-align: left;">#</th>';
-            html += '<th style="padding: 10px; text-align: left;">Type</th>';
-            html += '<th style="padding: 10px; text-align: left;">IP (Hostname)</th>';
-            html += '</tr>';
-
-            items.forEach(function(item, idx) {{
-                const bg = idx % 2 === 0 ? '#f8f9fa' : 'white';
-                const serverType = item.type || 'General';
-                const icon = typeIcons[serverType] || '🖥️';
-                const display = item.display || item;
-
-                html += `<tr style="background: ${{bg}};">`;
-                html += `<td style="padding: 8px; border-bottom: 1px solid #ddd;">${{idx + 1}}</td>`;
-                html += `<td style="padding: 8px; border-bottom: 1px solid #ddd;"><span style="font-size: 16px;">${{icon}}</span> ${{serverType}}</td>`;
-                html += `<td style="padding: 8px; border-bottom: 1px solid #ddd; font-family: monospace;">${{display}}</td>`;
-                html += `</tr>`;
-            }});
-            html += '</table></div>';
-
-            // Count server types
-            const typeCounts = {{}};
-            items.forEach(function(item) {{
-                const type = item.type || 'General';
-                typeCounts[type] = (typeCounts[type] || 0) + 1;
-            }});
-
-            html += `<div style="margin-top: 15px; padding: 15px; background: #e3f2fd; border-radius: 5px;">`;
-            html += `<strong>Total:</strong> ${{items.length}} servers<br/><br/>`;
-            html += `<strong>Breakdown by Type:</strong><br/>`;
-            for (let type in typeCounts) {{
-                const icon = typeIcons[type] || '🖥️';
-                html += `<span style="display: inline-block; margin: 5px 10px 5px 0;">${{icon}} ${{type}}: ${{typeCounts[type]}}</span>`;
-            }}
-            html += `</div>`;
-
-            modalContent.innerHTML = html;
-            modal.style.display = 'block';
-        }}
-
-        function closeModal() {{
-            document.getElementById('detailsModal').style.display = 'none';
-        }}
-
-        // Architecture diagram click handlers
-        function showWebServers() {{
-            const data = nodeDetails['ARCH_WEB'];
-            if (data) {{
-                showModal(data.title, data.items);
-            }}
-        }}
-
-        function showAppServers() {{
-            const data = nodeDetails['ARCH_APP'];
-            if (data) {{
-                showModal(data.title, data.items);
-            }}
-        }}
-
-        function showDatabaseServers() {{
-            const data = nodeDetails['ARCH_DB'];
-            if (data) {{
-                showModal(data.title, data.items);
-            }}
-        }}
-
-        // Close modal when clicking outside
-        window.onclick = function(event) {{
-            const modal = document.getElementById('detailsModal');
-            if (event.target == modal) {{
-                modal.style.display = 'none';
-            }}
-        }}
-    </script>
-</body>
-</html>"""
-
-        return html
+        generated = datetime.now()
+        return render_page(
+            'application_report', f"{app_id} - Application Architecture",
+            fields={
+                'app_id': app_id,
+                'generated': generated.strftime('%B %d, %Y at %I:%M %p'),
+                'year': generated.year,
+                'total_flows': total_flows,
+                'internal_flows': internal_flows,
+                'outbound_flows': outbound_flows,
+                'external_flows': external_flows,
+                'dest_apps': dest_apps,
+                'vmware_instances': vmware_sources + vmware_dests,
+                'failed_dns': failed_dns,
+            },
+            diagrams={
+                'architecture': architecture_mermaid,
+                'fullflow': fullflow_mermaid,
+                'upstream': upstream_mermaid,
+                'downstream': downstream_mermaid,
+            },
+            data={'nodeDetails': node_details}
+        )
 
     def _generate_png_from_mermaid(self, mmd_file: Path, png_file: Path) -> bool:
-        """Generate PNG using mmdc CLI"""
-        try:
-            subprocess.run([
-                'mmdc',
-                '-i', str(mmd_file),
-                '-o', str(png_file),
-                '-b', 'white',
-                '-w', '2400',
-                '-H', '1800'
-            ], check=True, capture_output=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        """Generate PNG using the shared Mermaid render pool"""
+        return render_mermaid_file(mmd_file, png_file, background='white', width=2400, height=1800)
 
     def _generate_svg_from_mermaid(self, mmd_file: Path, svg_file: Path) -> bool:
-        """Generate SVG using mmdc CLI"""
-        try:
-            subprocess.run([
-                'mmdc',
-                '-i', str(mmd_file),
-                '-o', str(svg_file),
-                '-b', 'white'
-            ], check=True, capture_output=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        """Generate SVG using the shared Mermaid render pool"""
+        return render_mermaid_file(mmd_file, svg_file, background='white')
 
     def _generate_architecture_docx(self, app_id: str, flows_df: pd.DataFrame, output_file: Path):
         """Generate Architecture DOCX documentation"""
@@ -1906,8 +1265,15 @@ class CompleteReportGenerator:
         with open(output_file, 'w') as f:
             json.dump(segmentation, f, indent=2)
 
-    def process_all_apps(self, batch_size: int = 10):
-        """Process all applications in batches"""
+    def process_all_apps(self, batch_size: int = 10, workers: int = None):
+        """
+        Process all applications
+
+        Args:
+            batch_size: Log a checkpoint every batch_size applications
+            workers: Worker processes for per-app generation (default:
+                NETSEG_REPORT_WORKERS or CPU count; 1 = in-process)
+        """
         logger.info("="*80)
         logger.info("COMPLETE REPORT GENERATION - FORTINET STYLE")
         logger.info("="*80)
@@ -1915,39 +1281,91 @@ class CompleteReportGenerator:
         # Get all app directories
         app_dirs = sorted([d for d in self.apps_dir.iterdir() if d.is_dir()])
         logger.info(f"Found {len(app_dirs)} applications")
-        logger.info(f"Processing in batches of {batch_size}")
+        logger.info(f"Checkpoint every {batch_size} applications")
         logger.info("")
 
         total_outputs = {}
         processed = 0
-
+        up_to_date = 0
+
+        # Build keys: own flows + generator code; cross-app outputs also
+        # depend on the app's slice of the upstream index
+        src_dir = Path(__file__).parent / 'src'
+        generator_sources = [Path(__file__), src_dir / 'mermaid_renderer.py', src_dir / 'upstream_index.py',
+                             src_dir / 'diagram_lod.py', *TEMPLATE_SOURCES]
+        upstream_index = self.upstream_index
+
+        # Plan in the parent: only out-of-date apps are dispatched
+        keys = {}
+        stale = []
         for app_dir in app_dirs:
             flows_csv = app_dir / 'flows.csv'
             if not flows_csv.exists():
                 continue
 
             app_id = app_dir.name
+            app_key = self.cache.key(flows_csv, generator_sources)
+            upstream = upstream_index.get(app_id)
+            cross_app_key = self.cache.key(app_key, upstream.to_dict() if upstream else None)
+            app_fresh = self.cache.is_fresh(f'{app_id}/app', app_key)
+            cross_app_fresh = self.cache.is_fresh(f'{app_id}/cross-app', cross_app_key)
+
+            if app_fresh and cross_app_fresh:
+                total_outputs[app_id] = self.cache.outputs(f'{app_id}/app') + self.cache.outputs(f'{app_id}/cross-app')
+                processed += 1
+                up_to_date += 1
+                continue
 
+            keys[app_id] = (app_key, cross_app_key)
+            stale.append((app_id, not app_fresh, not cross_app_fresh))
+
+        # Diagrams, HTML, DOCX and JSON in worker processes (logs merged in app order)
+        def collect(result):
+            nonlocal processed
+            app_id = result.item[0]
+            if not result.ok:
+                logger.error(f"[{app_id}] Error: {result.error}")
+                return
+            total_outputs[app_id] = result.value
+            processed += 1
+            if processed % batch_size == 0:
+                logger.info(f"[CHECKPOINT] Processed {processed}/{len(app_dirs)} apps")
+
+        results = run_per_app(_generate_app_package, stale, shared=self, workers=workers, on_result=collect)
+
+        # PNG/SVG through the shared render pool (already concurrent)
+        render_apps = [app_id for (app_id, app_outputs, _), result in zip(stale, results)
+                       if result.ok and app_outputs]
+        def render(app_id):
             try:
-                # Read enriched flows
-                flows_df = pd.read_csv(flows_csv)
+                return self._render_app_images(app_id, self.mmd_dir / f"{app_id}_downstream.mmd")
+            except Exception as e:
+                logger.error(f"[{app_id}] Image rendering failed: {e}")
+                return {}
 
-                # Generate all outputs
-                outputs = self.generate_for_app(app_id, flows_df)
-                total_outputs[app_id] = outputs
+        if render_apps:
+            with ThreadPoolExecutor(max_workers=get_render_pool().size) as executor:
+                images = executor.map(render, render_apps)
+                for app_id, image_outputs in zip(render_apps, images):
+                    total_outputs[app_id].update(image_outputs)
 
-                processed += 1
-
-                # Batch checkpoint
-                if processed % batch_size == 0:
-                    logger.info(f"[CHECKPOINT] Processed {processed}/{len(app_dirs)} apps")
+        for (app_id, app_outputs, cross_app_outputs), result in zip(stale, results):
+            if not result.ok:
+                continue
+            outputs = total_outputs[app_id]
+            app_key, cross_app_key = keys[app_id]
+            if app_outputs and 'png' in outputs and 'svg' in outputs:
+                self.cache.record(f'{app_id}/app', app_key,
+                                  [path for role, path in outputs.items() if role not in CROSS_APP_OUTPUTS])
+            if cross_app_outputs:
+                self.cache.record(f'{app_id}/cross-app', cross_app_key,
+                                  [path for role, path in outputs.items() if role in CROSS_APP_OUTPUTS])
 
-            except Exception as e:
-                logger.error(f"[{app_id}] Error: {e}")
+        self.cache.save()
 
         logger.info("")
         logger.info("="*80)
-        logger.info(f"COMPLETE! Processed {processed} applications")
+        logger.info(f"COMPLETE! Processed {processed} applications ({up_to_date} up to date)")
         logger.info("="*80)
         logger.info("")
         logger.info("Outputs generated:")
@@ -1961,12 +1379,31 @@ class CompleteReportGenerator:
         return total_outputs
 
 
+def _generate_app_package(item, generator: CompleteReportGenerator) -> Dict:
+    """Worker task: out-of-date outputs of one app, except PNG/SVG"""
+    app_id, app_outputs, cross_app_outputs = item
+    flows_df = pd.read_csv(generator.apps_dir / app_id / 'flows.csv')
+    return generator.generate_for_app(app_id, flows_df,
+                                      app_outputs=app_outputs,
+                                      cross_app_outputs=cross_app_outputs,
+                                      render_images=False)
+
+
 def main():
     """Generate complete reports for all applications"""
-    generator = CompleteReportGenerator()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate complete report packages for all applications')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild all outputs, even for apps whose flows are unchanged')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for per-app generation (default: NETSEG_REPORT_WORKERS or CPU count)')
+    args = parser.parse_args()
+
+    generator = CompleteReportGenerator(force=args.force)
 
     # Process all apps
-    outputs = generator.process_all_apps(batch_size=10)
+    outputs = generator.process_all_apps(batch_size=10, workers=args.workers)
 
     logger.info("")
     logger.info(f"Total applications processed: {len(outputs)}")
@@ -4,6 +4,9 @@
 Python-based PNG and SVG generation using Mermaid.ink API
 NO Node.js or Chromium required - pure Python!
 Generates both PNG (for compatibility) and SVG (for scalable, zoom-friendly diagrams)
+
+Set NETSEG_MERMAID_INK_URL to use a self-hosted mermaid.ink instead of the
+public API (see src/mermaid_ink_client.py for concurrency, backoff and cache).
 """
 import os
 import sys
@@ -17,17 +20,16 @@ if sys.platform == 'win32':
         sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
 import argparse
-import base64
-import urllib.request
-import urllib.parse
 from pathlib import Path
-import time
-import subprocess
-import tempfile
+
+from src.mermaid_ink_client import get_mermaid_ink_client
+from src.mermaid_renderer import render_mermaid, strip_mermaid_fences
+from src.utils.build_cache import ArtifactCache, MANIFEST_NAME
 
 def generate_with_mmdc(content: str, output_path: Path, format_type: str) -> bool:
     """
-    Fallback: Generate PNG or SVG using local mmdc when API fails
+    Fallback: Generate PNG or SVG using local Mermaid CLI when API fails
+    (in-process renderer, warm mmdc workers for unsupported syntax; see src/mermaid_renderer.py)
 
     Args:
         content: Raw Mermaid content (already stripped of fences)
@@ -37,39 +39,13 @@ def generate_with_mmdc(content: str, output_path: Path, format_type: str) -> boo
     Returns:
         True if successful, False otherwise
     """
-    # Write content to temporary file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False, encoding='utf-8') as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
+    options = {'format': format_type, 'timeout': 60}
+    if format_type == 'png':
+        options.update(width=4800, background='transparent')
 
     try:
-        # Run mmdc
-        cmd = ['mmdc', '-i', tmp_path, '-o', str(output_path)]
-        if format_type == 'png':
-            cmd.extend(['-w', '4800', '-b', 'transparent'])
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        # Clean up temp file
-        Path(tmp_path).unlink()
-
-        return result.returncode == 0
-
-    except FileNotFoundError:
-        # mmdc not found
-        Path(tmp_path).unlink()
-        return False
+        return render_mermaid(content, output_path, **options)
     except Exception:
-        # Any other error
-        try:
-            Path(tmp_path).unlink()
-        except:
-            pass
         return False
 
 def generate_diagram(mmd_file: Path, content: str, format_type: str) -> bool:
@@ -85,69 +61,81 @@ def generate_diagram(mmd_file: Path, content: str, format_type: str) -> bool:
         True if successful, False otherwise
     """
     output_path = mmd_file.with_suffix(f'.{format_type}')
-    
-    # Retry logic for 503 errors
-    max_retries = 3
-    retry_count = 0
-    success = False
-
-    while retry_count < max_retries and not success:
-        try:
-            # Encode diagram for URL (base64)
-            encoded = base64.urlsafe_b64encode(content.encode('utf-8')).decode('ascii')
-
-            # Use Mermaid.ink API
-            if format_type == 'png':
-                url = f"https://mermaid.ink/img/{encoded}?type=png&width=4800"
-            else:  # svg
-                url = f"https://mermaid.ink/svg/{encoded}"
-
-            # Download file
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'NetworkSegmentationAnalyzer/1.0')
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                if response.status == 200:
-                    data = response.read()
-
-                    # Validate content
-                    if format_type == 'png':
-                        is_valid = data.startswith(b'\x89PNG') and len(data) > 10240
-                        min_size = 10240
-                    else:  # svg
-                        is_valid = b'<svg' in data and len(data) > 100
-                        min_size = 100
-
-                    if is_valid:
-                        with open(output_path, 'wb') as f:
-                            f.write(data)
-                        success = True
-                    else:
-                        retry_count += 1
-                        time.sleep(3)
-                else:
-                    retry_count += 1
-                    time.sleep(2)
-
-            # Be nice to the API
-            if success:
-                time.sleep(1.5)
-
-        except Exception as e:
-            error_msg = str(e)
-            if '503' in error_msg or 'Service Unavailable' in error_msg:
-                retry_count += 1
-                time.sleep(3)
-            else:
-                retry_count = max_retries
-                break
 
-    # If API failed, try local mmdc as fallback
-    if not success:
-        if generate_with_mmdc(content, output_path, format_type):
-            success = True
+    # Mermaid.ink API (cached by content, rate-limited), local mmdc as fallback
+    if get_mermaid_ink_client().render_to_file(content, output_path, format_type, width=4800):
+        return True
+    return generate_with_mmdc(content, output_path, format_type)
+
+def stale_formats(mmd_file: Path, formats: list, cache: ArtifactCache) -> list:
+    """
+    Formats of a diagram whose output is missing or older than the .mmd content
+
+    Returns:
+        List of (format, build key) tuples
+    """
+    stale = []
+    for fmt in formats:
+        key = cache.key(mmd_file, fmt)
+        if not cache.is_fresh(f'{fmt}/{mmd_file.stem}', key):
+            stale.append((fmt, key))
+    return stale
+
+
+def render_batch(stale_by_file: dict, cache: ArtifactCache, contents: dict = None) -> dict:
+    """
+    Render the stale formats of many diagrams and record successful outputs
+
+    API requests for the whole batch run concurrently (bounded and
+    rate-limited by the mermaid.ink client); diagrams the API cannot render
+    fall back to local mmdc.
+
+    Args:
+        stale_by_file: {mmd_file: (format, key) tuples from stale_formats()}
+        cache: Build cache for the diagram directory
+        contents: {mmd_file: definition} for diagrams already in memory
+
+    Returns:
+        {mmd_file: {format: True/False}}
+    """
+    jobs = []
+    for mmd_file, stale in stale_by_file.items():
+        content = (contents or {}).get(mmd_file)
+        if content is None:
+            with open(mmd_file, 'r', encoding='utf-8') as f:
+                content = strip_mermaid_fences(f.read())
+        jobs.extend((mmd_file, content, fmt, key) for fmt, key in stale)
+
+    rendered = get_mermaid_ink_client().render_many(
+        [(content, mmd_file.with_suffix(f'.{fmt}')) for mmd_file, content, fmt, _ in jobs], width=4800
+    )
+
+    results = {mmd_file: {} for mmd_file in stale_by_file}
+    for (mmd_file, content, fmt, key), ok in zip(jobs, rendered):
+        output_path = mmd_file.with_suffix(f'.{fmt}')
+        ok = ok or generate_with_mmdc(content, output_path, fmt)
+        if ok:
+            cache.record(f'{fmt}/{mmd_file.stem}', key, [output_path])
+        results[mmd_file][fmt] = ok
+    return results
+
+
+def render_formats(mmd_file: Path, stale: list, cache: ArtifactCache, content: str = None) -> dict:
+    """
+    Render the stale formats of one diagram and record successful outputs
+
+    Args:
+        mmd_file: Source Mermaid file
+        stale: (format, key) tuples from stale_formats()
+        cache: Build cache for the diagram directory
+        content: Diagram definition if already in memory (read from mmd_file otherwise)
+
+    Returns:
+        {format: True/False}
+    """
+    contents = {mmd_file: content} if content is not None else None
+    return render_batch({mmd_file: stale}, cache, contents)[mmd_file]
 
-    return success
 
 def main():
     """Main execution"""
@@ -165,6 +153,11 @@ def main():
         default='both',
         help='Output format: png, svg, or both (default: both)'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-render all diagrams, even when the .mmd source is unchanged'
+    )
     args = parser.parse_args()
 
     print("="*80)
@@ -209,21 +202,22 @@ def main():
     if args.format in ['svg', 'both']:
         formats_to_generate.append('svg')
 
+    # Outputs are rebuilt when the .mmd content changed, not only when missing
+    cache = ArtifactCache(diagram_dir / MANIFEST_NAME, force=args.force)
+    stale_by_file = {}
+
     for mmd_file in all_mmd_files:
-        needs_generation = False
-        for fmt in formats_to_generate:
-            output_file = mmd_file.with_suffix(f'.{fmt}')
-            if not output_file.exists():
-                needs_generation = True
-                break
-        if needs_generation:
+        stale = stale_formats(mmd_file, formats_to_generate, cache)
+        if stale:
             missing_files.append(mmd_file)
+            stale_by_file[mmd_file] = stale
 
     print(f"Found {len(all_mmd_files)} total Mermaid diagrams")
     print(f"Need to process {len(missing_files)} diagrams")
 
     if not missing_files:
-        print("\n[OK] All output files already exist!")
+        cache.save()
+        print("\n[OK] All output files are up to date!")
         return
 
     print(f"\nGenerating diagrams using Mermaid.ink API...")
@@ -234,62 +228,22 @@ def main():
     svg_success = 0
     svg_failed = 0
 
+    results = render_batch(stale_by_file, cache)
+
     for mmd_file in missing_files:
         app_name = mmd_file.stem.replace('_diagram', '')
         print(f"\n{app_name}:")
 
-        # Read diagram content once
-        with open(mmd_file, 'r', encoding='utf-8') as f:
-            file_content = f.read()
-
-        # Strip markdown fences if present
-        if '```mermaid' in file_content:
-            lines = file_content.split('\n')
-            graph_lines = []
-            in_graph = False
-
-            for line in lines:
-                stripped = line.strip()
-                if stripped.startswith('```mermaid'):
-                    in_graph = True
-                    continue
-                elif stripped == '```':
-                    in_graph = False
-                    break
-                elif in_graph:
-                    graph_lines.append(line)
-
-            content = '\n'.join(graph_lines).strip()
-        else:
-            content = file_content.strip()
-
-        # Generate PNG if needed
-        if 'png' in formats_to_generate:
-            png_path = mmd_file.with_suffix('.png')
-            if not png_path.exists():
-                print(f"  PNG...", end=' ', flush=True)
-                if generate_diagram(mmd_file, content, 'png'):
-                    print("[OK]")
-                    png_success += 1
-                else:
-                    print("[FAILED]")
-                    png_failed += 1
+        for fmt, ok in results[mmd_file].items():
+            print(f"  {fmt.upper()}... {'[OK]' if ok else '[FAILED]'}")
+            if fmt == 'png':
+                png_success += ok
+                png_failed += not ok
             else:
-                print(f"  PNG... [EXISTS]")
-
-        # Generate SVG if needed
-        if 'svg' in formats_to_generate:
-            svg_path = mmd_file.with_suffix('.svg')
-            if not svg_path.exists():
-                print(f"  SVG...", end=' ', flush=True)
-                if generate_diagram(mmd_file, content, 'svg'):
-                    print("[OK]")
-                    svg_success += 1
-                else:
-                    print("[FAILED]")
-                    svg_failed += 1
-            else:
-                print(f"  SVG... [EXISTS]")
+                svg_success += ok
+                svg_failed += not ok
+
+    cache.save()
 
     print("\n" + "="*80)
     print(f"DIAGRAM GENERATION COMPLETE")
@@ -5,7 +5,10 @@ Generates detailed Solution Design documents for all applications using
 the comprehensive document generator.
 
 Usage:
-    python generate_solution_design_docs.py
+    python generate_solution_design_docs.py [--force]
+
+Documents are only regenerated for applications whose topology entry,
+diagrams or document generator changed since the last run.
 
 Output:
     outputs_final/word_reports/architecture/Solution_Design-{AppID}.docx
@@ -17,6 +20,7 @@ Version: 1.0
 import sys
 import json
 import logging
+import argparse
 from pathlib import Path
 from datetime import datetime
 
@@ -24,6 +28,8 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from comprehensive_solution_doc_generator import generate_comprehensive_solution_document
+from utils.build_cache import ArtifactCache, MANIFEST_NAME
+from orchestration.app_pool import run_per_app
 
 # Setup logging
 logging.basicConfig(
@@ -85,7 +91,9 @@ def find_application_diagrams(app_name: str, diagrams_dir: Path) -> tuple:
 def generate_all_solution_docs(
     topology_data: dict,
     diagrams_dir: Path,
-    output_dir: Path
+    output_dir: Path,
+    force: bool = False,
+    workers: int = None
 ):
     """Generate solution design documents for all applications
 
@@ -93,8 +101,13 @@ def generate_all_solution_docs(
         topology_data: Dictionary of application topology data
         diagrams_dir: Directory containing diagrams
         output_dir: Output directory for generated documents
+        force: Regenerate documents even when their inputs are unchanged
+        workers: Worker processes (default: NETSEG_REPORT_WORKERS or CPU
+            count; 1 = in-process)
     """
     output_dir.mkdir(parents=True, exist_ok=True)
+    cache = ArtifactCache(output_dir / MANIFEST_NAME, force=force)
+    generator_source = Path(__file__).parent / 'src' / 'comprehensive_solution_doc_generator.py'
 
     logger.info("=" * 80)
     logger.info("GENERATING SOLUTION DESIGN DOCUMENTS")
@@ -104,7 +117,9 @@ def generate_all_solution_docs(
     successful = 0
     failed = 0
     skipped = 0
+    up_to_date = 0
 
+    pending = []
     for idx, (app_name, app_data) in enumerate(topology_data.items(), 1):
         logger.info(f"\n[{idx}/{total_apps}] Processing: {app_name}")
 
@@ -119,37 +134,67 @@ def generate_all_solution_docs(
         # Output path
         output_path = output_dir / f"Solution_Design-{app_name}.docx"
 
-        try:
-            # Generate document
-            generate_comprehensive_solution_document(
-                app_name=app_name,
-                app_data=app_data,
-                png_path=png_path,
-                mermaid_path=mermaid_path,
-                output_path=str(output_path)
-            )
+        key = cache.key(
+            app_data,
+            Path(png_path) if png_path else None,
+            Path(mermaid_path) if mermaid_path else None,
+            generator_source
+        )
+        if cache.is_fresh(app_name, key):
+            logger.info(f"  [OK] Up to date: {output_path.name}")
+            up_to_date += 1
+            continue
 
-            successful += 1
-            logger.info(f"  [OK] Document generated: {output_path.name}")
+        pending.append((app_name, png_path, mermaid_path, str(output_path), key))
 
-        except Exception as e:
-            logger.error(f"  [FAIL] Failed to generate document: {e}")
+    # Documents are independent: build them in worker processes that share
+    # the topology, merging logs in application order
+    for result in run_per_app(_generate_solution_doc, pending, shared=topology_data, workers=workers):
+        app_name, _, _, output_path, key = result.item
+        if result.ok:
+            cache.record(app_name, key, [output_path])
+            successful += 1
+            logger.info(f"  [OK] Document generated: {Path(output_path).name}")
+        else:
+            logger.error(f"  [FAIL] Failed to generate document for {app_name}: {result.error}")
             failed += 1
 
+    cache.save()
+
     # Summary
     logger.info("\n" + "=" * 80)
     logger.info("GENERATION COMPLETE")
     logger.info("=" * 80)
     logger.info(f"Total applications: {total_apps}")
     logger.info(f"Documents generated: {successful}")
+    logger.info(f"Up to date (skipped): {up_to_date}")
     logger.info(f"Failed: {failed}")
     logger.info(f"Skipped (no diagrams): {skipped}")
     logger.info(f"Output directory: {output_dir}")
     logger.info("=" * 80)
 
 
+def _generate_solution_doc(item, topology_data: dict):
+    """Worker task: one solution design document"""
+    app_name, png_path, mermaid_path, output_path, _ = item
+    generate_comprehensive_solution_document(
+        app_name=app_name,
+        app_data=topology_data[app_name],
+        png_path=png_path,
+        mermaid_path=mermaid_path,
+        output_path=output_path
+    )
+
+
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Generate solution design documents for all applications')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate all documents, even for unchanged applications')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: NETSEG_REPORT_WORKERS or CPU count)')
+    args = parser.parse_args()
+
     start_time = datetime.now()
 
     logger.info("\n" + "=" * 80)
@@ -191,7 +236,7 @@ def main():
     logger.info("")
 
     # Generate documents
-    generate_all_solution_docs(topology_data, diagrams_dir, output_dir)
+    generate_all_solution_docs(topology_data, diagrams_dir, output_dir, force=args.force, workers=args.workers)
 
     # Completion
     end_time = datetime.now()
@@ -11,7 +11,10 @@ Now includes:
 3. HTML visualizations (NEW)
 
 Usage:
-    python generate_threat_surface_docs.py
+    python generate_threat_surface_docs.py [--force]
+
+Word docs are only regenerated for applications whose topology entry (or
+the document generator) changed since the last run; --force rebuilds all.
 
 Output Locations:
     - Word docs: outputs_final/word_reports/threat_surface/
@@ -19,12 +22,14 @@ Output Locations:
     - HTML viz: outputs/visualizations/
 """
 
+import argparse
 import json
 import logging
 import sys
 from pathlib import Path
 from datetime import datetime
 from src.threat_surface_netseg_generator import generate_threat_surface_document
+from src.utils.build_cache import ArtifactCache, MANIFEST_NAME
 
 # Force UTF-8 encoding for Windows console
 if sys.platform == 'win32':
@@ -65,6 +70,7 @@ def run_networkx_threat_analysis():
         # Import the new threat analysis modules
         from src.parser import parse_network_logs
         from src.graph_analyzer import GraphAnalyzer
+        from src.graph_snapshot import hash_input_files
         from src.threat_surface_analyzer import ThreatSurfaceAnalyzer
 
         # Parse network flows from ENRICHED persistent data (not raw source files!)
@@ -97,27 +103,37 @@ def run_networkx_threat_analysis():
 
         logger.info(f"  Found {len(flows_files)} enriched flows.csv files")
 
-        # Create a temporary directory with symlinks/copies for parsing
-        import tempfile
-        import shutil
+        # Reuse the graph snapshot when no flows.csv changed since it was written
+        snapshot_path = Path('outputs/threat_analysis/network_graph.gsnap')
+        input_hash = hash_input_files(flows_files, root=persistent_apps_dir)
+        graph_analyzer = GraphAnalyzer.from_snapshot(str(snapshot_path), content_hash=input_hash)
+
+        if graph_analyzer is not None:
+            logger.info(f"  [OK] Input unchanged - reusing graph snapshot {snapshot_path}")
+        else:
+            # Create a temporary directory with symlinks/copies for parsing
+            import tempfile
+            import shutil
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_path = Path(temp_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+                # Copy all flows.csv to temp directory with unique names
+                for i, flows_file in enumerate(flows_files):
+                    app_name = flows_file.parent.name
+                    dest = temp_path / f"{app_name}_flows.csv"
+                    shutil.copy2(flows_file, dest)
 
-            # Copy all flows.csv to temp directory with unique names
-            for i, flows_file in enumerate(flows_files):
-                app_name = flows_file.parent.name
-                dest = temp_path / f"{app_name}_flows.csv"
-                shutil.copy2(flows_file, dest)
+                logger.info(f"  Parsing enriched data from {len(flows_files)} applications...")
+                parser = parse_network_logs(str(temp_path))
 
-            logger.info(f"  Parsing enriched data from {len(flows_files)} applications...")
-            parser = parse_network_logs(str(temp_path))
+            logger.info(f"  [OK] Loaded {len(parser.records)} flow records")
 
-        logger.info(f"  [OK] Loaded {len(parser.records)} flow records")
+            # Build graph
+            logger.info("Building network graph with NetworkX...")
+            graph_analyzer = GraphAnalyzer(parser.records)
+            graph_analyzer.save_snapshot(str(snapshot_path), content_hash=input_hash)
 
-        # Build graph
-        logger.info("Building network graph with NetworkX...")
-        graph_analyzer = GraphAnalyzer(parser.records)
         logger.info(f"  [OK] Graph built: {graph_analyzer.graph.number_of_nodes()} nodes, "
                    f"{graph_analyzer.graph.number_of_edges()} edges")
 
@@ -206,8 +222,70 @@ def generate_threat_html_visualization():
         return False
 
 
-def main():
+def generate_threat_documents(topology, output_dir, force=False):
+    """
+    Generate a threat surface Word document per application
+
+    Args:
+        topology: {app_name: app_data} from the master topology
+        output_dir: Output directory for ThreatSurface-<app>.docx
+        force: Regenerate documents even when their topology entry is unchanged
+
+    Returns:
+        dict: success / up_to_date / failed counts and failed_apps list
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Skip documents whose inputs are unchanged since the last run
+    cache = ArtifactCache(output_dir / MANIFEST_NAME, force=force)
+    generator_source = Path(__file__).parent / 'src' / 'threat_surface_netseg_generator.py'
+
+    results = {'success': 0, 'up_to_date': 0, 'failed': 0, 'failed_apps': []}
+
+    for idx, (app_name, app_data) in enumerate(sorted(topology.items()), 1):
+        try:
+            # Progress indicator
+            progress = f"[{idx}/{len(topology)}]"
+            print(f"{progress} {app_name}...", end=' ', flush=True)
+
+            # Output path
+            output_path = output_dir / f'ThreatSurface-{app_name}.docx'
+
+            key = cache.key(app_data, generator_source)
+            if cache.is_fresh(app_name, key):
+                print("[UP TO DATE]")
+                results['up_to_date'] += 1
+                continue
+
+            # Generate document
+            generate_threat_surface_document(
+                app_name=app_name,
+                app_data=app_data,
+                output_path=str(output_path)
+            )
+            cache.record(app_name, key, [output_path])
+
+            print("[OK]")
+            results['success'] += 1
+
+        except Exception as e:
+            print(f"[ERROR] Error: {e}")
+            logger.error(f"Failed to generate document for {app_name}: {e}")
+            results['failed'] += 1
+            results['failed_apps'].append(app_name)
+
+    cache.save()
+    return results
+
+
+def main(argv=None):
     """Generate threat surface documents for all applications"""
+    parser = argparse.ArgumentParser(description='Generate threat surface documents for all applications')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate all Word documents, even for unchanged applications')
+    args = parser.parse_args(argv)
+
     print("="*80)
     print("THREAT SURFACE ANALYSIS & NETWORK SEGMENTATION DOCUMENTS")
     print("="*80)
@@ -274,46 +352,21 @@ def main():
 
     # Setup output directory
     output_dir = Path('outputs_final/word_reports/threat_surface')
-    output_dir.mkdir(parents=True, exist_ok=True)
 
     logger.info(f"Output directory: {output_dir}")
     print()
 
-    # Track statistics
-    success_count = 0
-    failed_count = 0
-    failed_apps = []
-
     start_time = datetime.now()
 
     # Generate documents for each application
     print("Generating threat surface documents...")
     print("-"*80)
 
-    for idx, (app_name, app_data) in enumerate(sorted(topology.items()), 1):
-        try:
-            # Progress indicator
-            progress = f"[{idx}/{len(topology)}]"
-            print(f"{progress} {app_name}...", end=' ', flush=True)
-
-            # Output path
-            output_path = output_dir / f'ThreatSurface-{app_name}.docx'
-
-            # Generate document
-            generate_threat_surface_document(
-                app_name=app_name,
-                app_data=app_data,
-                output_path=str(output_path)
-            )
-
-            print("[OK]")
-            success_count += 1
-
-        except Exception as e:
-            print(f"[ERROR] Error: {e}")
-            logger.error(f"Failed to generate document for {app_name}: {e}")
-            failed_count += 1
-            failed_apps.append(app_name)
+    results = generate_threat_documents(topology, output_dir, force=args.force)
+    success_count = results['success']
+    up_to_date_count = results['up_to_date']
+    failed_count = results['failed']
+    failed_apps = results['failed_apps']
 
     # Summary
     end_time = datetime.now()
@@ -325,6 +378,7 @@ def main():
     print("="*80)
     print(f"Total Applications:  {len(topology)}")
     print(f"Successfully Generated: {success_count}")
+    print(f"Up to date (skipped): {up_to_date_count}")
     print(f"Failed: {failed_count}")
     print(f"Duration: {duration:.1f} seconds")
     print(f"Average: {duration/len(topology):.1f} seconds per document")
@@ -350,6 +404,7 @@ def main():
     logger.info(f"Generation Summary:")
     logger.info(f"  Total: {len(topology)}")
     logger.info(f"  Success: {success_count}")
+    logger.info(f"  Up to date: {up_to_date_count}")
     logger.info(f"  Failed: {failed_count}")
     logger.info(f"  Duration: {duration:.1f}s")
     logger.info(f"  Output: {output_dir}")
@@ -5,7 +5,7 @@ Organize Application Deliverables
 ==================================
 Creates one folder per application and copies all related files:
 - Word reports (architecture, solution design, netseg, threat surface)
-- Diagrams (PNG, SVG, MMD, HTML)
+- Diagrams (PNG, SVG, MMD, HTML with its static/ bundle)
 - Enhanced diagrams
 - Enriched flows
 - HTML reports
@@ -21,6 +21,10 @@ from pathlib import Path
 import argparse
 import re
 
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from html_templates import copy_page
+
 # Force UTF-8 encoding (Windows fix)
 if sys.platform == 'win32':
     import codecs
@@ -61,6 +65,16 @@ def copy_file_safe(src, dst):
         return False
 
 
+def copy_html_safe(src, dst):
+    """Copy an HTML page with the static bundle it loads (see copy_file_safe)"""
+    try:
+        copy_page(src, dst.parent)
+        return True
+    except Exception as e:
+        print(f"    [WARNING] Failed to copy {src.name}: {e}")
+        return False
+
+
 def organize_app_files(app_code, output_base_dir):
     """
     Organize all files for a specific application
@@ -119,7 +133,8 @@ def organize_app_files(app_code, output_base_dir):
             src_file = diagram_dir / pattern
             if src_file.exists():
                 dst_file = diagrams_dest / src_file.name
-                if copy_file_safe(src_file, dst_file):
+                copy = copy_html_safe if src_file.suffix == '.html' else copy_file_safe
+                if copy(src_file, dst_file):
                     stats['diagrams'] += 1
 
     # 3. Enhanced Diagrams
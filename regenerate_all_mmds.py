@@ -23,6 +23,17 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from parser import FlowRecord
 from diagrams import MermaidDiagramGenerator
 from utils.hostname_resolver import HostnameResolver
+from utils.build_cache import ArtifactCache, MANIFEST_NAME
+from html_templates import TEMPLATE_SOURCES
+
+# Diagram content depends on these as well as on the app's CSV
+GENERATOR_SOURCES = [
+    Path(__file__),
+    Path(__file__).parent / 'src' / 'diagrams.py',
+    Path(__file__).parent / 'src' / 'diagram_lod.py',
+    Path(__file__).parent / 'src' / 'utils' / 'hostname_resolver.py',
+    *TEMPLATE_SOURCES,
+]
 
 def load_flow_records(csv_path):
     """Load flow records from CSV"""
@@ -71,6 +82,107 @@ def load_flow_records(csv_path):
 
     return records
 
+class MockZone:
+    """Minimal zone object expected by MermaidDiagramGenerator"""
+    def __init__(self, name, tier):
+        self.name = name
+        self.tier = tier
+        self.zone_type = 'micro'
+        self.security_level = tier
+        self.description = f"{name.replace('_', ' ').title()}"
+        self.members = set()
+
+
+def create_zones():
+    """Mock zones for diagram generation"""
+    return {
+        'MANAGEMENT_TIER': MockZone('MANAGEMENT_TIER', 1),
+        'WEB_TIER': MockZone('WEB_TIER', 2),
+        'APP_TIER': MockZone('APP_TIER', 3),
+        'DATA_TIER': MockZone('DATA_TIER', 4),
+        'CACHE_TIER': MockZone('CACHE_TIER', 5),
+        'MESSAGING_TIER': MockZone('MESSAGING_TIER', 6),
+    }
+
+
+def infer_zones(records, zones):
+    """Infer zone membership from the IPs in an app's records"""
+    for record in records:
+        for ip in [record.src_ip, record.dst_ip]:
+            if not ip or not isinstance(ip, str):
+                continue
+            if ip.startswith('10.100.160.'):
+                zones['MANAGEMENT_TIER'].members.add(ip)
+            elif ip.startswith('10.164.105.'):
+                zones['WEB_TIER'].members.add(ip)
+            elif ip.startswith('10.100.246.') or ip.startswith('10.165.116.'):
+                zones['APP_TIER'].members.add(ip)
+            elif ip.startswith('10.164.116.'):
+                zones['DATA_TIER'].members.add(ip)
+            elif ip.startswith('10.164.144.'):
+                zones['CACHE_TIER'].members.add(ip)
+            elif ip.startswith('10.164.145.'):
+                zones['MESSAGING_TIER'].members.add(ip)
+
+
+def find_app_csv(app_code, input_dir=Path('data/input')):
+    """Locate App_Code_<app>.csv in data/input or data/input/processed (None if missing)"""
+    for csv_path in (input_dir / f'App_Code_{app_code}.csv',
+                     input_dir / 'processed' / f'App_Code_{app_code}.csv'):
+        if csv_path.exists():
+            return csv_path
+    return None
+
+
+def create_hostname_resolver():
+    """Hostname resolver shared by all diagrams of a run"""
+    return HostnameResolver(
+        demo_mode=True,
+        filter_nonexistent=True,
+        mark_nonexistent=True
+    )
+
+
+def generate_app_mmd(app_code, csv_file, output_dir, hostname_resolver, cache, zones=None):
+    """
+    Generate the .mmd + .html diagram for one application (skipped when up to date)
+
+    Args:
+        app_code: Application code
+        csv_file: App_Code_<app>.csv path
+        output_dir: Diagram output directory
+        hostname_resolver: Shared HostnameResolver
+        cache: ArtifactCache for the output directory
+        zones: Zone dict to add this app's IPs to (default: fresh zones)
+
+    Returns:
+        Tuple (status, records) - status is 'ok', 'up_to_date' or 'no_records'
+    """
+    artifact = f'mmd/{app_code}'
+    key = cache.key(Path(csv_file), GENERATOR_SOURCES)
+    if cache.is_fresh(artifact, key):
+        return 'up_to_date', 0
+
+    records = load_flow_records(str(csv_file))
+    if not records:
+        return 'no_records', 0
+
+    zones = zones if zones is not None else create_zones()
+    infer_zones(records, zones)
+
+    generator = MermaidDiagramGenerator(
+        flow_records=records,
+        zones=zones,
+        hostname_resolver=hostname_resolver
+    )
+
+    # Generate MMD + HTML
+    output_mmd = Path(output_dir) / f"{app_code}_diagram.mmd"
+    generator.generate_app_diagram(app_code, str(output_mmd))
+    cache.record(artifact, key, [output_mmd, output_mmd.with_suffix('.html')])
+    return 'ok', len(records)
+
+
 def main():
     """Main execution"""
     parser = argparse.ArgumentParser(description='Regenerate MMD and HTML diagrams for applications')
@@ -80,6 +192,11 @@ def main():
         nargs='+',
         help='List of app codes to process (e.g., DNMET XECHK). If not specified, processes all apps.'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate all diagrams, even when the CSV and generator are unchanged'
+    )
     args = parser.parse_args()
 
     print("="*80)
@@ -94,17 +211,11 @@ def main():
     processed_dir = input_dir / 'processed'
 
     if args.apps:
-        # Only process specified apps
+        # Only process specified apps (data/input first, then data/input/processed)
         csv_files = []
         for app_code in args.apps:
-            # Try data/input first (unprocessed files)
-            csv_path = input_dir / f'App_Code_{app_code}.csv'
-
-            # If not found, try data/input/processed (already processed files)
-            if not csv_path.exists():
-                csv_path = processed_dir / f'App_Code_{app_code}.csv'
-
-            if csv_path.exists():
+            csv_path = find_app_csv(app_code, input_dir)
+            if csv_path:
                 csv_files.append(csv_path)
             else:
                 print(f"[WARNING] Warning: App_Code_{app_code}.csv not found in {input_dir} or {processed_dir}")
@@ -121,37 +232,20 @@ def main():
             print(f"  {len(args.apps) - len(csv_files)} apps not found")
     print("="*80)
 
-    # Mock zones for diagram generation
-    class MockZone:
-        def __init__(self, name, tier):
-            self.name = name
-            self.tier = tier
-            self.zone_type = 'micro'
-            self.security_level = tier
-            self.description = f"{name.replace('_', ' ').title()}"
-            self.members = set()
-
-    zones = {
-        'MANAGEMENT_TIER': MockZone('MANAGEMENT_TIER', 1),
-        'WEB_TIER': MockZone('WEB_TIER', 2),
-        'APP_TIER': MockZone('APP_TIER', 3),
-        'DATA_TIER': MockZone('DATA_TIER', 4),
-        'CACHE_TIER': MockZone('CACHE_TIER', 5),
-        'MESSAGING_TIER': MockZone('MESSAGING_TIER', 6),
-    }
+    zones = create_zones()
 
     # Initialize hostname resolver once
-    hostname_resolver = HostnameResolver(
-        demo_mode=True,
-        filter_nonexistent=True,
-        mark_nonexistent=True
-    )
+    hostname_resolver = create_hostname_resolver()
 
     output_dir = Path('outputs_final/diagrams')
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Skip apps whose CSV and generator code are unchanged since the last run
+    cache = ArtifactCache(output_dir / MANIFEST_NAME, force=args.force)
+
     success = 0
     failed = 0
+    up_to_date = 0
 
     for i, csv_file in enumerate(csv_files, 1):
         app_code = csv_file.stem.replace('App_Code_', '')
@@ -159,55 +253,28 @@ def main():
         print(f"\n[{i}/{len(csv_files)}] {app_code}...", end=' ', flush=True)
 
         try:
-            # Load flow records
-            records = load_flow_records(str(csv_file))
+            status, record_count = generate_app_mmd(app_code, csv_file, output_dir, hostname_resolver, cache, zones)
 
-            print(f"({len(records)} records)", end=' ', flush=True)
-
-            if not records:
-                print("[SKIP - No records]")
-                continue
-
-            # Infer zones from IPs in this app's records
-            for record in records:
-                for ip in [record.src_ip, record.dst_ip]:
-                    if not ip or not isinstance(ip, str):
-                        continue
-                    if ip.startswith('10.100.160.'):
-                        zones['MANAGEMENT_TIER'].members.add(ip)
-                    elif ip.startswith('10.164.105.'):
-                        zones['WEB_TIER'].members.add(ip)
-                    elif ip.startswith('10.100.246.') or ip.startswith('10.165.116.'):
-                        zones['APP_TIER'].members.add(ip)
-                    elif ip.startswith('10.164.116.'):
-                        zones['DATA_TIER'].members.add(ip)
-                    elif ip.startswith('10.164.144.'):
-                        zones['CACHE_TIER'].members.add(ip)
-                    elif ip.startswith('10.164.145.'):
-                        zones['MESSAGING_TIER'].members.add(ip)
-
-            # Create diagram generator
-            generator = MermaidDiagramGenerator(
-                flow_records=records,
-                zones=zones,
-                hostname_resolver=hostname_resolver
-            )
-
-            # Generate MMD + HTML
-            output_mmd = output_dir / f"{app_code}_diagram.mmd"
-            generator.generate_app_diagram(app_code, str(output_mmd))
-
-            print("[OK]")
-            success += 1
+            if status == 'up_to_date':
+                print("[UP TO DATE]")
+                up_to_date += 1
+            elif status == 'no_records':
+                print("(0 records) [SKIP - No records]")
+            else:
+                print(f"({record_count} records) [OK]")
+                success += 1
 
         except Exception as e:
             print(f"[ERROR: {e}]")
             failed += 1
 
+    cache.save()
+
     print("\n" + "="*80)
     print(f"REGENERATION COMPLETE")
     print("="*80)
     print(f"Success: {success}/{len(csv_files)}")
+    print(f"Up to date (skipped): {up_to_date}/{len(csv_files)}")
     print(f"Failed: {failed}/{len(csv_files)}")
     print(f"\nOutput: {output_dir}")
     print("="*80)
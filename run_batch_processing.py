@@ -5,13 +5,20 @@ Batch Processing Script - Process Files in Batches
 ===================================================
 Processes network flow files in configurable batches and generates all reports.
 
-This script orchestrates the complete workflow:
+This script orchestrates the complete workflow in one process:
 1. Process batch of N files (incremental learning)
-2. Generate .mmd and .html diagrams for ALL applications
-3. Generate PNG files using Python Mermaid.ink API (no Node.js/Chrome!)
-4. Generate network segmentation reports (optional)
+2. Generate .mmd and .html diagrams for the applications in the batch
+3. Generate PNG/SVG files (Python renderer, no Node.js/Chrome!)
+4. Generate Lucidchart exports (optional)
 5. Generate architecture documents (optional)
-6. Repeat for next batch
+6. Repeat for next batch, then build the master topology and threat
+   surface documents once
+
+Steps run as stages of a dependency graph (src/orchestration/stage_graph.py):
+the learner, models and hostname resolver are loaded once per run, stages
+hand their results to each other in memory, and the per-app diagram, image
+and document stages of a batch run concurrently (--workers). A timing table
+per stage group is logged after every batch.
 
 Usage Examples:
     # Process all 138 files in batches of 10 (RECOMMENDED)
@@ -38,6 +45,9 @@ Usage Examples:
     # Clear all tracking first (reprocess everything)
     python run_batch_processing.py --batch-size 10 --clear-first
 
+    # Rebuild diagrams/documents even if their inputs are unchanged
+    python run_batch_processing.py --batch-size 10 --force
+
 Per-File Status:
     The script shows real-time status for EACH file as it's processed:
     - File name being processed
@@ -53,7 +63,7 @@ IMPORTANT - PNG Generation:
     Rate limiting: The Mermaid.ink API has rate limits. Large batches may need delays.
 
 Author: Enterprise Security Team
-Version: 2.0 - Python PNG Generation (No Node.js!)
+Version: 3.0 - In-process stage graph
 """
 
 import sys
@@ -63,6 +73,7 @@ from datetime import datetime
 import subprocess
 import time
 import logging
+from functools import partial
 
 # Force UTF-8 encoding (Windows fix)
 if sys.platform == 'win32':
@@ -86,6 +97,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from orchestration.stage_graph import StageGraph, STATUS_FAILED, group_timings, timing_report
+from utils.build_cache import ArtifactCache, MANIFEST_NAME
+
 
 def run_command(cmd, description, show_realtime=False):
     """Run a command and capture output
@@ -191,215 +207,313 @@ def clear_file_tracking():
     return success
 
 
-def process_batch(batch_size=10, only_json=False):
-    """Process a batch of files with real-time per-file status
+def fix_mmd_file_fencing(mmd_file):
+    """Fix markdown fencing in one .mmd file (add ```mermaid wrapping)
 
     Args:
-        batch_size: Number of files to process
-        only_json: If True, save to JSON only (skip PostgreSQL)
+        mmd_file: Path to .mmd file
 
     Returns:
-        tuple: (success, list of app_codes processed)
-    """
-    logger.info("\n" + "="*80)
-    logger.info(f"STEP 1: PROCESSING BATCH ({batch_size} files)")
-    logger.info("="*80)
-
-    # Check how many files will be processed
-    from pathlib import Path
-    import json
-
-    # Get unprocessed files
-    input_dir = Path('./data/input')
-    file_tracker_path = input_dir / 'processed_files.json'
-
-    processed_files = set()
-    if file_tracker_path.exists():
-        with open(file_tracker_path, 'r') as f:
-            data = json.load(f)
-            processed_files = set(data.get('processed_files', {}).keys())
-
-    all_csv_files = sorted(input_dir.glob('App_Code_*.csv'))
-    new_files = [f for f in all_csv_files if f.name not in processed_files][:batch_size]
-
-    # Extract app codes that will be processed
-    app_codes_to_process = [f.stem.replace('App_Code_', '') for f in new_files]
-
-    logger.info(f"  Apps to process: {', '.join(app_codes_to_process[:5])}" +
-                (f" ... and {len(app_codes_to_process)-5} more" if len(app_codes_to_process) > 5 else ""))
-
-    cmd = [
-        sys.executable,
-        'run_incremental_learning.py',
-        '--batch',
-        '--max-files', str(batch_size)
-    ]
-
-    # Add --only-json flag if specified
-    if only_json:
-        cmd.append('--only-json')
-
-    # Use real-time output to show per-file status
-    success, output = run_command(
-        cmd,
-        f"Process batch of {batch_size} files",
-        show_realtime=True  # Show each file as it's processed
-    )
-
-    return success, app_codes_to_process
-
-
-def generate_netseg_reports(app_codes=None):
-    """Generate network segmentation reports (Word docs only - diagrams already generated)
-
-    Args:
-        app_codes: List of app codes to process. If None, processes all apps.
+        bool: True if the file was rewritten
     """
-    logger.info("\n" + "="*80)
-    if app_codes:
-        logger.info(f"STEP 4: GENERATING NETWORK SEGMENTATION REPORTS (Word docs) FOR {len(app_codes)} APPS")
-    else:
-        logger.info("STEP 4: GENERATING NETWORK SEGMENTATION REPORTS (Word docs)")
-    logger.info("="*80)
+    # Read content
+    with open(mmd_file, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
 
-    # Skip diagram generation (already done by Python PNG generation in Step 3)
-    # Only generate Word documents from existing PNGs
-    cmd = [sys.executable, 'generate_all_reports.py', '--skip-diagrams']
-    if app_codes:
-        cmd.extend(['--apps'] + app_codes)
-
-    success, output = run_command(
-        cmd,
-        f"Generate network segmentation reports (Word docs only) for {len(app_codes) if app_codes else 'all'} applications",
-        show_realtime=True
-    )
-    return success
-
-
-def generate_mmd_and_html(app_codes=None):
-    """Generate .mmd and .html files for specified applications
-
-    Args:
-        app_codes: List of app codes to process. If None, processes all apps.
-    """
-    logger.info("\n" + "="*80)
-    if app_codes:
-        logger.info(f"STEP 2: GENERATING MMD AND HTML DIAGRAMS FOR {len(app_codes)} APPS")
-    else:
-        logger.info("STEP 2: GENERATING MMD AND HTML DIAGRAMS FOR ALL APPS")
-    logger.info("="*80)
-
-    cmd = [sys.executable, 'regenerate_all_mmds.py']
-    if app_codes:
-        cmd.extend(['--apps'] + app_codes)
-
-    success, output = run_command(
-        cmd,
-        f"Generate .mmd and .html diagrams for {len(app_codes) if app_codes else 'all'} applications",
-        show_realtime=True
-    )
-    return success
-
-
-def fix_mmd_fencing(app_codes=None):
-    """Fix markdown fencing in .mmd files (add ```mermaid wrapping)
-
-    Args:
-        app_codes: List of app codes to process. If None, processes all .mmd files.
-
-    Returns:
-        bool: True if successful
-    """
-    logger.info("\n" + "="*80)
-    if app_codes:
-        logger.info(f"STEP 2B: FIXING MARKDOWN FENCING FOR {len(app_codes)} APPS")
-    else:
-        logger.info("STEP 2B: FIXING MARKDOWN FENCING FOR ALL MMD FILES")
-    logger.info("="*80)
+    # Check if already has markdown fencing
+    if content.startswith('```mermaid'):
+        logger.debug(f"  {mmd_file.name} - Already has fencing (skipped)")
+        return False
 
-    diagrams_dir = Path('outputs_final/diagrams')
+    # Add markdown fencing (Mermaid.ink API compatibility)
+    with open(mmd_file, 'w', encoding='utf-8') as f:
+        f.write(f"```mermaid\n{content}\n```")
 
-    # Find .mmd files to fix
-    if app_codes:
-        mmd_files = [diagrams_dir / f'{app_code}_diagram.mmd' for app_code in app_codes]
-        mmd_files = [f for f in mmd_files if f.exists()]
-    else:
-        mmd_files = list(diagrams_dir.glob('*.mmd'))
-
-    if not mmd_files:
-        logger.warning("No .mmd files found to fix")
-        return True
-
-    logger.info(f"Checking {len(mmd_files)} .mmd files for markdown fencing...")
-
-    success = 0
-    skipped = 0
-
-    for mmd_file in mmd_files:
-        # Read content
-        with open(mmd_file, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-
-        # Check if already has markdown fencing
-        if content.startswith('```mermaid'):
-            logger.debug(f"  {mmd_file.name} - Already has fencing (skipped)")
-            skipped += 1
-            continue
-
-        # Add markdown fencing
-        new_content = f"```mermaid\n{content}\n```"
-
-        # Write back
-        with open(mmd_file, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
-        logger.info(f"  [OK] {mmd_file.name} - Added markdown fencing")
-        success += 1
-
-    logger.info(f"[OK] Markdown fencing: {success} fixed, {skipped} skipped")
+    logger.info(f"  [OK] {mmd_file.name} - Added markdown fencing")
     return True
 
 
-def generate_pngs_python(app_codes=None):
-    """Generate PNG files using Python Mermaid.ink API (no Node.js required)
+class BatchPipeline:
+    """In-process batch pipeline
 
-    Args:
-        app_codes: List of app codes to process. If None, processes all apps.
-    """
-    logger.info("\n" + "="*80)
-    if app_codes:
-        logger.info(f"STEP 3: GENERATING PNG FILES FOR {len(app_codes)} APPS (Python/Mermaid.ink API)")
-    else:
-        logger.info("STEP 3: GENERATING PNG FILES (Python/Mermaid.ink API)")
-    logger.info("="*80)
-
-    cmd = [sys.executable, 'generate_pngs_python.py']
-    if app_codes:
-        cmd.extend(['--apps'] + app_codes)
-
-    success, output = run_command(
-        cmd,
-        f"Generate PNG files for {len(app_codes) if app_codes else 'all'} applications",
-        show_realtime=True
-    )
-    return success
+    Runs every step of a batch as a stage in a StageGraph instead of
+    launching one Python subprocess per step. State that used to be rebuilt
+    by every subprocess (imports of pandas/torch/networkx, the incremental
+    learner and its models, the hostname resolver, build manifests) is
+    created once per run and shared by all batches, and stages hand their
+    results to each other in memory:
 
+        learn ─┬─ mmd:<app> ── images:<app> ── docx:<app>
+               ├─ lucid                    └─ solution_docs
+               └─ (per app, for every app in the batch)
 
-def generate_architecture_docs():
-    """Generate architecture documents"""
-    logger.info("\n" + "="*80)
-    logger.info("STEP 3: GENERATING ARCHITECTURE DOCUMENTS")
-    logger.info("="*80)
-
-    # Run simple architecture docs
-    cmd1 = [sys.executable, 'generate_application_word_docs.py']
-    success1, _ = run_command(cmd1, "Generate application architecture docs")
+    After the last batch:
 
-    # Run comprehensive solution design docs
-    cmd2 = [sys.executable, 'generate_solution_design_docs.py']
-    success2, _ = run_command(cmd2, "Generate solution design docs")
+        master_topology ── threat_docs
+        threat_analysis ── threat_html
+    """
 
-    return success1 or success2  # Success if at least one worked
+    def __init__(self, args):
+        self.args = args
+        self.mermaid = args.output_format in ['mermaid', 'both']
+        self.lucid = args.output_format in ['lucid', 'both'] and not args.skip_reports
+        self.architecture_docs = self.lucid or not args.skip_architecture
+
+        self.diagrams_dir = Path('outputs_final/diagrams')
+        self.architecture_dir = Path('outputs_final/word_reports/architecture')
+        self.diagrams_dir.mkdir(parents=True, exist_ok=True)
+        self.architecture_dir.mkdir(parents=True, exist_ok=True)
+
+        # One manifest instance per directory (shared by all stages and threads)
+        self.cache = ArtifactCache(self.diagrams_dir / MANIFEST_NAME, force=args.force)
+
+        self._learner = None
+        self._hostname_resolver = None
+        self.timings = {}
+
+    @property
+    def learner(self):
+        """Incremental learner, initialized once for all batches"""
+        if self._learner is None:
+            import run_incremental_learning
+
+            config = run_incremental_learning.load_config()
+            enable_dl = config.get('models', {}).get('deep_learning', {}).get('enabled', False)
+            Path('models/incremental').mkdir(parents=True, exist_ok=True)
+
+            logger.info("\n[DEPS] Initializing incremental learner (once per run)...")
+            self._learner = run_incremental_learning.create_incremental_learner(
+                checkpoint_dir='models/incremental',
+                enable_dl=enable_dl,
+                only_json=self.args.only_json
+            )
+        return self._learner
+
+    @property
+    def hostname_resolver(self):
+        """Hostname resolver shared by all diagram stages"""
+        if self._hostname_resolver is None:
+            import regenerate_all_mmds
+
+            self._hostname_resolver = regenerate_all_mmds.create_hostname_resolver()
+        return self._hostname_resolver
+
+    def plan_batch(self):
+        """App codes of the files the next learn stage will process (same order)"""
+        pending = self.learner.scan_for_new_files()[:self.args.batch_size]
+        return [f.stem.replace('App_Code_', '') for f in pending]
+
+    # ------------------------------------------------------------------
+    # Batch stages
+    # ------------------------------------------------------------------
+
+    def learn(self, inputs):
+        """Process the batch with the incremental learner
+
+        Returns:
+            dict: {app_id: per-file result} (empty if no new files)
+        """
+        result = self.learner.run_incremental_batch(max_files=self.args.batch_size)
+        if result['status'] != 'success':
+            logger.info("[WARNING] No new files to process")
+            return {}
+
+        self.learner.export_current_topology('outputs_final/incremental_topology.json')
+        return {r['app_id']: r for r in result['results']}
+
+    def generate_mmd(self, app_code, inputs):
+        """Generate .mmd + .html for one app from the CSV the learn stage just processed"""
+        import regenerate_all_mmds
+
+        file_result = inputs['learn'].get(app_code)
+        if file_result and file_result['status'] != 'success':
+            raise RuntimeError(f"{app_code} was not processed ({file_result['status']})")
+
+        if file_result and file_result.get('new_location'):
+            csv_file = Path(file_result['new_location'])
+        else:
+            csv_file = regenerate_all_mmds.find_app_csv(app_code)
+        if csv_file is None or not csv_file.exists():
+            raise FileNotFoundError(f"App_Code_{app_code}.csv not found")
+
+        status, record_count = regenerate_all_mmds.generate_app_mmd(
+            app_code, csv_file, self.diagrams_dir, self.hostname_resolver, self.cache
+        )
+        mmd_file = self.diagrams_dir / f'{app_code}_diagram.mmd'
+        if status == 'no_records':
+            logger.info(f"  [SKIP] {app_code}: no flow records")
+            return None
+
+        fix_mmd_file_fencing(mmd_file)
+        logger.info(f"  [OK] {app_code}: diagram {'up to date' if status == 'up_to_date' else f'generated ({record_count} records)'}")
+        return mmd_file
+
+    def render_images(self, app_code, inputs):
+        """Render PNG + SVG for the app's diagrams whose .mmd changed
+
+        Returns:
+            Path to the app's diagram PNG (None if the app has no diagram)
+        """
+        import generate_pngs_python
+
+        mmd_file = inputs[f'mmd:{app_code}']
+        if mmd_file is None:
+            return None
+
+        # Application diagram (if another generator wrote one) is rendered too
+        mmd_files = [mmd_file, self.diagrams_dir / f'{app_code}_application_diagram.mmd']
+        for path in mmd_files:
+            if not path.exists():
+                continue
+            stale = generate_pngs_python.stale_formats(path, ['png', 'svg'], self.cache)
+            rendered = generate_pngs_python.render_formats(path, stale, self.cache)
+            failed = [fmt for fmt, ok in rendered.items() if not ok]
+            if failed:
+                logger.warning(f"  [WARNING] {path.name}: {', '.join(failed).upper()} generation failed")
+
+        png_file = mmd_file.with_suffix('.png')
+        if not png_file.exists():
+            raise RuntimeError(f"PNG not generated for {app_code}")
+        return png_file
+
+    def generate_docx(self, app_code, inputs):
+        """Architecture Word document from the app's PNG"""
+        import generate_all_reports
+
+        png_file = inputs.get(f'images:{app_code}', self.diagrams_dir / f'{app_code}_diagram.png')
+        if png_file is None or not png_file.exists():
+            logger.info(f"  [SKIP] {app_code}: no PNG diagram for architecture document")
+            return None
+
+        status = generate_all_reports.generate_architecture_docx(
+            app_code, png_file, self.architecture_dir, self.cache
+        )
+        return self.architecture_dir / f'{app_code}_architecture.docx' if status else None
+
+    def generate_lucid(self, app_codes, inputs):
+        """Lucidchart CSV exports for the apps in this batch"""
+        import generate_all_reports
+
+        apps_dir = Path('persistent_data/applications')
+        zones = generate_all_reports.setup_zones()
+
+        records = []
+        for app_code in app_codes:
+            if not (apps_dir / app_code).is_dir():
+                continue
+            app_records = generate_all_reports.load_flow_records(apps_dir / app_code)
+            for record in app_records:
+                generate_all_reports.infer_zone_from_ip(record.src_ip, zones)
+                generate_all_reports.infer_zone_from_ip(record.dst_ip, zones)
+            records.extend(app_records)
+
+        if not generate_all_reports.generate_lucidchart_export(records, zones, self.diagrams_dir):
+            raise RuntimeError("Lucidchart export failed")
+        return len(records)
+
+    def generate_solution_docs(self, inputs):
+        """Solution design documents from the learner's in-memory topology"""
+        import generate_solution_design_docs
+
+        png_files = list(self.diagrams_dir.glob('*_application_diagram.png'))
+        if not png_files:
+            logger.warning("[WARNING] No *_application_diagram.png files - skipping solution design docs")
+            return 0
+
+        logger.info(f"[INFO] Found {len(png_files)} application PNG files for solution design docs")
+        # In-process: this stage already runs alongside others on the stage
+        # graph's threads, and a batch only holds a few changed apps
+        generate_solution_design_docs.generate_all_solution_docs(
+            self.learner.current_topology, self.diagrams_dir, self.architecture_dir,
+            force=self.args.force, workers=1
+        )
+        return len(png_files)
+
+    def build_batch_graph(self, app_codes):
+        """Stage graph for one batch"""
+        graph = StageGraph()
+        graph.add('learn', self.learn)
+
+        image_stages = []
+        for app_code in app_codes:
+            docx_deps = ['learn']
+            if self.mermaid:
+                mmd = graph.add(f'mmd:{app_code}', partial(self.generate_mmd, app_code), deps=['learn'])
+                images = graph.add(f'images:{app_code}', partial(self.render_images, app_code), deps=[mmd])
+                image_stages.append(images)
+                docx_deps = [images]
+            if self.architecture_docs:
+                graph.add(f'docx:{app_code}', partial(self.generate_docx, app_code), deps=docx_deps)
+
+        if self.lucid:
+            graph.add('lucid', partial(self.generate_lucid, app_codes), deps=['learn'])
+        if not self.args.skip_architecture:
+            graph.add('solution_docs', self.generate_solution_docs, deps=['learn'] + image_stages)
+        return graph
+
+    # ------------------------------------------------------------------
+    # Final stages (once, after all batches)
+    # ------------------------------------------------------------------
+
+    def build_final_graph(self):
+        """Stage graph for master topology and threat surface outputs"""
+        graph = StageGraph()
+
+        def master_topology(inputs):
+            import build_master_topology
+
+            master = build_master_topology.collect_master_topology()
+            if master is None:
+                raise RuntimeError("No topology files to build master topology from")
+            build_master_topology.write_master_topology(master)
+            return master['topology']
+
+        def threat_analysis(inputs):
+            import generate_threat_surface_docs
+
+            if not generate_threat_surface_docs.run_networkx_threat_analysis():
+                raise RuntimeError("NetworkX threat analysis failed")
+
+        def threat_html(inputs):
+            import generate_threat_surface_docs
+
+            if not generate_threat_surface_docs.generate_threat_html_visualization():
+                raise RuntimeError("Threat HTML visualization failed")
+
+        def threat_docs(inputs):
+            import generate_threat_surface_docs
+
+            results = generate_threat_surface_docs.generate_threat_documents(
+                inputs['master_topology'], 'outputs_final/word_reports/threat_surface', force=self.args.force
+            )
+            if results['failed']:
+                logger.warning(f"[WARNING] Threat surface documents failed for: {', '.join(results['failed_apps'])}")
+            return results
+
+        graph.add('master_topology', master_topology)
+        graph.add('threat_docs', threat_docs, deps=['master_topology'])
+        graph.add('threat_analysis', threat_analysis)
+        graph.add('threat_html', threat_html, deps=['threat_analysis'])
+        return graph
+
+    def run_graph(self, graph, label):
+        """Run a stage graph, log its timing table and keep results for the summary"""
+        start = time.perf_counter()
+        results = graph.run(max_workers=self.args.workers)
+        self.cache.save()
+
+        logger.info(f"\n[TIMING] {label}: {time.perf_counter() - start:.1f}s wall\n{timing_report(results)}")
+        for result in results.values():
+            if result.status == STATUS_FAILED:
+                logger.warning(f"  [FAILED] {result.name}: {result.error}")
+
+        for group, timing in group_timings(results).items():
+            total = self.timings.setdefault(group, {'runs': 0, 'failed': 0, 'seconds': 0.0, 'max': 0.0})
+            total['runs'] += timing.stages
+            total['failed'] += timing.failed
+            total['seconds'] += timing.total_seconds
+            total['max'] = max(total['max'], timing.max_seconds)
+        return results
 
 
 def main():
@@ -486,6 +600,19 @@ def main():
         help='Save enriched flows to JSON only (skip PostgreSQL entirely, even if tables exist)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Stages run concurrently (per-app diagram/PNG/doc stages; default: 4)'
+    )
+
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Rebuild all diagrams and documents, even when their inputs are unchanged'
+    )
+
     args = parser.parse_args()
 
     print("\n" + "="*80)
@@ -502,6 +629,7 @@ def main():
     print(f"Flow filtering:")
     print(f"  - Filter non-existent: {'Yes' if args.filter_nonexistent else 'No'}")
     print(f"  - Mark non-existent: {'Yes (server-not-found)' if args.mark_nonexistent else 'No (show IPs)'}")
+    print(f"Concurrent stages: {args.workers}")
     print("="*80 + "\n")
 
     start_time = datetime.now()
@@ -530,6 +658,8 @@ def main():
         logger.info("  3. Files don't match pattern App_Code_*.csv")
         return
 
+    pipeline = BatchPipeline(args)
+
     # Statistics
     stats = {
         'batches_processed': 0,
@@ -548,65 +678,21 @@ def main():
         logger.info(f"BATCH {batch_num}/{total_batches}")
         logger.info("="*80)
 
-        # Step 1: Process batch
-        batch_success, app_codes_processed = process_batch(args.batch_size, args.only_json)
+        app_codes = pipeline.plan_batch()
+        logger.info(f"  Apps to process: {', '.join(app_codes[:5])}" +
+                    (f" ... and {len(app_codes)-5} more" if len(app_codes) > 5 else ""))
 
-        if batch_success:
+        results = pipeline.run_graph(pipeline.build_batch_graph(app_codes), f"Batch {batch_num}")
+
+        if results['learn'].ok:
             stats['batches_processed'] += 1
+            logger.info(f"\n[OK] Batch processing complete: {len(results['learn'].value)} apps processed")
 
-            logger.info(f"\n[OK] Batch processing complete: {len(app_codes_processed)} apps processed")
-
-            # Step 2: Generate .mmd and .html diagrams ONLY for apps in this batch
-            if args.output_format in ['mermaid', 'both']:
-                mmd_success = generate_mmd_and_html(app_codes_processed)
-                if not mmd_success:
-                    logger.warning("[WARNING] MMD generation had some failures - continuing...")
-
-                # Step 2B: Fix markdown fencing in .mmd files for Mermaid.ink API compatibility
-                fix_mmd_fencing(app_codes_processed)
-
-            # Step 3: Generate PNGs ONLY for apps in this batch (no Node.js/Chrome!)
-            if args.output_format in ['mermaid', 'both']:
-                png_success = generate_pngs_python(app_codes_processed)
-                if png_success:
-                    logger.info("[OK] PNG generation complete")
-                else:
-                    logger.warning("[WARNING] Some PNGs may be missing")
-
-            # Step 4: Generate network segmentation reports (ONLY for apps in this batch)
-            if not args.skip_reports:
-                if args.output_format in ['lucid', 'both']:
-                    reports_success = generate_netseg_reports(app_codes_processed)
-
-                    if reports_success:
-                        stats['reports_generated'] += 1
-                    else:
-                        stats['reports_failed'] += 1
-                        logger.warning("[WARNING] Report generation failed - continuing...")
-
-            # Step 5: Generate architecture docs (INDEPENDENT of skip_reports flag)
-            if not args.skip_architecture:
-                # Verify PNGs exist first (architecture docs require them)
-                diagrams_dir = Path('outputs_final/diagrams')
-                png_files = list(diagrams_dir.glob('*_application_diagram.png')) if diagrams_dir.exists() else []
-
-                if png_files:
-                    logger.info(f"\n[INFO] Found {len(png_files)} PNG files for architecture docs")
-                    arch_success = generate_architecture_docs()
-
-                    if arch_success:
-                        stats['architecture_generated'] += 1
-                    else:
-                        stats['architecture_failed'] += 1
-                        logger.warning("[WARNING] Architecture doc generation failed - continuing...")
-                else:
-                    logger.warning("\n[WARNING] Cannot generate architecture docs - No PNG files found")
-                    logger.info("  Architecture documents require PNG diagrams")
-                    logger.info("  Solutions:")
-                    logger.info("    1. Install mmdc: npm install -g @mermaid-js/mermaid-cli")
-                    logger.info("    2. Run: python generate_missing_pngs.py")
-                    logger.info("    3. Re-run batch processing after PNG generation")
-                    stats['architecture_failed'] += 1
+            for name, result in results.items():
+                if result.group == 'docx' or name == 'solution_docs':
+                    stats['architecture_generated' if result.ok else 'architecture_failed'] += 1
+                elif name == 'lucid':
+                    stats['reports_generated' if result.ok else 'reports_failed'] += 1
 
             # Check if more files remain
             remaining_files = count_unprocessed_files()
@@ -622,7 +708,7 @@ def main():
 
         else:
             stats['batches_failed'] += 1
-            logger.error(f"\n[ERROR] Batch {batch_num} failed!")
+            logger.error(f"\n[ERROR] Batch {batch_num} failed: {results['learn'].error}")
 
             user_input = input("\nContinue to next batch? (y/n): ").strip().lower()
 
@@ -632,55 +718,15 @@ def main():
 
             batch_num += 1
 
-    # Step 6: Build master topology from persistent data (runs ONCE at the end)
+    # Steps 6-7: Master topology and threat surface outputs (once, for ALL apps)
     if stats['batches_processed'] > 0:
         logger.info("\n\n" + "="*80)
-        logger.info("STEP 6: BUILDING MASTER TOPOLOGY FROM PERSISTENT DATA")
+        logger.info("MASTER TOPOLOGY & THREAT SURFACE DOCUMENTS")
         logger.info("="*80)
 
-        try:
-            cmd = [sys.executable, 'build_master_topology.py']
-            topology_success, _ = run_command(
-                cmd,
-                "Build cumulative master topology",
-                show_realtime=True
-            )
-
-            if topology_success:
-                logger.info("[OK] Master topology built successfully")
-                stats['master_topology_built'] = True
-            else:
-                logger.warning("[WARNING] Master topology build had issues")
-                stats['master_topology_built'] = False
-
-        except Exception as e:
-            logger.error(f"[ERROR] Master topology build failed: {e}")
-            stats['master_topology_built'] = False
-
-    # Step 7: Generate threat surface documents (runs ONCE at the end for ALL apps)
-    if stats['batches_processed'] > 0 and stats.get('master_topology_built', True):
-        logger.info("\n\n" + "="*80)
-        logger.info("STEP 7: GENERATING THREAT SURFACE & NETWORK SEGMENTATION DOCUMENTS")
-        logger.info("="*80)
-
-        try:
-            cmd = [sys.executable, 'generate_threat_surface_docs.py']
-            threat_success, _ = run_command(
-                cmd,
-                "Generate threat surface analysis documents",
-                show_realtime=True
-            )
-
-            if threat_success:
-                logger.info("[OK] Threat surface documents generated successfully")
-                stats['threat_surface_generated'] = True
-            else:
-                logger.warning("[WARNING] Threat surface document generation had some issues")
-                stats['threat_surface_generated'] = False
-
-        except Exception as e:
-            logger.error(f"[ERROR] Threat surface document generation failed: {e}")
-            stats['threat_surface_generated'] = False
+        results = pipeline.run_graph(pipeline.build_final_graph(), "Master topology & threat surface")
+        stats['master_topology_built'] = results['master_topology'].ok
+        stats['threat_surface_generated'] = results['threat_docs'].ok
 
     # Final summary
     end_time = datetime.now()
@@ -698,10 +744,10 @@ def main():
     print(f"  Batches failed: {stats['batches_failed']}")
 
     if not args.skip_reports:
-        print(f"  Netseg reports generated: {stats['reports_generated']}")
-        print(f"  Netseg reports failed: {stats['reports_failed']}")
+        print(f"  Lucidchart exports generated: {stats['reports_generated']}")
+        print(f"  Lucidchart exports failed: {stats['reports_failed']}")
 
-    if not args.skip_architecture:
+    if pipeline.architecture_docs:
         print(f"  Architecture docs generated: {stats['architecture_generated']}")
         print(f"  Architecture docs failed: {stats['architecture_failed']}")
 
@@ -711,10 +757,15 @@ def main():
     if stats.get('threat_surface_generated'):
         print(f"  Threat surface docs generated: [SUCCESS]")
 
+    print()
+    print("Stage timings (all batches):")
+    for group, total in pipeline.timings.items():
+        print(f"  {group:<16} {total['runs']:>4} runs  {total['seconds']:>8.1f}s total  "
+              f"{total['max']:>6.1f}s max  {total['failed']} failed")
+
     print()
     print("Output locations:")
     print("  Diagrams: outputs_final/diagrams/")
-    print("  Network segmentation reports: outputs_final/word_reports/netseg/")
     print("  Architecture documents: outputs_final/word_reports/architecture/")
     print("  Threat surface analysis: outputs_final/word_reports/threat_surface/")
     print("  Persistent topology (individual): persistent_data/topology/")
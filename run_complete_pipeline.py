@@ -52,11 +52,9 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from utils.file_tracker import FileTracker
 from persistence import create_persistence_manager
 from core.ensemble_model import EnsembleNetworkModel
+from core.model_registry import get_model_registry
 from diagrams import MermaidDiagramGenerator
 from exporters.lucidchart_exporter import LucidchartExporter
-from deep_learning.gat_model import GATApplicationAnalyzer
-from deep_learning.transformer_model import TemporalTrafficAnalyzer
-from deep_learning.vae_model import ApplicationBehaviorAnalyzer
 
 # Setup logging
 logging.basicConfig(
@@ -74,7 +72,8 @@ logger = logging.getLogger(__name__)
 class CompletePipeline:
     """Complete pipeline for file processing, training, and visualization"""
 
-    def __init__(self, watch_dir='./data/input', output_dir='./outputs_final', ignore_synthetic=False, use_deep_learning=True):
+    def __init__(self, watch_dir='./data/input', output_dir='./outputs_final', ignore_synthetic=False, use_deep_learning=True,
+                 model_worker=None):
         """Initialize pipeline with full ML/DL capabilities"""
         self.watch_dir = Path(watch_dir)
         self.output_dir = Path(output_dir)
@@ -96,15 +95,11 @@ class CompletePipeline:
         )
 
         self.pm = create_persistence_manager()
-        self.ensemble = EnsembleNetworkModel(self.pm, use_deep_learning=use_deep_learning)
 
-        # Deep learning models
-        if use_deep_learning:
-            logger.info("  Initializing deep learning models...")
-            self.gat_model = GATApplicationAnalyzer()
-            self.transformer_model = TemporalTrafficAnalyzer()
-            self.vae_model = ApplicationBehaviorAnalyzer()
-            logger.info("  [OK] GAT, Transformer, VAE models ready")
+        # Deep learning models are loaded on first use (locally or from a warm model worker)
+        self.model_registry = get_model_registry(worker_address=model_worker)
+        self.ensemble = EnsembleNetworkModel(self.pm, use_deep_learning=use_deep_learning,
+                                             model_registry=self.model_registry)
 
         # Tracking
         self.all_flows = []
@@ -128,6 +123,24 @@ class CompletePipeline:
         if self.ignore_synthetic:
             logger.info("  Ignoring synthetic data files")
 
+    def _deep_learning_model(self, name: str):
+        """Analyzer from the model registry (AttributeError when deep learning is off)"""
+        if not self.use_deep_learning:
+            raise AttributeError(name)
+        return self.model_registry.get(name)
+
+    @property
+    def gat_model(self):
+        return self._deep_learning_model('gat')
+
+    @property
+    def transformer_model(self):
+        return self._deep_learning_model('transformer')
+
+    @property
+    def vae_model(self):
+        return self._deep_learning_model('vae')
+
     def _is_synthetic(self, file_path: Path) -> bool:
         """Check if file is synthetic data (for demo purposes)"""
         # Synthetic files have pattern: App_Code_<generic_name>.csv where name is generic (app_1, test, synthetic, demo, etc.)
@@ -894,12 +907,19 @@ def main():
         help='Disable deep learning models (faster but less accurate)'
     )
 
+    parser.add_argument(
+        '--model-worker',
+        default=None,
+        help='host:port of a warm model worker (python src/core/model_registry.py --serve)'
+    )
+
     args = parser.parse_args()
 
     # Initialize pipeline
     pipeline = CompletePipeline(
         ignore_synthetic=args.ignore_synthetic,
-        use_deep_learning=not args.no_deep_learning
+        use_deep_learning=not args.no_deep_learning,
+        model_worker=args.model_worker
     )
 
     try:
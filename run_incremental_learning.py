@@ -177,6 +177,68 @@ Examples:
     return parser.parse_args()
 
 
+def load_config(config_path: str = 'config.yaml') -> dict:
+    """Load config.yaml (empty dict if missing)"""
+    import yaml
+    config_file = Path(config_path)
+    if not config_file.exists():
+        return {}
+    with open(config_file, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+def create_incremental_learner(watch_dir: str = './data/input',
+                               checkpoint_dir: str = 'models/incremental',
+                               enable_dl: bool = False,
+                               device: str = 'cpu',
+                               only_json: bool = False):
+    """
+    Initialize persistence, models and topology system
+
+    Expensive (imports torch/networkx, loads models and checkpoints), so
+    long-running callers such as run_batch_processing.py create it once
+    and call run_incremental_batch() for every batch.
+
+    Returns:
+        IncrementalLearningSystem
+    """
+    from persistence import create_persistence_manager
+    from core.ensemble_model import EnsembleNetworkModel
+    from agentic.local_semantic_analyzer import LocalSemanticAnalyzer
+    from agentic.unified_topology_system import UnifiedTopologyDiscoverySystem
+    from core.incremental_learner import IncrementalLearningSystem
+
+    # Initialize persistence using factory
+    # create_persistence_manager() uses defaults and auto-fallback
+    pm = create_persistence_manager()
+
+    # Initialize ensemble model with deep learning settings
+    ensemble = EnsembleNetworkModel(pm, use_deep_learning=enable_dl, device=device)
+
+    # Initialize semantic analyzer
+    semantic_analyzer = LocalSemanticAnalyzer(pm)
+
+    # Initialize topology system
+    topology_system = UnifiedTopologyDiscoverySystem(
+        persistence_manager=pm,
+        use_deep_learning=enable_dl,
+        use_graph_algorithms=True,
+        use_rl_optimization=False,  # Disable RL for incremental (too slow)
+        device=device
+    )
+
+    # Initialize incremental learning system
+    return IncrementalLearningSystem(
+        persistence_manager=pm,
+        ensemble_model=ensemble,
+        semantic_analyzer=semantic_analyzer,
+        topology_system=topology_system,
+        watch_dir=watch_dir,
+        checkpoint_dir=checkpoint_dir,
+        only_json=only_json  # Pass the only-json flag
+    )
+
+
 def main():
     """Main execution"""
 
@@ -216,12 +278,7 @@ def main():
     logger.info(f"Output directory: {output_dir}")
 
     # Load config.yaml for default settings
-    import yaml
-    config_file = Path('config.yaml')
-    config = {}
-    if config_file.exists():
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+    config = load_config()
 
     # Determine features (command-line overrides config.yaml)
     config_dl_enabled = config.get('models', {}).get('deep_learning', {}).get('enabled', False)
@@ -237,40 +294,14 @@ def main():
         # ====================================================================
         logger.info("\n[DEPS] Initializing components...")
 
-        from persistence import UnifiedPersistenceManager, create_persistence_manager
-        from core.ensemble_model import EnsembleNetworkModel
-        from agentic.local_semantic_analyzer import LocalSemanticAnalyzer
-        from agentic.unified_topology_system import UnifiedTopologyDiscoverySystem
-        from core.incremental_learner import IncrementalLearningSystem, ContinuousLearner
-
-        # Initialize persistence using factory
-        # create_persistence_manager() uses defaults and auto-fallback
-        pm = create_persistence_manager()
-
-        # Initialize ensemble model with deep learning settings
-        ensemble = EnsembleNetworkModel(pm, use_deep_learning=enable_dl, device=args.device)
-
-        # Initialize semantic analyzer
-        semantic_analyzer = LocalSemanticAnalyzer(pm)
-
-        # Initialize topology system
-        topology_system = UnifiedTopologyDiscoverySystem(
-            persistence_manager=pm,
-            use_deep_learning=enable_dl,
-            use_graph_algorithms=True,
-            use_rl_optimization=False,  # Disable RL for incremental (too slow)
-            device=args.device
-        )
+        from core.incremental_learner import ContinuousLearner
 
-        # Initialize incremental learning system
-        incremental_learner = IncrementalLearningSystem(
-            persistence_manager=pm,
-            ensemble_model=ensemble,
-            semantic_analyzer=semantic_analyzer,
-            topology_system=topology_system,
+        incremental_learner = create_incremental_learner(
             watch_dir=args.watch_dir,
             checkpoint_dir=str(models_dir),
-            only_json=args.only_json  # Pass the only-json flag
+            enable_dl=enable_dl,
+            device=args.device,
+            only_json=args.only_json
         )
 
         logger.info("[OK] All components initialized")
@@ -30,8 +30,11 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from src.parser import parse_network_logs
 from src.graph_analyzer import GraphAnalyzer
+from src.graph_snapshot import hash_input_files
 from src.threat_surface_analyzer import ThreatSurfaceAnalyzer
 
+SNAPSHOT_PATH = 'outputs/graph_analysis/network_graph.gsnap'
+
 
 def main():
     print("="*70)
@@ -39,15 +42,23 @@ def main():
     print("="*70)
     print()
 
-    # Step 1: Parse network flows
+    # Step 1: Parse network flows (skipped when the graph snapshot is current)
     print("[1/4] Parsing network flows from CSV files...")
-    parser = parse_network_logs('data/input')
-    print(f"   Loaded {len(parser.records)} flow records")
+    input_hash = hash_input_files(Path('data/input').glob('*.csv'), root='data/input')
+    graph_analyzer = GraphAnalyzer.from_snapshot(SNAPSHOT_PATH, content_hash=input_hash)
+
+    if graph_analyzer is not None:
+        print(f"   Input unchanged - reusing graph snapshot {SNAPSHOT_PATH}")
+    else:
+        parser = parse_network_logs('data/input')
+        print(f"   Loaded {len(parser.records)} flow records")
     print()
 
     # Step 2: Build in-memory graph
     print("[2/4] Building network graph...")
-    graph_analyzer = GraphAnalyzer(parser.records)
+    if graph_analyzer is None:
+        graph_analyzer = GraphAnalyzer(parser.records)
+        graph_analyzer.save_snapshot(SNAPSHOT_PATH, content_hash=input_hash)
     print(f"   Graph built: {graph_analyzer.graph.number_of_nodes()} nodes, "
           f"{graph_analyzer.graph.number_of_edges()} edges")
     print()
@@ -21,6 +21,7 @@ Components:
    - Cycle detection for circular dependencies
    - Bridge detection for critical connections
    - Hierarchical structure analysis
+   - Parallel analytics runner over a shared read-only graph snapshot
 
 All components are designed for:
 - 100% local processing (no data leaves your network)
@@ -63,6 +64,10 @@ try:
         BridgeDetector,
         HierarchyAnalyzer
     )
+    from .graph_analytics_runner import (
+        GraphAnalyticsRunner,
+        GraphSnapshot
+    )
     GRAPH_AVAILABLE = True
 except ImportError as e:
     logger.warning(f"Graph Topology Analyzer not available: {e}")
@@ -84,6 +89,8 @@ __all__ = [
     'CycleDetector',
     'BridgeDetector',
     'HierarchyAnalyzer',
+    'GraphAnalyticsRunner',
+    'GraphSnapshot',
 
     # Flags
     'SEMANTIC_AVAILABLE',
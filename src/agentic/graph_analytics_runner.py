@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel Graph Analytics Runner
+================================
+Runs the independent, read-only analyses behind
+GraphTopologyAnalyzer.comprehensive_analysis() in a process pool.
+
+How it works:
+- The graph is serialized ONCE into CSR arrays (indptr, indices, weights)
+  plus a node label table, all placed in shared memory
+- Each worker attaches to the snapshot once (pool initializer) and
+  rebuilds a private read-only NetworkX graph
+- Analyses are dispatched as named tasks with per-task timeouts, measured
+  from the moment a worker starts the task
+- Tasks that exceed their budget (or fail) are reported in the status
+  table; everything that finished is still returned (partial results)
+
+100% LOCAL PROCESSING
+
+Author: Enterprise Security Team
+Version: 3.0 - Advanced Graph Analytics
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+try:
+    import networkx as nx
+    NETWORKX_AVAILABLE = True
+except ImportError:
+    NETWORKX_AVAILABLE = False
+    logger.warning("NetworkX not available. Install with: pip install networkx")
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("NumPy not available. Install with: pip install numpy")
+
+try:
+    from multiprocessing import shared_memory
+    SHARED_MEMORY_AVAILABLE = True
+except ImportError:
+    SHARED_MEMORY_AVAILABLE = False
+
+
+# Per-analysis timeouts (seconds). Budgets are measured from task start.
+DEFAULT_TIMEOUTS = {
+    'louvain': 300,
+    'label_propagation': 120,
+    'greedy_modularity': 600,
+    'degree': 60,
+    'betweenness': 600,
+    'closeness': 600,
+    'pagerank': 120,
+    'eigenvector': 120,
+    'critical_infrastructure': 300,
+    'service_chains': 600,
+    'circular_dependencies': 300,
+    'hierarchy': 120,
+}
+
+DEFAULT_TIMEOUT = 600
+
+POLL_INTERVAL = 0.05  # Seconds between checks on running analyses
+
+
+class GraphSnapshot:
+    """
+    Read-only CSR snapshot of a NetworkX graph
+
+    Arrays:
+        indptr:  int64[N+1] row offsets
+        indices: int64[E]   destination node positions
+        weights: float64[E] edge weights
+        labels:  node IDs (position -> node)
+    """
+
+    def __init__(self, labels: List, indptr: 'np.ndarray', indices: 'np.ndarray',
+                 weights: 'np.ndarray', directed: bool = True):
+        self.labels = labels
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.directed = directed
+
+    @classmethod
+    def from_graph(cls, graph: 'nx.Graph', weight: str = 'weight') -> 'GraphSnapshot':
+        """Serialize a NetworkX graph into CSR arrays"""
+        labels = list(graph.nodes())
+        position = {node: i for i, node in enumerate(labels)}
+
+        indptr = np.zeros(len(labels) + 1, dtype=np.int64)
+        indices = []
+        weights = []
+
+        for i, node in enumerate(labels):
+            for neighbor, data in graph.adj[node].items():
+                indices.append(position[neighbor])
+                weights.append(float(data.get(weight, 1.0)))
+            indptr[i + 1] = len(indices)
+
+        return cls(
+            labels,
+            indptr,
+            np.asarray(indices, dtype=np.int64),
+            np.asarray(weights, dtype=np.float64),
+            directed=graph.is_directed()
+        )
+
+    def to_graph(self, weight: str = 'weight') -> 'nx.Graph':
+        """Rebuild a NetworkX graph from the CSR arrays"""
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        G.add_nodes_from(self.labels)
+
+        rows = np.repeat(np.arange(len(self.labels)), np.diff(self.indptr))
+        labels = self.labels
+        G.add_weighted_edges_from(
+            ((labels[u], labels[v], w)
+             for u, v, w in zip(rows.tolist(), self.indices.tolist(), self.weights.tolist())),
+            weight=weight
+        )
+        return G
+
+    def share(self) -> 'SharedGraphSnapshot':
+        """Copy the snapshot into shared memory blocks"""
+        return SharedGraphSnapshot.create(self)
+
+
+class SharedGraphSnapshot:
+    """
+    GraphSnapshot placed in multiprocessing.shared_memory
+
+    The owner (parent process) creates and unlinks the blocks. Workers only
+    receive the small `spec` dict and attach by name.
+    """
+
+    def __init__(self, blocks: Dict[str, 'shared_memory.SharedMemory'], spec: Dict):
+        self.blocks = blocks
+        self.spec = spec
+
+    @classmethod
+    def create(cls, snapshot: GraphSnapshot) -> 'SharedGraphSnapshot':
+        label_bytes = json.dumps(snapshot.labels).encode('utf-8')
+        arrays = {
+            'indptr': snapshot.indptr,
+            'indices': snapshot.indices,
+            'weights': snapshot.weights,
+            'labels': np.frombuffer(label_bytes, dtype=np.uint8),
+        }
+
+        blocks = {}
+        spec = {'directed': snapshot.directed, 'arrays': {}}
+        try:
+            for key, array in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+                blocks[key] = block
+                spec['arrays'][key] = (block.name, array.shape, array.dtype.str)
+        except Exception:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+
+        return cls(blocks, spec)
+
+    @staticmethod
+    def attach(spec: Dict) -> GraphSnapshot:
+        """Attach to shared blocks by name and copy out a private snapshot"""
+        arrays = {}
+        for key, (name, shape, dtype) in spec['arrays'].items():
+            block = _attach_shared_memory(name)
+            try:
+                arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf).copy()
+            finally:
+                block.close()
+
+        labels = json.loads(arrays['labels'].tobytes().decode('utf-8'))
+        return GraphSnapshot(labels, arrays['indptr'], arrays['indices'],
+                             arrays['weights'], directed=spec['directed'])
+
+    def close(self):
+        """Release and unlink all shared blocks"""
+        for block in self.blocks.values():
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks = {}
+
+
+def _attach_shared_memory(name: str) -> 'shared_memory.SharedMemory':
+    """Attach to an existing block (the owner is responsible for unlinking)"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+# ============================================================================
+# Analysis tasks (module-level so they are addressable by name in workers)
+# Analyzers run in strict mode so algorithm failures surface as task errors
+# ============================================================================
+
+def _task_louvain(graph):
+    from .graph_topology_analyzer import CommunityDetector
+    return [list(c) for c in CommunityDetector(graph, strict=True).louvain_communities()]
+
+
+def _task_label_propagation(graph):
+    from .graph_topology_analyzer import CommunityDetector
+    return [list(c) for c in CommunityDetector(graph, strict=True).label_propagation_communities()]
+
+
+def _task_greedy_modularity(graph):
+    from .graph_topology_analyzer import CommunityDetector
+    return [list(c) for c in CommunityDetector(graph, strict=True).greedy_modularity_communities()]
+
+
+def _task_degree(graph):
+    from .graph_topology_analyzer import CentralityAnalyzer
+    return CentralityAnalyzer(graph, strict=True).degree_centrality()
+
+
+def _task_betweenness(graph):
+    from .graph_topology_analyzer import CentralityAnalyzer
+    return CentralityAnalyzer(graph, strict=True).betweenness_centrality()
+
+
+def _task_closeness(graph):
+    from .graph_topology_analyzer import CentralityAnalyzer
+    return CentralityAnalyzer(graph, strict=True).closeness_centrality()
+
+
+def _task_pagerank(graph):
+    from .graph_topology_analyzer import CentralityAnalyzer
+    return CentralityAnalyzer(graph, strict=True).pagerank()
+
+
+def _task_eigenvector(graph):
+    from .graph_topology_analyzer import CentralityAnalyzer
+    return CentralityAnalyzer(graph, strict=True).eigenvector_centrality()
+
+
+def _task_critical_infrastructure(graph):
+    from .graph_topology_analyzer import BridgeDetector
+    undirected = graph.to_undirected() if graph.is_directed() else graph
+    return BridgeDetector(undirected, strict=True).analyze_critical_infrastructure()
+
+
+def _task_service_chains(graph):
+    from .graph_topology_analyzer import PathAnalyzer
+    return PathAnalyzer(graph).find_service_chains(min_length=3)[:20]  # Top 20
+
+
+def _task_circular_dependencies(graph):
+    from .graph_topology_analyzer import CycleDetector
+    return CycleDetector(graph, strict=True).identify_circular_dependencies()
+
+
+def _task_hierarchy(graph):
+    from .graph_topology_analyzer import HierarchyAnalyzer
+    hierarchy_analyzer = HierarchyAnalyzer(graph)
+    return {
+        'layers': {str(k): v for k, v in hierarchy_analyzer.compute_layers().items()},
+        'tier_structure': hierarchy_analyzer.identify_tier_structure()
+    }
+
+
+ANALYSIS_TASKS: Dict[str, Callable] = {
+    'louvain': _task_louvain,
+    'label_propagation': _task_label_propagation,
+    'greedy_modularity': _task_greedy_modularity,
+    'degree': _task_degree,
+    'betweenness': _task_betweenness,
+    'closeness': _task_closeness,
+    'pagerank': _task_pagerank,
+    'eigenvector': _task_eigenvector,
+    'critical_infrastructure': _task_critical_infrastructure,
+    'service_chains': _task_service_chains,
+    'circular_dependencies': _task_circular_dependencies,
+    'hierarchy': _task_hierarchy,
+}
+
+# Tasks that only make sense on directed graphs
+DIRECTED_ONLY_TASKS = {'service_chains', 'circular_dependencies', 'hierarchy'}
+
+
+# Worker-side state (one read-only graph per worker process)
+_WORKER_GRAPH = None
+_WORKER_STARTS = None
+
+
+def _init_worker(spec: Dict, starts):
+    global _WORKER_GRAPH, _WORKER_STARTS
+    _WORKER_GRAPH = SharedGraphSnapshot.attach(spec).to_graph()
+    _WORKER_STARTS = starts
+
+
+def _run_task(name: str, index: int):
+    _WORKER_STARTS[index] = time.time()  # Wall clock: compared across processes
+    start = time.perf_counter()
+    try:
+        result = ANALYSIS_TASKS[name](_WORKER_GRAPH)
+    except Exception as e:
+        # Some NetworkX exceptions do not survive pickling back to the parent
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+    return result, time.perf_counter() - start
+
+
+class GraphAnalyticsRunner:
+    """
+    Dispatches graph analyses to a process pool over a shared snapshot
+
+    Returns partial results: analyses that time out or fail are recorded
+    in the status table and left out of the results.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 timeouts: Optional[Dict[str, float]] = None,
+                 default_timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            max_workers: Pool size (default: min(#tasks, CPU count)); 1 runs in-process
+            timeouts: Per-analysis timeout overrides in seconds
+            default_timeout: Timeout for analyses without a specific budget
+        """
+        if not NETWORKX_AVAILABLE or not NUMPY_AVAILABLE:
+            raise ImportError("NetworkX and NumPy required for the analytics runner")
+
+        self.max_workers = max_workers
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.default_timeout = default_timeout
+
+    def default_tasks(self, graph: 'nx.Graph') -> List[str]:
+        """All analyses applicable to this graph"""
+        return [name for name in ANALYSIS_TASKS
+                if graph.is_directed() or name not in DIRECTED_ONLY_TASKS]
+
+    def run(self, graph: 'nx.Graph', tasks: Optional[List[str]] = None) -> Dict:
+        """
+        Run analyses on a graph
+
+        Args:
+            graph: NetworkX graph (not modified)
+            tasks: Analysis names from ANALYSIS_TASKS (default: all applicable)
+
+        Returns:
+            {'results': {task: result}, 'status': {task: {'status', 'elapsed'}}}
+        """
+        tasks = list(tasks) if tasks is not None else self.default_tasks(graph)
+        unknown = [t for t in tasks if t not in ANALYSIS_TASKS]
+        if unknown:
+            raise ValueError(f"Unknown analyses: {unknown}")
+
+        workers = self.max_workers or min(len(tasks), os.cpu_count() or 1)
+
+        if workers <= 1 or not SHARED_MEMORY_AVAILABLE or not tasks:
+            return self._run_serial(graph, tasks)
+
+        return self._run_pool(graph, tasks, workers)
+
+    def _run_serial(self, graph: 'nx.Graph', tasks: List[str]) -> Dict:
+        """In-process fallback (timeouts are not enforced)"""
+        results, status = {}, {}
+        for name in tasks:
+            start = time.perf_counter()
+            try:
+                results[name] = ANALYSIS_TASKS[name](graph)
+                status[name] = {'status': 'ok', 'elapsed': time.perf_counter() - start}
+            except Exception as e:
+                logger.error(f"Analysis '{name}' failed: {e}")
+                status[name] = {'status': 'error', 'elapsed': time.perf_counter() - start,
+                                'error': str(e)}
+        return {'results': results, 'status': status}
+
+    def _run_pool(self, graph: 'nx.Graph', tasks: List[str], workers: int) -> Dict:
+        logger.info(f"Dispatching {len(tasks)} graph analyses to {workers} workers...")
+
+        shared = GraphSnapshot.from_graph(graph).share()
+        starts = multiprocessing.Array('d', len(tasks), lock=False)  # 0.0 = not started yet
+        results, status = {}, {}
+        pool = multiprocessing.Pool(processes=workers, initializer=_init_worker,
+                                    initargs=(shared.spec, starts))
+        overrun = {}  # Timed-out tasks, still occupying a worker
+
+        try:
+            pending = {name: (i, pool.apply_async(_run_task, (name, i)))
+                       for i, name in enumerate(tasks)}
+
+            while pending:
+                now = time.time()
+                stalled = sum(1 for r in overrun.values() if not r.ready()) >= workers
+
+                for name, (i, async_result) in list(pending.items()):
+                    budget = self.timeouts.get(name, self.default_timeout)
+                    started = starts[i]
+
+                    if async_result.ready():
+                        del pending[name]
+                        try:
+                            results[name], elapsed = async_result.get()
+                            status[name] = {'status': 'ok', 'elapsed': elapsed}
+                        except Exception as e:
+                            logger.error(f"Analysis '{name}' failed: {e}")
+                            status[name] = {'status': 'error', 'elapsed': now - started if started else 0.0,
+                                            'error': str(e)}
+                    elif started and now - started > budget:
+                        del pending[name]
+                        overrun[name] = async_result
+                        logger.warning(f"Analysis '{name}' exceeded {budget}s budget - skipped")
+                        status[name] = {'status': 'timeout', 'elapsed': now - started}
+                    elif not started and stalled:
+                        del pending[name]
+                        logger.warning(f"Analysis '{name}' not started - all workers busy with "
+                                       f"over-budget analyses")
+                        status[name] = {'status': 'timeout', 'elapsed': 0.0}
+
+                if pending:
+                    time.sleep(POLL_INTERVAL)
+        finally:
+            if overrun or pending:
+                pool.terminate()  # Kill workers still running over-budget tasks
+            else:
+                pool.close()
+            pool.join()
+            shared.close()
+
+        status = {name: status[name] for name in tasks}
+        completed = sum(1 for s in status.values() if s['status'] == 'ok')
+        logger.info(f"  [OK] {completed}/{len(tasks)} analyses completed")
+
+        return {'results': results, 'status': status}
@@ -51,15 +51,17 @@ class CommunityDetector:
     Identifies application clusters and micro-segmentation zones
     """
 
-    def __init__(self, graph: 'nx.Graph' = None):
+    def __init__(self, graph: 'nx.Graph' = None, strict: bool = False):
         """
         Args:
             graph: NetworkX graph
+            strict: Raise algorithm failures instead of logging them and returning an empty result
         """
         if not NETWORKX_AVAILABLE:
             raise ImportError("NetworkX required for community detection")
 
         self.graph = graph
+        self.strict = strict
 
     def louvain_communities(self, resolution: float = 1.0) -> List[Set]:
         """
@@ -85,6 +87,8 @@ class CommunityDetector:
 
             return communities
         except Exception as e:
+            if self.strict:
+                raise
             logger.error(f"Louvain community detection failed: {e}")
             return []
 
@@ -108,6 +112,8 @@ class CommunityDetector:
 
             return communities
         except Exception as e:
+            if self.strict:
+                raise
             logger.error(f"Label propagation failed: {e}")
             return []
 
@@ -129,6 +135,8 @@ class CommunityDetector:
 
             return communities
         except Exception as e:
+            if self.strict:
+                raise
             logger.error(f"Greedy modularity failed: {e}")
             return []
 
@@ -180,15 +188,17 @@ class CentralityAnalyzer:
     Identifies critical applications and network hubs
     """
 
-    def __init__(self, graph: 'nx.Graph' = None):
+    def __init__(self, graph: 'nx.Graph' = None, strict: bool = False):
         """
         Args:
             graph: NetworkX graph
+            strict: Raise algorithm failures instead of logging them and returning an empty result
         """
         if not NETWORKX_AVAILABLE:
             raise ImportError("NetworkX required for centrality analysis")
 
         self.graph = graph
+        self.strict = strict
 
     def degree_centrality(self) -> Dict[str, float]:
         """
@@ -231,6 +241,8 @@ class CentralityAnalyzer:
         try:
             return nx.closeness_centrality(self.graph)
         except Exception as e:
+            if self.strict:
+                raise
             logger.error(f"Closeness centrality failed: {e}")
             return {}
 
@@ -259,6 +271,8 @@ class CentralityAnalyzer:
         try:
             return nx.eigenvector_centrality(self.graph, max_iter=max_iter)
         except Exception as e:
+            if self.strict:
+                raise
             logger.warning(f"Eigenvector centrality failed: {e}")
             return {}
 
@@ -287,13 +301,15 @@ class CentralityAnalyzer:
 
     def identify_critical_nodes(
         self,
-        threshold_percentile: float = 90.0
+        threshold_percentile: float = 90.0,
+        centralities: Optional[Dict[str, Dict[str, float]]] = None
     ) -> Dict[str, List[str]]:
         """
         Identify critical nodes based on multiple centrality metrics
 
         Args:
             threshold_percentile: Percentile threshold for criticality
+            centralities: Precomputed output of analyze_all_centralities()
 
         Returns:
             Dictionary of critical nodes per metric
@@ -304,7 +320,7 @@ class CentralityAnalyzer:
 
         import numpy as np
 
-        all_centralities = self.analyze_all_centralities()
+        all_centralities = centralities if centralities is not None else self.analyze_all_centralities()
         critical_nodes = {}
 
         for metric, scores in all_centralities.items():
@@ -462,15 +478,17 @@ class CycleDetector:
     Identifies problematic circular dependencies in application topology
     """
 
-    def __init__(self, graph: 'nx.DiGraph' = None):
+    def __init__(self, graph: 'nx.DiGraph' = None, strict: bool = False):
         """
         Args:
             graph: NetworkX directed graph
+            strict: Raise algorithm failures instead of logging them and returning an empty result
         """
         if not NETWORKX_AVAILABLE:
             raise ImportError("NetworkX required for cycle detection")
 
         self.graph = graph
+        self.strict = strict
 
     def find_cycles(self) -> List[List[str]]:
         """
@@ -487,6 +505,8 @@ class CycleDetector:
             logger.info(f"Found {len(cycles)} cycles")
             return cycles
         except Exception as e:
+            if self.strict:
+                raise
             logger.error(f"Cycle detection failed: {e}")
             return []
 
@@ -547,15 +567,17 @@ class BridgeDetector:
     Identifies edges whose removal would disconnect the network
     """
 
-    def __init__(self, graph: 'nx.Graph' = None):
+    def __init__(self, graph: 'nx.Graph' = None, strict: bool = False):
         """
         Args:
             graph: NetworkX graph (undirected)
+            strict: Raise algorithm failures instead of logging them and returning an empty result
         """
         if not NETWORKX_AVAILABLE:
             raise ImportError("NetworkX required for bridge detection")
 
         self.graph = graph
+        self.strict = strict
 
     def find_bridges(self) -> List[Tuple[str, str]]:
         """
@@ -572,6 +594,8 @@ class BridgeDetector:
             logger.info(f"Found {len(bridges)} bridge connections")
             return bridges
         except Exception as e:
+            if self.strict:
+                raise
             logger.error(f"Bridge detection failed: {e}")
             return []
 
@@ -592,6 +616,8 @@ class BridgeDetector:
             logger.info(f"Found {len(articulation_points)} articulation points")
             return articulation_points
         except Exception as e:
+            if self.strict:
+                raise
             logger.error(f"Articulation point detection failed: {e}")
             return set()
 
@@ -797,10 +823,20 @@ class GraphTopologyAnalyzer:
         self.graph = G
         return G
 
-    def comprehensive_analysis(self) -> Dict:
+    def comprehensive_analysis(
+        self,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        timeouts: Optional[Dict[str, float]] = None
+    ) -> Dict:
         """
         Run comprehensive topology analysis
 
+        Args:
+            parallel: Dispatch independent analyses to a process pool
+            max_workers: Pool size for parallel mode (default: CPU count)
+            timeouts: Per-analysis timeouts in seconds for parallel mode
+
         Returns:
             Complete analysis results
         """
@@ -808,6 +844,9 @@ class GraphTopologyAnalyzer:
             logger.warning("Graph not available for analysis")
             return {}
 
+        if parallel:
+            return self._parallel_analysis(max_workers, timeouts)
+
         logger.info("Running comprehensive graph analysis...")
 
         results = {}
@@ -825,7 +864,7 @@ class GraphTopologyAnalyzer:
         logger.info("  Computing centrality metrics...")
         cent_analyzer = CentralityAnalyzer(self.graph)
         centralities = cent_analyzer.analyze_all_centralities()
-        critical_nodes = cent_analyzer.identify_critical_nodes()
+        critical_nodes = cent_analyzer.identify_critical_nodes(centralities=centralities)
         results['centrality'] = centralities
         results['critical_nodes'] = critical_nodes
 
@@ -859,7 +898,71 @@ class GraphTopologyAnalyzer:
 
         # 7. Basic graph metrics
         logger.info("  Computing graph metrics...")
-        results['graph_metrics'] = {
+        results['graph_metrics'] = self._graph_metrics()
+
+        logger.info("Comprehensive analysis complete")
+
+        return results
+
+    def _parallel_analysis(
+        self,
+        max_workers: Optional[int] = None,
+        timeouts: Optional[Dict[str, float]] = None
+    ) -> Dict:
+        """
+        Parallel variant of comprehensive_analysis()
+
+        Same result layout; analyses that fail or exceed their budget are missing
+        from the results and listed in results['analysis_status'].
+        """
+        from .graph_analytics_runner import GraphAnalyticsRunner
+
+        logger.info("Running comprehensive graph analysis (parallel)...")
+
+        runner = GraphAnalyticsRunner(max_workers=max_workers, timeouts=timeouts)
+        run = runner.run(self.graph)
+        partial = run['results']
+
+        results = {}
+
+        results['communities'] = {
+            method: partial[method]
+            for method in ('louvain', 'label_propagation', 'greedy_modularity')
+            if method in partial
+        }
+
+        centralities = {
+            metric: partial[metric]
+            for metric in ('degree', 'betweenness', 'closeness', 'pagerank', 'eigenvector')
+            if metric in partial
+        }
+        results['centrality'] = centralities
+        results['critical_nodes'] = CentralityAnalyzer(self.graph).identify_critical_nodes(
+            centralities=centralities
+        )
+
+        if 'critical_infrastructure' in partial:
+            results['critical_infrastructure'] = partial['critical_infrastructure']
+
+        if self.graph.is_directed():
+            if 'service_chains' in partial:
+                results['service_chains'] = partial['service_chains']
+            if 'circular_dependencies' in partial:
+                results['circular_dependencies'] = partial['circular_dependencies']
+            if 'hierarchy' in partial:
+                results['layers'] = partial['hierarchy']['layers']
+                results['tier_structure'] = partial['hierarchy']['tier_structure']
+
+        results['graph_metrics'] = self._graph_metrics()
+        results['analysis_status'] = run['status']
+
+        logger.info("Comprehensive analysis complete")
+
+        return results
+
+    def _graph_metrics(self) -> Dict:
+        """Basic graph metrics"""
+        return {
             'num_nodes': self.graph.number_of_nodes(),
             'num_edges': self.graph.number_of_edges(),
             'density': nx.density(self.graph),
@@ -869,10 +972,6 @@ class GraphTopologyAnalyzer:
                          if self.graph.number_of_nodes() > 0 else 0
         }
 
-        logger.info("Comprehensive analysis complete")
-
-        return results
-
     def export_analysis(self, results: Dict, output_path: str):
         """
         Export analysis results to JSON
@@ -30,6 +30,11 @@ from pathlib import Path
 from collections import defaultdict, Counter
 from datetime import datetime
 
+try:
+    from src.feature_store import FeatureStore
+except ImportError:
+    from feature_store import FeatureStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,6 +80,7 @@ class UnifiedTopologyDiscoverySystem:
         self.network_graph = nx.DiGraph()
         self.application_graph = nx.DiGraph()
         self.combined_graph = nx.DiGraph()
+        self.feature_store = None  # FeatureStore over the current flows
 
         # Load existing ensemble model (from enterprise_network_analyzer.py)
         from core.ensemble_model import EnsembleNetworkModel
@@ -320,14 +326,17 @@ class UnifiedTopologyDiscoverySystem:
 
             edges.append((record.src_ip, record.dst_ip))
 
-        # Prepare data for ensemble model (reuse existing logic)
-        node_features = np.random.randn(len(node_ips), 64)  # Simplified
-        adj_matrix = nx.to_numpy_array(self.network_graph)
+        # Prepare data for ensemble model (real per-node/per-app features, cached per app)
+        self.feature_store = FeatureStore(flow_records)
+        apps = list(apps_observed)
+        node_features = self.feature_store.node_features(list(self.network_graph.nodes()))
+        # CSR adjacency (edges only - never densified to N x N)
+        adj_sparse = nx.to_scipy_sparse_array(self.network_graph, format='csr')
 
         # Use existing ensemble for predictions
-        graph_data = (node_features, adj_matrix)
-        sequences = np.random.randn(len(apps_observed), 50, 32)  # Simplified
-        traffic_matrices = np.random.randn(len(apps_observed), 128)  # Simplified
+        graph_data = (node_features, adj_sparse)
+        sequences = self.feature_store.app_sequences(apps, seq_len=50)
+        traffic_matrices = self.feature_store.app_features(apps)
 
         # Train ensemble if not already trained
         if self.ensemble_model.meta_model['trained_epochs'] == 0:
@@ -340,7 +349,7 @@ class UnifiedTopologyDiscoverySystem:
             'apps_observed': len(apps_observed),
             'network_graph': self.network_graph,
             'node_features': node_features,
-            'adj_matrix': adj_matrix
+            'adj_sparse': adj_sparse
         }
 
     def _analyze_application_semantics(
@@ -413,12 +422,12 @@ class UnifiedTopologyDiscoverySystem:
             logger.info("  Running GAT analysis...")
 
             node_features = network_topology['node_features']
-            adj_matrix = network_topology['adj_matrix']
+            adj_sparse = network_topology['adj_sparse']
             node_names = list(self.network_graph.nodes())
 
             gat_results = self.gat_analyzer.analyze_topology(
                 node_features,
-                adj_matrix,
+                adj_sparse,
                 node_names
             )
 
@@ -433,9 +442,15 @@ class UnifiedTopologyDiscoverySystem:
             behavior_vectors = []
             app_names = []
 
-            for app_name, analysis in application_semantics.items():
-                # Create behavior vector from semantic features
-                behavior_vec = self._create_behavior_vector(analysis)
+            app_list = list(application_semantics.keys())
+            if self.feature_store is not None:
+                flow_features = self.feature_store.app_features(app_list)
+            else:
+                flow_features = np.zeros((len(app_list), 128), dtype=np.float32)
+
+            for i, (app_name, analysis) in enumerate(application_semantics.items()):
+                # Create behavior vector from semantic + observed flow features
+                behavior_vec = self._create_behavior_vector(analysis, flow_features[i])
                 behavior_vectors.append(behavior_vec)
                 app_names.append(app_name)
 
@@ -644,8 +659,8 @@ class UnifiedTopologyDiscoverySystem:
 
         return final_results
 
-    def _create_behavior_vector(self, analysis: Dict) -> np.ndarray:
-        """Create behavior vector from semantic analysis"""
+    def _create_behavior_vector(self, analysis: Dict, flow_features: Optional[np.ndarray] = None) -> np.ndarray:
+        """Create behavior vector from semantic analysis (+ FeatureStore app features)"""
 
         # Create fixed-size feature vector
         vector = np.zeros(128)
@@ -675,47 +690,25 @@ class UnifiedTopologyDiscoverySystem:
         # Encode confidence
         vector[23] = analysis.get('confidence', 0.5)
 
-        # Fill rest with small random noise
-        vector[24:] = np.random.randn(104) * 0.01
+        # Observed traffic profile (leading FeatureStore app features; zeros for apps without flows)
+        if flow_features is not None:
+            vector[24:] = flow_features[:104]
 
         return vector
 
     def _build_temporal_sequences(self, flow_records: List) -> Optional[np.ndarray]:
-        """Build temporal sequences from flow records"""
+        """Build temporal sequences from flow records (last 100 timestamped flows per app)"""
 
         if not flow_records:
             return None
 
-        # Group by app and time
-        app_sequences = defaultdict(list)
+        if self.feature_store is None:
+            self.feature_store = FeatureStore(flow_records)
 
-        for record in flow_records:
-            if hasattr(record, 'timestamp') and record.timestamp:
-                app_sequences[record.app_name].append((
-                    record.timestamp,
-                    record.bytes,
-                    record.packets
-                ))
-
-        if not app_sequences:
+        if not self.feature_store.timestamped_apps():
             return None
 
-        # Create sequences matrix
-        max_seq_len = 100
-        num_apps = len(app_sequences)
-        sequences = np.zeros((num_apps, max_seq_len, 32))
-
-        for i, (app, seq) in enumerate(app_sequences.items()):
-            # Sort by time
-            seq = sorted(seq, key=lambda x: x[0])[-max_seq_len:]
-
-            for j, (ts, bytes_val, packets_val) in enumerate(seq):
-                sequences[i, j, 0] = bytes_val / 1e6  # Normalize
-                sequences[i, j, 1] = packets_val / 1000  # Normalize
-                # Add random features
-                sequences[i, j, 2:] = np.random.randn(30) * 0.01
-
-        return sequences
+        return self.feature_store.app_sequences(seq_len=100)
 
     def export_results(self, output_dir: str = './outputs_topology'):
         """Export all results to files"""
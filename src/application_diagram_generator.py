@@ -20,6 +20,16 @@ from pathlib import Path
 from typing import List, Dict, Set, Optional
 from collections import defaultdict
 
+try:
+    from src.mermaid_renderer import render_mermaid_file
+except ImportError:
+    from mermaid_renderer import render_mermaid_file
+
+try:
+    from src.html_templates import write_page
+except ImportError:
+    from html_templates import write_page
+
 logger = logging.getLogger(__name__)
 
 
@@ -376,70 +386,13 @@ class ApplicationDiagramGenerator:
         return mermaid
 
     def _generate_png_diagram(self, mmd_path: str, png_path: str):
-        """Generate PNG from Mermaid file using mmdc command"""
-        import subprocess
-        import tempfile
-
+        """Generate PNG from Mermaid file using the shared Mermaid render pool"""
         try:
-            # Create temporary file without markdown code fences (mmdc doesn't accept them)
-            with open(mmd_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Extract only the graph content (between ```mermaid and ```, excluding legend)
-            lines = content.split('\n')
-            graph_lines = []
-            in_graph = False
-
-            for line in lines:
-                if line.strip().startswith('```mermaid'):
-                    in_graph = True
-                    continue
-                elif line.strip() == '```':
-                    in_graph = False
-                    break
-                elif in_graph:
-                    graph_lines.append(line)
-
-            # Join only the graph content
-            content = '\n'.join(graph_lines).strip()
-
-            # Write raw mermaid to temp file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False, encoding='utf-8') as tmp:
-                tmp.write(content)
-                tmp_path = tmp.name
-
-            # Try mmdc command
-            success = False
-            for mmdc_cmd in ['mmdc']:
-                try:
-                    result = subprocess.run(
-                        [mmdc_cmd, '-i', tmp_path, '-o', png_path],
-                        capture_output=True,
-                        text=True,
-                        timeout=30
-                    )
-
-                    if result.returncode == 0:
-                        logger.info(f"[OK] PNG diagram generated: {Path(png_path).name}")
-                        success = True
-                        break
-                    elif 'UnknownDiagramError' in result.stderr:
-                        logger.warning(f"Mermaid syntax error in {Path(mmd_path).name}")
-                        break
-                except FileNotFoundError:
-                    continue
-
-            if not success:
-                logger.warning("mmdc not found - PNG generation skipped")
-
-            # Clean up temp file
-            try:
-                Path(tmp_path).unlink()
-            except:
-                pass
-
-        except subprocess.TimeoutExpired:
-            logger.error(f"PNG generation timed out for {Path(mmd_path).name}")
+            # mmdc doesn't accept markdown: render only the ```mermaid block (no legend)
+            if render_mermaid_file(mmd_path, png_path, format='png', timeout=30):
+                logger.info(f"[OK] PNG diagram generated: {Path(png_path).name}")
+            else:
+                logger.warning(f"PNG generation failed for {Path(mmd_path).name} (Mermaid syntax error or mmdc not installed)")
         except Exception as e:
             logger.error(f"Failed to generate PNG: {e}")
 
@@ -692,486 +645,8 @@ class ApplicationDiagramGenerator:
         # Join only the graph content
         graph_content = '\n'.join(graph_lines).strip()
 
-        html_template = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Application Data Flow Diagram</title>
-    <script src="https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js"></script>
-    <style>
-        * {{
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            margin: 0;
-            padding: 0;
-            background: #f5f5f5;
-            color: #333;
-            overflow: hidden;
-            height: 100vh;
-        }}
-        h1 {{
-            color: #2c3e50;
-            margin: 0;
-            padding: 15px 20px 15px 20px;
-            font-size: 22px;
-            background: white;
-            border-bottom: 3px solid #3498db;
-            box-shadow: 0 2px 6px rgba(0,0,0,0.1);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-        h1 span {{
-            flex: 1;
-        }}
-        h1 a {{
-            margin-left: 20px;
-            margin-right: 180px;
-            white-space: nowrap;
-        }}
-        .instructions {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 12px 20px;
-            color: white;
-            font-size: 14px;
-            font-weight: 500;
-            display: flex;
-            align-items: center;
-            gap: 15px;
-            box-shadow: 0 2px 6px rgba(0,0,0,0.15);
-        }}
-        .instructions strong {{
-            font-size: 15px;
-        }}
-        .diagram-container {{
-            background: #fafafa;
-            padding: 0;
-            margin: 0;
-            height: calc(100vh - 100px);
-            position: relative;
-            overflow: hidden;
-        }}
-        .diagram-container .mermaid {{
-            width: 100%;
-            height: 100%;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-        }}
-        .diagram-container svg {{
-            max-width: none !important;
-            width: auto !important;
-            height: auto !important;
-        }}
-        .controls {{
-            position: absolute;
-            top: 30px;
-            right: 30px;
-            z-index: 1000;
-            background: rgba(255, 255, 255, 0.95);
-            padding: 15px;
-            border-radius: 12px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-            border: 2px solid #e0e0e0;
-            text-align: center;
-        }}
-        .controls-title {{
-            font-size: 12px;
-            font-weight: 600;
-            color: #666;
-            margin-bottom: 12px;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-        .arrow-grid {{
-            display: grid;
-            grid-template-columns: repeat(3, 38px);
-            gap: 4px;
-            margin-bottom: 10px;
-        }}
-        .zoom-grid {{
-            display: grid;
-            grid-template-columns: repeat(3, 38px);
-            gap: 4px;
-            margin-top: 10px;
-            padding-top: 10px;
-            border-top: 1px solid #ddd;
-        }}
-        .arrow-btn {{
-            width: 38px;
-            height: 38px;
-            background: #f5f5f5;
-            border: 1px solid #ddd;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 18px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            transition: all 0.2s;
-            color: #333;
-            user-select: none;
-        }}
-        .arrow-btn:hover {{
-            background: #e8f4f8;
-            border-color: #64b5f6;
-            transform: translateY(-1px);
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .arrow-btn:active {{
-            transform: translateY(0);
-            box-shadow: none;
-        }}
-        .arrow-btn.empty {{
-            background: transparent;
-            border: none;
-            cursor: default;
-        }}
-        .arrow-btn.empty:hover {{
-            background: transparent;
-            border: none;
-            transform: none;
-            box-shadow: none;
-        }}
-        .controls-hint {{
-            margin-top: 10px;
-            padding-top: 10px;
-            border-top: 1px solid #ddd;
-            font-size: 10px;
-            color: #999;
-            line-height: 1.4;
-        }}
-        .legend {{
-            position: fixed;
-            bottom: 20px;
-            left: 20px;
-            max-width: 650px;
-            width: auto;
-            max-height: 320px;
-            padding: 18px;
-            background: rgba(255, 255, 255, 0.96);
-            border: 2px solid #3498db;
-            border-radius: 8px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.2);
-            font-size: 13px;
-            z-index: 1001;
-            overflow-y: auto;
-            position: relative;
-            transition: opacity 0.3s, transform 0.3s;
-        }}
-        .legend.hidden {{
-            opacity: 0;
-            transform: translateY(20px);
-            pointer-events: none;
-        }}
-        .legend-close-btn {{
-            position: absolute;
-            top: 10px;
-            right: 10px;
-            background: #e74c3c;
-            color: white;
-            border: none;
-            border-radius: 50%;
-            width: 24px;
-            height: 24px;
-            cursor: pointer;
-            font-size: 16px;
-            line-height: 1;
-            padding: 0;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-        }}
-        .legend-close-btn:hover {{
-            background: #c0392b;
-        }}
-        .legend-toggle-btn {{
-            position: fixed;
-            bottom: 20px;
-            left: 20px;
-            z-index: 1000;
-            background: #3498db;
-            color: white;
-            border: none;
-            border-radius: 6px;
-            padding: 10px 16px;
-            cursor: pointer;
-            font-size: 13px;
-            font-weight: 600;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-            display: none;
-        }}
-        .legend-toggle-btn.show {{
-            display: block;
-        }}
-        .legend h3 {{
-            margin-top: 0;
-            font-size: 14px;
-            color: #2c3e50;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 5px;
-        }}
-        .legend ul {{
-            margin: 8px 0;
-            padding-left: 18px;
-            line-height: 1.6;
-        }}
-    </style>
-</head>
-<body>
-    <h1>
-        <span>Application Data Flow Diagram</span>
-        <a href="../enhanced_diagrams/{app_code}_enhanced_application_diagram.html"
-           style="padding: 8px 16px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-           color: white; text-decoration: none; border-radius: 5px; font-weight: 500; font-size: 14px;
-           box-shadow: 0 2px 6px rgba(102, 126, 234, 0.4); transition: all 0.3s;"
-           onmouseover="this.style.transform='translateY(-1px)'; this.style.boxShadow='0 4px 10px rgba(102, 126, 234, 0.6)';"
-           onmouseout="this.style.transform='translateY(0)'; this.style.boxShadow='0 2px 6px rgba(102, 126, 234, 0.4)';">
-            View Enhanced Analysis
-        </a>
-    </h1>
-
-    <div class="instructions">
-        <strong>Navigation:</strong>
-        <span>Use directional arrows to pan • Mouse wheel to zoom • + and − to zoom in/out</span>
-    </div>
-
-    <div class="controls">
-        <div class="controls-title">Navigate</div>
-        <div class="arrow-grid">
-            <div class="arrow-btn empty"></div>
-            <div class="arrow-btn" onclick="panUp()" title="Pan North">↑</div>
-            <div class="arrow-btn empty"></div>
-            <div class="arrow-btn" onclick="panLeft()" title="Pan West">←</div>
-            <div class="arrow-btn" onclick="resetView()" title="Reset View">⊙</div>
-            <div class="arrow-btn" onclick="panRight()" title="Pan East">→</div>
-            <div class="arrow-btn empty"></div>
-            <div class="arrow-btn" onclick="panDown()" title="Pan South">↓</div>
-            <div class="arrow-btn empty"></div>
-        </div>
-        <div class="zoom-grid">
-            <div class="arrow-btn empty"></div>
-            <div class="arrow-btn" onclick="zoomIn()" title="Zoom In">+</div>
-            <div class="arrow-btn empty"></div>
-            <div class="arrow-btn empty"></div>
-            <div class="arrow-btn" onclick="zoomOut()" title="Zoom Out">−</div>
-            <div class="arrow-btn empty"></div>
-        </div>
-        <div class="controls-hint">Mouse wheel to zoom<br>Click & drag to pan</div>
-    </div>
-
-    <div class="legend">
-        <button class="legend-close-btn" onclick="toggleLegend()" title="Close Legend">×</button>
-        <h3>Legend</h3>
-        <ul>
-            <li><strong>[WHITE] Circles</strong> = Services/APIs</li>
-            <li><strong>[RECT] Rectangles</strong> = Data Stores</li>
-            <li><strong>[BLACK] Black solid</strong> = Observed flows (ExtraHop)</li>
-            <li><strong>[BLUE] Blue dashed</strong> = ML inference/predictions</li>
-            <li><strong>[VISUAL] Colors</strong> = Security zones</li>
-        </ul>
-        <div style="margin-top: 15px; padding: 18px; background: rgba(158, 158, 158, 0.15); border-radius: 6px; border-left: 4px solid #9e9e9e;">
-            <strong style="color: #2c3e50; font-size: 14px;">* Unknown Connections:</strong>
-            <p style="margin: 8px 0 0 0; font-size: 13px; line-height: 1.7;">
-                Unknown connections could not be definitively classified based on available ExtraHop network flow data.
-                This may occur when: <br><br>
-                <strong>(1)</strong> Destination endpoints do not have clear service type indicators,<br>
-                <strong>(2)</strong> Flow data lacks sufficient context to determine the application protocol, or<br>
-                <strong>(3)</strong> Connections involve custom or proprietary services without standard port/protocol patterns.
-                <br><br>
-                <strong>Recommendation:</strong> Manual investigation and correlation with application configuration is recommended.
-            </p>
-        </div>
-    </div>
-
-    <button class="legend-toggle-btn" id="legendToggle" onclick="toggleLegend()">Show Legend</button>
-
-    <div class="diagram-container">
-        <div class="mermaid">
-{graph_content}
-        </div>
-    </div>
-
-    <script>
-        let translateX = 0;
-        let translateY = 0;
-        let scale = 1;
-        const PAN_STEP = 100; // pixels to pan per arrow click
-
-        mermaid.initialize({{
-            startOnLoad: false,
-            theme: 'default',
-            maxTextSize: 90000,
-            flowchart: {{
-                curve: 'basis',
-                padding: 20,
-                useMaxWidth: false,
-                htmlLabels: true
-            }},
-            securityLevel: 'loose'
-        }});
-
-        // Initialize after Mermaid renders
-        window.addEventListener('load', function() {{
-            const mermaidDiv = document.querySelector('.mermaid');
-            if (mermaidDiv) {{
-                // Force render
-                mermaid.run({{ nodes: [mermaidDiv] }}).then(() => {{
-                    console.log('Mermaid rendered successfully');
-                    initControls();
-                }}).catch(err => {{
-                    console.error('Mermaid rendering failed:', err);
-                    // Show error message to user
-                    mermaidDiv.innerHTML = '<div style="padding: 40px; text-align: center; color: #e74c3c;"><h2>Diagram Rendering Error</h2><p>' + err.message + '</p><p>Check browser console for details.</p></div>';
-                }});
-            }} else {{
-                console.error('Mermaid div not found');
-            }}
-        }});
-
-        function initControls() {{
-            const container = document.querySelector('.diagram-container');
-            const svg = document.querySelector('.diagram-container svg');
-
-            if (!svg) return;
-
-            // Mouse wheel to zoom
-            container.addEventListener('wheel', zoom);
-
-            // Initial fit
-            setTimeout(() => {{
-                fitView();
-            }}, 500);
-        }}
-
-        function zoom(e) {{
-            e.preventDefault();
-
-            const svg = document.querySelector('.diagram-container svg');
-            if (!svg) return;
-
-            const delta = e.deltaY > 0 ? 0.9 : 1.1;
-            scale = Math.min(Math.max(0.1, scale * delta), 5);
-
-            updateTransform();
-        }}
-
-        function panUp() {{
-            translateY += PAN_STEP;
-            updateTransform();
-        }}
-
-        function panDown() {{
-            translateY -= PAN_STEP;
-            updateTransform();
-        }}
-
-        function panLeft() {{
-            translateX += PAN_STEP;
-            updateTransform();
-        }}
-
-        function panRight() {{
-            translateX -= PAN_STEP;
-            updateTransform();
-        }}
-
-        function zoomIn() {{
-            scale = Math.min(scale * 1.2, 5);
-            updateTransform();
-        }}
-
-        function zoomOut() {{
-            scale = Math.max(scale * 0.8, 0.1);
-            updateTransform();
-        }}
-
-        function resetView() {{
-            scale = 1;
-            translateX = 0;
-            translateY = 0;
-            updateTransform();
-            // Center the diagram after reset
-            setTimeout(() => {{
-                fitView();
-            }}, 100);
-        }}
-
-        function fitView() {{
-            const container = document.querySelector('.diagram-container');
-            const svg = document.querySelector('.diagram-container svg');
-            if (!svg || !container) {{
-                console.log('SVG or container not found');
-                return;
-            }}
-
-            // Reset transform first to get accurate dimensions
-            svg.style.transform = '';
-            translateX = 0;
-            translateY = 0;
-            scale = 1;
-
-            // Use getBBox for accurate SVG content dimensions
-            setTimeout(() => {{
-                const bbox = svg.getBBox();
-                const containerRect = container.getBoundingClientRect();
-
-                console.log('SVG BBox:', bbox.width, bbox.height);
-                console.log('Container:', containerRect.width, containerRect.height);
-
-                // Calculate scale to fit with 10% padding
-                const scaleX = (containerRect.width * 0.9) / bbox.width;
-                const scaleY = (containerRect.height * 0.9) / bbox.height;
-                scale = Math.min(scaleX, scaleY);
-
-                console.log('Calculated scale:', scale);
-
-                // Center the diagram accounting for bbox offset
-                translateX = (containerRect.width - bbox.width * scale) / 2 - (bbox.x * scale);
-                translateY = (containerRect.height - bbox.height * scale) / 2 - (bbox.y * scale);
-
-                console.log('Translate:', translateX, translateY);
-
-                updateTransform();
-            }}, 200);
-        }}
-
-        function updateTransform() {{
-            const svg = document.querySelector('.diagram-container svg');
-            if (svg) {{
-                svg.style.transformOrigin = '0 0';
-                svg.style.transition = 'transform 0.2s ease-out';
-                svg.style.transform = `translate(${{translateX}}px, ${{translateY}}px) scale(${{scale}})`;
-            }}
-        }}
-
-        function toggleLegend() {{
-            const legend = document.querySelector('.legend');
-            const toggleBtn = document.getElementById('legendToggle');
-
-            if (legend.classList.contains('hidden')) {{
-                legend.classList.remove('hidden');
-                toggleBtn.classList.remove('show');
-            }} else {{
-                legend.classList.add('hidden');
-                toggleBtn.classList.add('show');
-            }}
-            
-            // Recenter diagram after legend toggle
-            setTimeout(() => {{
-                fitView();
-            }}, 350);  // Wait for legend animation to complete
-        }}
-    </script>
-</body>
-</html>
-"""
-
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_template)
+        write_page('application_diagram', html_path, 'Application Data Flow Diagram',
+                   fields={'app_code': app_code}, diagrams={'main': graph_content})
 
         logger.info(f"[OK] HTML diagram saved: {html_path}")
 
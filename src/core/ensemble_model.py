@@ -22,6 +22,8 @@ from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import json
 
+from .model_registry import ModelRegistry, get_model_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,7 +40,8 @@ class EnsembleNetworkModel:
     Automatically picks the best model or ensembles predictions
     """
 
-    def __init__(self, persistence_manager, use_deep_learning=False, device='cpu'):
+    def __init__(self, persistence_manager, use_deep_learning=False, device='cpu', model_registry=None,
+                 local_registry=None):
         """
         Initialize ensemble model
 
@@ -46,11 +49,22 @@ class EnsembleNetworkModel:
             persistence_manager: Database for storing results
             use_deep_learning: Enable deep learning models (requires PyTorch)
             device: 'cpu' or 'cuda'
+            model_registry: ModelRegistry or ModelWorkerClient for the deep
+                learning analyzers (default: shared local registry)
+            local_registry: ModelRegistry for training when model_registry is
+                a model worker, which only serves inference (default: shared
+                local registry)
         """
         self.pm = persistence_manager
         self.use_deep_learning = use_deep_learning
         self.device = device
 
+        self.model_registry = model_registry or get_model_registry(device=device)
+        if isinstance(self.model_registry, ModelRegistry):
+            self.local_registry = self.model_registry
+        else:
+            self.local_registry = local_registry or get_model_registry(device=device)
+
         # Available models
         self.models = {}
         self.model_scores = {}  # Track performance of each model
@@ -87,49 +101,40 @@ class EnsembleNetworkModel:
         except ImportError:
             logger.warning("  [WARNING] scikit-learn not available")
 
-        # Optional: Deep Learning models
+        # Optional: Deep Learning models (imported and constructed on first use)
         if self.use_deep_learning:
-            try:
-                from deep_learning.gat_model import GATApplicationAnalyzer
-
-                self.models['gat'] = {
-                    'analyzer': GATApplicationAnalyzer(device=self.device),
-                    'type': 'deep_learning',
-                    'trained': False
-                }
-
-                logger.info("  [OK] GAT model loaded")
-
-            except ImportError as e:
-                logger.warning(f"  [WARNING] GAT model not available: {e}")
-
-            try:
-                from deep_learning.transformer_model import TemporalTrafficAnalyzer
-
-                self.models['transformer'] = {
-                    'analyzer': TemporalTrafficAnalyzer(device=self.device),
-                    'type': 'deep_learning',
-                    'trained': False
-                }
-
-                logger.info("  [OK] Transformer model loaded")
-
-            except ImportError as e:
-                logger.warning(f"  [WARNING] Transformer model not available: {e}")
-
-            try:
-                from deep_learning.vae_model import ApplicationBehaviorAnalyzer
-
-                self.models['vae'] = {
-                    'analyzer': ApplicationBehaviorAnalyzer(device=self.device),
-                    'type': 'deep_learning',
-                    'trained': False
-                }
+            for model_name in ('gat', 'transformer', 'vae'):
+                if self.model_registry.available(model_name):
+                    self.models[model_name] = {
+                        'analyzer': None,  # Loaded by _get_analyzer()
+                        'type': 'deep_learning',
+                        'trained': False
+                    }
+                    logger.info(f"  [OK] {model_name} model registered (lazy)")
+                else:
+                    logger.warning(f"  [WARNING] {model_name} model not available (PyTorch missing?)")
+
+    def _get_analyzer(self, model_name: str):
+        """Deep learning analyzer for a registered model (loaded via the registry)"""
+        model_info = self.models[model_name]
+        if model_info['analyzer'] is None:
+            model_info['analyzer'] = self.model_registry.get(model_name, device=self.device)
+        return model_info['analyzer']
+
+    def _get_trainable_analyzer(self, model_name: str):
+        """
+        Local analyzer for training
 
-                logger.info("  [OK] VAE model loaded")
+        A model worker only serves inference methods, so training always runs
+        on a local instance, which then also serves this ensemble's predictions
+        (the worker's copy does not have the trained weights).
+        """
+        if self.local_registry is self.model_registry:
+            return self._get_analyzer(model_name)
 
-            except ImportError as e:
-                logger.warning(f"  [WARNING] VAE model not available: {e}")
+        analyzer = self.local_registry.get(model_name, device=self.device)
+        self.models[model_name]['analyzer'] = analyzer
+        return analyzer
 
     def predict_zone(self, app_features: np.ndarray, app_name: str) -> Dict:
         """
@@ -144,21 +149,35 @@ class EnsembleNetworkModel:
         Returns:
             Dictionary with zone prediction and confidence
         """
-        predictions = {}
+        return self.predict_zones(np.asarray(app_features)[np.newaxis, :], [app_name])[0]
+
+    def predict_zones(self, X: np.ndarray, names: List[str]) -> List[Dict]:
+        """
+        Predict security zones for many applications at once
+
+        Each model runs once on the whole matrix; predict_proba gives both
+        the label (argmax) and the confidence (max probability).
+
+        Args:
+            X: Feature matrix [n_apps, n_features]
+            names: Application names (same order as X)
+
+        Returns:
+            One prediction dict per application (same shape as predict_zone)
+        """
+        X = np.asarray(X)
+        model_names, labels, confidences = [], [], []
 
         # Run each model
         for model_name, model_info in self.models.items():
             try:
                 if model_info['type'] == 'classical' and model_info['trained']:
                     classifier = model_info['classifier']
-                    pred = classifier.predict([app_features])[0]
-                    prob = classifier.predict_proba([app_features])[0]
+                    prob = classifier.predict_proba(X)  # [n_apps, n_classes]
 
-                    predictions[model_name] = {
-                        'zone': self._zone_index_to_name(pred),
-                        'confidence': float(np.max(prob)),
-                        'probabilities': prob.tolist()
-                    }
+                    model_names.append(model_name)
+                    labels.append(classifier.classes_[np.argmax(prob, axis=1)])
+                    confidences.append(np.max(prob, axis=1))
 
                 elif model_info['type'] == 'deep_learning' and model_info['trained']:
                     # Deep learning model prediction
@@ -169,49 +188,71 @@ class EnsembleNetworkModel:
                 logger.debug(f"Model {model_name} prediction failed: {e}")
 
         # Ensemble predictions
-        if predictions:
-            ensemble_result = self._ensemble_predictions(predictions)
-        else:
-            # Fallback: heuristic-based prediction
-            ensemble_result = self._heuristic_prediction(app_name)
+        if model_names:
+            return self._ensemble_predictions(model_names, np.vstack(labels), np.vstack(confidences))
 
-        return ensemble_result
+        # Fallback: heuristic-based prediction
+        return [self._heuristic_prediction(name) for name in names]
 
-    def _ensemble_predictions(self, predictions: Dict) -> Dict:
+    def _ensemble_predictions(
+        self,
+        model_names: List[str],
+        labels: np.ndarray,
+        confidences: np.ndarray
+    ) -> List[Dict]:
         """
         Combine predictions from multiple models
 
         Uses weighted voting based on model performance
-        """
-        # Extract zone predictions
-        zone_votes = {}
-        weighted_confidence = {}
 
-        for model_name, pred in predictions.items():
-            zone = pred['zone']
-            confidence = pred['confidence']
-
-            # Weight based on model's historical performance
-            weight = self.model_scores.get(model_name, 1.0)
-
-            if zone not in zone_votes:
-                zone_votes[zone] = 0
-                weighted_confidence[zone] = []
-
-            zone_votes[zone] += weight
-            weighted_confidence[zone].append(confidence * weight)
-
-        # Pick zone with most votes
-        best_zone = max(zone_votes, key=zone_votes.get)
-        avg_confidence = np.mean(weighted_confidence[best_zone])
-
-        return {
-            'predicted_zone': best_zone,
-            'confidence': float(avg_confidence),
-            'num_models': len(predictions),
-            'model_votes': zone_votes,
-            'method': 'ensemble'
-        }
+        Args:
+            model_names: Models that produced predictions
+            labels: Zone indices per model [n_models, n_apps]
+            confidences: Confidence per model [n_models, n_apps]
+        """
+        num_models, num_apps = labels.shape
+
+        # Zone names -> dense codes (name lookup once per distinct label)
+        distinct_labels, label_codes = np.unique(labels, return_inverse=True)
+        zone_names, name_codes = np.unique(
+            [self._zone_index_to_name(label) for label in distinct_labels], return_inverse=True
+        )
+        zone_codes = name_codes[label_codes.reshape(num_models, num_apps)]
+
+        # Weight based on each model's historical performance
+        weights = np.array([self.model_scores.get(name, 1.0) for name in model_names], dtype=np.float64)
+
+        # Weighted votes per (app, zone)
+        votes = np.zeros((num_apps, len(zone_names)))
+        apps = np.arange(num_apps)
+        for m in range(num_models):
+            votes[apps, zone_codes[m]] += weights[m]
+
+        # Pick zone with most votes (ties -> zone of the first model that voted for it)
+        model_vote = votes[apps, zone_codes]  # [n_models, n_apps]
+        first_best = np.argmax(model_vote == votes.max(axis=1), axis=0)
+        best = zone_codes[first_best, apps]
+
+        # Mean weighted confidence of the models backing the winning zone
+        backing = zone_codes == best
+        weighted = confidences * weights[:, np.newaxis]
+        avg_confidence = (weighted * backing).sum(axis=0) / backing.sum(axis=0)
+
+        results = []
+        for i in range(num_apps):
+            model_votes = {}
+            for m in range(num_models):
+                model_votes[str(zone_names[zone_codes[m, i]])] = float(votes[i, zone_codes[m, i]])
+
+            results.append({
+                'predicted_zone': str(zone_names[best[i]]),
+                'confidence': float(avg_confidence[i]),
+                'num_models': num_models,
+                'model_votes': model_votes,
+                'method': 'ensemble'
+            })
+
+        return results
 
     def _heuristic_prediction(self, app_name: str) -> Dict:
         """
@@ -277,7 +318,7 @@ class EnsembleNetworkModel:
     def train_deep_learning_models(
         self,
         node_features: np.ndarray,
-        adjacency_matrix: np.ndarray,
+        adjacency_matrix,
         zone_labels: np.ndarray
     ):
         """
@@ -285,7 +326,8 @@ class EnsembleNetworkModel:
 
         Args:
             node_features: Feature matrix [n_nodes, n_features]
-            adjacency_matrix: Adjacency matrix [n_nodes, n_nodes]
+            adjacency_matrix: Adjacency [n_nodes, n_nodes] (numpy or scipy.sparse)
+                or edge index [2, num_edges]
             zone_labels: Zone labels [n_nodes]
         """
         if not self.use_deep_learning:
@@ -297,7 +339,7 @@ class EnsembleNetworkModel:
         # Train GAT
         if 'gat' in self.models:
             try:
-                gat_analyzer = self.models['gat']['analyzer']
+                gat_analyzer = self._get_trainable_analyzer('gat')
                 history = gat_analyzer.train_on_observed_data(
                     node_features,
                     adjacency_matrix,
@@ -9,6 +9,7 @@ Features:
 - Incremental model training (no need to retrain from scratch)
 - Continuous topology updates
 - Model reinforcement as more data arrives
+- Streaming VAE anomaly scoring of each newly ingested app
 - Progress tracking
 
 100% LOCAL - NO EXTERNAL APIs
@@ -22,16 +23,17 @@ import time
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 import pandas as pd
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, deque
 
 # Import new DNS validation components
 from src.utils.hostname_resolver import HostnameResolver
 from src.utils.cross_reference_manager import CrossReferenceManager
 from src.utils.dns_cache_manager import DNSCacheManager
 from src.utils.retroactive_updater import RetroactiveUpdater
+from src.feature_store import FeatureStore
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +58,8 @@ class IncrementalLearningSystem:
         topology_system,
         watch_dir: str = './data/input',
         checkpoint_dir: str = './models/incremental',
-        only_json: bool = False
+        only_json: bool = False,
+        behavior_analyzer=None
     ):
         """
         Initialize incremental learning system
@@ -69,6 +72,8 @@ class IncrementalLearningSystem:
             watch_dir: Directory to watch for new files
             checkpoint_dir: Directory for checkpoints
             only_json: If True, save enriched flows to JSON only (skip PostgreSQL)
+            behavior_analyzer: ApplicationBehaviorAnalyzer for streaming anomaly scoring
+                               (default: the topology system's VAE analyzer, if any)
         """
         self.pm = persistence_manager
         self.ensemble = ensemble_model
@@ -98,6 +103,8 @@ class IncrementalLearningSystem:
             'model_updates': 0,
             'duplicates_skipped': 0,
             'errors_encountered': 0,
+            'apps_scored': 0,
+            'anomalies_detected': 0,
             'last_update': None,
             'start_time': datetime.now().isoformat()
         }
@@ -106,6 +113,18 @@ class IncrementalLearningSystem:
         self.current_apps_observed = set()
         self.current_topology = {}
 
+        # Flow graph maintained incrementally (GraphAnalyzer.apply_delta),
+        # exposure rescored for the neighborhood each delta touches
+        self.flow_graph = None
+        self.threat_surface = None
+
+        # Streaming behavior anomaly scoring (sketch state survives restarts)
+        self.behavior_analyzer = behavior_analyzer or getattr(topology_system, 'vae_analyzer', None)
+        self.anomaly_log = self.checkpoint_dir / 'anomalies.jsonl'
+        self.anomaly_sketch_file = self.checkpoint_dir / 'anomaly_sketch.json'
+        self.recent_anomalies = deque(maxlen=100)
+        self._load_anomaly_sketch()
+
         # NEW: DNS validation and cross-reference components
         self.hostname_resolver = HostnameResolver(
             demo_mode=False,
@@ -236,9 +255,15 @@ class IncrementalLearningSystem:
             # Incremental model update
             self._incremental_model_update(app_id, flow_records)
 
+            # Score the new app's behavior against everything seen so far
+            anomalies = self._score_behavior(app_id, flow_records)
+
             # Update topology
             self._update_topology(app_id, flow_records)
 
+            # Merge flows into the incremental flow graph
+            self._update_flow_graph(app_id, flow_records)
+
             # Calculate processing time
             process_time = time.time() - start_time
 
@@ -262,6 +287,7 @@ class IncrementalLearningSystem:
                 'process_time': process_time,
                 'status': 'success',
                 'new_location': str(new_path),
+                'anomalies': anomalies,
                 'timestamp': datetime.now().isoformat()
             }
 
@@ -552,6 +578,61 @@ class IncrementalLearningSystem:
             logger.info(f"  [SAVE] Saving model checkpoint (update #{self.stats['model_updates']})")
             self.ensemble.save_all_models()
 
+    def _score_behavior(self, app_id: str, flow_records: List) -> List[Dict]:
+        """
+        Streaming VAE anomaly score for one newly ingested app
+
+        Only this app's behavior vector is built and encoded; its
+        reconstruction error is compared with the running error quantile
+        (see ApplicationBehaviorAnalyzer.score_incremental).
+        """
+        analyzer = self.behavior_analyzer
+        if analyzer is None or getattr(analyzer, 'model', None) is None or not flow_records:
+            return []
+
+        behavior = FeatureStore(flow_records, cache_dir=None).app_features([app_id])
+        if behavior.shape[1] != analyzer.model.input_dim:
+            logger.debug(f"  Skipping anomaly scoring: {behavior.shape[1]} features, "
+                         f"VAE expects {analyzer.model.input_dim}")
+            return []
+
+        anomalies = analyzer.score_incremental(behavior, [app_id])
+        self.stats['apps_scored'] += 1
+
+        if anomalies:
+            self.stats['anomalies_detected'] += len(anomalies)
+            with open(self.anomaly_log, 'a', encoding='utf-8') as f:
+                for anomaly in anomalies:
+                    anomaly['timestamp'] = datetime.now().isoformat()
+                    self.recent_anomalies.append(anomaly)
+                    f.write(json.dumps(anomaly) + '\n')
+                    logger.warning(f"  [ANOMALY] {app_id}: reconstruction error {anomaly['reconstruction_error']:.4f} "
+                                   f"> p{analyzer.error_sketch.q * 100:g} {anomaly['threshold']:.4f} "
+                                   f"({anomaly['severity']})")
+
+        self._save_anomaly_sketch()
+        return anomalies
+
+    def _load_anomaly_sketch(self):
+        """Restore the streaming error quantile from a previous run"""
+        if self.behavior_analyzer is None or not self.anomaly_sketch_file.exists():
+            return
+        try:
+            from src.deep_learning.vae_model import P2Quantile
+        except ImportError:
+            from deep_learning.vae_model import P2Quantile
+        try:
+            with open(self.anomaly_sketch_file, 'r') as f:
+                self.behavior_analyzer.error_sketch = P2Quantile.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"  Ignoring unreadable anomaly sketch {self.anomaly_sketch_file}: {e}")
+
+    def _save_anomaly_sketch(self):
+        sketch = getattr(self.behavior_analyzer, 'error_sketch', None)
+        if sketch is not None:
+            with open(self.anomaly_sketch_file, 'w') as f:
+                json.dump(sketch.to_dict(), f)
+
     def _extract_features(self, flow_records: List) -> Dict:
         """Extract features from flow records"""
         features = {
@@ -740,6 +821,32 @@ class IncrementalLearningSystem:
         except Exception as e:
             logger.error(f"    [WARN] Failed to generate diagram: {e}")
 
+    def _update_flow_graph(self, app_id: str, flow_records: List):
+        """
+        Apply new flows to the in-memory flow graph without rebuilding it
+
+        Exposure scores (self.threat_surface.exposure_scores) are refreshed
+        only for the 1-hop neighborhood of the nodes the delta touched.
+        """
+        try:
+            from src.graph_analyzer import GraphAnalyzer
+            from src.threat_surface_analyzer import ThreatSurfaceAnalyzer
+
+            if self.flow_graph is None:
+                self.flow_graph = GraphAnalyzer(list(flow_records))
+                self.threat_surface = ThreatSurfaceAnalyzer(self.flow_graph)
+                changed_nodes = set(self.flow_graph.graph.nodes())
+            else:
+                changed_nodes = self.flow_graph.apply_delta(flow_records)['changed_nodes']
+
+            self.threat_surface.refresh_exposure(self.flow_graph.affected_neighborhood(changed_nodes))
+            self.flow_graph.clear_changes()
+
+            logger.info(f"    [OK] Flow graph updated for {app_id}: "
+                       f"{len(changed_nodes)} nodes touched")
+        except Exception as e:
+            logger.warning(f"    [WARN] Failed to update flow graph: {e}")
+
     def run_incremental_batch(self, max_files: int = None) -> Dict:
         """
         Process a batch of new files
@@ -783,6 +890,7 @@ class IncrementalLearningSystem:
 
         # Count duplicates from results
         duplicates = sum(1 for r in results if r.get('status') == 'duplicate')
+        anomalies = [a for r in results for a in r.get('anomalies', [])]
 
         # Summary
         logger.info("\n" + "=" * 80)
@@ -794,6 +902,7 @@ class IncrementalLearningSystem:
         logger.info(f"  Failed: {failed}")
         logger.info(f"  Total apps observed: {len(self.current_apps_observed)}")
         logger.info(f"  Model updates: {self.stats['model_updates']}")
+        logger.info(f"  Behavior anomalies: {len(anomalies)}")
         logger.info("=" * 80 + "\n")
 
         return {
@@ -802,6 +911,7 @@ class IncrementalLearningSystem:
             'successful': successful,
             'failed': failed,
             'results': results,
+            'anomalies': anomalies,
             'stats': self.stats
         }
 
@@ -1076,14 +1186,17 @@ class ContinuousLearner:
     Monitors directory and processes files as they arrive
     """
 
-    def __init__(self, incremental_learner: IncrementalLearningSystem, check_interval: int = 30):
+    def __init__(self, incremental_learner: IncrementalLearningSystem, check_interval: int = 30,
+                 on_anomaly: Optional[Callable[[Dict], None]] = None):
         """
         Args:
             incremental_learner: Incremental learning system
             check_interval: How often to check for new files (seconds)
+            on_anomaly: Called with each behavior anomaly as files are processed
         """
         self.learner = incremental_learner
         self.check_interval = check_interval
+        self.on_anomaly = on_anomaly
         self.running = False
 
         logger.info(f"[OK] Continuous Learner initialized (check every {check_interval}s)")
@@ -1113,6 +1226,7 @@ class ContinuousLearner:
                     logger.info(f"  No new files. Waiting {self.check_interval}s...")
                 else:
                     logger.info(f"  Processed {result['successful']} new files")
+                    self._emit_anomalies(result.get('anomalies', []))
 
                 # Wait before next check
                 time.sleep(self.check_interval)
@@ -1121,6 +1235,14 @@ class ContinuousLearner:
             logger.info("\n[WARNING] Continuous learning stopped by user")
             self.stop()
 
+    def _emit_anomalies(self, anomalies: List[Dict]):
+        """Report behavior anomalies found in the last batch"""
+        if anomalies:
+            logger.warning(f"  {len(anomalies)} behavior anomalies (log: {self.learner.anomaly_log})")
+        if self.on_anomaly is not None:
+            for anomaly in anomalies:
+                self.on_anomaly(anomaly)
+
     def stop(self):
         """Stop continuous learning"""
         self.running = False
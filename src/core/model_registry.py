@@ -0,0 +1,491 @@
+# -*- coding: utf-8 -*-
+"""
+Model Registry
+==============
+Lazy loading and caching of the deep learning analyzers (GAT, Transformer, VAE)
+
+- Each backend module (and therefore torch) is imported on first use, so
+  classical-only runs never pay for `import torch`
+- Pre-trained checkpoints are memory-mapped by the analyzers
+  (torch.load(mmap=True)); weights are paged in on demand and shared
+  through the OS page cache
+- ModelWorker keeps warm models in a long-lived process; CLI tools and the
+  web apps reach it through ModelWorkerClient, which exposes the same
+  get()/metrics() interface as ModelRegistry
+- Worker connections are authenticated with a per-install secret (a key
+  file generated with mode 0600 on first start, or an explicit env var);
+  clients may only call whitelisted inference methods
+- Import and construction times are recorded per model and can be
+  published as JSON
+
+Usage:
+    registry = get_model_registry()             # Local, lazy
+    gat = registry.get('gat')                   # Imports + constructs now
+
+    python src/core/model_registry.py --serve --preload gat vae
+    registry = get_model_registry(worker_address='127.0.0.1:6200')
+
+Environment:
+    NETSEG_MODEL_WORKER_ADDRESS   host:port of the worker (default 127.0.0.1:6200)
+    NETSEG_MODEL_WORKER_AUTHKEY   Shared secret (overrides the key file)
+    NETSEG_MODEL_WORKER_KEYFILE   Key file (default ~/.netseg/model_worker.key)
+
+100% LOCAL - NO EXTERNAL APIs
+
+Author: Enterprise Security Team
+Version: 1.0
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from datetime import datetime
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# name -> (module, class); modules are resolved with or without the 'src.' prefix
+MODEL_BACKENDS = {
+    'gat': ('deep_learning.gat_model', 'GATApplicationAnalyzer'),
+    'transformer': ('deep_learning.transformer_model', 'TemporalTrafficAnalyzer'),
+    'vae': ('deep_learning.vae_model', 'ApplicationBehaviorAnalyzer'),
+}
+
+DEFAULT_WORKER_ADDRESS = os.environ.get('NETSEG_MODEL_WORKER_ADDRESS', '127.0.0.1:6200')
+DEFAULT_KEY_FILE = os.environ.get('NETSEG_MODEL_WORKER_KEYFILE',
+                                  str(Path.home() / '.netseg' / 'model_worker.key'))
+
+# Analyzer methods clients may call on a worker: inference only (no training,
+# checkpoint loading/saving or export)
+ALLOWED_METHODS = frozenset({
+    'predict', 'predict_proba', 'predict_zones',
+    'analyze_topology',                                     # GAT
+    'predict_future_patterns', 'detect_topology_changes',   # Transformer
+    'analyze_temporal_patterns',
+    'detect_anomalies', 'score_incremental',                # VAE
+    'encode_behaviors', 'cluster_applications', 'get_behavior_fingerprint',
+})
+
+
+def load_authkey(key_file: Optional[str] = None, create: bool = False) -> bytes:
+    """
+    Per-install model worker secret
+
+    NETSEG_MODEL_WORKER_AUTHKEY wins when set; otherwise the key file is
+    read (it must not be accessible to other users). There is no built-in
+    default key.
+
+    Args:
+        key_file: Key file path (default: DEFAULT_KEY_FILE)
+        create: Generate the key file (mode 0600) if it does not exist
+
+    Returns:
+        Secret bytes
+    """
+    env_key = os.environ.get('NETSEG_MODEL_WORKER_AUTHKEY')
+    if env_key:
+        return env_key.encode()
+
+    path = Path(key_file or DEFAULT_KEY_FILE)
+    if not path.exists():
+        if not create:
+            raise FileNotFoundError(f"Model worker key not found: {path} (start the worker once "
+                                    f"to generate it, or set NETSEG_MODEL_WORKER_AUTHKEY)")
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass  # Created concurrently - read it below
+        else:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(secrets.token_hex(32))
+            logger.info(f"Generated model worker key: {path}")
+
+    if os.name == 'posix' and path.stat().st_mode & 0o077:
+        raise PermissionError(f"Model worker key {path} is accessible to other users (chmod 600 it)")
+
+    key = path.read_bytes().strip()
+    if not key:
+        raise PermissionError(f"Model worker key {path} is empty")
+    return key
+
+
+def parse_address(address: Union[str, Tuple[str, int]]) -> Tuple[str, int]:
+    """'host:port' -> (host, port)"""
+    if isinstance(address, tuple):
+        return address
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def _find_module(module: str) -> Optional[str]:
+    """Importable module name for a backend ('deep_learning.x' or 'src.deep_learning.x')"""
+    for candidate in (module, f'src.{module}'):
+        try:
+            if importlib.util.find_spec(candidate) is not None:
+                return candidate
+        except ImportError:
+            continue
+    return None
+
+
+class ModelRegistry:
+    """
+    Lazily constructed, cached model analyzers
+
+    get() is thread-safe; each (name, kwargs) combination is built once.
+    """
+
+    def __init__(self, device: str = 'cpu', metrics_path: Optional[str] = None):
+        """
+        Args:
+            device: Default device passed to analyzers
+            metrics_path: Write load metrics JSON here after every load (optional)
+        """
+        self.device = device
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self.backends = dict(MODEL_BACKENDS)
+        self._instances = {}
+        self._metrics = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, module: str, class_name: str):
+        """Add (or replace) a backend"""
+        self.backends[name] = (module, class_name)
+
+    def available(self, name: str) -> bool:
+        """Whether a backend and torch can be imported (without importing them)"""
+        if name not in self.backends:
+            return False
+        return importlib.util.find_spec('torch') is not None and \
+            _find_module(self.backends[name][0]) is not None
+
+    def is_loaded(self, name: str) -> bool:
+        return any(key[0] == name for key in self._instances)
+
+    def get(self, name: str, **kwargs):
+        """
+        Analyzer instance for a backend (imported and constructed on first use)
+
+        Args:
+            name: Backend name ('gat', 'transformer', 'vae', ...)
+            **kwargs: Constructor arguments (e.g. model_path); device defaults
+                to the registry device
+
+        Returns:
+            Analyzer instance
+        """
+        if name not in self.backends:
+            raise KeyError(f"Unknown model '{name}' (known: {sorted(self.backends)})")
+
+        kwargs.setdefault('device', self.device)
+        key = (name, tuple(sorted(kwargs.items())))
+
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                instance = self._load(name, kwargs)
+                self._instances[key] = instance
+            self._metrics[name]['requests'] += 1
+
+        return instance
+
+    def unload(self, name: str):
+        """Drop cached instances of a backend"""
+        with self._lock:
+            for key in [key for key in self._instances if key[0] == name]:
+                del self._instances[key]
+
+    def metrics(self) -> Dict:
+        """Load metrics per model"""
+        return {name: dict(values) for name, values in self._metrics.items()}
+
+    def publish_metrics(self, path: Optional[str] = None) -> Dict:
+        """Write load metrics to JSON (path or metrics_path) and return them"""
+        metrics = self.metrics()
+        target = Path(path) if path else self.metrics_path
+        if target:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, 'w', encoding='utf-8') as f:
+                json.dump({'generated_at': datetime.now().isoformat(), 'models': metrics}, f, indent=2)
+        return metrics
+
+    def _load(self, name: str, kwargs: Dict):
+        """Import the backend module and construct the analyzer, timing both"""
+        module_name, class_name = self.backends[name]
+        resolved = _find_module(module_name)
+        if resolved is None:
+            raise ImportError(f"Model backend module not found: {module_name}")
+
+        start = time.perf_counter()
+        module = importlib.import_module(resolved)
+        imported = time.perf_counter()
+        instance = getattr(module, class_name)(**kwargs)
+        constructed = time.perf_counter()
+
+        previous = self._metrics.get(name, {})
+        self._metrics[name] = {
+            'import_seconds': round(imported - start, 4),
+            'construct_seconds': round(constructed - imported, 4),
+            'load_seconds': round(constructed - start, 4),
+            'loaded_at': datetime.now().isoformat(),
+            'loads': previous.get('loads', 0) + 1,
+            'requests': previous.get('requests', 0),
+        }
+
+        logger.info(f"  [OK] {name} model loaded in {constructed - start:.2f}s "
+                   f"(import {imported - start:.2f}s, construct {constructed - imported:.2f}s)")
+
+        if self.metrics_path:
+            self.publish_metrics()
+
+        return instance
+
+
+class ModelWorker:
+    """
+    Long-lived process serving warm models over multiprocessing.connection
+
+    Requests are tuples:
+        ('call', model, kwargs, method, args, method_kwargs) -> method result
+        ('metrics',) -> registry metrics
+        ('ping',) -> 'pong'
+        ('shutdown',) -> stops the worker
+
+    Only clients holding the authkey can connect (requests are unpickled),
+    and 'call' is limited to allowed_methods.
+    """
+
+    def __init__(self, address: Union[str, Tuple[str, int]] = DEFAULT_WORKER_ADDRESS,
+                 authkey: Optional[bytes] = None, registry: Optional[ModelRegistry] = None,
+                 preload: Iterable[str] = (), allowed_methods: Iterable[str] = ALLOWED_METHODS):
+        """
+        Args:
+            address: 'host:port' to listen on (keep it on localhost)
+            authkey: Shared secret for clients (default: load_authkey(create=True))
+            registry: Registry to serve (default: new local registry)
+            preload: Models to load before accepting requests
+            allowed_methods: Analyzer methods clients may call
+        """
+        self.address = parse_address(address)
+        self.authkey = authkey or load_authkey(create=True)
+        self.registry = registry or ModelRegistry()
+        self.preload = list(preload)
+        self.allowed_methods = frozenset(allowed_methods)
+        self._stopped = threading.Event()
+
+    def serve_forever(self):
+        """Load preloaded models, then handle clients until shutdown"""
+        for name in self.preload:
+            self.registry.get(name)
+
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logger.info(f"Model worker listening on {self.address[0]}:{self.address[1]}")
+            while not self._stopped.is_set():
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    logger.warning(f"Model worker rejected connection: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+        logger.info("Model worker stopped")
+
+    def _serve_connection(self, conn):
+        """Answer requests on one client connection until it closes"""
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    conn.send(('ok', self._handle(request)))
+                except Exception as e:
+                    conn.send(('error', f"{type(e).__name__}: {e}"))
+
+                if request[0] == 'shutdown':
+                    self._stopped.set()
+                    # Wake the blocking accept() so serve_forever can exit
+                    try:
+                        Client(self.address, authkey=self.authkey).close()
+                    except OSError:
+                        pass
+                    return
+
+    def _handle(self, request: Tuple):
+        kind = request[0]
+        if kind == 'call':
+            _, name, model_kwargs, method, args, method_kwargs = request
+            if method not in self.allowed_methods:
+                raise PermissionError(f"Method not allowed: {method}")
+            return getattr(self.registry.get(name, **model_kwargs), method)(*args, **method_kwargs)
+        if kind == 'metrics':
+            return self.registry.metrics()
+        if kind in ('ping', 'shutdown'):
+            return 'pong'
+        raise ValueError(f"Unknown request: {kind}")
+
+
+class RemoteModel:
+    """Proxy for an analyzer held by a ModelWorker (method calls only)"""
+
+    def __init__(self, client: 'ModelWorkerClient', name: str, model_kwargs: Dict):
+        self._client = client
+        self._name = name
+        self._model_kwargs = model_kwargs
+
+    def __getattr__(self, method: str):
+        if method.startswith('_'):
+            raise AttributeError(method)
+
+        def call(*args, **kwargs):
+            return self._client.call(self._name, method, *args, model_kwargs=self._model_kwargs, **kwargs)
+
+        return call
+
+
+class ModelWorkerClient:
+    """
+    Client for a ModelWorker
+
+    get() returns RemoteModel proxies, so callers can use it in place of a
+    local ModelRegistry. The connection is reused and re-opened on failure.
+    """
+
+    def __init__(self, address: Union[str, Tuple[str, int]] = DEFAULT_WORKER_ADDRESS,
+                 authkey: Optional[bytes] = None):
+        """
+        Args:
+            address: Worker 'host:port'
+            authkey: Shared secret (default: load_authkey() on first connect)
+        """
+        self.address = parse_address(address)
+        self.authkey = authkey
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get(self, name: str, **kwargs) -> RemoteModel:
+        return RemoteModel(self, name, kwargs)
+
+    def available(self, name: str) -> bool:
+        return self.ping()
+
+    def call(self, name: str, method: str, *args, model_kwargs: Optional[Dict] = None, **kwargs):
+        """Call method on the worker's instance of model name"""
+        return self._request(('call', name, model_kwargs or {}, method, args, kwargs))
+
+    def metrics(self) -> Dict:
+        return self._request(('metrics',))
+
+    def ping(self) -> bool:
+        try:
+            return self._request(('ping',)) == 'pong'
+        except AuthenticationError:
+            logger.warning(f"Model worker at {self.address[0]}:{self.address[1]} rejected our key")
+            return False
+        except (OSError, EOFError):
+            return False
+
+    def shutdown(self):
+        self._request(('shutdown',))
+        self.close()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _request(self, request: Tuple):
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._conn is None:
+                        if self.authkey is None:
+                            self.authkey = load_authkey()
+                        self._conn = Client(self.address, authkey=self.authkey)
+                    self._conn.send(request)
+                    status, payload = self._conn.recv()
+                    break
+                except (OSError, EOFError):
+                    self.close()
+                    if attempt:
+                        raise
+
+        if status == 'error':
+            raise RuntimeError(f"Model worker error: {payload}")
+        return payload
+
+
+_default_registry = None
+
+
+def get_model_registry(device: str = 'cpu', worker_address: Optional[str] = None):
+    """
+    Shared model registry for this process
+
+    Args:
+        device: Device for locally loaded models
+        worker_address: ModelWorker 'host:port'; used when reachable,
+            otherwise models are loaded locally
+
+    Returns:
+        ModelWorkerClient or ModelRegistry (same get()/metrics() interface)
+    """
+    global _default_registry
+
+    if worker_address:
+        client = ModelWorkerClient(worker_address)
+        if client.ping():
+            logger.info(f"Using model worker at {worker_address}")
+            return client
+        logger.warning(f"Model worker at {worker_address} not reachable - loading models locally")
+
+    if _default_registry is None:
+        _default_registry = ModelRegistry(device=device)
+    return _default_registry
+
+
+def main():
+    """Run a model worker: python src/core/model_registry.py --serve"""
+    import sys
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    parser = argparse.ArgumentParser(description='Warm model worker for the deep learning analyzers')
+    parser.add_argument('--serve', action='store_true', help='Start the worker (blocks)')
+    parser.add_argument('--address', default=DEFAULT_WORKER_ADDRESS, help='host:port to listen on')
+    parser.add_argument('--device', default='cpu', help="'cpu' or 'cuda'")
+    parser.add_argument('--preload', nargs='*', default=list(MODEL_BACKENDS),
+                        help='Models to load at startup')
+    parser.add_argument('--metrics', default='./outputs/model_metrics.json',
+                        help='Load metrics JSON path')
+    parser.add_argument('--stop', action='store_true', help='Stop a running worker')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.stop:
+        ModelWorkerClient(args.address).shutdown()
+        return 0
+
+    if args.serve:
+        registry = ModelRegistry(device=args.device, metrics_path=args.metrics)
+        ModelWorker(args.address, registry=registry, preload=args.preload).serve_forever()
+        return 0
+
+    parser.print_help()
+    return 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
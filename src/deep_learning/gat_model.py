@@ -34,6 +34,147 @@ except ImportError:
     TORCH_AVAILABLE = False
     logger.warning("PyTorch not available. Install with: pip install torch")
 
+from .inference import export_model, inference_copy
+
+
+def to_edge_index(adj) -> 'torch.Tensor':
+    """
+    Convert an adjacency input to an edge index
+
+    Accepts a dense adjacency (numpy or torch), a scipy.sparse matrix, a torch
+    sparse tensor, or an existing edge index (torch.long tensor of shape [2, num_edges]).
+
+    Returns:
+        edge_index: LongTensor [2, num_edges]; row 0 = aggregating node i,
+        row 1 = neighbor j, for every adj[i, j] != 0
+    """
+    if TORCH_AVAILABLE and isinstance(adj, torch.Tensor):
+        if adj.is_sparse:
+            return adj.coalesce().indices()
+        if adj.dtype == torch.long and adj.dim() == 2 and adj.size(0) == 2:
+            return adj
+        return adj.nonzero().t()
+
+    if hasattr(adj, 'tocoo'):  # scipy.sparse
+        coo = adj.tocoo()
+        mask = coo.data != 0
+        return torch.from_numpy(np.vstack([coo.row[mask], coo.col[mask]]).astype(np.int64))
+
+    rows, cols = np.nonzero(np.asarray(adj))
+    return torch.from_numpy(np.vstack([rows, cols]).astype(np.int64))
+
+
+def _edge_softmax(scores: 'torch.Tensor', row: 'torch.Tensor', num_nodes: int) -> 'torch.Tensor':
+    """Softmax of edge scores [num_edges, num_heads] over the edges sharing a row"""
+    index = row.unsqueeze(-1).expand_as(scores)
+    with torch.no_grad():
+        row_max = scores.new_full((num_nodes, scores.size(1)), float('-inf'))
+        row_max = row_max.scatter_reduce(0, index, scores, reduce='amax')
+
+    exp_scores = (scores - row_max[row]).exp()
+    denom = scores.new_zeros(num_nodes, scores.size(1)).index_add_(0, row, exp_scores)
+    return exp_scores / denom[row]
+
+
+class NeighborSampler:
+    """
+    Fixed-fanout neighbor sampler for mini-batch GAT training/inference
+
+    For a batch of target nodes, keeps up to fanouts[k] neighbors per node at
+    hop k (all of them when the node has fewer). Sampled nodes are ordered by
+    hop, so layer l only has to produce outputs for the node prefix that
+    layer l + 1 reads. Memory depends on batch size and fanouts rather than
+    on graph size.
+    """
+
+    def __init__(self, edge_index, num_nodes: int, fanouts: Tuple[int, ...] = (10, 5, 5),
+                 seed: Optional[int] = None):
+        """
+        Args:
+            edge_index: Edge index [2, num_edges] (see to_edge_index)
+            num_nodes: Number of nodes in the full graph
+            fanouts: Neighbors kept per node, one entry per GAT layer (targets first)
+            seed: Random seed (fixed seed = reproducible samples)
+        """
+        edge_index = to_edge_index(edge_index).cpu().numpy()
+        row, col = edge_index[0], edge_index[1]
+
+        # CSR layout: neighbors of node i are col[rowptr[i]:rowptr[i + 1]]
+        order = np.argsort(row, kind='stable')
+        self.col = col[order]
+        self.rowptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row, minlength=num_nodes), out=self.rowptr[1:])
+
+        self.num_nodes = num_nodes
+        self.fanouts = tuple(fanouts)
+        self.rng = np.random.default_rng(seed)
+
+    def _sample_hop(self, frontier: np.ndarray, fanout: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Sample up to fanout neighbors per frontier node -> unique (rows, cols)"""
+        start = self.rowptr[frontier]
+        degree = self.rowptr[frontier + 1] - start
+        take = np.minimum(degree, fanout)
+        total = int(take.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        slot = np.arange(total) - np.repeat(np.cumsum(take) - take, take)
+        slot_degree = np.repeat(degree, take)
+        sampled = (self.rng.random(total) * slot_degree).astype(np.int64)
+        offset = np.where(slot_degree <= fanout, slot, sampled)
+
+        rows = np.repeat(frontier, take)
+        cols = self.col[np.repeat(start, take) + offset]
+
+        # Sampling with replacement can repeat an edge - keep each once
+        keys = np.unique(rows * self.num_nodes + cols)
+        return keys // self.num_nodes, keys % self.num_nodes
+
+    def sample(self, batch: np.ndarray) -> Tuple[np.ndarray, List[Tuple['torch.Tensor', int]]]:
+        """
+        Sample the computation graph of a batch of target nodes
+
+        Args:
+            batch: Global ids of target nodes (unique)
+
+        Returns:
+            n_id: Global ids of sampled nodes, targets first, then ordered by hop
+            blocks: One (edge_index, num_rows) per GAT layer, first layer first.
+                    edge_index is in local ids; the layer produces outputs for
+                    local nodes [0, num_rows)
+        """
+        batch = np.asarray(batch, dtype=np.int64)
+        hop_nodes = [batch]
+        hop_edges = []
+        seen = np.unique(batch)
+        frontier = batch
+
+        for fanout in self.fanouts:
+            rows, cols = self._sample_hop(frontier, fanout)
+            hop_edges.append((rows, cols))
+            frontier = np.setdiff1d(cols, seen)
+            seen = np.union1d(seen, frontier)
+            hop_nodes.append(frontier)
+
+        n_id = np.concatenate(hop_nodes)
+        order = np.argsort(n_id)
+
+        def local(ids: np.ndarray) -> np.ndarray:
+            return order[np.searchsorted(n_id, ids, sorter=order)]
+
+        # Layer l aggregates into nodes within (num_layers - l) hops of the targets
+        num_layers = len(self.fanouts)
+        hop_end = np.cumsum([len(nodes) for nodes in hop_nodes])
+        blocks = []
+        for layer in range(num_layers):
+            depth = num_layers - layer
+            rows = np.concatenate([hop_edges[h][0] for h in range(depth)])
+            cols = np.concatenate([hop_edges[h][1] for h in range(depth)])
+            edge_index = torch.from_numpy(np.vstack([local(rows), local(cols)]).astype(np.int64))
+            blocks.append((edge_index, int(hop_end[depth - 1])))
+
+        return n_id, blocks
+
 
 class GraphAttentionLayer(nn.Module if TORCH_AVAILABLE else object):
     """
@@ -75,47 +216,55 @@ class GraphAttentionLayer(nn.Module if TORCH_AVAILABLE else object):
         self.leaky_relu = nn.LeakyReLU(0.2)
         self.dropout_layer = nn.Dropout(dropout)
 
-    def forward(self, x: torch.Tensor, adj: torch.Tensor) -> torch.Tensor:
+    def forward(self, x: torch.Tensor, adj, size: Optional[int] = None) -> torch.Tensor:
         """
         Forward pass through GAT layer
 
+        Attention is scored only on existing edges (edge list + scatter
+        softmax), so memory is O(num_edges * num_heads + num_nodes * out_features)
+        instead of O(num_nodes^2 * out_features).
+
         Args:
             x: Node features [num_nodes, in_features]
-            adj: Adjacency matrix [num_nodes, num_nodes]
+            adj: Adjacency [num_nodes, num_nodes] (dense or sparse) or edge index [2, num_edges]
+            size: Only compute outputs for nodes [0, size) (mini-batch blocks; default all)
 
         Returns:
-            Updated node features [num_nodes, out_features * num_heads]
+            Updated node features [size or num_nodes, out_features * num_heads]
         """
         num_nodes = x.size(0)
+        num_targets = num_nodes if size is None else size
+        edge_index = to_edge_index(adj).to(x.device)
+        row, col = edge_index[0], edge_index[1]
+
+        # All heads in one projection: [num_nodes, num_heads, out_features]
+        weight = torch.stack([w.weight for w in self.W])  # [num_heads, out_features, in_features]
+        h = (x @ weight.view(-1, self.in_features).t()).view(num_nodes, self.num_heads, self.out_features)
+
+        # attention([h_i, h_j]) = a_i . W x_i + a_j . W x_j, folded into per-head input projections
+        attention = torch.cat([a.weight for a in self.attention], dim=0)  # [num_heads, 2 * out_features]
+        proj_i = torch.einsum('hf,hfi->ih', attention[:, :self.out_features], weight)
+        proj_j = torch.einsum('hf,hfi->ih', attention[:, self.out_features:], weight)
+        score_i = x[:num_targets] @ proj_i  # [num_targets, num_heads]
+        score_j = x @ proj_j  # [num_nodes, num_heads]
+
+        # Attention scores per edge, normalized over each node's neighbors
+        e = self.leaky_relu(score_i[row] + score_j[col])  # [num_edges, num_heads]
+        alpha = _edge_softmax(e, row, num_targets)
+        alpha = self.dropout_layer(alpha)
+
+        # Weighted aggregation as sparse [targets, N] @ dense [N, F] per head
+        # (nodes without neighbors get zeros). Traces use the equivalent
+        # index_add form, since sparse tensors are frozen into a trace as constants.
         outputs = []
-
         for head_idx in range(self.num_heads):
-            # Linear transformation
-            h = self.W[head_idx](x)  # [num_nodes, out_features]
-
-            # Compute attention coefficients
-            # Repeat h for all pairs (i, j)
-            h_i = h.repeat(1, num_nodes).view(num_nodes * num_nodes, self.out_features)
-            h_j = h.repeat(num_nodes, 1)
-
-            # Concatenate h_i and h_j
-            concat_h = torch.cat([h_i, h_j], dim=1)  # [num_nodes * num_nodes, 2 * out_features]
-
-            # Attention scores
-            e = self.leaky_relu(self.attention[head_idx](concat_h))  # [num_nodes * num_nodes, 1]
-            e = e.view(num_nodes, num_nodes)  # [num_nodes, num_nodes]
-
-            # Mask attention scores with adjacency matrix
-            e = e.masked_fill(adj == 0, float('-inf'))
-
-            # Softmax to get attention weights
-            alpha = F.softmax(e, dim=1)  # [num_nodes, num_nodes]
-            alpha = self.dropout_layer(alpha)
-
-            # Weighted aggregation
-            h_prime = torch.matmul(alpha, h)  # [num_nodes, out_features]
-
-            outputs.append(h_prime)
+            if torch.jit.is_tracing():
+                messages = alpha[:, head_idx:head_idx + 1] * h[col, head_idx]
+                outputs.append(h.new_zeros(num_targets, self.out_features).index_add_(0, row, messages))
+                continue
+            alpha_head = torch.sparse_coo_tensor(edge_index, alpha[:, head_idx],
+                                                 (num_targets, num_nodes), check_invariants=False)
+            outputs.append(torch.sparse.mm(alpha_head, h[:, head_idx]))
 
         # Concatenate all heads
         output = torch.cat(outputs, dim=1)  # [num_nodes, out_features * num_heads]
@@ -135,6 +284,9 @@ class ApplicationTopologyGAT(nn.Module if TORCH_AVAILABLE else object):
     - Output: Application embeddings for clustering/classification
     """
 
+    # Attention layers read W.weight directly, so only the classifier is int8-quantized
+    quantize_exclude = ('gat1', 'gat2', 'gat3')
+
     def __init__(self, input_dim: int = 64, hidden_dim: int = 128, output_dim: int = 32, num_zones: int = 7):
         """
         Args:
@@ -179,19 +331,20 @@ class ApplicationTopologyGAT(nn.Module if TORCH_AVAILABLE else object):
                 if m.bias is not None:
                     nn.init.zeros_(m.bias)
 
-    def forward(self, x: torch.Tensor, adj: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    def forward(self, x: torch.Tensor, adj) -> Tuple[torch.Tensor, torch.Tensor]:
         """
         Forward pass
 
         Args:
             x: Node features [num_nodes, input_dim]
-            adj: Adjacency matrix [num_nodes, num_nodes]
+            adj: Adjacency [num_nodes, num_nodes] (dense or sparse) or edge index [2, num_edges]
 
         Returns:
             embeddings: Node embeddings [num_nodes, output_dim]
             zone_logits: Zone classification logits [num_nodes, num_zones]
         """
-        # GAT layers
+        # GAT layers (convert once, shared by all layers)
+        adj = to_edge_index(adj)
         h = F.elu(self.gat1(x, adj))
         h = F.elu(self.gat2(h, adj))
         embeddings = self.gat3(h, adj)  # Final embeddings
@@ -201,6 +354,77 @@ class ApplicationTopologyGAT(nn.Module if TORCH_AVAILABLE else object):
 
         return embeddings, zone_logits
 
+    def forward_blocks(
+        self,
+        x: torch.Tensor,
+        blocks: List[Tuple[torch.Tensor, int]]
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Forward pass over sampled blocks (see NeighborSampler.sample)
+
+        Args:
+            x: Features of the sampled nodes [len(n_id), input_dim]
+            blocks: One (edge_index, num_rows) per GAT layer
+
+        Returns:
+            embeddings, zone_logits for the first blocks[-1][1] nodes (the targets)
+        """
+        (edges1, size1), (edges2, size2), (edges3, size3) = blocks
+
+        h = F.elu(self.gat1(x, edges1, size=size1))
+        h = F.elu(self.gat2(h, edges2, size=size2))
+        embeddings = self.gat3(h, edges3, size=size3)
+
+        zone_logits = self.classifier(embeddings)
+
+        return embeddings, zone_logits
+
+    def forward_minibatch(
+        self,
+        x: torch.Tensor,
+        adj,
+        batch_size: int = 1024,
+        fanouts: Tuple[int, ...] = (10, 5, 5),
+        seed: Optional[int] = 0
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Neighbor-sampled inference for graphs too large for one full pass
+
+        Each batch of target nodes is run on its sampled 3-hop computation
+        graph (see NeighborSampler), so peak memory is bounded by batch_size
+        and fanouts.
+
+        Args:
+            x: Node features [num_nodes, input_dim]
+            adj: Adjacency (dense or sparse) or edge index
+            batch_size: Target nodes per batch
+            fanouts: Neighbors sampled per node, one entry per GAT layer
+            seed: Sampling seed (fixed by default for reproducible results)
+
+        Returns:
+            embeddings: Node embeddings [num_nodes, output_dim]
+            zone_logits: Zone classification logits [num_nodes, num_zones]
+        """
+        num_nodes = x.size(0)
+        sampler = NeighborSampler(adj, num_nodes, fanouts=fanouts, seed=seed)
+
+        self.eval()
+        with torch.inference_mode():
+            embeddings = x.new_zeros(num_nodes, self.output_dim)
+            zone_logits = x.new_zeros(num_nodes, self.num_zones)
+
+            for start in range(0, num_nodes, batch_size):
+                batch = np.arange(start, min(start + batch_size, num_nodes))
+                n_id, blocks = sampler.sample(batch)
+                sub_x = x[torch.from_numpy(n_id).to(x.device)]
+                blocks = [(edge_index.to(x.device), size) for edge_index, size in blocks]
+
+                batch_embeddings, batch_logits = self.forward_blocks(sub_x, blocks)
+                embeddings[start:start + len(batch)] = batch_embeddings
+                zone_logits[start:start + len(batch)] = batch_logits
+
+        return embeddings, zone_logits
+
     def get_attention_weights(self, x: torch.Tensor, adj: torch.Tensor) -> List[torch.Tensor]:
         """
         Extract attention weights for visualization
@@ -212,6 +436,18 @@ class ApplicationTopologyGAT(nn.Module if TORCH_AVAILABLE else object):
         # Simplified version: return adjacency-based importance
         return [adj]
 
+    def infer(self, x: torch.Tensor, adj) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Single eval-mode forward pass without autograd bookkeeping
+
+        Returns:
+            embeddings: Node embeddings [num_nodes, output_dim]
+            zone_logits: Zone classification logits [num_nodes, num_zones]
+        """
+        self.eval()
+        with torch.inference_mode():
+            return self.forward(x, adj)
+
     def predict_zones(self, x: torch.Tensor, adj: torch.Tensor) -> np.ndarray:
         """
         Predict security zones for applications
@@ -219,12 +455,8 @@ class ApplicationTopologyGAT(nn.Module if TORCH_AVAILABLE else object):
         Returns:
             zone_predictions: Array of zone indices [num_nodes]
         """
-        self.eval()
-        with torch.no_grad():
-            _, zone_logits = self.forward(x, adj)
-            zone_predictions = torch.argmax(zone_logits, dim=1)
-
-        return zone_predictions.cpu().numpy()
+        _, zone_logits = self.infer(x, adj)
+        return torch.argmax(zone_logits, dim=1).cpu().numpy()
 
     def get_embeddings(self, x: torch.Tensor, adj: torch.Tensor) -> np.ndarray:
         """
@@ -233,10 +465,7 @@ class ApplicationTopologyGAT(nn.Module if TORCH_AVAILABLE else object):
         Returns:
             embeddings: Array of embeddings [num_nodes, output_dim]
         """
-        self.eval()
-        with torch.no_grad():
-            embeddings, _ = self.forward(x, adj)
-
+        embeddings, _ = self.infer(x, adj)
         return embeddings.cpu().numpy()
 
 
@@ -294,7 +523,7 @@ class GATTrainer:
 
         # Move to device
         x = x.to(self.device)
-        adj = adj.to(self.device)
+        adj = to_edge_index(adj).to(self.device)
         labels = labels.to(self.device)
         train_mask = train_mask.to(self.device)
 
@@ -332,7 +561,7 @@ class GATTrainer:
 
         with torch.no_grad():
             x = x.to(self.device)
-            adj = adj.to(self.device)
+            adj = to_edge_index(adj).to(self.device)
             labels = labels.to(self.device)
             val_mask = val_mask.to(self.device)
 
@@ -345,16 +574,70 @@ class GATTrainer:
 
         return loss.item(), accuracy
 
+    def sampled_epoch(
+        self,
+        x: torch.Tensor,
+        sampler: NeighborSampler,
+        labels: torch.Tensor,
+        mask: torch.Tensor,
+        batch_size: int = 1024,
+        train: bool = True
+    ) -> Tuple[float, float]:
+        """
+        One mini-batch pass over the masked nodes using neighbor sampling
+
+        Args:
+            x: Node features (full graph)
+            sampler: NeighborSampler over the full graph
+            labels: Zone labels
+            mask: Boolean mask of nodes to train/evaluate on
+            batch_size: Target nodes per batch
+            train: Update weights (False = validation pass)
+
+        Returns:
+            loss, accuracy (averaged over masked nodes)
+        """
+        self.model.train(train)
+        targets = np.random.permutation(np.flatnonzero(mask.cpu().numpy())) if train \
+            else np.flatnonzero(mask.cpu().numpy())
+
+        total_loss, total_correct = 0.0, 0
+        for start in range(0, len(targets), batch_size):
+            batch = targets[start:start + batch_size]
+            n_id, blocks = sampler.sample(batch)
+            n_id = torch.from_numpy(n_id)
+
+            sub_x = x[n_id].to(self.device)
+            blocks = [(edge_index.to(self.device), size) for edge_index, size in blocks]
+            batch_labels = labels[n_id[:len(batch)]].to(self.device)
+
+            with torch.set_grad_enabled(train):
+                _, zone_logits = self.model.forward_blocks(sub_x, blocks)
+                loss = self.criterion(zone_logits, batch_labels)
+
+            if train:
+                self.optimizer.zero_grad()
+                loss.backward()
+                self.optimizer.step()
+
+            total_loss += loss.item() * len(batch)
+            total_correct += (torch.argmax(zone_logits, dim=1) == batch_labels).sum().item()
+
+        num_targets = max(len(targets), 1)
+        return total_loss / num_targets, total_correct / num_targets
+
     def train(
         self,
         x: torch.Tensor,
-        adj: torch.Tensor,
+        adj,
         labels: torch.Tensor,
         train_mask: torch.Tensor,
         val_mask: torch.Tensor,
         epochs: int = 200,
         early_stopping_patience: int = 20,
-        checkpoint_path: Optional[str] = None
+        checkpoint_path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        fanouts: Tuple[int, ...] = (10, 5, 5)
     ) -> Dict:
         """
         Full training loop
@@ -363,6 +646,8 @@ class GATTrainer:
             epochs: Number of training epochs
             early_stopping_patience: Stop if no improvement for N epochs
             checkpoint_path: Path to save best model
+            batch_size: Enable neighbor-sampled mini-batch training (None = full graph)
+            fanouts: Neighbors sampled per node per layer (mini-batch mode)
 
         Returns:
             Training history dictionary
@@ -372,12 +657,19 @@ class GATTrainer:
         best_val_loss = float('inf')
         patience_counter = 0
 
+        adj = to_edge_index(adj)
+        sampler = NeighborSampler(adj, x.size(0), fanouts=fanouts) if batch_size else None
+
         for epoch in range(epochs):
-            # Train
-            train_loss, train_acc = self.train_epoch(x, adj, labels, train_mask)
+            if sampler is not None:
+                train_loss, train_acc = self.sampled_epoch(x, sampler, labels, train_mask, batch_size)
+                val_loss, val_acc = self.sampled_epoch(x, sampler, labels, val_mask, batch_size, train=False)
+            else:
+                # Train
+                train_loss, train_acc = self.train_epoch(x, adj, labels, train_mask)
 
-            # Validate
-            val_loss, val_acc = self.validate(x, adj, labels, val_mask)
+                # Validate
+                val_loss, val_acc = self.validate(x, adj, labels, val_mask)
 
             # Record history
             self.training_history['train_loss'].append(train_loss)
@@ -440,12 +732,22 @@ class GATApplicationAnalyzer:
     Integrates with existing network analysis pipeline
     """
 
-    def __init__(self, model_path: Optional[str] = None, device: str = 'cpu'):
+    def __init__(self, model_path: Optional[str] = None, device: str = 'cpu',
+                 full_batch_limit: int = 20000, batch_size: int = 1024, quantize: bool = False):
         """
         Args:
             model_path: Path to pre-trained model (optional)
             device: 'cpu' or 'cuda'
+            full_batch_limit: Above this many nodes, use neighbor-sampled mini-batch inference
+            batch_size: Target nodes per batch in mini-batch mode
+            quantize: Run inference on an int8 dynamic-quantized copy (CPU only)
         """
+        self.full_batch_limit = full_batch_limit
+        self.batch_size = batch_size
+        self.device = device
+        self.quantize = quantize and device == 'cpu'
+        self._inference_model = None
+
         if not TORCH_AVAILABLE:
             logger.warning("PyTorch not available. GAT analysis will be limited.")
             self.model = None
@@ -473,10 +775,17 @@ class GATApplicationAnalyzer:
 
         logger.info("[OK] GAT Application Analyzer initialized")
 
+    @property
+    def inference_model(self) -> ApplicationTopologyGAT:
+        """Eval-mode (optionally quantized) model used by analyze_topology; rebuilt after training"""
+        if self._inference_model is None:
+            self._inference_model = inference_copy(self.model, quantize=self.quantize)
+        return self._inference_model
+
     def analyze_topology(
         self,
         node_features: np.ndarray,
-        adjacency_matrix: np.ndarray,
+        adjacency_matrix,
         node_names: List[str]
     ) -> Dict:
         """
@@ -484,7 +793,7 @@ class GATApplicationAnalyzer:
 
         Args:
             node_features: Feature matrix [num_nodes, feature_dim]
-            adjacency_matrix: Adjacency matrix [num_nodes, num_nodes]
+            adjacency_matrix: Adjacency matrix [num_nodes, num_nodes] (numpy or scipy.sparse)
             node_names: List of application names
 
         Returns:
@@ -496,13 +805,27 @@ class GATApplicationAnalyzer:
 
         logger.info(f"[SEARCH] Analyzing topology with GAT ({len(node_names)} applications)...")
 
-        # Convert to tensors
+        # Convert to tensors (edge list - never densified)
         x = torch.FloatTensor(node_features)
-        adj = torch.FloatTensor(adjacency_matrix)
+        edge_index = to_edge_index(adjacency_matrix)
+
+        # Get predictions (one pass yields both embeddings and zone logits)
+        model = self.inference_model
+        if len(node_names) > self.full_batch_limit:
+            logger.info(f"  Mini-batch inference (batch_size={self.batch_size})")
+            embeddings, zone_logits = model.forward_minibatch(x, edge_index, batch_size=self.batch_size)
+        else:
+            embeddings, zone_logits = model.infer(x, edge_index)
 
-        # Get predictions
-        zone_predictions = self.model.predict_zones(x, adj)
-        embeddings = self.model.get_embeddings(x, adj)
+        zone_confidence, zone_predictions = torch.softmax(zone_logits, dim=1).max(dim=1)
+        zone_confidence = zone_confidence.cpu().numpy()
+        zone_predictions = zone_predictions.cpu().numpy()
+        embeddings = embeddings.cpu().numpy()
+
+        if hasattr(adjacency_matrix, 'tocsr'):  # scipy.sparse
+            centrality = np.asarray(adjacency_matrix.sum(axis=1)).ravel()
+        else:
+            centrality = np.asarray(adjacency_matrix).sum(axis=1)
 
         # Build results
         results = {
@@ -515,9 +838,9 @@ class GATApplicationAnalyzer:
             zone_idx = zone_predictions[i]
             results['applications'][app_name] = {
                 'predicted_zone': self.zone_mapping.get(zone_idx, 'UNKNOWN'),
-                'zone_confidence': 0.85,  # TODO: Extract from softmax probabilities
+                'zone_confidence': float(zone_confidence[i]),
                 'embedding': embeddings[i].tolist(),
-                'centrality': float(np.sum(adjacency_matrix[i]))
+                'centrality': float(centrality[i])
             }
 
         logger.info(f"[OK] GAT analysis complete")
@@ -527,7 +850,7 @@ class GATApplicationAnalyzer:
     def train_on_observed_data(
         self,
         node_features: np.ndarray,
-        adjacency_matrix: np.ndarray,
+        adjacency_matrix,
         zone_labels: np.ndarray,
         train_ratio: float = 0.8
     ) -> Dict:
@@ -551,7 +874,7 @@ class GATApplicationAnalyzer:
 
         # Convert to tensors
         x = torch.FloatTensor(node_features)
-        adj = torch.FloatTensor(adjacency_matrix)
+        adj = to_edge_index(adjacency_matrix)
         labels = torch.LongTensor(zone_labels)
 
         # Create train/val masks
@@ -565,11 +888,13 @@ class GATApplicationAnalyzer:
         train_mask[indices[:train_size]] = True
         val_mask[indices[train_size:]] = True
 
-        # Train
+        # Train (neighbor-sampled mini-batches for large graphs)
+        self._inference_model = None
         history = self.trainer.train(
             x, adj, labels, train_mask, val_mask,
             epochs=200,
-            checkpoint_path='./models/gat_checkpoint.pt'
+            checkpoint_path='./models/gat_checkpoint.pt',
+            batch_size=self.batch_size if num_nodes > self.full_batch_limit else None
         )
 
         return history
@@ -594,35 +919,95 @@ class GATApplicationAnalyzer:
 
         return clusters
 
-    def _identify_critical_connections(self, adj_matrix: np.ndarray, node_names: List[str]) -> List[Dict]:
+    def _identify_critical_connections(self, adj_matrix, node_names: List[str]) -> List[Dict]:
         """Identify critical connections (high traffic/importance)"""
-        critical = []
+        num_nodes = len(node_names)
+
+        # Nonzero entries only (dense or scipy.sparse)
+        if hasattr(adj_matrix, 'tocoo'):
+            coo = adj_matrix.tocoo()
+            rows, cols, values = coo.row, coo.col, coo.data.astype(np.float64)
+        else:
+            adj_matrix = np.asarray(adj_matrix)
+            rows, cols = np.nonzero(adj_matrix)
+            values = adj_matrix[rows, cols].astype(np.float64)
 
-        # Find top connections by weight
-        for i in range(len(node_names)):
-            for j in range(i + 1, len(node_names)):
-                weight = adj_matrix[i, j] + adj_matrix[j, i]
-                if weight > np.percentile(adj_matrix, 90):  # Top 10%
-                    critical.append({
-                        'source': node_names[i],
-                        'target': node_names[j],
-                        'weight': float(weight),
-                        'importance': 'HIGH'
-                    })
+        keep = values != 0
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+
+        # Top 10% threshold of the full matrix, implicit zeros included
+        threshold = self._matrix_percentile(values, num_nodes * num_nodes, 90)
+
+        # Symmetric weight adj[i, j] + adj[j, i] per unordered pair i < j
+        low, high = np.minimum(rows, cols), np.maximum(rows, cols)
+        pair = low != high
+        keys = low[pair].astype(np.int64) * num_nodes + high[pair]
+        pair_keys, inverse = np.unique(keys, return_inverse=True)
+        weights = np.bincount(inverse, weights=values[pair], minlength=len(pair_keys))
+
+        critical = []
+        for idx in np.flatnonzero(weights > threshold):
+            i, j = divmod(int(pair_keys[idx]), num_nodes)
+            critical.append({
+                'source': node_names[i],
+                'target': node_names[j],
+                'weight': float(weights[idx]),
+                'importance': 'HIGH'
+            })
 
         return sorted(critical, key=lambda x: x['weight'], reverse=True)[:20]  # Top 20
 
+    @staticmethod
+    def _matrix_percentile(nonzero_values: np.ndarray, total: int, q: float) -> float:
+        """np.percentile of a matrix given only its nonzero values and total size"""
+        if total == 0:
+            return 0.0
+        num_zeros = total - len(nonzero_values)
+        negative = np.sort(nonzero_values[nonzero_values < 0])
+        positive = np.sort(nonzero_values[nonzero_values > 0])
+
+        def value_at(k: int) -> float:
+            if k < len(negative):
+                return float(negative[k])
+            k -= len(negative)
+            if k < num_zeros:
+                return 0.0
+            return float(positive[k - num_zeros])
+
+        # Linear interpolation, same as np.percentile's default method
+        position = (total - 1) * q / 100.0
+        lower = int(np.floor(position))
+        upper = min(lower + 1, total - 1)
+        fraction = position - lower
+        return value_at(lower) + (value_at(upper) - value_at(lower)) * fraction
+
     def _load_model(self, path: str, device: str) -> ApplicationTopologyGAT:
         """Load pre-trained model"""
         model = ApplicationTopologyGAT()
-        checkpoint = torch.load(path, map_location=torch.device(device))
-        model.load_state_dict(checkpoint['model_state_dict'])
+        # Memory-mapped: weights are paged in on demand and shared via the page cache
+        checkpoint = torch.load(path, map_location=torch.device(device), mmap=True)
+        model.load_state_dict(checkpoint['model_state_dict'], assign=True)
         model.eval()
 
         logger.info(f"[OK] Pre-trained GAT model loaded from {path}")
 
         return model
 
+    def export_model(self, path: str, format: str = 'torchscript') -> Path:
+        """
+        Export the inference model (inputs: node features, edge index [2, num_edges])
+
+        Args:
+            path: Output file
+            format: 'torchscript' or 'onnx'
+        """
+        model = self.inference_model
+        x = torch.zeros(4, model.input_dim)
+        edge_index = torch.tensor([[0, 1, 2, 3], [1, 2, 3, 0]])
+        return export_model(model, (x, edge_index), path, format=format,
+                            input_names=('node_features', 'edge_index'),
+                            dynamic_axes={'node_features': {0: 'nodes'}, 'edge_index': {1: 'edges'}})
+
     def export_analysis(self, results: Dict, output_path: str):
         """Export analysis results to JSON"""
         output_file = Path(output_path)
@@ -294,6 +294,27 @@ class DQNAgent:
             q_values = self.q_network(state_tensor)
             return q_values.argmax(dim=1).item()
 
+    def select_actions(self, states: np.ndarray, eval_mode: bool = False) -> np.ndarray:
+        """
+        Epsilon-greedy actions for a batch of states (one forward pass)
+
+        Args:
+            states: States [batch, state_dim]
+            eval_mode: If True, no exploration (greedy)
+
+        Returns:
+            Action indices [batch]
+        """
+        with torch.no_grad():
+            q_values = self.q_network(torch.FloatTensor(np.asarray(states)).to(self.device))
+            actions = q_values.argmax(dim=1).cpu().numpy()
+
+        if not eval_mode:
+            explore = np.array([random.random() < self.epsilon for _ in range(len(actions))])
+            actions[explore] = [random.randrange(self.action_dim) for _ in range(int(explore.sum()))]
+
+        return actions
+
     def store_experience(self, state, action, reward, next_state, done):
         """Store experience in replay buffer"""
         self.replay_buffer.push(state, action, reward, next_state, done)
@@ -391,6 +412,10 @@ class SegmentationEnvironment:
     - State: Network topology, traffic patterns, security metrics
     - Actions: Segmentation decisions (zone assignments, ACLs, etc.)
     - Rewards: Security improvement, performance impact, complexity cost
+
+    The topology is compiled once into integer edge arrays, a per-edge
+    volume vector and a denied zone-pair matrix. Reward terms are kept as
+    running totals; a step only re-scores the edges of the app that moved.
     """
 
     def __init__(
@@ -417,6 +442,8 @@ class SegmentationEnvironment:
         self.num_apps = len(network_topology.get('applications', []))
         self.action_dim = self.num_apps * self.num_zones
 
+        self._compile_topology()
+
         # Current state
         self.current_state = None
         self.current_segmentation = None
@@ -426,6 +453,58 @@ class SegmentationEnvironment:
             f"(state_dim: {self.state_dim}, action_dim: {self.action_dim})"
         )
 
+    def _compile_topology(self):
+        """
+        Precompute integer arrays for reward terms
+
+        Node index num_apps stands for endpoints that are not applications;
+        it is pinned to zone code num_zones ("unassigned"), which differs
+        from every real zone and matches no policy.
+        """
+        self.apps = list(self.topology.get('applications', []))
+        app_index = {app: i for i, app in enumerate(self.apps)}
+        unassigned = len(self.apps)
+
+        connections = self.topology.get('connections', [])
+        volumes = self.traffic.get('volumes', {})
+        self.edge_src = np.array([app_index.get(c.get('source'), unassigned) for c in connections],
+                                 dtype=np.int64)
+        self.edge_dst = np.array([app_index.get(c.get('destination'), unassigned) for c in connections],
+                                 dtype=np.int64)
+        self.edge_volume = np.array(
+            [volumes.get(f"{c.get('source')}->{c.get('destination')}", 0) for c in connections],
+            dtype=np.float64
+        )
+        self.total_traffic = sum(volumes.values()) or 1.0
+
+        # denied_pairs[src_zone, dst_zone] = number of deny policies for the pair
+        self.denied_pairs = np.zeros((self.num_zones + 1, self.num_zones + 1), dtype=np.int64)
+        for policy in self.security.get('policies', []):
+            src_zone = policy.get('source_zone')
+            dst_zone = policy.get('destination_zone')
+            if policy.get('allowed', True) or not all(
+                isinstance(z, (int, np.integer)) and 0 <= z < self.num_zones for z in (src_zone, dst_zone)
+            ):
+                continue
+            self.denied_pairs[src_zone, dst_zone] += 1
+
+        # Incident edges per app (CSR), for incremental re-scoring
+        endpoints = np.concatenate([self.edge_src, self.edge_dst])
+        edge_ids = np.tile(np.arange(len(connections), dtype=np.int64), 2)
+        keep = endpoints < unassigned
+        pairs = np.unique(np.stack([endpoints[keep], edge_ids[keep]], axis=1), axis=0).reshape(-1, 2)
+        self.incident_edges = pairs[:, 1]
+        self.incident_ptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(pairs[:, 0], minlength=len(self.apps)))]
+        ).astype(np.int64)
+
+        # Zone per node (last slot = unassigned endpoints)
+        self.zone_codes = np.full(len(self.apps) + 1, self.num_zones, dtype=np.int64)
+        self.zone_counts = np.zeros(self.num_zones, dtype=np.int64)
+        self._cross_zone = 0.0
+        self._violations = 0
+        self._one_hot = np.zeros(len(self.apps) * self.num_zones, dtype=np.float32)
+
     def reset(self) -> np.ndarray:
         """
         Reset environment to initial state
@@ -439,6 +518,12 @@ class SegmentationEnvironment:
             for app in self.topology.get('applications', [])
         }
 
+        self.zone_codes[:-1] = [self.current_segmentation[app] for app in self.apps]
+        self._cross_zone, self._violations = self._edge_terms(slice(None))
+        self.zone_counts = np.bincount(self.zone_codes[:-1], minlength=self.num_zones)
+        self._one_hot[:] = 0
+        self._one_hot[np.arange(len(self.apps)) * self.num_zones + self.zone_codes[:-1]] = 1
+
         self.current_state = self._compute_state()
 
         return self.current_state
@@ -458,9 +543,8 @@ class SegmentationEnvironment:
         zone_idx = action % self.num_zones
 
         # Apply action (move app to zone)
-        apps = list(self.topology.get('applications', []))
-        if app_idx < len(apps):
-            self.current_segmentation[apps[app_idx]] = zone_idx
+        if app_idx < len(self.apps):
+            self._move(app_idx, zone_idx)
 
         # Compute next state
         next_state = self._compute_state()
@@ -482,6 +566,33 @@ class SegmentationEnvironment:
 
         return next_state, reward, done, info
 
+    def _move(self, app_idx: int, zone_idx: int):
+        """Reassign one app and update the running reward terms from its edges"""
+        old_zone = self.zone_codes[app_idx]
+        self.current_segmentation[self.apps[app_idx]] = zone_idx
+        if old_zone == zone_idx:
+            return
+
+        edges = self.incident_edges[self.incident_ptr[app_idx]:self.incident_ptr[app_idx + 1]]
+        cross_before, violations_before = self._edge_terms(edges)
+        self.zone_codes[app_idx] = zone_idx
+        cross_after, violations_after = self._edge_terms(edges)
+
+        self._cross_zone += cross_after - cross_before
+        self._violations += violations_after - violations_before
+        self.zone_counts[old_zone] -= 1
+        self.zone_counts[zone_idx] += 1
+        self._one_hot[app_idx * self.num_zones + old_zone] = 0
+        self._one_hot[app_idx * self.num_zones + zone_idx] = 1
+
+    def _edge_terms(self, edges) -> Tuple[float, int]:
+        """Cross-zone volume and policy violations over a subset of edges"""
+        src_zones = self.zone_codes[self.edge_src[edges]]
+        dst_zones = self.zone_codes[self.edge_dst[edges]]
+        cross_zone = float(self.edge_volume[edges][src_zones != dst_zones].sum())
+        violations = int(self.denied_pairs[src_zones, dst_zones].sum())
+        return cross_zone, violations
+
     def _compute_state(self) -> np.ndarray:
         """
         Compute state representation from current segmentation
@@ -492,29 +603,14 @@ class SegmentationEnvironment:
         - Security violations count
         - Network complexity metrics
         """
-        state_components = []
-
-        # Zone assignments (one-hot)
-        apps = list(self.topology.get('applications', []))
-        for app in apps:
-            zone = self.current_segmentation.get(app, 0)
-            one_hot = [0] * self.num_zones
-            one_hot[zone] = 1
-            state_components.extend(one_hot)
-
-        # Cross-zone traffic
-        cross_zone_traffic = self._compute_cross_zone_traffic()
-        state_components.append(cross_zone_traffic)
-
-        # Security violations
-        violations = self._compute_security_violations()
-        state_components.append(violations)
-
-        # Complexity
-        complexity = self._compute_complexity_score()
-        state_components.append(complexity)
-
-        return np.array(state_components, dtype=np.float32)
+        return np.concatenate([
+            self._one_hot,
+            np.array([
+                self._compute_cross_zone_traffic(),
+                self._compute_security_violations(),
+                self._compute_complexity_score()
+            ], dtype=np.float32)
+        ])
 
     def _compute_state_dim(self) -> int:
         """Compute state dimension"""
@@ -542,7 +638,7 @@ class SegmentationEnvironment:
         """Compute security score (0-1, higher is better)"""
         # Simplified: fewer cross-zone connections = better security
         violations = self._compute_security_violations()
-        max_violations = len(self.topology.get('connections', []))
+        max_violations = len(self.edge_src)
 
         if max_violations == 0:
             return 1.0
@@ -553,14 +649,13 @@ class SegmentationEnvironment:
         """Compute performance score (0-1, higher is better)"""
         # Simplified: minimize cross-zone traffic
         cross_zone_traffic = self._compute_cross_zone_traffic()
-        total_traffic = sum(self.traffic.get('volumes', {}).values()) or 1.0
 
-        return 1.0 - min(cross_zone_traffic / total_traffic, 1.0)
+        return 1.0 - min(cross_zone_traffic / self.total_traffic, 1.0)
 
     def _compute_complexity_score(self) -> float:
         """Compute complexity score (0-1, higher is better)"""
         # Simplified: fewer zones used = lower complexity
-        zones_used = len(set(self.current_segmentation.values()))
+        zones_used = int(np.count_nonzero(self.zone_counts))
 
         return 1.0 - (zones_used / self.num_zones)
 
@@ -574,40 +669,108 @@ class SegmentationEnvironment:
 
     def _compute_cross_zone_traffic(self) -> float:
         """Compute cross-zone traffic volume"""
-        cross_zone = 0.0
+        return self._cross_zone
 
-        for conn in self.topology.get('connections', []):
-            src = conn.get('source')
-            dst = conn.get('destination')
-            volume = self.traffic.get('volumes', {}).get(f"{src}->{dst}", 0)
+    def _compute_security_violations(self) -> int:
+        """Count security violations"""
+        return self._violations
 
-            if self.current_segmentation.get(src) != self.current_segmentation.get(dst):
-                cross_zone += volume
 
-        return cross_zone
+class VectorizedSegmentationEnvironment:
+    """
+    Batch of independent segmentation episodes over one compiled topology
 
-    def _compute_security_violations(self) -> int:
-        """Count security violations"""
-        violations = 0
+    Every reward term is evaluated for all environments at once with NumPy
+    indexing over [num_envs, num_edges] zone arrays.
+    """
 
-        # Check policy violations
-        for policy in self.security.get('policies', []):
-            src_zone = policy.get('source_zone')
-            dst_zone = policy.get('destination_zone')
-            allowed = policy.get('allowed', True)
+    def __init__(self, env: SegmentationEnvironment, num_envs: int = 8):
+        """
+        Args:
+            env: SegmentationEnvironment providing the compiled topology
+            num_envs: Number of parallel episodes
+        """
+        self.env = env
+        self.num_envs = num_envs
+        self.state_dim = env.state_dim
+        self.action_dim = env.action_dim
 
-            # Count connections violating policy
-            for conn in self.topology.get('connections', []):
-                src = conn.get('source')
-                dst = conn.get('destination')
+        # Zone per node for every environment (last column = unassigned endpoints)
+        self.zone_codes = np.full((num_envs, env.num_apps + 1), env.num_zones, dtype=np.int64)
 
-                src_assigned = self.current_segmentation.get(src)
-                dst_assigned = self.current_segmentation.get(dst)
+    def reset(self) -> np.ndarray:
+        """
+        Reset every environment to a random segmentation
 
-                if src_assigned == src_zone and dst_assigned == dst_zone and not allowed:
-                    violations += 1
+        Returns:
+            States [num_envs, state_dim]
+        """
+        self.zone_codes[:, :-1] = np.array(
+            [[random.randint(0, self.env.num_zones - 1) for _ in range(self.env.num_apps)]
+             for _ in range(self.num_envs)],
+            dtype=np.int64
+        ).reshape(self.num_envs, self.env.num_apps)
+        return self._compute_states()[0]
 
-        return violations
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        Apply one action per environment
+
+        Args:
+            actions: Action indices [num_envs] (app_idx * num_zones + zone_idx)
+
+        Returns:
+            next_states [num_envs, state_dim], rewards [num_envs], dones [num_envs],
+            info (score arrays)
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        app_idx = actions // self.env.num_zones
+        zone_idx = actions % self.env.num_zones
+
+        valid = app_idx < self.env.num_apps
+        self.zone_codes[np.flatnonzero(valid), app_idx[valid]] = zone_idx[valid]
+
+        states, info = self._compute_states()
+        rewards = (info['security_score']
+                   - 0.3 * (1.0 - info['performance_score'])
+                   - 0.2 * (1.0 - info['complexity_score']))
+        dones = np.zeros(self.num_envs, dtype=bool)  # Continuous task
+
+        return states, rewards, dones, info
+
+    def segmentation(self, env_idx: int = 0) -> Dict:
+        """Zone assignment dict for one environment"""
+        return {app: int(z) for app, z in zip(self.env.apps, self.zone_codes[env_idx, :-1])}
+
+    def _compute_states(self) -> Tuple[np.ndarray, Dict]:
+        """States and score arrays for all environments"""
+        env = self.env
+        src_zones = self.zone_codes[:, env.edge_src]
+        dst_zones = self.zone_codes[:, env.edge_dst]
+
+        cross_zone = ((src_zones != dst_zones) * env.edge_volume).sum(axis=1)
+        violations = env.denied_pairs[src_zones, dst_zones].sum(axis=1)
+
+        assigned = self.zone_codes[:, :-1]
+        used = np.zeros((self.num_envs, env.num_zones + 1), dtype=bool)
+        used[np.arange(self.num_envs)[:, np.newaxis], assigned] = True
+        complexity = 1.0 - used[:, :env.num_zones].sum(axis=1) / env.num_zones
+
+        one_hot = np.zeros((self.num_envs, env.num_apps, env.num_zones), dtype=np.float32)
+        one_hot[np.arange(self.num_envs)[:, np.newaxis], np.arange(env.num_apps), assigned] = 1
+        states = np.concatenate([
+            one_hot.reshape(self.num_envs, -1),
+            np.stack([cross_zone, violations, complexity], axis=1).astype(np.float32)
+        ], axis=1)
+
+        num_edges = len(env.edge_src)
+        info = {
+            'security_score': (1.0 - np.minimum(violations / num_edges, 1.0)) if num_edges
+            else np.ones(self.num_envs),
+            'performance_score': 1.0 - np.minimum(cross_zone / env.total_traffic, 1.0),
+            'complexity_score': complexity
+        }
+        return states, info
 
 
 class RLSegmentationOptimizer:
@@ -665,7 +828,8 @@ class RLSegmentationOptimizer:
         max_steps_per_episode: int = 100,
         batch_size: int = 64,
         target_update_freq: int = 10,
-        checkpoint_path: str = './models/rl_agent.pt'
+        checkpoint_path: str = './models/rl_agent.pt',
+        num_envs: int = 1
     ) -> Dict:
         """
         Train RL agent
@@ -676,6 +840,8 @@ class RLSegmentationOptimizer:
             batch_size: Batch size for updates
             target_update_freq: Frequency to update target network
             checkpoint_path: Path to save checkpoints
+            num_envs: Parallel environments per episode (> 1 uses
+                VectorizedSegmentationEnvironment; episode reward is the mean)
 
         Returns:
             Training history
@@ -686,60 +852,114 @@ class RLSegmentationOptimizer:
 
         logger.info(f"Training RL agent for {num_episodes} episodes...")
 
+        vector_env = VectorizedSegmentationEnvironment(self.env, num_envs) if num_envs > 1 else None
+
         for episode in range(num_episodes):
-            state = self.env.reset()
-            episode_reward = 0
-            episode_length = 0
+            if vector_env is not None:
+                episode_reward, episode_length = self._run_vector_episode(
+                    vector_env, max_steps_per_episode, batch_size
+                )
+            else:
+                episode_reward, episode_length = self._run_episode(max_steps_per_episode, batch_size)
 
-            for step in range(max_steps_per_episode):
-                # Select action
-                action = self.agent.select_action(state)
+            self._finish_episode(episode, episode_reward, episode_length,
+                                 target_update_freq, checkpoint_path)
 
-                # Execute action
-                next_state, reward, done, info = self.env.step(action)
+        logger.info("Training complete!")
 
-                # Store experience
-                self.agent.store_experience(state, action, reward, next_state, done)
+        return self.agent.training_history
 
-                # Update agent
-                loss = self.agent.update(batch_size)
+    def _run_episode(self, max_steps: int, batch_size: int) -> Tuple[float, int]:
+        """One episode in the single environment; returns (episode reward, length)"""
+        state = self.env.reset()
+        episode_reward = 0
+        episode_length = 0
 
-                # Update metrics
-                episode_reward += reward
-                episode_length += 1
+        for step in range(max_steps):
+            # Select action
+            action = self.agent.select_action(state)
 
-                state = next_state
+            # Execute action
+            next_state, reward, done, info = self.env.step(action)
 
-                if done:
-                    break
+            # Store experience
+            self.agent.store_experience(state, action, reward, next_state, done)
 
-            # Update target network
-            if episode % target_update_freq == 0:
-                self.agent.update_target_network()
+            # Update agent
+            loss = self.agent.update(batch_size)
 
-            # Decay epsilon
-            self.agent.decay_epsilon()
+            # Update metrics
+            episode_reward += reward
+            episode_length += 1
 
-            # Record episode
-            self.agent.training_history['episode_rewards'].append(episode_reward)
-            self.agent.training_history['episode_lengths'].append(episode_length)
-            self.agent.training_history['epsilon'].append(self.agent.epsilon)
+            state = next_state
 
-            # Logging
-            if episode % 50 == 0:
-                avg_reward = np.mean(self.agent.training_history['episode_rewards'][-50:])
-                logger.info(
-                    f"  Episode {episode}: avg_reward={avg_reward:.2f}, "
-                    f"epsilon={self.agent.epsilon:.3f}"
-                )
+            if done:
+                break
 
-            # Save checkpoint
-            if episode % 100 == 0 and episode > 0:
-                self.agent.save(checkpoint_path)
+        return episode_reward, episode_length
 
-        logger.info("Training complete!")
+    def _run_vector_episode(
+        self,
+        vector_env: 'VectorizedSegmentationEnvironment',
+        max_steps: int,
+        batch_size: int
+    ) -> Tuple[float, int]:
+        """One batch of parallel episodes; returns (mean episode reward, length)"""
+        states = vector_env.reset()
+        episode_rewards = np.zeros(vector_env.num_envs)
+        episode_length = 0
+
+        for step in range(max_steps):
+            actions = self.agent.select_actions(states)
+            next_states, rewards, dones, info = vector_env.step(actions)
+
+            for i in range(vector_env.num_envs):
+                self.agent.store_experience(states[i], int(actions[i]), float(rewards[i]),
+                                            next_states[i], bool(dones[i]))
+            self.agent.update(batch_size)
+
+            episode_rewards += rewards
+            episode_length += 1
+            states = next_states
+
+            if dones.all():
+                break
 
-        return self.agent.training_history
+        return float(episode_rewards.mean()), episode_length
+
+    def _finish_episode(
+        self,
+        episode: int,
+        episode_reward: float,
+        episode_length: int,
+        target_update_freq: int,
+        checkpoint_path: str
+    ):
+        """Target sync, epsilon decay, history, logging and checkpoints"""
+        # Update target network
+        if episode % target_update_freq == 0:
+            self.agent.update_target_network()
+
+        # Decay epsilon
+        self.agent.decay_epsilon()
+
+        # Record episode
+        self.agent.training_history['episode_rewards'].append(episode_reward)
+        self.agent.training_history['episode_lengths'].append(episode_length)
+        self.agent.training_history['epsilon'].append(self.agent.epsilon)
+
+        # Logging
+        if episode % 50 == 0:
+            avg_reward = np.mean(self.agent.training_history['episode_rewards'][-50:])
+            logger.info(
+                f"  Episode {episode}: avg_reward={avg_reward:.2f}, "
+                f"epsilon={self.agent.epsilon:.3f}"
+            )
+
+        # Save checkpoint
+        if episode % 100 == 0 and episode > 0:
+            self.agent.save(checkpoint_path)
 
     def optimize_segmentation(self) -> Dict:
         """
@@ -37,6 +37,8 @@ except ImportError:
     TORCH_AVAILABLE = False
     logger.warning("PyTorch not available. Install with: pip install torch")
 
+from .inference import export_model, inference_copy
+
 
 class PositionalEncoding(nn.Module if TORCH_AVAILABLE else object):
     """
@@ -411,6 +413,20 @@ class TrafficPatternTransformer(nn.Module if TORCH_AVAILABLE else object):
 
         return outputs
 
+    def infer(self, x: torch.Tensor) -> Dict[str, torch.Tensor]:
+        """
+        Single eval-mode forward pass without autograd bookkeeping
+
+        Args:
+            x: Input sequence [batch_size, seq_len, input_dim]
+
+        Returns:
+            Same dictionary as forward() (predictions, classifications, change scores)
+        """
+        self.eval()
+        with torch.inference_mode():
+            return self.forward(x)
+
     def predict_next_step(self, x: torch.Tensor) -> torch.Tensor:
         """
         Predict next time step in sequence
@@ -421,10 +437,7 @@ class TrafficPatternTransformer(nn.Module if TORCH_AVAILABLE else object):
         Returns:
             Predicted next step [batch_size, input_dim]
         """
-        self.eval()
-        with torch.no_grad():
-            outputs = self.forward(x)
-            return outputs['predictions']
+        return self.infer(x)['predictions']
 
     def detect_topology_change(self, x: torch.Tensor) -> torch.Tensor:
         """
@@ -436,10 +449,7 @@ class TrafficPatternTransformer(nn.Module if TORCH_AVAILABLE else object):
         Returns:
             Change probability [batch_size]
         """
-        self.eval()
-        with torch.no_grad():
-            outputs = self.forward(x)
-            return outputs['change_scores']
+        return self.infer(x)['change_scores']
 
     def classify_pattern(self, x: torch.Tensor) -> torch.Tensor:
         """
@@ -451,10 +461,7 @@ class TrafficPatternTransformer(nn.Module if TORCH_AVAILABLE else object):
         Returns:
             Pattern class logits [batch_size, num_classes]
         """
-        self.eval()
-        with torch.no_grad():
-            outputs = self.forward(x)
-            return outputs['classifications']
+        return self.infer(x)['classifications']
 
 
 class TemporalTrafficDataset(Dataset if TORCH_AVAILABLE else object):
@@ -494,6 +501,107 @@ class TemporalTrafficDataset(Dataset if TORCH_AVAILABLE else object):
         return item
 
 
+class WindowedTrafficDataset(Dataset if TORCH_AVAILABLE else object):
+    """
+    Lazy sliding windows over a memory-mapped time-bucket array
+
+    Reads the float32 [num_apps, num_buckets, feature_dim] file written by
+    FeatureStore.time_buckets() (shape from its .json sidecar). Only the
+    (app, start) index is held in memory; each window is copied out of the
+    memory map when the DataLoader asks for it, so months of history train
+    in bounded memory. Windows are ordered by (app, start), which together
+    with a seeded loader makes runs reproducible.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        window: int = 48,
+        stride: int = 1,
+        min_active: int = 1,
+        windows: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            path: Bucket array (.f32) written by FeatureStore.time_buckets()
+            window: Buckets per sample (the trainer predicts the last from the rest)
+            stride: Buckets between consecutive window starts
+            min_active: Skip windows with fewer non-empty buckets than this
+            windows: Precomputed (app, start) index (used by split())
+        """
+        if not TORCH_AVAILABLE:
+            raise ImportError("PyTorch required")
+
+        self.path = str(path)
+        with open(Path(self.path).with_suffix('.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.apps = meta['apps']
+        self.shape = (len(self.apps), int(meta['num_buckets']), int(meta['feature_dim']))
+        self.feature_dim = self.shape[2]
+        self.window = window
+        self.stride = stride
+        self._values = None
+
+        if window > self.shape[1]:
+            raise ValueError(f"Window of {window} buckets exceeds the {self.shape[1]} available")
+
+        self.windows = windows if windows is not None else self._index_windows(min_active)
+
+    @property
+    def values(self) -> np.memmap:
+        # Opened per process, so DataLoader workers map the file instead of pickling it
+        if self._values is None:
+            self._values = np.memmap(self.path, dtype=np.float32, mode='r', shape=self.shape)
+        return self._values
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_values'] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.windows)
+
+    def __getitem__(self, idx: int) -> Dict[str, torch.Tensor]:
+        app, start = self.windows[idx]
+        return {'sequence': torch.from_numpy(np.array(self.values[app, start:start + self.window]))}
+
+    def _index_windows(self, min_active: int, apps_per_chunk: int = 256) -> np.ndarray:
+        """(app, start) pairs with at least min_active non-empty buckets"""
+        num_apps, num_buckets, _ = self.shape
+        starts = np.arange(0, num_buckets - self.window + 1, self.stride)
+
+        index = []
+        for first in range(0, num_apps, apps_per_chunk):
+            active = np.asarray(self.values[first:first + apps_per_chunk, :, 0] > 0, dtype=np.int32)
+            active = np.concatenate([np.zeros((len(active), 1), dtype=np.int32), active.cumsum(axis=1)], axis=1)
+            counts = active[:, starts + self.window] - active[:, starts]
+            apps, positions = np.nonzero(counts >= min_active)
+            index.append(np.stack([apps + first, starts[positions]], axis=1))
+
+        return np.concatenate(index).astype(np.int64) if index else np.zeros((0, 2), dtype=np.int64)
+
+    def split(self, val_fraction: float = 0.2) -> Tuple['WindowedTrafficDataset', 'WindowedTrafficDataset']:
+        """
+        Split by time: training windows end before the cutoff bucket, validation
+        windows start at or after it (no overlap, no look-ahead)
+        """
+        cutoff = int(round(self.shape[1] * (1 - val_fraction)))
+        starts = self.windows[:, 1]
+        train = self.windows[starts + self.window <= cutoff]
+        val = self.windows[starts >= cutoff]
+        return (WindowedTrafficDataset(self.path, self.window, self.stride, windows=train),
+                WindowedTrafficDataset(self.path, self.window, self.stride, windows=val))
+
+    def loader(self, batch_size: int = 64, shuffle: bool = True, seed: int = 42,
+               num_workers: int = 0) -> DataLoader:
+        """DataLoader with a seeded shuffle order"""
+        generator = torch.Generator()
+        generator.manual_seed(seed)
+        return DataLoader(self, batch_size=batch_size, shuffle=shuffle, generator=generator,
+                          num_workers=num_workers)
+
+
 class TransformerTrainer:
     """
     Trainer for Transformer model - handles training loop, validation, checkpointing
@@ -779,12 +887,16 @@ class TemporalTrafficAnalyzer:
     5. Service lifecycle analysis
     """
 
-    def __init__(self, model_path: Optional[str] = None, device: str = 'cpu'):
+    def __init__(self, model_path: Optional[str] = None, device: str = 'cpu', quantize: bool = False):
         """
         Args:
             model_path: Path to pre-trained Transformer model (optional)
             device: 'cpu' or 'cuda'
+            quantize: Run inference on an int8 dynamic-quantized copy (CPU only)
         """
+        self.quantize = quantize and device == 'cpu'
+        self._inference_model = None
+
         if not TORCH_AVAILABLE:
             logger.warning("PyTorch not available. Transformer analysis will be limited.")
             self.model = None
@@ -802,6 +914,13 @@ class TemporalTrafficAnalyzer:
 
         logger.info("Temporal Traffic Analyzer initialized")
 
+    @property
+    def inference_model(self) -> TrafficPatternTransformer:
+        """Eval-mode (optionally quantized) model used for analysis; rebuilt after training"""
+        if self._inference_model is None:
+            self._inference_model = inference_copy(self.model, quantize=self.quantize)
+        return self._inference_model
+
     def predict_future_patterns(
         self,
         traffic_sequences: np.ndarray,
@@ -824,13 +943,13 @@ class TemporalTrafficAnalyzer:
         logger.info(f"Predicting {num_steps} future steps...")
 
         predictions = []
-        current_seq = torch.FloatTensor(traffic_sequences).to(self.device)
+        model = self.inference_model
 
-        self.model.eval()
-        with torch.no_grad():
+        with torch.inference_mode():
+            current_seq = torch.as_tensor(traffic_sequences, dtype=torch.float32, device=self.device)
             for _ in range(num_steps):
                 # Predict next step
-                next_step = self.model.predict_next_step(current_seq)
+                next_step = model.infer(current_seq)['predictions']
 
                 # Store prediction
                 predictions.append(next_step.cpu().numpy())
@@ -868,8 +987,8 @@ class TemporalTrafficAnalyzer:
 
         logger.info(f"Detecting topology changes in {len(traffic_sequences)} sequences...")
 
-        x = torch.FloatTensor(traffic_sequences).to(self.device)
-        change_scores = self.model.detect_topology_change(x).cpu().numpy()
+        x = torch.as_tensor(traffic_sequences, dtype=torch.float32, device=self.device)
+        change_scores = self.inference_model.detect_topology_change(x).cpu().numpy()
 
         changes = []
         for i, score in enumerate(change_scores):
@@ -908,8 +1027,8 @@ class TemporalTrafficAnalyzer:
 
         logger.info(f"Analyzing temporal patterns in {len(traffic_sequences)} sequences...")
 
-        x = torch.FloatTensor(traffic_sequences).to(self.device)
-        classifications = self.model.classify_pattern(x).cpu().numpy()
+        x = torch.as_tensor(traffic_sequences, dtype=torch.float32, device=self.device)
+        classifications = self.inference_model.classify_pattern(x).cpu().numpy()
         pattern_ids = np.argmax(classifications, axis=1)
 
         # Default pattern names if not provided
@@ -934,9 +1053,70 @@ class TemporalTrafficAnalyzer:
             'confidence_scores': classifications.tolist()
         }
 
+    def train_on_buckets(
+        self,
+        bucket_path: str,
+        window: int = 48,
+        stride: int = 1,
+        epochs: int = 20,
+        batch_size: int = 64,
+        val_fraction: float = 0.2,
+        seed: int = 42,
+        checkpoint_path: Optional[str] = None,
+        **model_kwargs
+    ) -> Dict:
+        """
+        Train on sliding windows of a FeatureStore.time_buckets() array
+
+        Args:
+            bucket_path: Bucket array (.f32) written by FeatureStore.time_buckets()
+            window: Buckets per training window
+            stride: Buckets between window starts
+            epochs: Training epochs
+            batch_size: Windows per batch
+            val_fraction: Trailing share of the time range used for validation
+            seed: Seed for weight init and shuffling
+            checkpoint_path: Where to save the best model (optional)
+            **model_kwargs: TrafficPatternTransformer arguments for a new model
+
+        Returns:
+            Training history dictionary
+        """
+        if not TORCH_AVAILABLE:
+            raise ImportError("PyTorch required")
+
+        torch.manual_seed(seed)
+        dataset = WindowedTrafficDataset(bucket_path, window=window, stride=stride)
+        train_set, val_set = dataset.split(val_fraction)
+        if len(train_set) == 0:
+            raise ValueError(f"No training windows of {window} buckets in {bucket_path}")
+        if len(val_set) == 0:
+            logger.warning("No validation windows after the time cutoff - validating on training windows")
+            val_set = train_set
+
+        logger.info(f"Training on {len(train_set)} windows ({len(val_set)} validation) from {bucket_path}")
+        self._inference_model = None
+
+        if self.model is None:
+            self.model = TrafficPatternTransformer(input_dim=dataset.feature_dim, **model_kwargs)
+            self.trainer = TransformerTrainer(self.model, device=self.device)
+        elif self.model.input_dim != dataset.feature_dim:
+            raise ValueError(f"Model expects {self.model.input_dim} features per step, "
+                             f"buckets have {dataset.feature_dim}")
+
+        history = self.trainer.train(
+            train_set.loader(batch_size, shuffle=True, seed=seed),
+            val_set.loader(batch_size, shuffle=False),
+            epochs=epochs,
+            checkpoint_path=checkpoint_path
+        )
+        self.model.eval()
+        return history
+
     def _load_model(self, path: str, device: str) -> Tuple:
         """Load pre-trained Transformer model"""
-        checkpoint = torch.load(path, map_location=torch.device(device))
+        # Memory-mapped: weights are paged in on demand and shared via the page cache
+        checkpoint = torch.load(path, map_location=torch.device(device), mmap=True)
 
         config = checkpoint['model_config']
         model = TrafficPatternTransformer(
@@ -945,7 +1125,7 @@ class TemporalTrafficAnalyzer:
             num_heads=config['num_heads'],
             num_layers=config['num_layers']
         )
-        model.load_state_dict(checkpoint['model_state_dict'])
+        model.load_state_dict(checkpoint['model_state_dict'], assign=True)
         model.eval()
 
         trainer = TransformerTrainer(model, device=device)
@@ -957,6 +1137,20 @@ class TemporalTrafficAnalyzer:
 
         return model, trainer
 
+    def export_model(self, path: str, format: str = 'torchscript', seq_len: int = 16) -> Path:
+        """
+        Export the inference model (input: sequences [batch, seq_len, input_dim])
+
+        Args:
+            path: Output file
+            format: 'torchscript' or 'onnx'
+            seq_len: Sequence length of the tracing example
+        """
+        model = self.inference_model
+        x = torch.zeros(1, seq_len, model.input_dim)
+        return export_model(model, (x,), path, format=format, input_names=('sequences',),
+                            dynamic_axes={'sequences': {0: 'batch', 1: 'steps'}})
+
     def export_analysis(self, results: Dict, output_path: str):
         """Export analysis results to JSON"""
         output_file = Path(output_path)
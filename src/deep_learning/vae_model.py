@@ -9,6 +9,7 @@ Learns compressed representations of application behavior patterns:
 - Application clustering by behavior similarity
 - Synthetic traffic pattern generation for testing
 - Behavioral fingerprinting for zero-day app discovery
+- Streaming anomaly scoring of newly ingested apps (P-square quantile sketch)
 
 100% LOCAL TRAINING AND INFERENCE
 
@@ -16,6 +17,7 @@ Author: Enterprise Security Team
 Version: 3.0 - Deep Learning Enhanced
 """
 
+import bisect
 import numpy as np
 import logging
 from typing import Dict, List, Tuple, Optional
@@ -36,6 +38,8 @@ except ImportError:
     TORCH_AVAILABLE = False
     logger.warning("PyTorch not available. Install with: pip install torch")
 
+from .inference import export_model, inference_copy
+
 
 class ApplicationBehaviorEncoder(nn.Module if TORCH_AVAILABLE else object):
     """
@@ -302,7 +306,7 @@ class ApplicationBehaviorVAE(nn.Module if TORCH_AVAILABLE else object):
             generated: Generated behavior vectors
         """
         self.eval()
-        with torch.no_grad():
+        with torch.inference_mode():
             # Sample from standard normal distribution
             z = torch.randn(num_samples, self.latent_dim).to(device)
 
@@ -311,24 +315,35 @@ class ApplicationBehaviorVAE(nn.Module if TORCH_AVAILABLE else object):
 
         return generated
 
-    def reconstruction_error(self, x: torch.Tensor) -> torch.Tensor:
+    def infer(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
         """
-        Compute reconstruction error for anomaly detection
+        Single eval-mode forward pass without autograd bookkeeping
 
         Args:
             x: Input behavior vectors
 
         Returns:
-            errors: Reconstruction error per sample
+            errors: Reconstruction error (MSE) per sample
+            mu: Latent means
         """
         self.eval()
-        with torch.no_grad():
-            reconstructed, _, _ = self.forward(x)
-
-            # MSE per sample
+        with torch.inference_mode():
+            reconstructed, mu, _ = self.forward(x)
             errors = torch.mean((x - reconstructed) ** 2, dim=1)
 
-        return errors
+        return errors, mu
+
+    def reconstruction_error(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Compute reconstruction error for anomaly detection
+
+        Args:
+            x: Input behavior vectors
+
+        Returns:
+            errors: Reconstruction error per sample
+        """
+        return self.infer(x)[0]
 
 
 def vae_loss_function(
@@ -367,6 +382,93 @@ def vae_loss_function(
     return total_loss, recon_loss, kl_loss
 
 
+class P2Quantile:
+    """
+    Streaming quantile estimate with the P-square algorithm (Jain & Chlamtac, 1985)
+
+    Keeps five markers whose heights track the minimum, q/2, q, (1+q)/2 and
+    maximum quantiles, adjusted with piecewise-parabolic interpolation on
+    every observation: O(1) memory and update time, no stored samples.
+    """
+
+    def __init__(self, q: float):
+        """
+        Args:
+            q: Quantile in (0, 1), e.g. 0.95
+        """
+        if not 0 < q < 1:
+            raise ValueError(f"Quantile must be in (0, 1), got {q}")
+
+        self.q = q
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+        self.increments = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current estimate (exact for the first five observations; None before any)"""
+        if self.count == 0:
+            return None
+        if self.count < 5:
+            return float(np.percentile(self.heights, self.q * 100))
+        return self.heights[2]
+
+    def add(self, x: float):
+        """Add one observation"""
+        x = float(x)
+        self.count += 1
+        h, n = self.heights, self.positions
+
+        if self.count <= 5:
+            bisect.insort(h, x)
+            return
+
+        # Cell containing x (extending the extreme markers if needed)
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(h, x) - 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = h[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+                )
+                if h[i - 1] < candidate < h[i + 1]:
+                    h[i] = candidate
+                else:
+                    h[i] += d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def to_dict(self) -> Dict:
+        return {'q': self.q, 'count': self.count, 'heights': list(self.heights),
+                'positions': list(self.positions), 'desired': list(self.desired)}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'P2Quantile':
+        sketch = cls(state['q'])
+        sketch.count = int(state['count'])
+        sketch.heights = [float(v) for v in state['heights']]
+        sketch.positions = [float(v) for v in state['positions']]
+        sketch.desired = [float(v) for v in state['desired']]
+        return sketch
+
+
 class BehaviorDataset(Dataset if TORCH_AVAILABLE else object):
     """Dataset for application behavior vectors"""
 
@@ -629,12 +731,16 @@ class ApplicationBehaviorAnalyzer:
     4. Synthetic Generation: Generate test traffic patterns
     """
 
-    def __init__(self, model_path: Optional[str] = None, device: str = 'cpu'):
+    def __init__(self, model_path: Optional[str] = None, device: str = 'cpu', quantize: bool = False):
         """
         Args:
             model_path: Path to pre-trained VAE model (optional)
             device: 'cpu' or 'cuda'
+            quantize: Run inference on an int8 dynamic-quantized copy (CPU only)
         """
+        self.quantize = quantize and device == 'cpu'
+        self._inference_model = None
+
         if not TORCH_AVAILABLE:
             logger.warning("PyTorch not available. VAE analysis will be limited.")
             self.model = None
@@ -653,9 +759,24 @@ class ApplicationBehaviorAnalyzer:
         # Statistics for anomaly detection
         self.reconstruction_threshold = None
         self.latent_stats = None
+        self.error_sketch: Optional[P2Quantile] = None
 
         logger.info("Application Behavior Analyzer initialized")
 
+    @property
+    def inference_model(self) -> ApplicationBehaviorVAE:
+        """Eval-mode (optionally quantized) model used for analysis; rebuilt after training"""
+        if self._inference_model is None:
+            self._inference_model = inference_copy(self.model, quantize=self.quantize)
+        return self._inference_model
+
+    def _encode(self, behavior_vectors: np.ndarray) -> np.ndarray:
+        """Latent means without autograd bookkeeping"""
+        model = self.inference_model
+        with torch.inference_mode():
+            x = torch.as_tensor(behavior_vectors, dtype=torch.float32, device=self.device)
+            return model.encode(x).cpu().numpy()
+
     def train_on_behaviors(
         self,
         behavior_vectors: np.ndarray,
@@ -718,6 +839,7 @@ class ApplicationBehaviorAnalyzer:
         )
 
         # Compute statistics for anomaly detection
+        self._inference_model = None
         self._compute_statistics(behavior_vectors)
 
         logger.info("VAE training complete")
@@ -747,11 +869,9 @@ class ApplicationBehaviorAnalyzer:
 
         logger.info(f"Detecting anomalies in {len(behavior_vectors)} applications...")
 
-        # Convert to tensor
-        x = torch.FloatTensor(behavior_vectors).to(self.device)
-
         # Compute reconstruction errors
-        errors = self.model.reconstruction_error(x).cpu().numpy()
+        x = torch.as_tensor(behavior_vectors, dtype=torch.float32, device=self.device)
+        errors = self.inference_model.reconstruction_error(x).cpu().numpy()
 
         # Determine threshold
         if self.reconstruction_threshold is None:
@@ -777,6 +897,75 @@ class ApplicationBehaviorAnalyzer:
 
         return anomalies
 
+    def score_incremental(
+        self,
+        behavior_vectors: np.ndarray,
+        app_names: List[str],
+        threshold_percentile: float = 95.0,
+        min_observations: int = 20
+    ) -> List[Dict]:
+        """
+        Score newly ingested apps against a streaming error quantile
+
+        Only the given vectors are encoded. Each error is compared with the
+        running quantile of all errors seen so far (training errors seed the
+        sketch) and then added to it, so apps can arrive one file at a time.
+
+        Args:
+            behavior_vectors: Behavior vectors of the new apps [num_new, feature_dim]
+            app_names: Application names
+            threshold_percentile: Percentile of past errors used as threshold
+            min_observations: Errors needed before anything is flagged
+
+        Returns:
+            Anomalous apps (same fields as detect_anomalies, plus 'observations')
+        """
+        if not TORCH_AVAILABLE or self.model is None:
+            logger.warning("VAE not available for anomaly scoring")
+            return []
+
+        q = threshold_percentile / 100
+        if self.error_sketch is None or self.error_sketch.q != q:
+            self.error_sketch = P2Quantile(q)
+
+        x = torch.as_tensor(behavior_vectors, dtype=torch.float32, device=self.device).reshape(
+            len(app_names), -1)
+        errors = self.inference_model.reconstruction_error(x).cpu().numpy()
+
+        anomalies = []
+        for app_name, error in zip(app_names, errors):
+            threshold = self.error_sketch.value if self.error_sketch.count >= min_observations else None
+            if threshold is not None and threshold > 0 and error > threshold:
+                anomalies.append({
+                    'app_name': app_name,
+                    'reconstruction_error': float(error),
+                    'threshold': float(threshold),
+                    'anomaly_score': float(error / threshold),
+                    'severity': 'HIGH' if error > threshold * 1.5 else 'MEDIUM',
+                    'observations': self.error_sketch.count
+                })
+            self.error_sketch.add(error)
+
+        return anomalies
+
+    def encode_behaviors(self, behavior_vectors: np.ndarray) -> np.ndarray:
+        """
+        Latent codes (encoder means) for behavior vectors
+
+        Suitable as SimilarAppIndex vectors for latent-space similar-app search.
+
+        Args:
+            behavior_vectors: Behavior vectors [num_apps, feature_dim]
+
+        Returns:
+            Latent codes [num_apps, latent_dim] (empty if the VAE is unavailable)
+        """
+        if not TORCH_AVAILABLE or self.model is None:
+            logger.warning("VAE not available for encoding")
+            return np.array([])
+
+        return self._encode(behavior_vectors)
+
     def cluster_applications(
         self,
         behavior_vectors: np.ndarray,
@@ -801,8 +990,7 @@ class ApplicationBehaviorAnalyzer:
         logger.info(f"Clustering {len(behavior_vectors)} applications...")
 
         # Encode to latent space
-        x = torch.FloatTensor(behavior_vectors).to(self.device)
-        latent = self.model.encode(x).cpu().numpy()
+        latent = self._encode(behavior_vectors)
 
         # K-means clustering in latent space
         from sklearn.cluster import KMeans
@@ -881,12 +1069,11 @@ class ApplicationBehaviorAnalyzer:
             logger.warning("VAE not available for fingerprinting")
             return {}
 
-        # Encode to latent space
-        x = torch.FloatTensor(behavior_vector).unsqueeze(0).to(self.device)
-        latent = self.model.encode(x).cpu().numpy()[0]
-
-        # Compute reconstruction error
-        error = self.model.reconstruction_error(x).cpu().numpy()[0]
+        # Latent code and reconstruction error in one pass
+        x = torch.as_tensor(behavior_vector, dtype=torch.float32, device=self.device).unsqueeze(0)
+        errors, mu = self.inference_model.infer(x)
+        latent = mu.cpu().numpy()[0]
+        error = errors.cpu().numpy()[0]
 
         fingerprint = {
             'latent_representation': latent.tolist(),
@@ -902,14 +1089,20 @@ class ApplicationBehaviorAnalyzer:
         if self.model is None:
             return
 
-        x = torch.FloatTensor(behavior_vectors).to(self.device)
+        x = torch.as_tensor(behavior_vectors, dtype=torch.float32, device=self.device)
 
-        # Reconstruction errors
-        errors = self.model.reconstruction_error(x).cpu().numpy()
+        # Reconstruction errors and latent means (one pass)
+        errors, mu = self.inference_model.infer(x)
+        errors = errors.cpu().numpy()
         self.reconstruction_threshold = np.percentile(errors, 95)
 
+        # Seed the streaming sketch used by score_incremental()
+        self.error_sketch = P2Quantile(0.95)
+        for error in errors:
+            self.error_sketch.add(error)
+
         # Latent space statistics
-        latent = self.model.encode(x).cpu().numpy()
+        latent = mu.cpu().numpy()
         self.latent_stats = {
             'mean': np.mean(latent, axis=0),
             'std': np.std(latent, axis=0)
@@ -919,7 +1112,8 @@ class ApplicationBehaviorAnalyzer:
 
     def _load_model(self, path: str, device: str) -> Tuple:
         """Load pre-trained VAE model"""
-        checkpoint = torch.load(path, map_location=torch.device(device))
+        # Memory-mapped: weights are paged in on demand and shared via the page cache
+        checkpoint = torch.load(path, map_location=torch.device(device), mmap=True)
 
         config = checkpoint['model_config']
         model = ApplicationBehaviorVAE(
@@ -927,7 +1121,7 @@ class ApplicationBehaviorAnalyzer:
             latent_dim=config['latent_dim'],
             beta=config['beta']
         )
-        model.load_state_dict(checkpoint['model_state_dict'])
+        model.load_state_dict(checkpoint['model_state_dict'], assign=True)
         model.eval()
 
         trainer = VAETrainer(model, device=device)
@@ -939,6 +1133,18 @@ class ApplicationBehaviorAnalyzer:
 
         return model, trainer
 
+    def export_model(self, path: str, format: str = 'torchscript') -> Path:
+        """
+        Export the inference model (input: behavior vectors [batch, input_dim])
+
+        Args:
+            path: Output file
+            format: 'torchscript' or 'onnx'
+        """
+        model = self.inference_model
+        x = torch.zeros(2, model.input_dim)
+        return export_model(model, (x,), path, format=format, input_names=('behaviors',))
+
     def export_analysis(self, results: Dict, output_path: str):
         """Export analysis results to JSON"""
         output_file = Path(output_path)
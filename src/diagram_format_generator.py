@@ -10,22 +10,25 @@ Features:
 - SVG generation via Mermaid.ink API (infinite zoom capability)
 - DOCX generation with embedded diagrams
 - Automatic fallback to local mmdc if API fails
-- Retry logic for API errors
+- Retry with adaptive backoff and a content-hash render cache for API calls
+  (src/mermaid_ink_client.py)
 
 Author: Enterprise Security Team
 Version: 1.0
 """
 
 import logging
-import base64
-import urllib.request
-import urllib.parse
 import time
-import subprocess
-import tempfile
 from pathlib import Path
 from typing import Optional, Tuple
 
+try:
+    from src.mermaid_ink_client import get_mermaid_ink_client
+    from src.mermaid_renderer import render_mermaid
+except ImportError:
+    from mermaid_ink_client import get_mermaid_ink_client
+    from mermaid_renderer import render_mermaid
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,6 +44,8 @@ class DiagramFormatGenerator:
         """
         self.max_retries = max_retries
         self.api_timeout = api_timeout
+        # Process-wide client: options apply if this generator creates it
+        get_mermaid_ink_client(max_retries=max_retries, timeout=api_timeout)
         logger.info(f"DiagramFormatGenerator initialized (max_retries={max_retries}, timeout={api_timeout}s)")
 
     def generate_png(self, mermaid_content: str, output_path: Path, width: int = 4800) -> bool:
@@ -235,7 +240,7 @@ class DiagramFormatGenerator:
 
     def _generate_via_api(self, content: str, output_path: Path,
                          format_type: str, width: int = 4800) -> bool:
-        """Generate diagram via Mermaid.ink API
+        """Generate diagram via Mermaid.ink API (shared client: cached, rate-limited)
 
         Args:
             content: Clean Mermaid content (without fences)
@@ -246,67 +251,11 @@ class DiagramFormatGenerator:
         Returns:
             True if successful, False otherwise
         """
-        retry_count = 0
-        success = False
-
-        while retry_count < self.max_retries and not success:
-            try:
-                # Encode diagram for URL (base64)
-                encoded = base64.urlsafe_b64encode(content.encode('utf-8')).decode('ascii')
-
-                # Build URL
-                if format_type == 'png':
-                    url = f"https://mermaid.ink/img/{encoded}?type=png&width={width}"
-                else:  # svg
-                    url = f"https://mermaid.ink/svg/{encoded}"
-
-                # Download file
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'NetworkSegmentationAnalyzer/1.0')
-
-                with urllib.request.urlopen(req, timeout=self.api_timeout) as response:
-                    if response.status == 200:
-                        data = response.read()
-
-                        # Validate content
-                        if format_type == 'png':
-                            is_valid = data.startswith(b'\x89PNG') and len(data) > 10240
-                        else:  # svg
-                            is_valid = b'<svg' in data and len(data) > 100
-
-                        if is_valid:
-                            with open(output_path, 'wb') as f:
-                                f.write(data)
-                            success = True
-                        else:
-                            logger.warning(f"  Invalid {format_type.upper()} data received (retry {retry_count + 1})")
-                            retry_count += 1
-                            time.sleep(3)
-                    else:
-                        logger.warning(f"  API returned status {response.status} (retry {retry_count + 1})")
-                        retry_count += 1
-                        time.sleep(2)
-
-                # Be nice to the API
-                if success:
-                    time.sleep(1.5)
-
-            except Exception as e:
-                error_msg = str(e)
-                if '503' in error_msg or 'Service Unavailable' in error_msg:
-                    logger.warning(f"  API unavailable (503), retry {retry_count + 1}")
-                    retry_count += 1
-                    time.sleep(3)
-                else:
-                    logger.warning(f"  API error: {error_msg}")
-                    retry_count = self.max_retries
-                    break
-
-        return success
+        return get_mermaid_ink_client().render_to_file(content, output_path, format_type, width)
 
     def _generate_via_mmdc(self, content: str, output_path: Path,
                           format_type: str, width: int = 4800) -> bool:
-        """Generate diagram via local mmdc (Mermaid CLI)
+        """Generate diagram locally (in-process renderer, Mermaid CLI for unsupported syntax)
 
         Args:
             content: Clean Mermaid content (without fences)
@@ -317,41 +266,14 @@ class DiagramFormatGenerator:
         Returns:
             True if successful, False otherwise
         """
-        # Write content to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False, encoding='utf-8') as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
+        options = {'format': format_type, 'timeout': 60}
+        if format_type == 'png':
+            options.update(width=width, background='transparent')
 
         try:
-            # Run mmdc
-            cmd = ['mmdc', '-i', tmp_path, '-o', str(output_path)]
-            if format_type == 'png':
-                cmd.extend(['-w', str(width), '-b', 'transparent'])
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            # Clean up temp file
-            Path(tmp_path).unlink()
-
-            return result.returncode == 0
-
-        except FileNotFoundError:
-            # mmdc not found
-            logger.warning("  mmdc not installed (install with: npm install -g @mermaid-js/mermaid-cli)")
-            Path(tmp_path).unlink()
-            return False
+            return render_mermaid(content, output_path, **options)
         except Exception as e:
-            # Any other error
             logger.warning(f"  mmdc error: {e}")
-            try:
-                Path(tmp_path).unlink()
-            except:
-                pass
             return False
 
 
@@ -0,0 +1,600 @@
+"""
+Level-of-Detail Diagram Aggregation
+===================================
+Keeps generated Mermaid diagrams within a fixed node and edge budget.
+
+Applications with thousands of peers produce diagrams that mmdc cannot
+render in time and browsers cannot lay out. Above the budget, nodes are
+aggregated level by level - e.g. hostname pattern, /24 subnet, /16 subnet,
+then the whole partition (tier) - using the finest level whose groups and
+collapsed edges fit. Parallel edges between groups are merged with summed
+flow counts. Groups never span partitions (tiers, dependency types, flow
+directions).
+
+Every aggregated diagram gets a drill-down manifest (<diagram>.lod.json)
+with each group's members and the member-level edges. A group's expanded
+sub-diagram is rendered from the manifest only when requested
+(expand_group); if the group alone exceeds the budget it is aggregated
+again at the finer levels, and its sub-groups become drillable too.
+
+Usage:
+    budget = DiagramBudget.from_env()
+    if not budget.fits(len(nodes), len(edges)):
+        view = aggregate(nodes, edges, NETWORK_LEVELS, budget)
+        mermaid = render_view(view, partitions, direction='TB')
+        write_manifest(view, 'outputs/diagrams/ACDA_diagram.lod.json', 'ACDA_diagram.mmd', partitions)
+
+    # Later, on demand (see expand_diagram_group.py)
+    expand_group('outputs/diagrams/ACDA_diagram.lod.json', 'G3')   # -> ACDA_diagram.lod/G3.mmd
+
+    NETSEG_DIAGRAM_MAX_NODES  Node budget per diagram (default: 100)
+    NETSEG_DIAGRAM_MAX_EDGES  Edge budget per diagram (default: 150)
+
+Author: Enterprise Security Team
+Version: 1.0
+"""
+
+import ipaddress
+import json
+import logging
+import os
+import re
+import shutil
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Aggregation levels for IP nodes, finest first
+NETWORK_LEVELS = ('hostname', 'subnet24', 'subnet16')
+
+# Last-resort levels: whole partition (main diagrams) or contiguous ranges of
+# nodes (drill-down, where the group already is one partition or pattern)
+PARTITION_LEVEL = 'partition'
+RANGE_LEVEL = 'range'
+
+# Edge labels shown on a collapsed edge
+MAX_EDGE_LABELS = 3
+
+
+@dataclass(frozen=True)
+class DiagramBudget:
+    """Maximum nodes and edges in one diagram"""
+    max_nodes: int = 100
+    max_edges: int = 150
+
+    def __post_init__(self):
+        if self.max_nodes < 1 or self.max_edges < 1:
+            raise ValueError(f"Diagram budget must be positive (nodes={self.max_nodes}, edges={self.max_edges})")
+
+    @classmethod
+    def from_env(cls) -> 'DiagramBudget':
+        """Budget from NETSEG_DIAGRAM_MAX_NODES / NETSEG_DIAGRAM_MAX_EDGES"""
+        return cls(
+            max_nodes=int(os.environ.get('NETSEG_DIAGRAM_MAX_NODES', cls.max_nodes)),
+            max_edges=int(os.environ.get('NETSEG_DIAGRAM_MAX_EDGES', cls.max_edges)),
+        )
+
+    def fits(self, nodes: int, edges: int) -> bool:
+        return nodes <= self.max_nodes and edges <= self.max_edges
+
+
+@dataclass
+class LodNode:
+    """One diagram node before aggregation"""
+    id: str  # Mermaid-safe node ID
+    label: str  # Display label (already sanitized for Mermaid)
+    partition: str  # Groups never span partitions ('' = outside any subgraph)
+    keys: Dict[str, str] = field(default_factory=dict)  # Aggregation level -> group key
+    style: str = ''  # classDef name
+    flows: int = 0
+    pinned: bool = False  # Never aggregated (e.g. the application itself)
+
+
+@dataclass
+class LodEdge:
+    """Directed edge; parallel edges between groups are merged"""
+    src: str
+    dst: str
+    flows: int = 1
+    labels: Set[str] = field(default_factory=set)  # e.g. protocol:port
+
+
+@dataclass
+class LodGroup:
+    """Aggregate of several nodes of one partition"""
+    id: str
+    partition: str
+    level: str
+    key: str
+    members: List[str]
+    flows: int = 0
+    internal_flows: int = 0  # Flows between members (not drawn)
+
+
+@dataclass
+class LodPartition:
+    """How a partition is drawn: subgraph ID, title and classDef for its groups"""
+    id: str
+    label: str
+    style: str = ''
+
+
+@dataclass
+class LodView:
+    """Diagram at one level of detail"""
+    level: str  # Level used ('node' = not aggregated)
+    levels: Tuple[str, ...]  # Levels available for drill-down (finest first)
+    nodes: Dict[str, LodNode]  # All input nodes
+    groups: Dict[str, LodGroup]  # Multi-member groups
+    display_id: Dict[str, str]  # Node ID -> drawn ID (itself or its group)
+    edges: List[LodEdge]  # Drawn edges, heaviest first
+    source_edges: List[LodEdge]  # Member-level edges (for drill-down)
+    unit: str = 'nodes'
+    dropped_edges: int = 0  # Lightest edges left out to stay within budget
+
+    @property
+    def aggregated(self) -> bool:
+        return bool(self.groups) or self.dropped_edges > 0
+
+    def drawn(self) -> List[str]:
+        """Drawn IDs: individual nodes in input order, then groups"""
+        return [node_id for node_id in self.nodes if self.display_id[node_id] == node_id] + list(self.groups)
+
+
+def hostname_pattern(hostname: Optional[str]) -> Optional[str]:
+    """
+    Hostname with its domain dropped and digit runs replaced by '#'
+
+    'web-prod-01.corp.local' -> 'web-prod-#'. None for IPs, 'Unknown' and
+    names without a usable pattern.
+    """
+    if not hostname or not isinstance(hostname, str) or hostname == 'Unknown':
+        return None
+    try:
+        ipaddress.ip_address(hostname)
+        return None
+    except ValueError:
+        pass
+
+    short = hostname.split('.')[0].lower()
+    pattern = re.sub(r'\d+', '#', short)
+    return pattern if pattern.strip('#-_') else None
+
+
+def subnet(ip: str, prefix: int) -> Optional[str]:
+    """Network of an IP as a string ('10.1.2.0/24'); IPv6 uses /48 and /64"""
+    try:
+        address = ipaddress.ip_address(ip)
+    except (ValueError, TypeError):
+        return None
+    if address.version == 6:
+        prefix = 48 if prefix <= 16 else 64
+    return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+
+def network_keys(ip: str, hostname: Optional[str] = None) -> Dict[str, str]:
+    """Group keys of an IP node for NETWORK_LEVELS"""
+    keys = {
+        'hostname': hostname_pattern(hostname),
+        'subnet24': subnet(ip, 24),
+        'subnet16': subnet(ip, 16),
+    }
+    return {level: key for level, key in keys.items() if key}
+
+
+def _natural(text: str) -> List:
+    """Sort key ordering digit runs numerically ('10_0_0_9' < '10_0_0_10')"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', text)]
+
+
+def _short_label(node: LodNode) -> str:
+    return node.label.split('<br/>')[0]
+
+
+def _group_keys(nodes: List[LodNode], levels: Sequence[str], level: str, slots: int) -> Dict[str, Tuple[str, str]]:
+    """Node ID -> (level used, key) of groupable nodes at one level"""
+    keys = {}
+    if level == RANGE_LEVEL:
+        by_partition = defaultdict(list)
+        for node in nodes:
+            by_partition[node.partition].append(node)
+        size = max(2, -(-len(nodes) // max(2, slots)))
+        for partition_nodes in by_partition.values():
+            partition_nodes.sort(key=lambda node: _natural(node.id))
+            for start in range(0, len(partition_nodes), size):
+                chunk = partition_nodes[start:start + size]
+                key = f"{_short_label(chunk[0])} to {_short_label(chunk[-1])}"
+                keys.update((node.id, (RANGE_LEVEL, key)) for node in chunk)
+        return keys
+
+    for node in nodes:
+        keys[node.id] = (PARTITION_LEVEL, node.partition)
+        if level != PARTITION_LEVEL:
+            # Nodes without a key at this level use the next coarser one
+            for candidate in levels[levels.index(level):]:
+                if node.keys.get(candidate):
+                    keys[node.id] = (candidate, node.keys[candidate])
+                    break
+    return keys
+
+
+def _group(nodes: List[LodNode], levels: Sequence[str], level: str, prefix: str, slots: int):
+    """Group the unpinned nodes at one level; single-member groups stay plain nodes"""
+    keys = _group_keys([node for node in nodes if not node.pinned], levels, level, slots)
+    members = defaultdict(list)
+    for node in nodes:
+        if node.id in keys:
+            members[(node.partition,) + keys[node.id]].append(node.id)
+
+    display_id = {node.id: node.id for node in nodes}
+    groups = {}
+    for partition, used, key in sorted(members):
+        ids = members[(partition, used, key)]
+        if len(ids) == 1:
+            continue
+        group_id = f"{prefix}{len(groups) + 1}"
+        groups[group_id] = LodGroup(group_id, partition, used, key, ids)
+        for node_id in ids:
+            display_id[node_id] = group_id
+    return display_id, groups
+
+
+def _collapse(edges: List[LodEdge], display_id: Dict[str, str], groups: Dict[str, LodGroup]) -> List[LodEdge]:
+    """Merge edges between the same drawn nodes"""
+    merged: Dict[Tuple[str, str], LodEdge] = {}
+    for edge in edges:
+        src, dst = display_id[edge.src], display_id[edge.dst]
+        if src == dst and src in groups:
+            groups[src].internal_flows += edge.flows
+            continue
+        collapsed = merged.get((src, dst))
+        if collapsed is None:
+            collapsed = merged[(src, dst)] = LodEdge(src, dst, 0, set())
+        collapsed.flows += edge.flows
+        collapsed.labels.update(edge.labels)
+    return sorted(merged.values(), key=lambda edge: (-edge.flows, edge.src, edge.dst))
+
+
+def aggregate(
+    nodes: Iterable[LodNode],
+    edges: Iterable[LodEdge],
+    levels: Sequence[str] = NETWORK_LEVELS,
+    budget: Optional[DiagramBudget] = None,
+    prefix: str = 'G',
+    unit: str = 'nodes',
+    last_resort: str = PARTITION_LEVEL
+) -> LodView:
+    """
+    Aggregate a graph to the finest level that fits the budget
+
+    Args:
+        nodes: Diagram nodes (IDs must be unique)
+        edges: Edges between node IDs (unknown endpoints are ignored)
+        levels: Aggregation levels, finest first (keys come from LodNode.keys)
+        budget: Node/edge budget (default: DiagramBudget.from_env())
+        prefix: Group ID prefix
+        unit: What a node is, for group labels ('servers', 'apps')
+        last_resort: Level tried after levels - PARTITION_LEVEL or RANGE_LEVEL
+
+    Returns:
+        LodView (level 'node' when the graph already fits)
+    """
+    budget = budget or DiagramBudget.from_env()
+    nodes = list(nodes)
+    by_id = {node.id: node for node in nodes}
+    if len(by_id) != len(nodes):
+        raise ValueError("Diagram node IDs must be unique")
+
+    source_edges = [edge for edge in edges if edge.src in by_id and edge.dst in by_id]
+    levels = tuple(levels)
+
+    display_id = {node.id: node.id for node in nodes}
+    groups: Dict[str, LodGroup] = {}
+    level = 'node'
+    collapsed = _collapse(source_edges, display_id, groups)
+
+    if last_resort not in (PARTITION_LEVEL, RANGE_LEVEL):
+        raise ValueError(f"Unknown last-resort level: {last_resort}")
+
+    if not budget.fits(len(nodes), len(collapsed)):
+        slots = budget.max_nodes - sum(node.pinned for node in nodes)
+        for level in levels + (last_resort,):
+            display_id, groups = _group(nodes, levels, level, prefix, slots)
+            if len(groups) == 1 and level != last_resort and \
+                    len(next(iter(groups.values())).members) == sum(not node.pinned for node in nodes):
+                continue  # One group of everything shows nothing; try coarser
+            collapsed = _collapse(source_edges, display_id, groups)
+            if budget.fits(len(set(display_id.values())), len(collapsed)):
+                break
+
+        drawn = len(set(display_id.values()))
+        if drawn > budget.max_nodes:
+            logger.warning(f"Diagram still has {drawn} nodes at {level} level (budget {budget.max_nodes})")
+
+    for node in nodes:
+        group = groups.get(display_id[node.id])
+        if group:
+            group.flows += node.flows
+
+    dropped = max(0, len(collapsed) - budget.max_edges)
+    if dropped:
+        logger.info(f"Diagram edge budget: dropped {dropped} lightest of {len(collapsed)} edges")
+
+    return LodView(level, levels, by_id, groups, display_id, collapsed[:budget.max_edges],
+                   source_edges, unit, dropped)
+
+
+def _quote(label: str) -> str:
+    return label.replace('"', '#quot;')
+
+
+def group_label(group: LodGroup, unit: str) -> str:
+    """Label of an aggregated node"""
+    return f"<b>{group.key}</b><br/>{len(group.members)} {unit} | {group.flows} flows"
+
+
+def edge_label(edge: LodEdge) -> str:
+    """Label of a drawn edge: flow count and first labels"""
+    label = f"{edge.flows} flows"
+    if edge.labels:
+        labels = sorted(edge.labels)
+        label += '<br/>' + ', '.join(labels[:MAX_EDGE_LABELS])
+        if len(labels) > MAX_EDGE_LABELS:
+            label += f" +{len(labels) - MAX_EDGE_LABELS} more"
+    return label
+
+
+def render_view(
+    view: LodView,
+    partitions: Optional[Dict[str, LodPartition]] = None,
+    direction: str = 'TB',
+    title: str = '',
+    class_defs: Sequence[str] = ()
+) -> str:
+    """
+    Mermaid source for a view
+
+    Groups are drawn as subroutine-shaped nodes ([[...]]) - the drillable
+    aggregates - with their partition's classDef.
+
+    Args:
+        view: LodView from aggregate()
+        partitions: Partition -> subgraph (partitions not listed, or '', are
+            drawn outside subgraphs); subgraphs follow this order
+        direction: Mermaid graph direction
+        title: Comment line at the top
+        class_defs: classDef lines
+
+    Returns:
+        Mermaid source
+    """
+    partitions = partitions or {}
+    lines = [f"graph {direction}"]
+    if title:
+        lines.append(f"    %% {title}")
+    if view.aggregated:
+        used = ', '.join(sorted({group.level for group in view.groups.values()})) or view.level
+        lines.append(f"    %% Level of detail: {used} - {len(view.groups)} groups, "
+                     f"{view.dropped_edges} edges dropped (drill-down in .lod.json manifest)")
+    lines.extend(f"    {class_def}" for class_def in class_defs)
+    lines.append("")
+
+    by_partition = defaultdict(list)
+    for drawn_id in view.drawn():
+        item = view.groups.get(drawn_id) or view.nodes[drawn_id]
+        by_partition[item.partition].append(drawn_id)
+
+    def node_line(drawn_id: str, style: str) -> str:
+        group = view.groups.get(drawn_id)
+        if group:
+            line = f"{drawn_id}[[\"{_quote(group_label(group, view.unit))}\"]]"
+        else:
+            node = view.nodes[drawn_id]
+            line = f"{drawn_id}[\"{_quote(node.label)}\"]"
+            style = node.style or style
+        return f"{line}:::{style}" if style else line
+
+    ordered = [name for name in partitions if name in by_partition]
+    ordered += [name for name in by_partition if name not in partitions]
+    for name in ordered:
+        partition = partitions.get(name) if name else None
+        if partition:
+            lines.append(f"    subgraph {partition.id}[\"{_quote(partition.label)}\"]")
+            lines.append("        direction LR")
+            lines.extend(f"        {node_line(drawn_id, partition.style)}" for drawn_id in by_partition[name])
+            lines.append("    end")
+        else:
+            lines.extend(f"    {node_line(drawn_id, '')}" for drawn_id in by_partition[name])
+        lines.append("")
+
+    for edge in view.edges:
+        lines.append(f"    {edge.src} -->|{edge_label(edge)}| {edge.dst}")
+
+    return '\n'.join(lines) + '\n'
+
+
+def _lod_dir(manifest_path: Path) -> Path:
+    """Directory of a manifest's sub-diagrams (ACDA_diagram.lod.json -> ACDA_diagram.lod/)"""
+    return manifest_path.with_name(manifest_path.name[:-len('.json')])
+
+
+def _group_entry(group: LodGroup, view: LodView, lod_dir_name: str, parent: Optional[str] = None) -> Dict:
+    return {
+        'parent': parent,  # Group this one was split from (None = main diagram)
+        'label': group_label(group, view.unit),
+        'partition': group.partition,
+        'level': group.level,
+        'key': group.key,
+        'members': group.members,
+        'flows': group.flows,
+        'internal_flows': group.internal_flows,
+        'diagram': f"{lod_dir_name}/{group.id}.mmd",
+    }
+
+
+def write_manifest(
+    view: LodView,
+    manifest_path: Union[str, Path],
+    diagram: str,
+    partitions: Optional[Dict[str, LodPartition]] = None,
+    direction: str = 'TB',
+    class_defs: Sequence[str] = ()
+) -> Path:
+    """
+    Write the drill-down manifest of an aggregated view
+
+    Sub-diagrams of a previous manifest at the same path are removed (they
+    are regenerated on demand).
+
+    Args:
+        view: Aggregated LodView
+        manifest_path: Manifest file (<diagram stem>.lod.json)
+        diagram: Diagram file the manifest belongs to (name, for reference)
+        partitions, direction, class_defs: As render_view (reused for sub-diagrams)
+
+    Returns:
+        Manifest path
+    """
+    manifest_path = Path(manifest_path)
+    clear_manifest(manifest_path)
+    lod_dir_name = _lod_dir(manifest_path).name
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'diagram': diagram,
+        'level': view.level,
+        'levels': list(view.levels),
+        'unit': view.unit,
+        'direction': direction,
+        'class_defs': list(class_defs),
+        'partitions': {name: [p.id, p.label, p.style] for name, p in (partitions or {}).items()},
+        'dropped_edges': view.dropped_edges,
+        'nodes': {
+            node.id: {'label': node.label, 'partition': node.partition, 'keys': node.keys,
+                      'style': node.style, 'flows': node.flows}
+            for node in view.nodes.values()
+        },
+        'groups': {group.id: _group_entry(group, view, lod_dir_name) for group in view.groups.values()},
+        'edges': [[edge.src, edge.dst, edge.flows, sorted(edge.labels)] for edge in view.source_edges],
+    }
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    logger.info(f"[OK] Drill-down manifest: {manifest_path.name} ({len(view.groups)} groups)")
+    return manifest_path
+
+
+def clear_manifest(manifest_path: Union[str, Path]):
+    """Remove a manifest and its generated sub-diagrams (diagram no longer aggregated)"""
+    manifest_path = Path(manifest_path)
+    if manifest_path.exists():
+        manifest_path.unlink()
+    lod_dir = _lod_dir(manifest_path)
+    if lod_dir.is_dir():
+        shutil.rmtree(lod_dir)
+
+
+def load_manifest(manifest_path: Union[str, Path]) -> Dict:
+    """Read a drill-down manifest"""
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported drill-down manifest version in {manifest_path}: {manifest.get('version')}")
+    return manifest
+
+
+def expand_group(
+    manifest_path: Union[str, Path],
+    group_id: str,
+    budget: Optional[DiagramBudget] = None,
+    force: bool = False
+) -> Path:
+    """
+    Generate (once) the expanded sub-diagram of one group
+
+    The sub-diagram shows the group's members and their edges to the rest
+    of the diagram (drawn as in the parent view). Members that exceed the
+    budget are aggregated at the levels finer than the group's; the new
+    sub-groups are added to the manifest.
+
+    Args:
+        manifest_path: Drill-down manifest
+        group_id: Group to expand (e.g. 'G3' or 'G3_2')
+        budget: Node/edge budget (default: DiagramBudget.from_env())
+        force: Regenerate even if the sub-diagram exists
+
+    Returns:
+        Path of the sub-diagram (.mmd)
+
+    Raises:
+        KeyError: If the group is not in the manifest
+    """
+    manifest_path = Path(manifest_path)
+    manifest = load_manifest(manifest_path)
+    if group_id not in manifest['groups']:
+        raise KeyError(f"Group {group_id} not in {manifest_path.name} (groups: {', '.join(manifest['groups'])})")
+
+    group = manifest['groups'][group_id]
+    output = manifest_path.parent / group['diagram']
+    if output.exists() and not force:
+        return output
+
+    # Nodes outside the group are drawn as in the view the group was drawn in
+    groups = manifest['groups']
+    group_of = {}
+    for other_id, other in groups.items():
+        for member in other['members']:
+            group_of[(other.get('parent'), member)] = other_id
+
+    def drawn_as(node_id: str, parent: Optional[str]) -> str:
+        if (parent, node_id) in group_of:
+            return group_of[(parent, node_id)]
+        if parent is None or node_id in groups[parent]['members']:
+            return node_id
+        return drawn_as(node_id, groups[parent].get('parent'))
+
+    members = set(group['members'])
+    nodes = [LodNode(member, **manifest['nodes'][member]) for member in group['members']]
+    context = {}
+    edges = []
+    for src, dst, flows, labels in manifest['edges']:
+        if src not in members and dst not in members:
+            continue
+        ends = []
+        for end in (src, dst):
+            if end not in members:
+                end = drawn_as(end, group.get('parent'))
+                if end not in context:
+                    label = groups[end]['label'] if end in groups else manifest['nodes'][end]['label']
+                    context[end] = LodNode(end, label, '', pinned=True)
+            ends.append(end)
+        edges.append(LodEdge(ends[0], ends[1], flows, set(labels)))
+
+    levels = manifest['levels']
+    finer = levels[:levels.index(group['level'])] if group['level'] in levels else levels
+    view = aggregate(nodes + list(context.values()), edges, finer, budget,
+                     prefix=f"{group_id}_", unit=manifest['unit'], last_resort=RANGE_LEVEL)
+
+    partitions = {name: LodPartition(*spec) for name, spec in manifest['partitions'].items()}
+    mermaid = render_view(view, partitions, manifest['direction'],
+                          title=f"{manifest['diagram']} - {group['key']} ({len(members)} {manifest['unit']})",
+                          class_defs=manifest['class_defs'])
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(mermaid, encoding='utf-8')
+
+    if view.groups:
+        lod_dir_name = _lod_dir(manifest_path).name
+        for sub_group in view.groups.values():
+            groups[sub_group.id] = _group_entry(sub_group, view, lod_dir_name, parent=group_id)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+
+    logger.info(f"[OK] Expanded {group_id}: {output.name} ({len(members)} {manifest['unit']})")
+    return output
@@ -13,6 +13,19 @@ from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 from collections import defaultdict, Counter
 
+try:
+    from src.diagram_lod import (
+        NETWORK_LEVELS, DiagramBudget, LodEdge, LodNode, LodPartition,
+        aggregate, clear_manifest, network_keys, render_view, write_manifest
+    )
+    from src.html_templates import write_page
+except ImportError:
+    from diagram_lod import (
+        NETWORK_LEVELS, DiagramBudget, LodEdge, LodNode, LodPartition,
+        aggregate, clear_manifest, network_keys, render_view, write_manifest
+    )
+    from html_templates import write_page
+
 logger = logging.getLogger(__name__)
 
 
@@ -215,6 +228,11 @@ class MermaidDiagramGenerator:
         # Collect flow summary
         flow_summary = defaultdict(lambda: {'count': 0, 'bytes': 0, 'protocols': set(), 'ports': set()})
 
+        # Per-node aggregates, built in the same pass (no per-node scans of flow_summary)
+        inbound_ports = defaultdict(set)       # IP -> ports it receives connections on
+        inbound_protocols = defaultdict(set)   # IP -> protocols it receives
+        outbound_ports = defaultdict(set)      # IP -> ports it connects to
+
         for record in app_records:
             # Skip records with None IPs
             if record.src_ip is None or record.dst_ip is None:
@@ -229,10 +247,14 @@ class MermaidDiagramGenerator:
 
             if hasattr(record, 'port') and record.port:
                 proto = getattr(record, 'protocol', 'TCP')
-                flow_summary[key]['protocols'].add(f"{proto}:{record.port}")
+                protocol = f"{proto}:{record.port}"
                 flow_summary[key]['ports'].add(record.port)
+                inbound_ports[record.dst_ip].add(record.port)
+                outbound_ports[record.src_ip].add(record.port)
             else:
-                flow_summary[key]['protocols'].add(getattr(record, 'protocol', 'TCP'))
+                protocol = getattr(record, 'protocol', 'TCP')
+            flow_summary[key]['protocols'].add(protocol)
+            inbound_protocols[record.dst_ip].add(protocol)
 
         logger.info(f"  Application has {len(application_components)} internal components")
         logger.info(f"  Application depends on {len(external_dependencies)} external services")
@@ -240,13 +262,9 @@ class MermaidDiagramGenerator:
         # Classify external dependencies by service type
         dependency_types = {}
         for dep_ip in external_dependencies:
-            # Find ports and protocols used for this dependency
-            ports_used = set()
-            protocols_used = set()
-            for (src, dst), stats in flow_summary.items():
-                if dst == dep_ip:
-                    ports_used.update(stats['ports'])
-                    protocols_used.update(stats['protocols'])
+            # Ports and protocols used for this dependency
+            ports_used = inbound_ports.get(dep_ip, set())
+            protocols_used = inbound_protocols.get(dep_ip, set())
 
             # Check for TDS protocol (SQL Server) - User clarification: TDS indicates database connection
             has_tds = any('TDS' in str(proto).upper() for proto in protocols_used)
@@ -287,21 +305,15 @@ class MermaidDiagramGenerator:
         # User request: Classify source components by type to show intra-app flows (web→app→db)
         app_components_by_type = defaultdict(list)
 
-        for comp_ip in application_components:
-            # Find ports this component USES (as a client, outbound)
-            outbound_ports = set()
-            inbound_ports = set()  # Ports this component listens on (as a server)
-
-            for (src, dst), stats in flow_summary.items():
-                if src == comp_ip:
-                    outbound_ports.update(stats['ports'])
-                # Check if this IP receives connections (is a destination in other flows)
-                if dst == comp_ip:
-                    inbound_ports.update(stats['ports'])
+        # Resolve all component names in one batch call
+        component_names = self.hostname_resolver.resolve_many_with_display(application_components, None)
 
-            # Classify by service type based on ports and hostname
-            hostname, display_label = self.hostname_resolver.resolve_with_display(comp_ip, None)
-            service_type = self._classify_service_type(comp_ip, hostname, inbound_ports, outbound_ports)
+        for comp_ip in application_components:
+            # Classify by service type based on ports (listened on / used as client) and hostname
+            hostname, display_label = component_names[comp_ip]
+            service_type = self._classify_service_type(
+                comp_ip, hostname, inbound_ports.get(comp_ip, set()), outbound_ports.get(comp_ip, set())
+            )
 
             # REQUIREMENTS 1-2: Add app code to display label
             display_label_with_app = f"{display_label} [{app_name}]"
@@ -309,6 +321,7 @@ class MermaidDiagramGenerator:
             app_components_by_type[service_type].append({
                 'ip': comp_ip,
                 'safe_name': self._safe_name(comp_ip),
+                'hostname': hostname,
                 'display_label': display_label_with_app
             })
 
@@ -327,6 +340,41 @@ class MermaidDiagramGenerator:
             'UNKNOWN': {'class': 'mgmtTier', 'label': 'Unknown/Other', 'icon': '?'}
         }
 
+        # Group external dependencies by type (RIGHT SIDE)
+        deps_by_type = defaultdict(list)
+        dependency_names = self.hostname_resolver.resolve_many_with_display(external_dependencies, 'EXTERNAL')
+
+        for dep_ip in external_dependencies:
+            dep_type = dependency_types.get(dep_ip, 'downstream_app')
+            hostname, display_label = dependency_names[dep_ip]
+
+            deps_by_type[dep_type].append({
+                'ip': dep_ip,
+                'safe_name': self._safe_name(dep_ip),
+                'hostname': hostname,
+                'display_label': display_label
+            })
+
+        # External dependency subgraph titles (RIGHT SIDE)
+        type_labels = {
+            'queue': 'Queues',
+            'cache': 'Caches',
+            'database': 'Databases',
+            'downstream_app': 'Downstream Applications'
+        }
+
+        # Level of detail: too many servers or flows for one readable diagram -
+        # aggregate them (drill-down via the .lod.json manifest) instead of truncating
+        budget = DiagramBudget.from_env()
+        manifest_path = Path(output_path).with_suffix('.lod.json')
+        if not budget.fits(len(application_components | external_dependencies), len(flow_summary)):
+            mermaid_content = self._render_lod_app_diagram(
+                app_name, lines, app_components_by_type, deps_by_type, flow_summary,
+                service_order, service_config, type_labels, budget, manifest_path
+            )
+            return self._save_app_diagram(app_name, mermaid_content, output_path)
+        clear_manifest(manifest_path)
+
         # Add application service tiers as SEPARATE subgraphs (LEFT SIDE - stacked vertically)
         lines.append(f"    %% Application Components by Service Type")
         for service_type in service_order:
@@ -356,27 +404,6 @@ class MermaidDiagramGenerator:
             lines.append("    end")
             lines.append("")
 
-        # Group external dependencies by type (RIGHT SIDE)
-        deps_by_type = defaultdict(list)
-
-        for dep_ip in external_dependencies:
-            dep_type = dependency_types.get(dep_ip, 'downstream_app')
-            hostname, display_label = self.hostname_resolver.resolve_with_display(dep_ip, 'EXTERNAL')
-
-            deps_by_type[dep_type].append({
-                'ip': dep_ip,
-                'safe_name': self._safe_name(dep_ip),
-                'display_label': display_label
-            })
-
-        # Add external dependencies subgraphs (RIGHT SIDE)
-        type_labels = {
-            'queue': 'Queues',
-            'cache': 'Caches',
-            'database': 'Databases',
-            'downstream_app': 'Downstream Applications'
-        }
-
         lines.append(f"    %% Infrastructure & External Dependencies (Right Side)")
         for dep_type in ['queue', 'cache', 'database', 'downstream_app']:
             if dep_type not in deps_by_type:
@@ -522,8 +549,86 @@ class MermaidDiagramGenerator:
             lines.append(f"    {src_safe} -->|{edge_label_full}| {dst_safe}")
             flows_added.add((src, dst))
 
-        mermaid_content = '\n'.join(lines)
+        return self._save_app_diagram(app_name, '\n'.join(lines), output_path)
+
+    def _render_lod_app_diagram(
+        self,
+        app_name: str,
+        lines: List[str],
+        app_components_by_type: Dict[str, List[Dict]],
+        deps_by_type: Dict[str, List[Dict]],
+        flow_summary: Dict[Tuple[str, str], Dict],
+        service_order: List[str],
+        service_config: Dict[str, Dict],
+        type_labels: Dict[str, str],
+        budget: DiagramBudget,
+        manifest_path: Path
+    ) -> str:
+        """
+        Application diagram aggregated to fit the diagram budget
 
+        Servers are grouped by hostname pattern, /24, /16 or whole tier (the
+        finest level that fits); the drill-down manifest lists each group's
+        members for expand_diagram_group.py.
+        """
+        node_flows = defaultdict(int)
+        for (src, dst), stats in flow_summary.items():
+            node_flows[src] += stats['count']
+            node_flows[dst] += stats['count']
+
+        dep_classes = {'database': 'database', 'cache': 'cache', 'queue': 'queue', 'downstream_app': 'downstream'}
+        partitions = {}
+        nodes = {}
+
+        for service_type in service_order:
+            if service_type not in app_components_by_type:
+                continue
+            config = service_config[service_type]
+            comps = app_components_by_type[service_type]
+            partitions[service_type] = LodPartition(
+                self._safe_name(f"{app_name}_{service_type}"),
+                f"{config['label']}<br/>{len(comps)} server(s)",
+                config['class']
+            )
+            for comp in sorted(comps, key=lambda x: x['ip']):
+                nodes[comp['ip']] = (comp, service_type, config['class'])
+
+        for dep_type in ['queue', 'cache', 'database', 'downstream_app']:
+            if dep_type not in deps_by_type:
+                continue
+            partitions[dep_type] = LodPartition(self._safe_name(f"{dep_type}_infra"), type_labels[dep_type],
+                                                dep_classes[dep_type])
+            for dep in sorted(deps_by_type[dep_type], key=lambda x: x['ip']):
+                # Servers that are also dependencies are drawn once, in their tier
+                nodes.setdefault(dep['ip'], (dep, dep_type, dep_classes[dep_type]))
+
+        lod_nodes = []
+        for ip, (info, partition, style) in nodes.items():
+            label = self._sanitize_label(info['display_label'])
+            if '⚠️' in label or '[NO DNS]' in label:
+                style = 'missingData'
+            lod_nodes.append(LodNode(info['safe_name'], label, partition, network_keys(ip, info['hostname']),
+                                     style, node_flows[ip]))
+
+        lod_edges = [
+            LodEdge(self._safe_name(src), self._safe_name(dst), stats['count'], set(stats['protocols']))
+            for (src, dst), stats in flow_summary.items()
+        ]
+
+        view = aggregate(lod_nodes, lod_edges, NETWORK_LEVELS, budget, unit='servers')
+        logger.info(f"  Level of detail: {len(nodes)} servers -> {len(view.drawn())} nodes "
+                    f"({view.level}, {len(view.groups)} groups)")
+
+        class_defs = [line.strip() for line in lines if line.strip().startswith('classDef ')]
+        mermaid_content = render_view(view, partitions, 'TB',
+                                      title=f"Application: {app_name} - Tier-based Architecture View",
+                                      class_defs=class_defs)
+        write_manifest(view, manifest_path, manifest_path.name.replace('.lod.json', '.mmd'),
+                       partitions, 'TB', class_defs)
+        return mermaid_content.rstrip('\n')
+
+    def _save_app_diagram(self, app_name: str, mermaid_content: str, output_path: str) -> str:
+        """Write an application diagram as .mmd and .html"""
         # Save as .mmd file with markdown fencing for better compatibility
         mmd_file = Path(output_path)
         mmd_file.parent.mkdir(parents=True, exist_ok=True)
@@ -771,501 +876,9 @@ class MermaidDiagramGenerator:
             return False
 
     def _generate_html_diagram(self, mermaid_content: str, output_path: str, title: str):
-        """Generate standalone HTML file with Mermaid diagram"""
-        html_template = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>{title}</title>
-    <script src="https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/svg-pan-zoom/3.6.1/svg-pan-zoom.min.js"></script>
-    <style>
-        body {{
-            margin: 0;
-            padding: 20px;
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: #ffffff;
-            color: #333;
-        }}
-        h1 {{
-            color: #2c3e50;
-            text-align: center;
-            margin-bottom: 20px;
-            font-size: 24px;
-        }}
-        #diagram-wrapper {{
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            margin: 20px auto;
-            max-width: 95%;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            position: relative;
-        }}
-        #diagram-container {{
-            width: 100%;
-            height: 1200px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            overflow: auto;
-            position: relative;
-            background: #ffffff;
-        }}
-        #diagram-container svg {{
-            max-width: none !important;
-            width: auto !important;
-            height: auto !important;
-            min-width: 100%;
-        }}
-        .mermaid {{
-            width: 100%;
-            height: 100%;
-            display: flex;
-            justify-content: center;
-            align-items: flex-start;
-        }}
-        .controls {{
-            position: absolute;
-            top: 30px;
-            right: 30px;
-            z-index: 1000;
-            background: white;
-            padding: 10px;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.15);
-            border: 1px solid #ddd;
-        }}
-        .controls button {{
-            display: block;
-            width: 100%;
-            margin: 5px 0;
-            padding: 8px 16px;
-            background: #3498db;
-            color: white;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 500;
-        }}
-        .controls button:hover {{
-            background: #2980b9;
-        }}
-        .controls button:active {{
-            background: #21618c;
-        }}
-        .info {{
-            max-width: 95%;
-            margin: 20px auto;
-            background: #fafafa;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            border: 1px solid #e0e0e0;
-        }}
-        .info h2 {{
-            color: #2c3e50;
-            font-size: 20px;
-            margin-top: 0;
-        }}
-        .legend {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 15px;
-            margin-top: 15px;
-        }}
-        .legend-item {{
-            background: #f8f9fa;
-            padding: 15px;
-            border-radius: 6px;
-            border-left: 4px solid #3498db;
-        }}
-        .legend-title {{
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 8px;
-            font-size: 14px;
-        }}
-        .legend-item span {{
-            font-size: 13px;
-            line-height: 1.6;
-        }}
-        .theme-toggle {{
-            text-align: center;
-            margin: 10px 0;
-        }}
-        .theme-toggle label {{
-            margin-right: 10px;
-            font-weight: 500;
-        }}
-
-        /* Dark theme styles */
-        body.dark {{
-            background: #2d2d2d;
-            color: #e0e0e0;
-        }}
-        body.dark h1 {{
-            color: #64b5f6;
-        }}
-        body.dark #diagram-wrapper {{
-            background: #263238;
-        }}
-        body.dark #diagram-container {{
-            background: #2d3436;
-            border-color: #455a64;
-        }}
-        body.dark .info {{
-            background: #263238;
-        }}
-        body.dark .info h2 {{
-            color: #64b5f6;
-        }}
-        body.dark .legend-item {{
-            background: #37474f;
-            border-left-color: #64b5f6;
-        }}
-        body.dark .legend-title {{
-            color: #90caf9;
-        }}
-        body.dark .controls {{
-            background: #37474f;
-            border-color: #455a64;
-        }}
-    </style>
-</head>
-<body>
-    <h1>[SECURITY] {title}</h1>
-
-    <div class="info">
-        <div class="theme-toggle">
-            <label>Theme:</label>
-            <button onclick="toggleTheme('light')" style="padding: 6px 12px; margin: 0 5px; cursor: pointer;">Light</button>
-            <button onclick="toggleTheme('dark')" style="padding: 6px 12px; margin: 0 5px; cursor: pointer;">Dark</button>
-        </div>
-        <h2>Network Segmentation Diagram</h2>
-        <p>This diagram visualizes the network topology and traffic flows for security analysis and segmentation planning.</p>
-        <p><strong>Mouse Controls:</strong> Use mouse wheel to zoom, click and drag to pan. Use buttons on right for zoom controls.</p>
-        <p><strong>Keyboard Shortcuts (Requirement 8):</strong>
-            <code>+</code>=Zoom in,
-            <code>-</code>=Zoom out,
-            <code>0</code>/<code>R</code>=Reset,
-            <code>F</code>=Fit to screen,
-            <code>C</code>=Center,
-            <code>Arrow keys</code>=Pan,
-            <code>?</code>=Help
-        </p>
-
-        <div class="legend">
-            <div class="legend-item">
-                <div class="legend-title">Traffic Volume Indicators</div>
-                <span><strong>=====></strong> High volume (>100 flows) - Thick solid lines<br>
-                <strong>-----></strong> Medium volume (10-100 flows) - Solid lines<br>
-                <strong>-.-.-></strong> Low volume (<10 flows) - Dotted/dashed lines</span>
-            </div>
-            <div class="legend-item">
-                <div class="legend-title">Flow Direction Indicators (Requirement 6)</div>
-                <span>
-                <strong>INTRA-APP:</strong> Internal communication within same application (web→app→db)<br>
-                <strong>INTER-APP:</strong> Communication between different applications (internal network)<br>
-                <strong>EGRESS:</strong> Outbound traffic to external networks/internet<br>
-                <strong>INGRESS:</strong> Inbound traffic from external networks/internet (if shown)
-                </span>
-            </div>
-            <div class="legend-item">
-                <div class="legend-title">Security Zone Colors</div>
-                <span>
-                <span style="color: #f44336;">■</span> External/High Risk<br>
-                <span style="color: #ff9800;">■</span> DMZ/Medium Risk<br>
-                <span style="color: #4caf50;">■</span> Internal/Low Risk<br>
-                <span style="color: #2196f3;">■</span> Application Tier<br>
-                <span style="color: #ff5722;">■</span> Data Tier<br>
-                <span style="color: #00bcd4;">■</span> Cache Tier<br>
-                <span style="color: #9c27b0;">■</span> Messaging Tier<br>
-                <span style="color: #ffc107;">■</span> Management Tier
-                </span>
-            </div>
-            <div class="legend-item">
-                <div class="legend-title">Data Source Attribution</div>
-                <span>
-                <strong>[BLACK] Black solid</strong> = Observed from network flows (ExtraHop)<br>
-                <strong>[BLUE] Blue dashed</strong> = ML inference/predictions<br>
-                <strong>[WHITE] Gray dashed</strong> = Unknown/unclassified
-                </span>
-            </div>
-            <div class="legend-item">
-                <div class="legend-title">⚠️ Missing Data Indicators (Requirement 9)</div>
-                <span>
-                <strong style="color: #ff4444;">⚠️ IP [NO DNS]</strong> = Hostname not resolved - DNS lookup failed or no PTR record<br>
-                <span style="color: #ff4444;">■</span> Red dashed border indicates nodes requiring manual investigation<br>
-                These nodes may need hostname mapping, DNS configuration, or infrastructure review
-                </span>
-            </div>
-            <div class="legend-item" style="grid-column: 1 / -1; border-left-color: #9e9e9e; padding: 20px; font-size: 14px;">
-                <div class="legend-title" style="font-size: 16px; margin-bottom: 12px;">* Unknown Connections - Detailed Explanation</div>
-                <span style="font-size: 14px; line-height: 1.8;">
-                Unknown connections could not be definitively classified based on available ExtraHop network flow data.
-                This may occur when: <br><br>
-                <strong>(1)</strong> Destination endpoints do not have clear service type indicators in their network signatures<br>
-                <strong>(2)</strong> Flow data lacks sufficient context to determine the application protocol<br>
-                <strong>(3)</strong> Connections involve custom or proprietary services without standard port/protocol patterns<br><br>
-                <strong>Recommendation:</strong> Manual investigation and correlation with application configuration is recommended to properly classify these dependencies.
-                </span>
-            </div>
-        </div>
-    </div>
-
-    <div id="diagram-wrapper">
-        <div class="controls">
-            <button onclick="zoomIn()">Zoom In (+)</button>
-            <button onclick="zoomOut()">Zoom Out (-)</button>
-            <button onclick="resetView()">Reset View</button>
-            <button onclick="centerView()">Center</button>
-            <button onclick="fitView()">Fit to Screen</button>
-        </div>
-        <div id="diagram-container">
-            <div class="mermaid">
-{mermaid_content}
-            </div>
-        </div>
-    </div>
-
-    <script>
-        let panZoom;
-        let currentZoom = 1;
-        let currentPan = {{ x: 0, y: 0 }};
-
-        mermaid.initialize({{
-            startOnLoad: false,
-            theme: 'default',
-            flowchart: {{
-                useMaxWidth: true,
-                htmlLabels: true,
-                curve: 'linear',
-                padding: 15,
-                nodeSpacing: 80,
-                rankSpacing: 120,
-                diagramPadding: 15
-            }},
-            themeVariables: {{
-                primaryColor: '#fffde7',
-                primaryTextColor: '#000',
-                primaryBorderColor: '#f57c00',
-                lineColor: '#000000',
-                secondaryColor: '#fff9c4',
-                tertiaryColor: '#fffde7',
-                edgeLabelBackground: '#ffffff',
-                clusterBkg: '#fffde7',
-                clusterBorder: '#f57c00'
-            }}
-        }});
-
-        // Initialize diagram on window load
-        window.addEventListener('load', function() {{
-            const mermaidDiv = document.querySelector('.mermaid');
-            if (mermaidDiv) {{
-                mermaid.run({{ nodes: [mermaidDiv] }}).then(() => {{
-                    console.log('Mermaid rendered successfully');
-                    initializePanZoom();
-                }}).catch(err => {{
-                    console.error('Mermaid rendering failed:', err);
-                }});
-            }}
-        }});
-
-        function initializePanZoom() {{
-            setTimeout(() => {{
-                const svg = document.querySelector('#diagram-container svg');
-                console.log('SVG element:', svg);
-
-                if (svg) {{
-                    // Remove fixed dimensions
-                    svg.removeAttribute('width');
-                    svg.removeAttribute('height');
-                    svg.style.width = '100%';
-                    svg.style.height = 'auto';
-
-                    // Initialize svg-pan-zoom
-                    try {{
-                        panZoom = svgPanZoom(svg, {{
-                            zoomEnabled: true,
-                            controlIconsEnabled: false,
-                            fit: false,
-                            center: false,
-                            minZoom: 0.1,
-                            maxZoom: 20,
-                            zoomScaleSensitivity: 0.3,
-                            onZoom: function(level) {{
-                                currentZoom = level;
-                                console.log('Zoomed to:', level);
-                            }},
-                            onPan: function(point) {{
-                                currentPan = point;
-                            }}
-                        }});
-                        console.log('Pan-zoom initialized successfully');
-                    }} catch(err) {{
-                        console.error('Pan-zoom initialization failed:', err);
-                    }}
-                }} else {{
-                    console.error('SVG element not found');
-                }}
-            }}, 1000);
-        }}
-
-        // Manual zoom controls with fallback
-        function zoomIn() {{
-            if (panZoom) {{
-                panZoom.zoomIn();
-            }} else {{
-                currentZoom *= 1.3;
-                applyManualZoom();
-            }}
-        }}
-
-        function zoomOut() {{
-            if (panZoom) {{
-                panZoom.zoomOut();
-            }} else {{
-                currentZoom *= 0.7;
-                applyManualZoom();
-            }}
-        }}
-
-        function resetView() {{
-            if (panZoom) {{
-                panZoom.reset();
-            }} else {{
-                currentZoom = 1;
-                currentPan = {{ x: 0, y: 0 }};
-                applyManualZoom();
-            }}
-        }}
-
-        function centerView() {{
-            if (panZoom) {{
-                panZoom.center();
-            }}
-        }}
-
-        function fitView() {{
-            if (panZoom) {{
-                panZoom.fit();
-                panZoom.center();
-            }}
-        }}
-
-        function applyManualZoom() {{
-            const svg = document.querySelector('#diagram-container svg');
-            if (svg) {{
-                svg.style.transform = `scale(${{currentZoom}}) translate(${{currentPan.x}}px, ${{currentPan.y}}px)`;
-                svg.style.transformOrigin = 'top left';
-            }}
-        }}
-
-        // Theme toggle function
-        function toggleTheme(theme) {{
-            if (theme === 'dark') {{
-                document.body.classList.add('dark');
-                localStorage.setItem('theme', 'dark');
-            }} else {{
-                document.body.classList.remove('dark');
-                localStorage.setItem('theme', 'light');
-            }}
-        }}
-
-        // Load saved theme
-        const savedTheme = localStorage.getItem('theme') || 'light';
-        if (savedTheme === 'dark') {{
-            document.body.classList.add('dark');
-        }}
-
-        // REQUIREMENT 8: Keyboard navigation
-        document.addEventListener('keydown', function(e) {{
-            // Prevent default browser shortcuts for these keys
-            const handledKeys = ['+', '-', '=', '0', 'r', 'R', 'c', 'C', 'f', 'F'];
-            if (handledKeys.includes(e.key)) {{
-                e.preventDefault();
-            }}
-
-            switch(e.key) {{
-                case '+':
-                case '=':  // Also handle = key (same as + without shift)
-                    zoomIn();
-                    console.log('Keyboard: Zoom in (+)');
-                    break;
-                case '-':
-                case '_':
-                    zoomOut();
-                    console.log('Keyboard: Zoom out (-)');
-                    break;
-                case '0':
-                    resetView();
-                    console.log('Keyboard: Reset view (0)');
-                    break;
-                case 'r':
-                case 'R':
-                    resetView();
-                    console.log('Keyboard: Reset view (R)');
-                    break;
-                case 'c':
-                case 'C':
-                    centerView();
-                    console.log('Keyboard: Center view (C)');
-                    break;
-                case 'f':
-                case 'F':
-                    fitView();
-                    console.log('Keyboard: Fit to screen (F)');
-                    break;
-                case 'ArrowUp':
-                    if (panZoom) {{
-                        panZoom.panBy({{x: 0, y: 50}});
-                    }}
-                    break;
-                case 'ArrowDown':
-                    if (panZoom) {{
-                        panZoom.panBy({{x: 0, y: -50}});
-                    }}
-                    break;
-                case 'ArrowLeft':
-                    if (panZoom) {{
-                        panZoom.panBy({{x: 50, y: 0}});
-                    }}
-                    break;
-                case 'ArrowRight':
-                    if (panZoom) {{
-                        panZoom.panBy({{x: -50, y: 0}});
-                    }}
-                    break;
-                case '?':
-                    // Show keyboard shortcuts help
-                    alert(
-                        'KEYBOARD SHORTCUTS:\\n\\n' +
-                        'Zoom:\\n' +
-                        '  + or = : Zoom in\\n' +
-                        '  - : Zoom out\\n' +
-                        '  0 or R : Reset view\\n' +
-                        '  F : Fit to screen\\n' +
-                        '  C : Center view\\n\\n' +
-                        'Pan:\\n' +
-                        '  Arrow keys : Pan in direction\\n\\n' +
-                        'Help:\\n' +
-                        '  ? : Show this help'
-                    );
-                    break;
-            }}
-        }});
-
-        console.log('Keyboard navigation enabled. Press ? for help.');
-    </script>
-</body>
-</html>'''
-
-        html_file = Path(output_path)
-        html_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_template)
+        """Generate HTML page for the diagram (shell from the shared static bundle)"""
+        write_page('network_diagram', output_path, title, fields={'title': title},
+                   diagrams={'main': mermaid_content})
 
         logger.info(f"[OK] HTML diagram saved: {output_path}")
 
@@ -0,0 +1,814 @@
+"""
+Flow Feature Store
+===================
+Real per-node and per-app features for the ML/DL models, computed from
+flow records with vectorized group-bys (no per-record Python loops, no
+random padding).
+
+Feature sets (all float32):
+    node features   [num_nodes, 64]          - GAT / GNN node inputs
+    app features    [num_apps, 128]          - ensemble traffic matrices, VAE
+    app sequences   [num_apps, seq_len, 32]  - transformer / RNN inputs
+    time buckets    [num_apps, num_buckets, 32] - windowed transformer training
+
+Node features depend on the whole graph and are cached under the hash of
+all flows. App features and sequences only depend on the app's own flows
+and are cached per app under the hash of that app's flows, so unchanged
+apps are served from cache when new data arrives for other apps.
+
+Cache layout (default ./outputs/feature_store/):
+    nodes_<hash>.npz     - node ids + node feature matrix
+    apps/<app>.L<n>.npz  - app hash, feature row, sequence of length n
+    buckets_<hash>_<interval>s.f32 (+ .json) - memory-mapped time buckets
+
+Author: Network Security Team
+Version: 1.0
+"""
+
+import hashlib
+import json
+import logging
+import re
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NODE_FEATURE_DIM = 64
+APP_FEATURE_DIM = 128
+SEQUENCE_FEATURE_DIM = 32
+BUCKET_FEATURE_DIM = 32
+
+# Destination port categories (named services first, then IANA ranges)
+SERVICE_PORTS = [
+    ('web', [80, 443, 8080, 8443]),
+    ('ssh', [22]),
+    ('dns', [53]),
+    ('smtp', [25]),
+    ('ntp', [123]),
+    ('windows', [135, 139, 445, 3389]),
+    ('ldap', [389, 636]),
+    ('mssql', [1433]),
+    ('oracle', [1521]),
+    ('mysql', [3306]),
+    ('postgres', [5432]),
+    ('messaging', [5672, 9092, 61616]),
+    ('redis', [6379]),
+    ('search', [9200, 9300]),
+    ('mongodb', [27017]),
+]
+PORT_CATEGORIES = [name for name, _ in SERVICE_PORTS] + ['well_known', 'registered', 'ephemeral', 'none']
+TRANSPORTS = ['tcp', 'udp', 'icmp', 'other']
+
+QUANTILES = (0.5, 0.9, 0.99)
+APP_TIME_BUCKETS = 56
+
+_PORT_LOOKUP = np.array(sorted(p for _, ports in SERVICE_PORTS for p in ports), dtype=np.int64)
+_PORT_LOOKUP_CODE = np.array([
+    next(i for i, (_, ports) in enumerate(SERVICE_PORTS) if p in ports) for p in _PORT_LOOKUP
+], dtype=np.int64)
+
+
+def port_categories(ports: np.ndarray) -> np.ndarray:
+    """Map destination ports (-1 = none) to PORT_CATEGORIES codes"""
+    ports = np.asarray(ports, dtype=np.int64)
+    codes = np.select(
+        [ports < 0, ports < 1024, ports < 49152],
+        [PORT_CATEGORIES.index('none'), PORT_CATEGORIES.index('well_known'), PORT_CATEGORIES.index('registered')],
+        PORT_CATEGORIES.index('ephemeral')
+    )
+    pos = np.clip(np.searchsorted(_PORT_LOOKUP, ports), 0, len(_PORT_LOOKUP) - 1)
+    named = _PORT_LOOKUP[pos] == ports
+    codes[named] = _PORT_LOOKUP_CODE[pos[named]]
+    return codes
+
+
+def _ports(records: List) -> np.ndarray:
+    """Integer ports (-1 when missing); tolerates string ports from raw CSV records"""
+    ports = [r.port if r.port is not None else -1 for r in records]
+    try:
+        return np.array(ports, dtype=np.int64)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(ports, dtype=object), errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+
+
+def flows_to_frame(records: List) -> pd.DataFrame:
+    """Columnar view of FlowRecord objects (one pass over the records)"""
+    return pd.DataFrame({
+        'app': [r.app_name for r in records],
+        'src': [r.src_ip for r in records],
+        'dst': [r.dst_ip for r in records],
+        'port': _ports(records),
+        'transport': [(r.transport or 'other').lower() for r in records],
+        'bytes': np.array([r.bytes or 0 for r in records], dtype=np.float64),
+        'packets': np.array([r.packets or 0 for r in records], dtype=np.float64),
+        'duration': np.array([getattr(r, 'duration', None) or 0.0 for r in records], dtype=np.float64),
+        'is_internal': np.array([bool(r.is_internal) for r in records], dtype=bool),
+        'timestamp': pd.to_datetime([getattr(r, 'timestamp', None) for r in records]),
+    })
+
+
+def _histogram(groups: np.ndarray, bins: np.ndarray, num_groups: int, num_bins: int,
+               normalize: bool = True) -> np.ndarray:
+    """Per-group bin counts [num_groups, num_bins] (optionally as fractions)"""
+    counts = np.bincount(groups * num_bins + bins, minlength=num_groups * num_bins)
+    counts = counts.reshape(num_groups, num_bins).astype(np.float64)
+    if normalize:
+        totals = counts.sum(axis=1, keepdims=True)
+        counts = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+    return counts
+
+
+def _group_quantiles(groups: np.ndarray, values: np.ndarray, num_groups: int,
+                     quantiles=QUANTILES) -> np.ndarray:
+    """Per-group quantiles [num_groups, len(quantiles)] (linear interpolation, 0 for empty groups)"""
+    result = np.zeros((num_groups, len(quantiles)))
+    if len(values) == 0:
+        return result
+
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=num_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    present = counts > 0
+
+    for k, q in enumerate(quantiles):
+        position = q * (counts[present] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts[present] - 1)
+        fraction = position - lower
+        low_values = sorted_values[starts[present] + lower]
+        high_values = sorted_values[starts[present] + upper]
+        result[present, k] = low_values + (high_values - low_values) * fraction
+
+    return result
+
+
+def _distinct(keys: np.ndarray) -> np.ndarray:
+    """Distinct int64 keys (hash-based, order not guaranteed)"""
+    return pd.unique(np.asarray(keys, dtype=np.int64))
+
+
+def _key_counts(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct int64 keys and their counts"""
+    codes, distinct = pd.factorize(np.asarray(keys, dtype=np.int64))
+    return distinct, np.bincount(codes, minlength=len(distinct))
+
+
+def _group_sum(groups: np.ndarray, values: np.ndarray, num_groups: int) -> np.ndarray:
+    return np.bincount(groups, weights=values, minlength=num_groups)
+
+
+def _cyclic(values: np.ndarray, period: float) -> Tuple[np.ndarray, np.ndarray]:
+    angle = 2 * np.pi * values / period
+    return np.sin(angle), np.cos(angle)
+
+
+def _interval_seconds(interval) -> float:
+    """Bucket width in seconds from a number or a pandas offset string ('1h', '15min')"""
+    if isinstance(interval, (int, float, np.number)):
+        seconds = float(interval)
+    else:
+        seconds = pd.Timedelta(interval).total_seconds()
+    if seconds <= 0:
+        raise ValueError(f"Bucket interval must be positive, got {interval!r}")
+    return seconds
+
+
+class _ScratchDir:
+    """Temporary directory, removed once nothing references it (or at exit)"""
+
+    def __init__(self, prefix: str):
+        self.path = Path(tempfile.mkdtemp(prefix=prefix))
+        weakref.finalize(self, shutil.rmtree, str(self.path), True)
+
+
+class TimeBucketSeries:
+    """
+    Per-app time-bucketed activity stored as a memory-mapped float32 array
+
+    The array [num_apps, num_buckets, BUCKET_FEATURE_DIM] lives in a raw
+    .f32 file; a .json sidecar next to it records the shape, app order,
+    start time and bucket width, so the file can be re-opened (including
+    from DataLoader worker processes) without rebuilding.
+    """
+
+    def __init__(self, path: str, apps: List[str], start: float, interval: float, num_buckets: int):
+        self.path = Path(path)
+        self.apps = list(apps)
+        self.start = float(start)
+        self.interval = float(interval)
+        self.num_buckets = int(num_buckets)
+        self._values: Optional[np.memmap] = None
+        self._scratch: Optional[_ScratchDir] = None  # Keeps a store's temp dir alive
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return len(self.apps), self.num_buckets, BUCKET_FEATURE_DIM
+
+    @property
+    def values(self) -> np.memmap:
+        """Read-only memory map of the bucket array (opened on first access)"""
+        if self._values is None:
+            self._values = np.memmap(self.path, dtype=np.float32, mode='r', shape=self.shape)
+        return self._values
+
+    @property
+    def metadata_path(self) -> Path:
+        return self.path.with_suffix('.json')
+
+    def bucket_times(self) -> pd.DatetimeIndex:
+        """Start time of every bucket"""
+        return pd.to_datetime(self.start + np.arange(self.num_buckets) * self.interval, unit='s')
+
+    def save_metadata(self, content_hash: str = ''):
+        with open(self.metadata_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'apps': self.apps,
+                'start': self.start,
+                'interval': self.interval,
+                'num_buckets': self.num_buckets,
+                'feature_dim': BUCKET_FEATURE_DIM,
+                'content_hash': content_hash,
+            }, f)
+
+    @classmethod
+    def open(cls, path: str) -> 'TimeBucketSeries':
+        """Re-open a series written by FeatureStore.time_buckets()"""
+        path = Path(path)
+        with open(path.with_suffix('.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('feature_dim') != BUCKET_FEATURE_DIM:
+            raise ValueError(f"{path}: feature_dim {meta.get('feature_dim')} != {BUCKET_FEATURE_DIM}")
+        return cls(path, meta['apps'], meta['start'], meta['interval'], meta['num_buckets'])
+
+
+class FeatureStore:
+    """
+    Cached, vectorized feature builder over a set of flow records
+
+    Usage:
+        store = FeatureStore(parser.records)
+        X_nodes = store.node_features(list(graph.nodes()))    # GAT
+        X_apps = store.app_features(app_names)                # ensemble / VAE
+        seqs = store.app_sequences(app_names, seq_len=50)     # transformer
+    """
+
+    def __init__(self, records: List, cache_dir: Optional[str] = './outputs/feature_store',
+                 seq_len: int = 50):
+        """
+        Args:
+            records: FlowRecord objects
+            cache_dir: On-disk cache directory (None = in-memory only; time
+                buckets then go to one temp dir per store, removed with it)
+            seq_len: Default sequence length for app_sequences()
+        """
+        self.frame = flows_to_frame(records)
+        self.seq_len = seq_len
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        frame = self.frame
+        self.app_codes, self.apps = pd.factorize(frame['app'], sort=False)
+        self.apps = [str(a) for a in self.apps]
+        self.app_position = {app: i for i, app in enumerate(self.apps)}
+
+        self.content_hash, self.app_hashes = self._hash_flows()
+
+        self._node_cache: Optional[Tuple[Dict[str, int], np.ndarray]] = None
+        self._scratch: Optional[_ScratchDir] = None
+        self._app_cache: Dict[Tuple[str, int], Dict] = {}
+
+        logger.info(f"FeatureStore: {len(frame)} flows, {len(self.apps)} apps "
+                   f"(hash {self.content_hash[:12]})")
+
+    # ------------------------------------------------------------------
+    # Hashing / cache
+    # ------------------------------------------------------------------
+
+    def _hash_flows(self) -> Tuple[str, Dict[str, str]]:
+        """Global content hash + per-app hashes from vectorized row hashes"""
+        if len(self.frame) == 0:
+            return hashlib.sha256(b'').hexdigest(), {}
+
+        row_hashes = pd.util.hash_pandas_object(self.frame, index=False).to_numpy()
+        content_hash = hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+        order = np.argsort(self.app_codes, kind='stable')
+        bounds = np.cumsum(np.bincount(self.app_codes, minlength=len(self.apps)))[:-1]
+        app_hashes = {
+            app: hashlib.sha256(row_hashes[rows].tobytes()).hexdigest()
+            for app, rows in zip(self.apps, np.split(order, bounds))
+        }
+        return content_hash, app_hashes
+
+    def _app_cache_file(self, app: str, seq_len: int) -> Path:
+        safe_name = re.sub(r'[^A-Za-z0-9_-]', '_', app)
+        return self.cache_dir / 'apps' / f'{safe_name}.L{seq_len}.npz'
+
+    def _load_cached_apps(self, apps: List[str], seq_len: int) -> List[str]:
+        """Fill the in-memory cache from disk; return apps that still need computing"""
+        missing = []
+        for app in apps:
+            if (app, seq_len) in self._app_cache:
+                continue
+
+            if self.cache_dir is not None:
+                cache_file = self._app_cache_file(app, seq_len)
+                if cache_file.exists():
+                    try:
+                        with np.load(cache_file, allow_pickle=False) as cached:
+                            if str(cached['app']) == app and str(cached['hash']) == self.app_hashes[app] \
+                                    and int(cached['seq_len']) == seq_len:
+                                self._app_cache[(app, seq_len)] = {
+                                    'features': cached['features'],
+                                    'sequence': cached['sequence']
+                                }
+                                continue
+                    except (OSError, ValueError, KeyError) as e:
+                        logger.debug(f"Ignoring unreadable feature cache {cache_file}: {e}")
+
+            missing.append(app)
+        return missing
+
+    def _store_apps(self, apps: List[str], features: np.ndarray, sequences: np.ndarray, seq_len: int):
+        for i, app in enumerate(apps):
+            self._app_cache[(app, seq_len)] = {'features': features[i], 'sequence': sequences[i]}
+
+            if self.cache_dir is not None:
+                cache_file = self._app_cache_file(app, seq_len)
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                np.savez(cache_file, app=app, hash=self.app_hashes[app], seq_len=seq_len,
+                         features=features[i], sequence=sequences[i])
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def node_features(self, nodes: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Node feature matrix (zeros for nodes not seen in the flows)
+
+        Args:
+            nodes: Node IDs in the desired row order (default: all, first-seen order)
+
+        Returns:
+            float32 [len(nodes), NODE_FEATURE_DIM]
+        """
+        if self._node_cache is None:
+            self._node_cache = self._load_or_build_nodes()
+        index, matrix = self._node_cache
+
+        if nodes is None:
+            return matrix.copy()
+
+        rows = np.array([index.get(node, -1) for node in nodes], dtype=np.int64)
+        result = np.zeros((len(rows), NODE_FEATURE_DIM), dtype=np.float32)
+        known = rows >= 0
+        result[known] = matrix[rows[known]]
+        return result
+
+    def app_features(self, apps: Optional[List[str]] = None) -> np.ndarray:
+        """
+        App feature matrix (zeros for apps without flows)
+
+        Args:
+            apps: App names in the desired row order (default: all, first-seen order)
+
+        Returns:
+            float32 [len(apps), APP_FEATURE_DIM]
+        """
+        apps = self.apps if apps is None else list(apps)
+        self._ensure_apps(apps, self.seq_len)
+
+        result = np.zeros((len(apps), APP_FEATURE_DIM), dtype=np.float32)
+        for i, app in enumerate(apps):
+            entry = self._app_cache.get((app, self.seq_len))
+            if entry is not None:
+                result[i] = entry['features']
+        return result
+
+    def app_sequences(self, apps: Optional[List[str]] = None, seq_len: Optional[int] = None) -> np.ndarray:
+        """
+        Per-app sequences of the last seq_len timestamped flows, oldest first
+
+        Rows are left-aligned; shorter histories are zero-padded at the end.
+
+        Args:
+            apps: App names in the desired row order (default: apps with timestamped flows)
+            seq_len: Sequence length (default: store seq_len)
+
+        Returns:
+            float32 [len(apps), seq_len, SEQUENCE_FEATURE_DIM]
+        """
+        seq_len = seq_len or self.seq_len
+        if apps is None:
+            apps = self.timestamped_apps()
+        apps = list(apps)
+        self._ensure_apps(apps, seq_len)
+
+        result = np.zeros((len(apps), seq_len, SEQUENCE_FEATURE_DIM), dtype=np.float32)
+        for i, app in enumerate(apps):
+            entry = self._app_cache.get((app, seq_len))
+            if entry is not None:
+                result[i] = entry['sequence']
+        return result
+
+    def time_buckets(self, interval='1h', path: Optional[str] = None,
+                     max_chunk_bytes: int = 256 * 2 ** 20) -> TimeBucketSeries:
+        """
+        Bin every timestamped app's flows into fixed intervals on disk
+
+        Buckets are aligned to multiples of the interval (so hour/day features
+        are stable across rebuilds) and cover the whole observed time range.
+        Apps are processed in chunks so peak memory stays around
+        max_chunk_bytes regardless of how much history is binned; the result
+        is written into a float32 memory map and reused while the flows are
+        unchanged.
+
+        Bucket features [32]:
+            0-3     log flows, log bytes, log packets, log total duration
+            4       internal fraction
+            5-8     transport mix
+            9-12    hour-of-day and day-of-week of the bucket start (sin, cos)
+            13-31   destination port category mix (PORT_CATEGORIES)
+
+        Args:
+            interval: Bucket width (seconds or a pandas offset string like '15min')
+            path: Output .f32 file (default: cache_dir, or without cache a temp
+                dir shared by this store's series and removed once the store
+                and all of them are gone)
+            max_chunk_bytes: Working-memory budget per chunk of apps
+
+        Returns:
+            TimeBucketSeries over timestamped_apps()
+        """
+        seconds_per_bucket = _interval_seconds(interval)
+        apps = self.timestamped_apps()
+        if not apps:
+            raise ValueError("No timestamped flows to bucket")
+
+        scratch = None
+        if path is None:
+            directory = self.cache_dir
+            if directory is None:
+                if self._scratch is None:
+                    self._scratch = _ScratchDir('feature_store_')
+                scratch = self._scratch
+                directory = scratch.path
+            path = directory / f'buckets_{self.content_hash[:16]}_{seconds_per_bucket:g}s.f32'
+        path = Path(path)
+
+        if path.exists() and path.with_suffix('.json').exists():
+            try:
+                cached = TimeBucketSeries.open(path)
+                with open(cached.metadata_path, 'r', encoding='utf-8') as f:
+                    cached_hash = json.load(f).get('content_hash')
+                if cached_hash == self.content_hash and cached.interval == seconds_per_bucket \
+                        and cached.apps == apps:
+                    cached._scratch = scratch
+                    return cached
+            except (OSError, ValueError, KeyError) as e:
+                logger.debug(f"Ignoring unreadable bucket cache {path}: {e}")
+
+        timestamps = self.frame['timestamp']
+        timed = np.flatnonzero(timestamps.notna().to_numpy())
+        seconds = timestamps.to_numpy(dtype='datetime64[ns]')[timed].astype(np.int64) / 1e9
+
+        start = np.floor(seconds.min() / seconds_per_bucket) * seconds_per_bucket
+        edges = start + np.arange(int((seconds.max() - start) // seconds_per_bucket) + 2) * seconds_per_bucket
+        num_buckets = len(edges) - 1
+        buckets = np.searchsorted(edges, seconds, side='right') - 1
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        series = TimeBucketSeries(path, apps, start, seconds_per_bucket, num_buckets)
+        series._scratch = scratch
+        values = np.memmap(path, dtype=np.float32, mode='w+', shape=series.shape)
+
+        # Time-of-bucket features are shared by every app
+        bucket_start = pd.to_datetime(edges[:-1], unit='s')
+        clock = np.zeros((num_buckets, 4))
+        clock[:, 0], clock[:, 1] = _cyclic(bucket_start.hour.to_numpy(), 24)
+        clock[:, 2], clock[:, 3] = _cyclic(bucket_start.dayofweek.to_numpy(), 7)
+
+        # Timed rows grouped by position in `apps`
+        local = np.full(len(self.apps), -1, dtype=np.int64)
+        local[[self.app_position[app] for app in apps]] = np.arange(len(apps))
+        groups = local[self.app_codes[timed]]
+        order = np.argsort(groups, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(groups, minlength=len(apps)))])
+
+        frame = self.frame.iloc[timed]
+        bytes_ = frame['bytes'].to_numpy()
+        packets = frame['packets'].to_numpy()
+        duration = frame['duration'].to_numpy()
+        internal = frame['is_internal'].to_numpy().astype(float)
+        transport = self._transport_codes(frame)
+        port_codes = port_categories(frame['port'].to_numpy())
+
+        chunk = max(1, int(max_chunk_bytes // max(num_buckets * BUCKET_FEATURE_DIM * 8, 1)))
+        for first in range(0, len(apps), chunk):
+            last = min(first + chunk, len(apps))
+            rows = order[bounds[first]:bounds[last]]
+            cells = (last - first) * num_buckets
+            keys = (groups[rows] - first) * num_buckets + buckets[rows]
+
+            block = np.zeros((cells, BUCKET_FEATURE_DIM))
+            flows = np.bincount(keys, minlength=cells).astype(np.float64)
+            block[:, 0] = np.log1p(flows)
+            block[:, 1] = np.log1p(_group_sum(keys, bytes_[rows], cells))
+            block[:, 2] = np.log1p(_group_sum(keys, packets[rows], cells))
+            block[:, 3] = np.log1p(_group_sum(keys, duration[rows], cells))
+            block[:, 4] = np.divide(_group_sum(keys, internal[rows], cells), flows,
+                                    out=np.zeros(cells), where=flows > 0)
+            block[:, 5:9] = _histogram(keys, transport[rows], cells, len(TRANSPORTS))
+            block[:, 9:13] = np.tile(clock, (last - first, 1))
+            block[:, 13:32] = _histogram(keys, port_codes[rows], cells, len(PORT_CATEGORIES))
+
+            values[first:last] = block.reshape(last - first, num_buckets, BUCKET_FEATURE_DIM)
+
+        values.flush()
+        del values
+        series.save_metadata(self.content_hash)
+
+        logger.info(f"FeatureStore: {len(apps)} apps x {num_buckets} buckets of "
+                    f"{seconds_per_bucket:g}s -> {path}")
+        return series
+
+    def timestamped_apps(self) -> List[str]:
+        """Apps with at least one timestamped flow (first-seen order)"""
+        has_time = np.zeros(len(self.apps), dtype=bool)
+        has_time[self.app_codes[self.frame['timestamp'].notna().to_numpy()]] = True
+        return [app for app, flag in zip(self.apps, has_time) if flag]
+
+    # ------------------------------------------------------------------
+    # Builders
+    # ------------------------------------------------------------------
+
+    def _ensure_apps(self, apps: List[str], seq_len: int):
+        known = [app for app in apps if app in self.app_position]
+        missing = self._load_cached_apps(known, seq_len)
+        if not missing:
+            return
+
+        logger.debug(f"FeatureStore: computing features for {len(missing)} apps")
+        features, sequences = self._build_apps(missing, seq_len)
+        self._store_apps(missing, features, sequences, seq_len)
+
+    def _load_or_build_nodes(self) -> Tuple[Dict[str, int], np.ndarray]:
+        cache_file = self.cache_dir / f'nodes_{self.content_hash[:16]}.npz' if self.cache_dir else None
+
+        if cache_file is not None and cache_file.exists():
+            try:
+                with np.load(cache_file, allow_pickle=False) as cached:
+                    if str(cached['hash']) == self.content_hash:
+                        nodes = [str(n) for n in cached['nodes']]
+                        return {node: i for i, node in enumerate(nodes)}, cached['features']
+            except (OSError, ValueError, KeyError) as e:
+                logger.debug(f"Ignoring unreadable node feature cache {cache_file}: {e}")
+
+        nodes, matrix = self._build_nodes()
+
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            for stale in cache_file.parent.glob('nodes_*.npz'):
+                stale.unlink()
+            np.savez(cache_file, hash=self.content_hash, nodes=np.array(nodes, dtype=str), features=matrix)
+
+        return {node: i for i, node in enumerate(nodes)}, matrix
+
+    def _build_nodes(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Node features [N, 64]:
+            0-3    degree, in-degree, out-degree (unique peers), observed flag
+            4-5    log flows out / in
+            6-8    log bytes p50/p90/p99 (flows touching the node)
+            9-11   log packets p50/p90/p99
+            12     internal flow fraction
+            13-16  transport mix
+            17-35  destination port category mix (PORT_CATEGORIES)
+            36-59  hour-of-day activity mix
+            60     log total bytes
+            61     log mean duration
+            62     log number of apps touching the node
+            63     inbound byte share
+        """
+        frame = self.frame
+        num_flows = len(frame)
+        codes, nodes = pd.factorize(pd.concat([frame['src'], frame['dst']], ignore_index=True), sort=False)
+        nodes = [str(n) for n in nodes]
+        num_nodes = len(nodes)
+        src, dst = codes[:num_flows], codes[num_flows:]
+
+        matrix = np.zeros((num_nodes, NODE_FEATURE_DIM))
+        if num_flows == 0:
+            return nodes, matrix.astype(np.float32)
+
+        # Degrees over unique directed edges (same as DiGraph degree)
+        edge_keys = _distinct(src.astype(np.int64) * num_nodes + dst)
+        out_degree = np.bincount(edge_keys // num_nodes, minlength=num_nodes)
+        in_degree = np.bincount(edge_keys % num_nodes, minlength=num_nodes)
+        matrix[:, 0] = in_degree + out_degree
+        matrix[:, 1] = in_degree
+        matrix[:, 2] = out_degree
+        matrix[:, 3] = 1.0
+
+        flows_out = np.bincount(src, minlength=num_nodes)
+        flows_in = np.bincount(dst, minlength=num_nodes)
+        matrix[:, 4] = np.log1p(flows_out)
+        matrix[:, 5] = np.log1p(flows_in)
+
+        # Endpoint view: every flow counted once for its source and once for its destination
+        endpoint = codes
+        bytes_ = np.tile(frame['bytes'].to_numpy(), 2)
+        packets = np.tile(frame['packets'].to_numpy(), 2)
+        touches = flows_out + flows_in
+
+        matrix[:, 6:9] = np.log1p(_group_quantiles(endpoint, bytes_, num_nodes))
+        matrix[:, 9:12] = np.log1p(_group_quantiles(endpoint, packets, num_nodes))
+        matrix[:, 12] = _group_sum(endpoint, np.tile(frame['is_internal'].to_numpy(), 2).astype(float),
+                                   num_nodes) / np.maximum(touches, 1)
+
+        transport = self._transport_codes()
+        matrix[:, 13:17] = _histogram(endpoint, np.tile(transport, 2), num_nodes, len(TRANSPORTS))
+        ports = np.tile(port_categories(frame['port'].to_numpy()), 2)
+        matrix[:, 17:36] = _histogram(endpoint, ports, num_nodes, len(PORT_CATEGORIES))
+
+        timestamps = frame['timestamp']
+        timed = np.tile(timestamps.notna().to_numpy(), 2)
+        hours = np.tile(timestamps.dt.hour.fillna(0).to_numpy(dtype=np.int64), 2)
+        matrix[:, 36:60] = _histogram(endpoint[timed], hours[timed], num_nodes, 24)
+
+        total_bytes = _group_sum(endpoint, bytes_, num_nodes)
+        matrix[:, 60] = np.log1p(total_bytes)
+        matrix[:, 61] = np.log1p(_group_sum(endpoint, np.tile(frame['duration'].to_numpy(), 2), num_nodes)
+                                 / np.maximum(touches, 1))
+
+        node_apps = _distinct(endpoint.astype(np.int64) * len(self.apps) + np.tile(self.app_codes, 2))
+        matrix[:, 62] = np.log1p(np.bincount(node_apps // len(self.apps), minlength=num_nodes))
+
+        bytes_in = _group_sum(dst, frame['bytes'].to_numpy(), num_nodes)
+        matrix[:, 63] = np.divide(bytes_in, total_bytes, out=np.zeros(num_nodes), where=total_bytes > 0)
+
+        return nodes, matrix.astype(np.float32)
+
+    def _transport_codes(self, frame: Optional[pd.DataFrame] = None) -> np.ndarray:
+        frame = self.frame if frame is None else frame
+        codes = pd.Categorical(frame['transport'], categories=TRANSPORTS).codes.astype(np.int64)
+        codes[codes < 0] = TRANSPORTS.index('other')
+        return codes
+
+    def _build_apps(self, apps: List[str], seq_len: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        App features [A, 128]:
+            0-4     flows/1e4, bytes/1e9, sources/100, destinations/100, external facing
+            5-7     log bytes p50/p90/p99
+            8-10    log packets p50/p90/p99
+            11-13   log duration p50/p90/p99
+            14-17   transport mix
+            18-36   destination port category mix
+            37-60   hour-of-day activity mix
+            61-67   day-of-week activity mix
+            68-71   log unique ports, log mean source fan-out, log max destination fan-in, log unique peers
+            72-127  activity over the app's own observation window (56 equal buckets)
+
+        Sequences [A, seq_len, 32] per flow (oldest first):
+            0-1     bytes/1e6, packets/1000
+            2-4     log bytes, log packets, log duration
+            5       internal flag
+            6-9     transport one-hot
+            10-13   hour-of-day and day-of-week (sin, cos)
+            14      log seconds since the app's previous flow
+            15      port / 65535
+            16-31   service port one-hot (SERVICE_PORTS, last = other)
+        """
+        frame = self.frame
+        positions = np.array([self.app_position[app] for app in apps], dtype=np.int64)
+        local = np.full(len(self.apps), -1, dtype=np.int64)
+        local[positions] = np.arange(len(apps))
+
+        rows = np.flatnonzero(local[self.app_codes] >= 0)
+        sub = frame.iloc[rows]
+        groups = local[self.app_codes[rows]]
+        num_apps = len(apps)
+
+        features = np.zeros((num_apps, APP_FEATURE_DIM))
+        sequences = np.zeros((num_apps, seq_len, SEQUENCE_FEATURE_DIM))
+
+        bytes_ = sub['bytes'].to_numpy()
+        packets = sub['packets'].to_numpy()
+        duration = sub['duration'].to_numpy()
+        ports = sub['port'].to_numpy()
+        port_codes = port_categories(ports)
+        transport = self._transport_codes(sub)
+        flows = np.bincount(groups, minlength=num_apps)
+
+        # Unique (app, endpoint) pairs
+        src_codes, _ = pd.factorize(sub['src'])
+        dst_codes, _ = pd.factorize(sub['dst'])
+        num_src, num_dst = int(src_codes.max()) + 1, int(dst_codes.max()) + 1
+        src_pairs = _distinct(groups * num_src + src_codes)
+        dst_pairs = _distinct(groups * num_dst + dst_codes)
+        num_sources = np.bincount(src_pairs // num_src, minlength=num_apps)
+        num_destinations = np.bincount(dst_pairs // num_dst, minlength=num_apps)
+
+        features[:, 0] = flows / 10000
+        features[:, 1] = _group_sum(groups, bytes_, num_apps) / 1e9
+        features[:, 2] = num_sources / 100
+        features[:, 3] = num_destinations / 100
+        features[:, 4] = _group_sum(groups, (~sub['is_internal'].to_numpy()).astype(float), num_apps) > 0
+
+        features[:, 5:8] = np.log1p(_group_quantiles(groups, bytes_, num_apps))
+        features[:, 8:11] = np.log1p(_group_quantiles(groups, packets, num_apps))
+        features[:, 11:14] = np.log1p(_group_quantiles(groups, duration, num_apps))
+        features[:, 14:18] = _histogram(groups, transport, num_apps, len(TRANSPORTS))
+        features[:, 18:37] = _histogram(groups, port_codes, num_apps, len(PORT_CATEGORIES))
+
+        timestamps = sub['timestamp']
+        timed = timestamps.notna().to_numpy()
+        seconds = np.where(timed, timestamps.to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9, 0.0)
+        hours = timestamps.dt.hour.fillna(0).to_numpy(dtype=np.int64)
+        weekdays = timestamps.dt.dayofweek.fillna(0).to_numpy(dtype=np.int64)
+        features[:, 37:61] = _histogram(groups[timed], hours[timed], num_apps, 24)
+        features[:, 61:68] = _histogram(groups[timed], weekdays[timed], num_apps, 7)
+
+        # Fan-out/fan-in within the app's own flows
+        app_edges = _distinct((groups * num_src + src_codes) * num_dst + dst_codes)
+        src_keys, fan_out = _key_counts(app_edges // num_dst)
+        dst_keys, fan_in = _key_counts(app_edges // num_dst // num_src * num_dst + app_edges % num_dst)
+        src_group = src_keys // num_src
+        dst_group = dst_keys // num_dst
+        port_pairs = _distinct(groups * 65537 + (ports + 1))
+
+        features[:, 68] = np.log1p(np.bincount(port_pairs // 65537, minlength=num_apps))
+        features[:, 69] = np.log1p(_group_sum(src_group, fan_out.astype(float), num_apps) / np.maximum(num_sources, 1))
+        max_fan_in = np.zeros(num_apps)
+        np.maximum.at(max_fan_in, dst_group, fan_in)
+        features[:, 70] = np.log1p(max_fan_in)
+        features[:, 71] = np.log1p(num_sources + num_destinations)
+
+        # Activity shape over each app's own window
+        if timed.any():
+            first = np.full(num_apps, np.inf)
+            last = np.full(num_apps, -np.inf)
+            np.minimum.at(first, groups[timed], seconds[timed])
+            np.maximum.at(last, groups[timed], seconds[timed])
+            span = np.maximum(last - first, 1e-9)
+            g = groups[timed]
+            bucket = np.minimum(((seconds[timed] - first[g]) / span[g] * APP_TIME_BUCKETS).astype(np.int64),
+                                APP_TIME_BUCKETS - 1)
+            features[:, 72:128] = _histogram(g, bucket, num_apps, APP_TIME_BUCKETS)
+
+            sequences[:] = self._build_sequences(
+                groups[timed], seconds[timed], bytes_[timed], packets[timed], duration[timed],
+                sub['is_internal'].to_numpy()[timed], transport[timed], hours[timed], weekdays[timed],
+                ports[timed], num_apps, seq_len
+            )
+
+        return features.astype(np.float32), sequences.astype(np.float32)
+
+    @staticmethod
+    def _build_sequences(groups, seconds, bytes_, packets, duration, internal, transport,
+                         hours, weekdays, ports, num_apps: int, seq_len: int) -> np.ndarray:
+        """Last seq_len flows per app by time, left-aligned, one lexsort for all apps"""
+        order = np.lexsort((seconds, groups))
+        groups = groups[order]
+
+        counts = np.bincount(groups, minlength=num_apps)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        rank = np.arange(len(groups)) - starts[groups]
+        skip = np.maximum(counts - seq_len, 0)
+        keep = rank >= skip[groups]
+        slot = (rank - skip[groups])[keep]
+        g = groups[keep]
+        idx = order[keep]
+
+        # Gap to the previous flow of the same app (0 for the first one)
+        gaps = np.diff(seconds[order], prepend=0.0)
+        gaps[starts[counts > 0]] = 0.0
+        gaps = np.maximum(gaps, 0.0)[keep]
+
+        step = np.zeros((len(idx), SEQUENCE_FEATURE_DIM))
+        step[:, 0] = bytes_[idx] / 1e6
+        step[:, 1] = packets[idx] / 1000
+        step[:, 2] = np.log1p(bytes_[idx])
+        step[:, 3] = np.log1p(packets[idx])
+        step[:, 4] = np.log1p(duration[idx])
+        step[:, 5] = internal[idx]
+        step[np.arange(len(idx)), 6 + transport[idx]] = 1.0
+        step[:, 10], step[:, 11] = _cyclic(hours[idx], 24)
+        step[:, 12], step[:, 13] = _cyclic(weekdays[idx], 7)
+        step[:, 14] = np.log1p(gaps)
+        step[:, 15] = np.maximum(ports[idx], 0) / 65535
+        service = port_categories(ports[idx])
+        service[service >= len(SERVICE_PORTS)] = len(SERVICE_PORTS)
+        step[np.arange(len(idx)), 16 + service] = 1.0
+
+        sequences = np.zeros((num_apps, seq_len, SEQUENCE_FEATURE_DIM))
+        sequences[g, slot] = step
+        return sequences
@@ -9,18 +9,24 @@ Features:
 - All paths enumeration (with depth limit)
 - Gap analysis (expected flows that don't exist)
 - Policy violation detection
+- Precomputed node tier index (subnet → tier mapping from config.yaml)
+- Incremental graph maintenance (apply_delta) with change tracking
+- Versioned on-disk graph snapshots for fast reload (see graph_snapshot.py)
 - Interactive HTML visualization
 
 Author: Network Security Team
 Version: 1.0
 """
 
+import hashlib
 import logging
 from pathlib import Path
 from typing import List, Dict, Set, Tuple, Optional
 from collections import defaultdict
 import json
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -31,42 +37,212 @@ except ImportError:
     logger.warning("NetworkX not available. Install with: pip install networkx")
 
 
+# Default subnet prefix → tier mapping (first matching prefix wins).
+# Overridden by `graph_analysis.tier_subnets` in config.yaml.
+DEFAULT_TIER_SUBNETS = [
+    ('10.164.105.', 'WEB'),
+    ('10.100.246.', 'APP'),
+    ('10.165.116.', 'APP'),
+    ('10.164.116.', 'DATABASE'),
+    ('10.164.144.', 'CACHE'),
+    ('10.164.145.', 'QUEUE'),
+]
+
+# Tier code table - index in this list is the tier code stored in the index
+TIER_NAMES = ['UNKNOWN', 'WEB', 'APP', 'DATABASE', 'CACHE', 'QUEUE',
+              'LOADBALANCER', 'MANAGEMENT']
+
+
+def load_tier_subnets() -> List[Tuple[str, str]]:
+    """
+    Load subnet prefix → tier mapping from config.yaml
+
+    Returns:
+        List of (prefix, tier) tuples in match order
+    """
+    try:
+        from src.config import get_config
+        configured = get_config().get('graph_analysis.tier_subnets')
+    except Exception as e:
+        logger.debug(f"Could not load tier subnets from config: {e}")
+        configured = None
+
+    if not configured:
+        return list(DEFAULT_TIER_SUBNETS)
+
+    return [(str(prefix), str(tier).upper()) for prefix, tier in configured.items()]
+
+
 class GraphAnalyzer:
     """
     In-memory graph analysis for network flows
     No Graph DB required - uses NetworkX for graph algorithms
     """
 
-    def __init__(self, flow_records: List):
+    def __init__(self, flow_records: List,
+                 tier_subnets: Optional[List[Tuple[str, str]]] = None):
         """
         Initialize with flow records
 
         Args:
             flow_records: List of FlowRecord objects
+            tier_subnets: Optional (prefix, tier) mapping; defaults to config.yaml
         """
         if not NETWORKX_AVAILABLE:
             raise ImportError("NetworkX is required. Install with: pip install networkx")
 
-        self.records = flow_records
+        self._init_state(tier_subnets)
+
+        logger.info(f"GraphAnalyzer initialized with {len(flow_records)} records")
+        self._build_graph(flow_records)
+        self._build_tier_index()
+
+    def _init_state(self, tier_subnets: Optional[List[Tuple[str, str]]] = None):
+        """Initialize empty graph, metadata, tier index and change tracking"""
+        # Raw records are not kept once merged into the graph - only their
+        # count and a running content hash (see save_snapshot)
+        self.record_count = 0
+        self._records_hash = hashlib.sha256()
         self.graph = nx.DiGraph()  # Directed graph (flows have direction)
         self.node_metadata = {}  # IP -> {app_code, tier, hostname, etc.}
 
-        logger.info(f"GraphAnalyzer initialized with {len(flow_records)} records")
-        self._build_graph()
+        # Tier index (built once per graph build)
+        self.tier_subnets = list(tier_subnets) if tier_subnets else load_tier_subnets()
+        self.tier_names = list(TIER_NAMES)
+        for _, tier in self.tier_subnets:
+            if tier not in self.tier_names:
+                self.tier_names.append(tier)
+        self.tier_code_map = {tier: code for code, tier in enumerate(self.tier_names)}
+        self.node_index = {}  # IP -> position in tier_codes
+        self.node_tiers = {}  # IP -> tier name
+        self.tier_codes = np.zeros(0, dtype=np.int16)
+
+        # Change tracking for incremental recomputation (see apply_delta)
+        self.changed_nodes: Set[str] = set()
+        self.changed_edges: Set[Tuple[str, str]] = set()
+        self._last_pagerank: Dict[str, float] = {}
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path: str,
+                      content_hash: Optional[str] = None,
+                      tier_subnets: Optional[List[Tuple[str, str]]] = None) -> Optional['GraphAnalyzer']:
+        """
+        Open a graph snapshot written by save_snapshot()
+
+        Args:
+            snapshot_path: Snapshot directory
+            content_hash: Current input hash; a mismatch means the snapshot is stale
+            tier_subnets: Current (prefix, tier) mapping (default: config.yaml);
+                          a snapshot built with a different mapping is stale
+
+        Returns:
+            GraphAnalyzer (without flow records) or None if missing/stale
+        """
+        from src.graph_snapshot import is_snapshot_current, open_snapshot
+
+        if not NETWORKX_AVAILABLE:
+            raise ImportError("NetworkX is required. Install with: pip install networkx")
+
+        tier_subnets = list(tier_subnets) if tier_subnets else load_tier_subnets()
+        if not is_snapshot_current(snapshot_path, content_hash, tier_subnets):
+            logger.info(f"Graph snapshot missing or stale: {snapshot_path}")
+            return None
+
+        snapshot = open_snapshot(snapshot_path)
+        header, cols = snapshot['header'], snapshot['columns']
+
+        analyzer = cls.__new__(cls)
+        analyzer._init_state(tier_subnets)
+
+        nodes = cols['node_ip'].tolist()
+        hostnames = cols['node_hostname'].tolist()
+        apps = cols['node_app'].tolist()
+        internal = cols['node_internal'].tolist()
+
+        analyzer.graph.add_nodes_from(nodes)
+        analyzer.node_metadata = {
+            node: {'hostname': hostnames[i], 'app_code': apps[i], 'is_internal': internal[i]}
+            for i, node in enumerate(nodes)
+        }
+
+        protocols = header['protocols']
+        port_ptr = cols['edge_port_ptr'].tolist()
+        ports = cols['edge_ports'].tolist()
+        proto_ptr = cols['edge_proto_ptr'].tolist()
+        protos = cols['edge_protos'].tolist()
+        flows = cols['edge_flows'].tolist()
+        byte_totals = cols['edge_bytes'].tolist()
+
+        analyzer.graph.add_edges_from(
+            (nodes[u], nodes[v], {
+                'flows': flows[i],
+                'bytes': byte_totals[i],
+                'protocols': [protocols[c] for c in protos[proto_ptr[i]:proto_ptr[i + 1]]],
+                'ports': ports[port_ptr[i]:port_ptr[i + 1]],
+                'weight': flows[i]
+            })
+            for i, (u, v) in enumerate(zip(cols['edge_src'].tolist(), cols['edge_dst'].tolist()))
+        )
+
+        # Tier index comes straight from the snapshot column
+        analyzer.tier_names = list(header['tier_names'])
+        analyzer.tier_code_map = {tier: code for code, tier in enumerate(analyzer.tier_names)}
+        analyzer.node_index = {node: i for i, node in enumerate(nodes)}
+        analyzer.tier_codes = np.array(cols['node_tier'], dtype=np.int16)
+        analyzer.node_tiers = {
+            node: analyzer.tier_names[code] for node, code in zip(nodes, analyzer.tier_codes.tolist())
+        }
+
+        logger.info(f"GraphAnalyzer loaded from snapshot {snapshot_path}: "
+                   f"{analyzer.graph.number_of_nodes()} nodes, {analyzer.graph.number_of_edges()} edges")
+        return analyzer
 
-    def _build_graph(self):
+    def save_snapshot(self, snapshot_path: str, content_hash: Optional[str] = None) -> Path:
+        """
+        Write the graph to a versioned on-disk snapshot
+
+        Args:
+            snapshot_path: Snapshot directory
+            content_hash: Hash of the inputs (default: hash of all records
+                          merged into this analyzer, see hash_flow_records)
+
+        Returns:
+            Snapshot directory path
+        """
+        from src.graph_snapshot import write_snapshot
+
+        if content_hash is None:
+            content_hash = self._records_hash.hexdigest()
+        return write_snapshot(self, snapshot_path, content_hash)
+
+    def _build_graph(self, flow_records: List):
         """Build NetworkX graph from flow records"""
         logger.info("Building in-memory network graph...")
 
+        self._merge_records(flow_records)
+
+        logger.info(f"  Graph built: {self.graph.number_of_nodes()} nodes, "
+                   f"{self.graph.number_of_edges()} edges")
+
+    def _merge_records(self, records: List) -> Tuple[Set[str], Set[Tuple[str, str]]]:
+        """
+        Aggregate flow records into graph edges and node metadata (in place)
+
+        Records are only counted and hashed afterwards, not retained.
+
+        Returns:
+            (touched nodes, touched edges)
+        """
         edge_stats = defaultdict(lambda: {
             'flows': 0,
             'bytes': 0,
             'protocols': set(),
             'ports': set()
         })
+        touched_nodes = set()
 
         # Aggregate flows into edges
-        for record in self.records:
+        for record in records:
             if record.src_ip and record.dst_ip:
                 # Add edge with aggregated stats
                 key = (record.src_ip, record.dst_ip)
@@ -89,20 +265,145 @@ class GraphAnalyzer:
                         'app_code': record.app_name,
                         'is_internal': record.is_internal
                     }
+                touched_nodes.add(record.src_ip)
+                touched_nodes.add(record.dst_ip)
 
-        # Add edges to graph
+        # Add (or merge into) graph edges
         for (src, dst), stats in edge_stats.items():
-            self.graph.add_edge(
-                src, dst,
-                flows=stats['flows'],
-                bytes=stats['bytes'],
-                protocols=list(stats['protocols']),
-                ports=sorted(stats['ports']),
-                weight=stats['flows']  # For shortest path algorithms
-            )
+            if self.graph.has_edge(src, dst):
+                edge_data = self.graph[src][dst]
+                edge_data['flows'] += stats['flows']
+                edge_data['bytes'] += stats['bytes']
+                edge_data['protocols'] = list(set(edge_data['protocols']) | stats['protocols'])
+                edge_data['ports'] = sorted(set(edge_data['ports']) | stats['ports'])
+                edge_data['weight'] = edge_data['flows']
+            else:
+                self.graph.add_edge(
+                    src, dst,
+                    flows=stats['flows'],
+                    bytes=stats['bytes'],
+                    protocols=list(stats['protocols']),
+                    ports=sorted(stats['ports']),
+                    weight=stats['flows']  # For shortest path algorithms
+                )
+
+        from src.graph_snapshot import update_flow_records_hash
+
+        self.record_count += len(records)
+        update_flow_records_hash(self._records_hash, records)
+
+        return touched_nodes, set(edge_stats)
+
+    def apply_delta(self, new_records: List) -> Dict:
+        """
+        Incrementally merge new flow records into the existing graph
 
-        logger.info(f"  Graph built: {self.graph.number_of_nodes()} nodes, "
-                   f"{self.graph.number_of_edges()} edges")
+        Updates edge aggregates, node metadata, degrees and the tier index in
+        place (no rebuild) and records which nodes/edges changed so downstream
+        metrics can be refreshed for the affected part of the graph only.
+
+        Args:
+            new_records: List of FlowRecord objects not yet in the graph
+
+        Returns:
+            Dict with changed/new nodes and edges for this delta
+        """
+        known_nodes = set(self.graph.nodes())
+        known_edges = set(self.graph.edges())
+
+        touched_nodes, touched_edges = self._merge_records(new_records)
+
+        new_nodes = touched_nodes - known_nodes
+        if new_nodes:
+            self._extend_tier_index([n for n in self.graph.nodes() if n in new_nodes])
+
+        self.changed_nodes |= touched_nodes
+        self.changed_edges |= touched_edges
+
+        delta = {
+            'changed_nodes': touched_nodes,
+            'new_nodes': new_nodes,
+            'changed_edges': touched_edges,
+            'new_edges': touched_edges - known_edges
+        }
+
+        logger.info(f"  Graph delta applied: {len(new_records)} records, "
+                   f"{len(new_nodes)} new nodes, {len(delta['new_edges'])} new edges, "
+                   f"{len(touched_nodes)} nodes touched")
+        return delta
+
+    def clear_changes(self):
+        """Reset change tracking after downstream metrics have been refreshed"""
+        self.changed_nodes = set()
+        self.changed_edges = set()
+
+    def affected_neighborhood(self, nodes: Optional[Set[str]] = None,
+                              hops: int = 1) -> Set[str]:
+        """
+        Nodes within `hops` (either direction) of changed nodes
+
+        Use to limit exposure/threat rescoring to the affected neighborhood.
+        """
+        frontier = set(nodes if nodes is not None else self.changed_nodes)
+        affected = set(frontier)
+
+        for _ in range(hops):
+            next_frontier = set()
+            for node in frontier:
+                next_frontier.update(self.graph.predecessors(node))
+                next_frontier.update(self.graph.successors(node))
+            frontier = next_frontier - affected
+            affected |= frontier
+
+        return affected
+
+    def touched_components(self, nodes: Optional[Set[str]] = None) -> List[Set[str]]:
+        """
+        Weakly connected components that contain changed nodes
+
+        Use to refresh community detection only where the graph changed.
+        """
+        remaining = set(nodes if nodes is not None else self.changed_nodes)
+        undirected = self.graph.to_undirected(as_view=True)
+        components = []
+
+        while remaining:
+            component = nx.node_connected_component(undirected, remaining.pop())
+            remaining -= component
+            components.append(component)
+
+        return components
+
+    def _build_tier_index(self):
+        """Classify every node once and store node → tier code array"""
+        nodes = list(self.graph.nodes())
+        self.node_index = {node: i for i, node in enumerate(nodes)}
+        self.node_tiers = {node: self._match_tier(node) for node in nodes}
+        self.tier_codes = np.fromiter(
+            (self.tier_code_map[self.node_tiers[node]] for node in nodes),
+            dtype=np.int16, count=len(nodes)
+        )
+
+    def _extend_tier_index(self, new_nodes: List[str]):
+        """Append newly added nodes to the tier index"""
+        offset = len(self.node_index)
+        for i, node in enumerate(new_nodes):
+            self.node_index[node] = offset + i
+            self.node_tiers[node] = self._match_tier(node)
+
+        new_codes = np.fromiter(
+            (self.tier_code_map[self.node_tiers[node]] for node in new_nodes),
+            dtype=np.int16, count=len(new_nodes)
+        )
+        self.tier_codes = np.concatenate([self.tier_codes, new_codes])
+
+    def _edge_tier_codes(self) -> Tuple[List[Tuple[str, str]], np.ndarray, np.ndarray]:
+        """Return edge list with aligned source/destination tier code arrays"""
+        edges = list(self.graph.edges())
+        index = self.node_index
+        src_pos = np.fromiter((index[u] for u, _ in edges), dtype=np.int64, count=len(edges))
+        dst_pos = np.fromiter((index[v] for _, v in edges), dtype=np.int64, count=len(edges))
+        return edges, self.tier_codes[src_pos], self.tier_codes[dst_pos]
 
     def find_shortest_path(self, source_ip: str, target_ip: str) -> Optional[Dict]:
         """
@@ -255,31 +556,50 @@ class GraphAnalyzer:
 
         violations = []
 
-        for policy in policies:
-            if policy['action'] != 'DENY':
-                continue  # Only check DENY policies
-
-            # Find all edges matching the policy pattern
-            for src, dst, edge_data in self.graph.edges(data=True):
-                src_tier = self._classify_node_tier(src)
-                dst_tier = self._classify_node_tier(dst)
-
-                if (src_tier == policy['source_tier'] and
-                    dst_tier == policy['destination_tier']):
-
-                    violations.append({
-                        'policy_name': policy['name'],
-                        'source_ip': src,
-                        'source_hostname': self.node_metadata.get(src, {}).get('hostname', ''),
-                        'source_tier': src_tier,
-                        'destination_ip': dst,
-                        'destination_hostname': self.node_metadata.get(dst, {}).get('hostname', ''),
-                        'destination_tier': dst_tier,
-                        'flows': edge_data['flows'],
-                        'protocols': edge_data['protocols'],
-                        'ports': edge_data['ports'],
-                        'severity': 'HIGH'
-                    })
+        deny_policies = [p for p in policies if p['action'] == 'DENY']  # Only check DENY policies
+        if not deny_policies or self.graph.number_of_edges() == 0:
+            logger.info(f"  Found {len(violations)} policy violations")
+            return violations
+
+        edges, src_codes, dst_codes = self._edge_tier_codes()
+
+        # Policy matrix: [source tier code, destination tier code] -> denied
+        num_tiers = len(self.tier_names)
+        policy_matrix = np.zeros((num_tiers, num_tiers), dtype=bool)
+        policy_pairs = []
+        for policy in deny_policies:
+            src_code = self.tier_code_map.get(policy['source_tier'])
+            dst_code = self.tier_code_map.get(policy['destination_tier'])
+            policy_pairs.append((src_code, dst_code))
+            if src_code is not None and dst_code is not None:
+                policy_matrix[src_code, dst_code] = True
+
+        candidate = policy_matrix[src_codes, dst_codes]
+        if not candidate.any():
+            logger.info(f"  Found {len(violations)} policy violations")
+            return violations
+
+        for policy, (src_code, dst_code) in zip(deny_policies, policy_pairs):
+            if src_code is None or dst_code is None:
+                continue
+
+            matches = np.flatnonzero(candidate & (src_codes == src_code) & (dst_codes == dst_code))
+            for i in matches:
+                src, dst = edges[i]
+                edge_data = self.graph[src][dst]
+                violations.append({
+                    'policy_name': policy['name'],
+                    'source_ip': src,
+                    'source_hostname': self.node_metadata.get(src, {}).get('hostname', ''),
+                    'source_tier': self.tier_names[src_code],
+                    'destination_ip': dst,
+                    'destination_hostname': self.node_metadata.get(dst, {}).get('hostname', ''),
+                    'destination_tier': self.tier_names[dst_code],
+                    'flows': edge_data['flows'],
+                    'protocols': edge_data['protocols'],
+                    'ports': edge_data['ports'],
+                    'severity': 'HIGH'
+                })
 
         logger.info(f"  Found {len(violations)} policy violations")
         return violations
@@ -347,7 +667,10 @@ class GraphAnalyzer:
         betweenness_centrality = nx.betweenness_centrality(self.graph, weight='weight')
 
         # PageRank (importance based on connections)
-        pagerank = nx.pagerank(self.graph, weight='weight')
+        # Warm start from the previous run after incremental updates
+        pagerank = nx.pagerank(self.graph, weight='weight',
+                               nstart=self._last_pagerank or None)
+        self._last_pagerank = pagerank
 
         for node in self.graph.nodes():
             metrics[node] = {
@@ -416,19 +739,18 @@ class GraphAnalyzer:
         logger.info(f"  [OK] Graph data exported: {output_path}")
 
     def _classify_node_tier(self, ip_address: str) -> str:
-        """Classify node into tier based on IP pattern"""
-        if ip_address.startswith('10.164.105.'):
-            return 'WEB'
-        elif ip_address.startswith('10.100.246.') or ip_address.startswith('10.165.116.'):
-            return 'APP'
-        elif ip_address.startswith('10.164.116.'):
-            return 'DATABASE'
-        elif ip_address.startswith('10.164.144.'):
-            return 'CACHE'
-        elif ip_address.startswith('10.164.145.'):
-            return 'QUEUE'
-        else:
-            return 'UNKNOWN'
+        """Classify node into tier (index lookup, prefix match for unseen IPs)"""
+        tier = self.node_tiers.get(ip_address)
+        if tier is None:
+            tier = self._match_tier(ip_address)
+        return tier
+
+    def _match_tier(self, ip_address: str) -> str:
+        """Match IP against configured subnet prefixes"""
+        for prefix, tier in self.tier_subnets:
+            if ip_address.startswith(prefix):
+                return tier
+        return 'UNKNOWN'
 
     def _assess_gap_severity(self, gap_type: str) -> str:
         """Assess severity of a topology gap"""
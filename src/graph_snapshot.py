@@ -0,0 +1,254 @@
+"""
+Graph Snapshot Serialization
+=============================
+Versioned on-disk snapshot of a GraphAnalyzer graph so tools can skip
+re-parsing raw CSVs and rebuilding the graph on every invocation.
+
+Layout (one directory per snapshot, e.g. outputs/graph_analysis/network_graph.gsnap/):
+    header.json          - format/version, content hash, counts, string tables
+    node_ip.npy          - node IDs (fixed-width unicode)
+    node_hostname.npy    - hostnames
+    node_app.npy         - app codes
+    node_internal.npy    - bool is_internal
+    node_tier.npy        - int16 tier codes (GraphAnalyzer tier index)
+    edge_src.npy         - int32 source node positions
+    edge_dst.npy         - int32 destination node positions
+    edge_flows.npy       - int64 flow counts
+    edge_bytes.npy       - int64 byte totals
+    edge_port_ptr.npy    - int64 CSR offsets into edge_ports
+    edge_ports.npy       - int32 ports
+    edge_proto_ptr.npy   - int64 CSR offsets into edge_protos
+    edge_protos.npy      - int16 codes into header['protocols']
+
+All arrays are plain .npy files opened with mmap_mode='r'.
+
+Staleness: the header stores a content hash of the input flows and the
+subnet -> tier mapping the tier index was built with. Callers pass the
+current hash when loading; a hash or tier mapping mismatch (or a different
+format version) means the snapshot is stale and the graph must be rebuilt.
+
+Users: run_graph_analysis.py, run_threat_analysis.py and
+generate_threat_surface_docs.py - the tools that build a GraphAnalyzer from
+raw flows. The FastAPI app and generate_all_reports.py never build one
+(they read per-app topology JSON), so they have nothing to load from here.
+
+Author: Network Security Team
+Version: 1.0
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 'netseg-graph-snapshot'
+SNAPSHOT_VERSION = 1
+
+NODE_COLUMNS = ['node_ip', 'node_hostname', 'node_app', 'node_internal', 'node_tier']
+EDGE_COLUMNS = ['edge_src', 'edge_dst', 'edge_flows', 'edge_bytes',
+                'edge_port_ptr', 'edge_ports', 'edge_proto_ptr', 'edge_protos']
+
+
+def hash_flow_records(records: Iterable) -> str:
+    """
+    Content hash of parsed flow records (fields used by GraphAnalyzer)
+
+    Args:
+        records: Iterable of FlowRecord objects
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    update_flow_records_hash(digest, records)
+    return digest.hexdigest()
+
+
+def update_flow_records_hash(digest: 'hashlib._Hash', records: Iterable):
+    """Feed flow records into a running hash (same result as hash_flow_records in one go)"""
+    for r in records:
+        digest.update(
+            f"{r.src_ip}|{r.dst_ip}|{r.src_hostname}|{r.dst_hostname}|{r.app_name}|"
+            f"{r.transport}|{r.port}|{r.bytes}|{r.is_internal}\n".encode('utf-8')
+        )
+
+
+def hash_input_files(paths: Iterable[Union[str, Path]],
+                     root: Optional[Union[str, Path]] = None) -> str:
+    """
+    Content hash of raw input files (checked before parsing anything)
+
+    Files are keyed by their path relative to the input root (e.g.
+    APP1/flows.csv, APP2/flows.csv) and hashed in sorted key order so the
+    result does not depend on directory listing order.
+
+    Args:
+        paths: Input CSV paths
+        root: Input root directory (default: common parent of all paths)
+
+    Returns:
+        SHA-256 hex digest
+    """
+    paths = [Path(p).resolve() for p in paths]
+    if root is not None:
+        root = Path(root).resolve()
+    elif paths:
+        root = Path(os.path.commonpath([p.parent for p in paths]))
+
+    digest = hashlib.sha256()
+    for key, path in sorted((p.relative_to(root).as_posix(), p) for p in paths):
+        digest.update(key.encode('utf-8') + b'\0')
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _string_column(values: List[str]) -> np.ndarray:
+    """Fixed-width unicode array (mmap-able, unlike object arrays)"""
+    width = max((len(v) for v in values), default=1) or 1
+    return np.array(values, dtype=f'<U{width}')
+
+
+def _ragged(lists: List[List[int]], dtype) -> (np.ndarray, np.ndarray):
+    """CSR-encode a list of lists -> (offsets, flat values)"""
+    ptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum([len(x) for x in lists], out=ptr[1:])
+    flat = np.fromiter((v for x in lists for v in x), dtype=dtype, count=int(ptr[-1]))
+    return ptr, flat
+
+
+def write_snapshot(analyzer, path: Union[str, Path], content_hash: str) -> Path:
+    """
+    Write a GraphAnalyzer graph to a snapshot directory
+
+    Args:
+        analyzer: Built GraphAnalyzer
+        path: Snapshot directory (replaced if it exists)
+        content_hash: Hash of the input flows the graph was built from
+
+    Returns:
+        Snapshot directory path
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    tmp_path.mkdir(parents=True)
+
+    graph = analyzer.graph
+    nodes = list(graph.nodes())
+    position = {node: i for i, node in enumerate(nodes)}
+    metadata = analyzer.node_metadata
+
+    columns = {
+        'node_ip': _string_column([str(n) for n in nodes]),
+        'node_hostname': _string_column([metadata.get(n, {}).get('hostname') or '' for n in nodes]),
+        'node_app': _string_column([metadata.get(n, {}).get('app_code') or '' for n in nodes]),
+        'node_internal': np.array([bool(metadata.get(n, {}).get('is_internal', True)) for n in nodes],
+                                  dtype=bool),
+        'node_tier': np.array([analyzer.tier_code_map[analyzer.node_tiers[n]] for n in nodes],
+                              dtype=np.int16),
+    }
+
+    edges = list(graph.edges(data=True))
+    protocols = sorted({str(p) for _, _, d in edges for p in d['protocols']})
+    proto_code = {p: i for i, p in enumerate(protocols)}
+
+    columns['edge_src'] = np.array([position[u] for u, _, _ in edges], dtype=np.int32)
+    columns['edge_dst'] = np.array([position[v] for _, v, _ in edges], dtype=np.int32)
+    columns['edge_flows'] = np.array([d['flows'] for _, _, d in edges], dtype=np.int64)
+    columns['edge_bytes'] = np.array([d['bytes'] for _, _, d in edges], dtype=np.int64)
+    columns['edge_port_ptr'], columns['edge_ports'] = _ragged(
+        [[int(p) for p in d['ports']] for _, _, d in edges], np.int32)
+    columns['edge_proto_ptr'], columns['edge_protos'] = _ragged(
+        [[proto_code[str(p)] for p in d['protocols']] for _, _, d in edges], np.int16)
+
+    for name, array in columns.items():
+        np.save(tmp_path / f'{name}.npy', array, allow_pickle=False)
+
+    header = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'content_hash': content_hash,
+        'created_at': datetime.now().isoformat(),
+        'node_count': len(nodes),
+        'edge_count': len(edges),
+        'tier_names': analyzer.tier_names,
+        'tier_subnets': [list(pair) for pair in analyzer.tier_subnets],
+        'protocols': protocols,
+        'columns': {name: {'dtype': array.dtype.str, 'shape': list(array.shape)}
+                    for name, array in columns.items()}
+    }
+    with open(tmp_path / 'header.json', 'w', encoding='utf-8') as f:
+        json.dump(header, f, indent=2)
+
+    # Swap in atomically-ish so readers never see a half-written snapshot
+    if path.exists():
+        shutil.rmtree(path)
+    tmp_path.rename(path)
+
+    logger.info(f"  [OK] Graph snapshot written: {path} ({len(nodes)} nodes, {len(edges)} edges)")
+    return path
+
+
+def read_header(path: Union[str, Path]) -> Optional[Dict]:
+    """Read a snapshot header (None if missing or unreadable)"""
+    header_file = Path(path) / 'header.json'
+    if not header_file.exists():
+        return None
+    try:
+        with open(header_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Unreadable graph snapshot header {header_file}: {e}")
+        return None
+
+
+def is_snapshot_current(path: Union[str, Path], content_hash: Optional[str] = None,
+                        tier_subnets: Optional[List] = None) -> bool:
+    """
+    Check whether a snapshot exists, has a supported version and matches
+    the current inputs
+
+    Args:
+        path: Snapshot directory
+        content_hash: Current input hash (None skips the staleness check)
+        tier_subnets: Current (prefix, tier) mapping; the stored tier index is
+                      stale if it was built with a different one (None skips)
+    """
+    header = read_header(path)
+    if header is None:
+        return False
+    if header.get('format') != SNAPSHOT_FORMAT or header.get('version') != SNAPSHOT_VERSION:
+        return False
+    if tier_subnets is not None and header.get('tier_subnets') != [list(pair) for pair in tier_subnets]:
+        return False
+    return content_hash is None or header.get('content_hash') == content_hash
+
+
+def open_snapshot(path: Union[str, Path]) -> Dict:
+    """
+    Memory-map all snapshot columns
+
+    Returns:
+        {'header': header dict, 'columns': {name: np.memmap}}
+    """
+    path = Path(path)
+    header = read_header(path)
+    if header is None:
+        raise FileNotFoundError(f"Graph snapshot not found: {path}")
+
+    columns = {
+        name: np.load(path / f'{name}.npy', mmap_mode='r', allow_pickle=False)
+        for name in NODE_COLUMNS + EDGE_COLUMNS
+    }
+    return {'header': header, 'columns': columns}
@@ -0,0 +1,169 @@
+let translateX = 0;
+let translateY = 0;
+let scale = 1;
+const PAN_STEP = 100; // pixels to pan per arrow click
+
+mermaid.initialize({
+    startOnLoad: false,
+    theme: 'default',
+    maxTextSize: 90000,
+    flowchart: {
+        curve: 'basis',
+        padding: 20,
+        useMaxWidth: false,
+        htmlLabels: true
+    },
+    securityLevel: 'loose'
+});
+
+// Initialize after Mermaid renders
+window.addEventListener('load', function() {
+    const mermaidDiv = document.querySelector('.mermaid');
+    if (mermaidDiv) {
+        // Force render
+        mermaid.run({ nodes: [mermaidDiv] }).then(() => {
+            console.log('Mermaid rendered successfully');
+            initControls();
+        }).catch(err => {
+            console.error('Mermaid rendering failed:', err);
+            // Show error message to user
+            mermaidDiv.innerHTML = '<div style="padding: 40px; text-align: center; color: #e74c3c;"><h2>Diagram Rendering Error</h2><p>' + err.message + '</p><p>Check browser console for details.</p></div>';
+        });
+    } else {
+        console.error('Mermaid div not found');
+    }
+});
+
+function initControls() {
+    const container = document.querySelector('.diagram-container');
+    const svg = document.querySelector('.diagram-container svg');
+
+    if (!svg) return;
+
+    // Mouse wheel to zoom
+    container.addEventListener('wheel', zoom);
+
+    // Initial fit
+    setTimeout(() => {
+        fitView();
+    }, 500);
+}
+
+function zoom(e) {
+    e.preventDefault();
+
+    const svg = document.querySelector('.diagram-container svg');
+    if (!svg) return;
+
+    const delta = e.deltaY > 0 ? 0.9 : 1.1;
+    scale = Math.min(Math.max(0.1, scale * delta), 5);
+
+    updateTransform();
+}
+
+function panUp() {
+    translateY += PAN_STEP;
+    updateTransform();
+}
+
+function panDown() {
+    translateY -= PAN_STEP;
+    updateTransform();
+}
+
+function panLeft() {
+    translateX += PAN_STEP;
+    updateTransform();
+}
+
+function panRight() {
+    translateX -= PAN_STEP;
+    updateTransform();
+}
+
+function zoomIn() {
+    scale = Math.min(scale * 1.2, 5);
+    updateTransform();
+}
+
+function zoomOut() {
+    scale = Math.max(scale * 0.8, 0.1);
+    updateTransform();
+}
+
+function resetView() {
+    scale = 1;
+    translateX = 0;
+    translateY = 0;
+    updateTransform();
+    // Center the diagram after reset
+    setTimeout(() => {
+        fitView();
+    }, 100);
+}
+
+function fitView() {
+    const container = document.querySelector('.diagram-container');
+    const svg = document.querySelector('.diagram-container svg');
+    if (!svg || !container) {
+        console.log('SVG or container not found');
+        return;
+    }
+
+    // Reset transform first to get accurate dimensions
+    svg.style.transform = '';
+    translateX = 0;
+    translateY = 0;
+    scale = 1;
+
+    // Use getBBox for accurate SVG content dimensions
+    setTimeout(() => {
+        const bbox = svg.getBBox();
+        const containerRect = container.getBoundingClientRect();
+
+        console.log('SVG BBox:', bbox.width, bbox.height);
+        console.log('Container:', containerRect.width, containerRect.height);
+
+        // Calculate scale to fit with 10% padding
+        const scaleX = (containerRect.width * 0.9) / bbox.width;
+        const scaleY = (containerRect.height * 0.9) / bbox.height;
+        scale = Math.min(scaleX, scaleY);
+
+        console.log('Calculated scale:', scale);
+
+        // Center the diagram accounting for bbox offset
+        translateX = (containerRect.width - bbox.width * scale) / 2 - (bbox.x * scale);
+        translateY = (containerRect.height - bbox.height * scale) / 2 - (bbox.y * scale);
+
+        console.log('Translate:', translateX, translateY);
+
+        updateTransform();
+    }, 200);
+}
+
+function updateTransform() {
+    const svg = document.querySelector('.diagram-container svg');
+    if (svg) {
+        svg.style.transformOrigin = '0 0';
+        svg.style.transition = 'transform 0.2s ease-out';
+        svg.style.transform = `translate(${translateX}px, ${translateY}px) scale(${scale})`;
+    }
+}
+
+function toggleLegend() {
+    const legend = document.querySelector('.legend');
+    const toggleBtn = document.getElementById('legendToggle');
+
+    if (legend.classList.contains('hidden')) {
+        legend.classList.remove('hidden');
+        toggleBtn.classList.remove('show');
+    } else {
+        legend.classList.add('hidden');
+        toggleBtn.classList.add('show');
+    }
+
+    // Recenter diagram after legend toggle
+    setTimeout(() => {
+        fitView();
+    }, 350);  // Wait for legend animation to complete
+}
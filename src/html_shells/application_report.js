@@ -0,0 +1,276 @@
+mermaid.initialize({
+    startOnLoad: true,
+    theme: 'default',
+    securityLevel: 'loose',
+    themeVariables: {
+        fontSize: '13px',
+        fontFamily: 'Inter, -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif',
+        primaryColor: '#fff',
+        primaryTextColor: '#000',
+        lineColor: '#333',
+        edgeLabelBackground: '#ffffff'
+    },
+    flowchart: {
+        nodeSpacing: 50,
+        rankSpacing: 80,
+        padding: 15,
+        useMaxWidth: true,
+        htmlLabels: true,
+        curve: 'basis'
+    }
+});
+
+let currentZoom = 1;
+let currentView = 'architecture';
+
+// After Mermaid renders, hide the non-active views
+window.addEventListener('load', function() {
+    setTimeout(function() {
+        document.getElementById('view-fullflow').style.display = 'none';
+        document.getElementById('view-upstream').style.display = 'none';
+        document.getElementById('view-downstream').style.display = 'none';
+    }, 500);
+});
+
+function showView(view) {
+    // Hide all views
+    document.getElementById('view-architecture').style.display = 'none';
+    document.getElementById('view-fullflow').style.display = 'none';
+    document.getElementById('view-upstream').style.display = 'none';
+    document.getElementById('view-downstream').style.display = 'none';
+
+    // Remove active from all buttons
+    document.getElementById('btn-architecture').classList.remove('active');
+    document.getElementById('btn-fullflow').classList.remove('active');
+    document.getElementById('btn-upstream').classList.remove('active');
+    document.getElementById('btn-downstream').classList.remove('active');
+
+    // Show selected view
+    document.getElementById('view-' + view).style.display = 'block';
+    document.getElementById('btn-' + view).classList.add('active');
+
+    currentView = view;
+    resetZoom();
+}
+
+function zoomIn() {
+    currentZoom += 0.1;
+    const activeView = document.getElementById('view-' + currentView);
+    if (activeView) {
+        activeView.style.transform = `scale(${currentZoom})`;
+    }
+}
+
+function zoomOut() {
+    currentZoom = Math.max(0.5, currentZoom - 0.1);
+    const activeView = document.getElementById('view-' + currentView);
+    if (activeView) {
+        activeView.style.transform = `scale(${currentZoom})`;
+    }
+}
+
+function resetZoom() {
+    currentZoom = 1;
+    const activeView = document.getElementById('view-' + currentView);
+    if (activeView) {
+        activeView.style.transform = 'scale(1)';
+    }
+}
+
+function downloadSVG() {
+    const svg = document.querySelector('#diagram svg');
+    if (svg) {
+        const svgData = new XMLSerializer().serializeToString(svg);
+        const blob = new Blob([svgData], { type: 'image/svg+xml' });
+        const url = URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        a.href = url;
+        a.download = NETSEG_DATA.fields.app_id + '_architecture.svg';
+        a.click();
+    }
+}
+
+function downloadPNG() {
+    const svg = document.querySelector('#diagram svg');
+    if (svg) {
+        const canvas = document.createElement('canvas');
+        const ctx = canvas.getContext('2d');
+        const img = new Image();
+        const svgData = new XMLSerializer().serializeToString(svg);
+        const blob = new Blob([svgData], { type: 'image/svg+xml' });
+        const url = URL.createObjectURL(blob);
+
+        img.onload = function() {
+            canvas.width = img.width * 2;
+            canvas.height = img.height * 2;
+            ctx.drawImage(img, 0, 0, canvas.width, canvas.height);
+            canvas.toBlob(function(blob) {
+                const pngUrl = URL.createObjectURL(blob);
+                const a = document.createElement('a');
+                a.href = pngUrl;
+                a.download = NETSEG_DATA.fields.app_id + '_architecture.png';
+                a.click();
+            });
+        };
+        img.src = url;
+    }
+}
+
+// Node details data for modal popups
+const nodeDetails = NETSEG_DATA.data.nodeDetails;
+
+// Add click handlers to all diagram nodes
+window.addEventListener('load', function() {
+    setTimeout(function() {
+        // Get all node elements from Mermaid diagrams
+        const nodes = document.querySelectorAll('.node');
+        nodes.forEach(function(node) {
+            // Make nodes clickable if they have "+X more"
+            const label = node.querySelector('.nodeLabel');
+            if (label && label.textContent.includes('(+')) {
+                node.style.cursor = 'pointer';
+                node.addEventListener('click', function(e) {
+                    e.stopPropagation();
+                    showNodeDetails(node);
+                });
+            }
+        });
+    }, 1000);
+});
+
+function showNodeDetails(node) {
+    const label = node.querySelector('.nodeLabel');
+    if (!label) return;
+
+    const text = label.textContent;
+
+    // Try to determine which node this is
+    let nodeKey = null;
+    let details = null;
+
+    // Check if it's SOURCE
+    if (text.includes(NETSEG_DATA.fields.app_id) && text.includes('Servers')) {
+        nodeKey = 'SOURCE';
+        details = nodeDetails.SOURCE;
+    }
+    // Check for destination apps
+    else {
+        for (let key in nodeDetails) {
+            if (key.startsWith('DEST_')) {
+                const appName = key.replace('DEST_', '');
+                if (text.includes(appName)) {
+                    details = nodeDetails[key];
+                    break;
+                }
+            }
+        }
+    }
+    // Check for EXTERNAL
+    if (!details && (text.includes('External') || text.includes('Internet'))) {
+        details = nodeDetails.EXTERNAL;
+    }
+
+    if (details) {
+        showModal(details.title, details.items);
+    }
+}
+
+function showModal(title, items) {
+    const modal = document.getElementById('detailsModal');
+    const modalTitle = document.getElementById('modalTitle');
+    const modalContent = document.getElementById('modalContent');
+
+    modalTitle.textContent = title;
+
+    // Server type icons/emojis
+    const typeIcons = {
+        'Web': '🌐',
+        'Database': '🗄️',
+        'App': '⚙️',
+        'DNS': '🔍',
+        'Mail': '📧',
+        'File': '📁',
+        'Domain Controller': '👑',
+        'Cache': '💾',
+        'Message Queue': '📨',
+        'Monitoring': '📊',
+        'Backup': '💿',
+        'General': '🖥️'
+    };
+
+    // Build the list with server types
+    let html = '<div style="max-height: 500px; overflow-y: auto;">';
+    html += '<table style="width: 100%; border-collapse: collapse;">';
+    html += '<tr style="background: #2a5298; color: white;">';
+    html += '<th style="padding: 10px; text-align: left;">#</th>';
+    html += '<th style="padding: 10px; text-align: left;">Type</th>';
+    html += '<th style="padding: 10px; text-align: left;">IP (Hostname)</th>';
+    html += '</tr>';
+
+    items.forEach(function(item, idx) {
+        const bg = idx % 2 === 0 ? '#f8f9fa' : 'white';
+        const serverType = item.type || 'General';
+        const icon = typeIcons[serverType] || '🖥️';
+        const display = item.display || item;
+
+        html += `<tr style="background: ${bg};">`;
+        html += `<td style="padding: 8px; border-bottom: 1px solid #ddd;">${idx + 1}</td>`;
+        html += `<td style="padding: 8px; border-bottom: 1px solid #ddd;"><span style="font-size: 16px;">${icon}</span> ${serverType}</td>`;
+        html += `<td style="padding: 8px; border-bottom: 1px solid #ddd; font-family: monospace;">${display}</td>`;
+        html += `</tr>`;
+    });
+    html += '</table></div>';
+
+    // Count server types
+    const typeCounts = {};
+    items.forEach(function(item) {
+        const type = item.type || 'General';
+        typeCounts[type] = (typeCounts[type] || 0) + 1;
+    });
+
+    html += `<div style="margin-top: 15px; padding: 15px; background: #e3f2fd; border-radius: 5px;">`;
+    html += `<strong>Total:</strong> ${items.length} servers<br/><br/>`;
+    html += `<strong>Breakdown by Type:</strong><br/>`;
+    for (let type in typeCounts) {
+        const icon = typeIcons[type] || '🖥️';
+        html += `<span style="display: inline-block; margin: 5px 10px 5px 0;">${icon} ${type}: ${typeCounts[type]}</span>`;
+    }
+    html += `</div>`;
+
+    modalContent.innerHTML = html;
+    modal.style.display = 'block';
+}
+
+function closeModal() {
+    document.getElementById('detailsModal').style.display = 'none';
+}
+
+// Architecture diagram click handlers
+function showWebServers() {
+    const data = nodeDetails['ARCH_WEB'];
+    if (data) {
+        showModal(data.title, data.items);
+    }
+}
+
+function showAppServers() {
+    const data = nodeDetails['ARCH_APP'];
+    if (data) {
+        showModal(data.title, data.items);
+    }
+}
+
+function showDatabaseServers() {
+    const data = nodeDetails['ARCH_DB'];
+    if (data) {
+        showModal(data.title, data.items);
+    }
+}
+
+// Close modal when clicking outside
+window.onclick = function(event) {
+    const modal = document.getElementById('detailsModal');
+    if (event.target == modal) {
+        modal.style.display = 'none';
+    }
+}
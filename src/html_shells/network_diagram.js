@@ -0,0 +1,227 @@
+let panZoom;
+let currentZoom = 1;
+let currentPan = { x: 0, y: 0 };
+
+mermaid.initialize({
+    startOnLoad: false,
+    theme: 'default',
+    flowchart: {
+        useMaxWidth: true,
+        htmlLabels: true,
+        curve: 'linear',
+        padding: 15,
+        nodeSpacing: 80,
+        rankSpacing: 120,
+        diagramPadding: 15
+    },
+    themeVariables: {
+        primaryColor: '#fffde7',
+        primaryTextColor: '#000',
+        primaryBorderColor: '#f57c00',
+        lineColor: '#000000',
+        secondaryColor: '#fff9c4',
+        tertiaryColor: '#fffde7',
+        edgeLabelBackground: '#ffffff',
+        clusterBkg: '#fffde7',
+        clusterBorder: '#f57c00'
+    }
+});
+
+// Initialize diagram on window load
+window.addEventListener('load', function() {
+    const mermaidDiv = document.querySelector('.mermaid');
+    if (mermaidDiv) {
+        mermaid.run({ nodes: [mermaidDiv] }).then(() => {
+            console.log('Mermaid rendered successfully');
+            initializePanZoom();
+        }).catch(err => {
+            console.error('Mermaid rendering failed:', err);
+        });
+    }
+});
+
+function initializePanZoom() {
+    setTimeout(() => {
+        const svg = document.querySelector('#diagram-container svg');
+        console.log('SVG element:', svg);
+
+        if (svg) {
+            // Remove fixed dimensions
+            svg.removeAttribute('width');
+            svg.removeAttribute('height');
+            svg.style.width = '100%';
+            svg.style.height = 'auto';
+
+            // Initialize svg-pan-zoom
+            try {
+                panZoom = svgPanZoom(svg, {
+                    zoomEnabled: true,
+                    controlIconsEnabled: false,
+                    fit: false,
+                    center: false,
+                    minZoom: 0.1,
+                    maxZoom: 20,
+                    zoomScaleSensitivity: 0.3,
+                    onZoom: function(level) {
+                        currentZoom = level;
+                        console.log('Zoomed to:', level);
+                    },
+                    onPan: function(point) {
+                        currentPan = point;
+                    }
+                });
+                console.log('Pan-zoom initialized successfully');
+            } catch(err) {
+                console.error('Pan-zoom initialization failed:', err);
+            }
+        } else {
+            console.error('SVG element not found');
+        }
+    }, 1000);
+}
+
+// Manual zoom controls with fallback
+function zoomIn() {
+    if (panZoom) {
+        panZoom.zoomIn();
+    } else {
+        currentZoom *= 1.3;
+        applyManualZoom();
+    }
+}
+
+function zoomOut() {
+    if (panZoom) {
+        panZoom.zoomOut();
+    } else {
+        currentZoom *= 0.7;
+        applyManualZoom();
+    }
+}
+
+function resetView() {
+    if (panZoom) {
+        panZoom.reset();
+    } else {
+        currentZoom = 1;
+        currentPan = { x: 0, y: 0 };
+        applyManualZoom();
+    }
+}
+
+function centerView() {
+    if (panZoom) {
+        panZoom.center();
+    }
+}
+
+function fitView() {
+    if (panZoom) {
+        panZoom.fit();
+        panZoom.center();
+    }
+}
+
+function applyManualZoom() {
+    const svg = document.querySelector('#diagram-container svg');
+    if (svg) {
+        svg.style.transform = `scale(${currentZoom}) translate(${currentPan.x}px, ${currentPan.y}px)`;
+        svg.style.transformOrigin = 'top left';
+    }
+}
+
+// Theme toggle function
+function toggleTheme(theme) {
+    if (theme === 'dark') {
+        document.body.classList.add('dark');
+        localStorage.setItem('theme', 'dark');
+    } else {
+        document.body.classList.remove('dark');
+        localStorage.setItem('theme', 'light');
+    }
+}
+
+// Load saved theme
+const savedTheme = localStorage.getItem('theme') || 'light';
+if (savedTheme === 'dark') {
+    document.body.classList.add('dark');
+}
+
+// REQUIREMENT 8: Keyboard navigation
+document.addEventListener('keydown', function(e) {
+    // Prevent default browser shortcuts for these keys
+    const handledKeys = ['+', '-', '=', '0', 'r', 'R', 'c', 'C', 'f', 'F'];
+    if (handledKeys.includes(e.key)) {
+        e.preventDefault();
+    }
+
+    switch(e.key) {
+        case '+':
+        case '=':  // Also handle = key (same as + without shift)
+            zoomIn();
+            console.log('Keyboard: Zoom in (+)');
+            break;
+        case '-':
+        case '_':
+            zoomOut();
+            console.log('Keyboard: Zoom out (-)');
+            break;
+        case '0':
+            resetView();
+            console.log('Keyboard: Reset view (0)');
+            break;
+        case 'r':
+        case 'R':
+            resetView();
+            console.log('Keyboard: Reset view (R)');
+            break;
+        case 'c':
+        case 'C':
+            centerView();
+            console.log('Keyboard: Center view (C)');
+            break;
+        case 'f':
+        case 'F':
+            fitView();
+            console.log('Keyboard: Fit to screen (F)');
+            break;
+        case 'ArrowUp':
+            if (panZoom) {
+                panZoom.panBy({x: 0, y: 50});
+            }
+            break;
+        case 'ArrowDown':
+            if (panZoom) {
+                panZoom.panBy({x: 0, y: -50});
+            }
+            break;
+        case 'ArrowLeft':
+            if (panZoom) {
+                panZoom.panBy({x: 50, y: 0});
+            }
+            break;
+        case 'ArrowRight':
+            if (panZoom) {
+                panZoom.panBy({x: -50, y: 0});
+            }
+            break;
+        case '?':
+            // Show keyboard shortcuts help
+            alert(
+                'KEYBOARD SHORTCUTS:\n\n' +
+                'Zoom:\n' +
+                '  + or = : Zoom in\n' +
+                '  - : Zoom out\n' +
+                '  0 or R : Reset view\n' +
+                '  F : Fit to screen\n' +
+                '  C : Center view\n\n' +
+                'Pan:\n' +
+                '  Arrow keys : Pan in direction\n\n' +
+                'Help:\n' +
+                '  ? : Show this help'
+            );
+            break;
+    }
+});
+
+console.log('Keyboard navigation enabled. Press ? for help.');
@@ -0,0 +1,26 @@
+// Shared runtime: reads the page's embedded JSON payload and mounts the shell
+// markup before the shell script runs.
+const NETSEG_DATA = JSON.parse(document.getElementById('netseg-data').textContent);
+
+function netsegEscape(value) {
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+}
+
+function netsegMount(bodyTemplate) {
+    // ${name} slots are filled from the payload fields (HTML-escaped)
+    const fields = NETSEG_DATA.fields || {};
+    const markup = bodyTemplate.replace(/\$\{(\w+)\}/g, function(match, name) {
+        return name in fields ? netsegEscape(fields[name]) : '';
+    });
+    document.body.insertAdjacentHTML('afterbegin', markup);
+
+    // Mermaid source goes in as text; Mermaid decodes it when rendering
+    const diagrams = NETSEG_DATA.diagrams || {};
+    document.querySelectorAll('[data-diagram]').forEach(function(element) {
+        element.textContent = diagrams[element.dataset.diagram] || '';
+    });
+}
@@ -0,0 +1,290 @@
+"""
+HTML Page Templates
+===================
+Compiled page templates and shared, versioned static bundles for the
+interactive HTML diagrams.
+
+Each HTML output used to inline its whole CSS/JS shell, so hundreds of
+per-app files differed only in the diagram payload. Now:
+- The shell (CSS, markup, JS) lives in src/html_shells/ and is published
+  once per output directory as static/<shell>.<version>.css/.js, where the
+  version is a content hash (browsers cache it; a changed shell gets a new
+  file name)
+- The per-app page is a small compiled template carrying only the title,
+  the bundle references and the diagram/data payload as embedded JSON
+- The bundle's runtime mounts the shell markup and fills it from the payload
+
+Shells:
+    network_diagram      MermaidDiagramGenerator (pan/zoom viewer with legend)
+    application_diagram  ApplicationDiagramGenerator (navigation controls)
+    application_report   CompleteReportGenerator (view toggle, server modals)
+
+Usage:
+    write_page('network_diagram', 'outputs/diagrams/ACDA_diagram.html',
+               title='Application: ACDA',
+               diagrams={'main': mermaid_content})
+
+Author: Enterprise Security Team
+Version: 1.0
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import shutil
+from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SHELL_DIR = Path(__file__).parent / 'html_shells'
+STATIC_DIR_NAME = 'static'
+
+MERMAID_SCRIPT = 'https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js'
+MERMAID_10_SCRIPT = 'https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js'
+SVG_PAN_ZOOM_SCRIPT = 'https://cdnjs.cloudflare.com/ajax/libs/svg-pan-zoom/3.6.1/svg-pan-zoom.min.js'
+
+# Shell name -> external scripts it needs (loaded before the bundle)
+SHELLS = {
+    'network_diagram': (MERMAID_SCRIPT, SVG_PAN_ZOOM_SCRIPT),
+    'application_diagram': (MERMAID_SCRIPT,),
+    'application_report': (MERMAID_10_SCRIPT,),
+}
+
+# href/src attributes pointing into a page's static bundle directory
+STATIC_REF_PATTERN = re.compile(rf'(?:href|src)="({STATIC_DIR_NAME}/[^"/]+)"')
+
+# Files that determine page and bundle content (for build cache keys)
+TEMPLATE_SOURCES = [Path(__file__)] + sorted(SHELL_DIR.glob('*.*'))
+
+
+class CompiledTemplate:
+    """
+    Text template with ${name} slots
+
+    The text is split into literal chunks and slot names once; rendering is
+    a single join.
+    """
+
+    SLOT_PATTERN = re.compile(r'\$\{(\w+)\}')
+
+    def __init__(self, text: str):
+        parts = self.SLOT_PATTERN.split(text)
+        self._literals = parts[0::2]
+        self._slots = parts[1::2]
+
+    @property
+    def slots(self) -> Tuple[str, ...]:
+        return tuple(self._slots)
+
+    def render(self, **values: str) -> str:
+        """
+        Fill every slot (values are inserted as-is)
+
+        Raises:
+            KeyError: If a slot has no value
+        """
+        out = [self._literals[0]]
+        for slot, literal in zip(self._slots, self._literals[1:]):
+            out.append(values[slot])
+            out.append(literal)
+        return ''.join(out)
+
+
+@dataclass(frozen=True)
+class ShellBundle:
+    """One shell's static CSS/JS, named by content version"""
+    name: str
+    css: str
+    js: str
+    scripts: Tuple[str, ...]
+    version: str
+
+    @property
+    def stylesheet(self) -> str:
+        """Stylesheet path relative to the page"""
+        return f"{STATIC_DIR_NAME}/{self.name}.{self.version}.css"
+
+    @property
+    def bundle(self) -> str:
+        """Script path relative to the page"""
+        return f"{STATIC_DIR_NAME}/{self.name}.{self.version}.js"
+
+    def publish(self, html_dir: Union[str, Path]):
+        """Write the bundle next to pages in html_dir (once; existing files are kept)"""
+        html_dir = Path(html_dir)
+        for relative, content in ((self.stylesheet, self.css), (self.bundle, self.js)):
+            path = html_dir / relative
+            if path in _published:
+                continue
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Atomic: concurrent report workers may publish the same bundle
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                tmp_path.write_text(content, encoding='utf-8')
+                os.replace(tmp_path, path)
+                logger.debug(f"Published static bundle: {path}")
+            _published.add(path)
+
+
+_published: Set[Path] = set()
+
+
+@lru_cache(maxsize=None)
+def _page_template() -> CompiledTemplate:
+    return CompiledTemplate((SHELL_DIR / 'page.html').read_text(encoding='utf-8'))
+
+
+@lru_cache(maxsize=None)
+def get_bundle(shell: str) -> ShellBundle:
+    """
+    Load a shell's bundle
+
+    The bundle script is the shared runtime, the shell markup (mounted by
+    the runtime) and the shell's own script.
+
+    Raises:
+        ValueError: If the shell is unknown
+    """
+    if shell not in SHELLS:
+        raise ValueError(f"Unknown HTML shell: {shell} (expected one of {', '.join(SHELLS)})")
+
+    css = (SHELL_DIR / f'{shell}.css').read_text(encoding='utf-8')
+    markup = (SHELL_DIR / f'{shell}.html').read_text(encoding='utf-8')
+    runtime = (SHELL_DIR / 'shell.js').read_text(encoding='utf-8')
+    script = (SHELL_DIR / f'{shell}.js').read_text(encoding='utf-8')
+    js = f"{runtime}\nnetsegMount({json.dumps(markup)});\n\n{script}"
+
+    version = hashlib.sha256(f"{css}\0{js}".encode('utf-8')).hexdigest()[:12]
+    return ShellBundle(shell, css, js, SHELLS[shell], version)
+
+
+def _plain(value: Any) -> Any:
+    """JSON-safe copy: numpy scalars -> Python, NaN -> None"""
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_plain(item) for item in value]
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def embed_json(payload: Dict) -> str:
+    """Serialize payload for a <script type="application/json"> block"""
+    text = json.dumps(_plain(payload), ensure_ascii=False, separators=(',', ':'), default=str)
+    # '<' can only occur inside JSON strings; escaping it keeps '</script>' out of the block
+    return text.replace('<', '\\u003c')
+
+
+def render_page(
+    shell: str,
+    title: str,
+    fields: Optional[Dict[str, Any]] = None,
+    diagrams: Optional[Dict[str, str]] = None,
+    data: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Render a page for a shell
+
+    Args:
+        shell: Shell name (see SHELLS)
+        title: Page title
+        fields: Values for the shell markup's ${name} slots
+        diagrams: data-diagram key -> Mermaid source
+        data: Extra data for the shell script (NETSEG_DATA.data)
+
+    Returns:
+        HTML referencing the shell's static bundle under static/
+    """
+    bundle = get_bundle(shell)
+    payload = {'fields': fields or {}, 'diagrams': diagrams or {}, 'data': data or {}}
+    return _page_template().render(
+        title=escape(title),
+        scripts='\n'.join(f'    <script src="{src}"></script>' for src in bundle.scripts),
+        stylesheet=bundle.stylesheet,
+        bundle=bundle.bundle,
+        payload=embed_json(payload),
+    )
+
+
+def write_page(
+    shell: str,
+    output_path: Union[str, Path],
+    title: str,
+    fields: Optional[Dict[str, Any]] = None,
+    diagrams: Optional[Dict[str, str]] = None,
+    data: Optional[Dict[str, Any]] = None
+) -> Path:
+    """
+    Render a page and write it with its static bundle
+
+    Args:
+        shell: Shell name (see SHELLS)
+        output_path: HTML file to write
+        title, fields, diagrams, data: As render_page
+
+    Returns:
+        Path of the written HTML file
+    """
+    html_file = Path(output_path)
+    html_file.parent.mkdir(parents=True, exist_ok=True)
+    get_bundle(shell).publish(html_file.parent)
+    html_file.write_text(render_page(shell, title, fields, diagrams, data), encoding='utf-8')
+    return html_file
+
+
+def static_references(html: str) -> List[str]:
+    """Static bundle files a page loads (paths relative to the page)"""
+    return list(dict.fromkeys(STATIC_REF_PATTERN.findall(html)))
+
+
+def copy_page(html_file: Union[str, Path], dest_dir: Union[str, Path]) -> Path:
+    """
+    Copy a page together with the static bundle files it references
+
+    Pages only carry their payload; without static/ next to them they render
+    blank. Referenced files are copied from the source page's directory, or
+    published from the current shell when the source lacks them.
+
+    Args:
+        html_file: Page to copy
+        dest_dir: Directory to copy it into
+
+    Returns:
+        Path of the copied page
+
+    Raises:
+        FileNotFoundError: If a referenced bundle file can neither be copied
+            nor published
+    """
+    html_file = Path(html_file)
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    current = {}
+    for shell in SHELLS:
+        bundle = get_bundle(shell)
+        current[bundle.stylesheet] = current[bundle.bundle] = bundle
+
+    for relative in static_references(html_file.read_text(encoding='utf-8')):
+        source, target = html_file.parent / relative, dest_dir / relative
+        if target.exists():
+            continue
+        if source.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+        elif relative in current:
+            current[relative].publish(dest_dir)
+        else:
+            raise FileNotFoundError(f"Static bundle file not found for {html_file.name}: {source}")
+
+    return Path(shutil.copy2(html_file, dest_dir / html_file.name))
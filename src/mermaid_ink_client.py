@@ -0,0 +1,370 @@
+"""
+Mermaid.ink Client
+==================
+Batched, rate-limited rendering through the mermaid.ink HTTP API (or a
+self-hosted instance of it).
+
+The API path used to open a new HTTPS connection per diagram and sleep a
+fixed 1.5 s after each one. This client instead:
+
+- Keeps one keep-alive connection per worker thread
+- Bounds the number of requests in flight (shared by all callers)
+- Spaces requests by a shared delay that doubles on 429/5xx (honouring
+  Retry-After) and halves again on success
+- Caches rendered bytes on disk by content hash (format, width, definition),
+  so an identical diagram is never rendered twice - across runs, and
+  concurrent requests for the same diagram share one API call
+- render_many() renders a batch concurrently, results in input order
+
+Usage:
+    client = get_mermaid_ink_client()
+    client.render_to_file(definition, 'out/ACDA_diagram.png', width=4800)
+    results = client.render_many([(definition, 'out/ACDA.svg'), (other, 'out/BLZE.svg')])
+
+Environment:
+    NETSEG_MERMAID_INK_URL       API base URL (default: https://mermaid.ink), e.g.
+                                 http://localhost:3000 for a local mermaid.ink container
+    NETSEG_MERMAID_INK_WORKERS   Requests in flight (default: 4)
+    NETSEG_MERMAID_INK_INTERVAL  Minimum seconds between requests (default: 0.2)
+    NETSEG_MERMAID_INK_CACHE     Render cache directory (default: persistent_data/mermaid_ink_cache;
+                                 empty disables the cache)
+
+Author: Enterprise Security Team
+Version: 1.0
+"""
+
+import atexit
+import base64
+import hashlib
+import http.client
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+MERMAID_INK_URL = 'https://mermaid.ink'
+DEFAULT_CACHE_DIR = 'persistent_data/mermaid_ink_cache'
+USER_AGENT = 'NetworkSegmentationAnalyzer/1.0'
+INK_FORMATS = ('png', 'svg')
+
+# Rate limited or temporarily unavailable: back off and retry
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def valid_image(data: bytes, format: str) -> bool:
+    """Whether API output looks like a real rendering (not an error page or blank image)"""
+    if format == 'png':
+        return data.startswith(b'\x89PNG') and len(data) > 10240
+    return b'<svg' in data and len(data) > 100
+
+
+def diagram_path(definition: str, format: str, width: int = 4800) -> str:
+    """API request path for a diagram"""
+    if format not in INK_FORMATS:
+        raise ValueError(f"Unsupported mermaid.ink format '{format}' (expected one of {INK_FORMATS})")
+    encoded = base64.urlsafe_b64encode(definition.encode('utf-8')).decode('ascii')
+    if format == 'png':
+        return f"/img/{encoded}?type=png&width={width}"
+    return f"/svg/{encoded}"
+
+
+class RenderCache:
+    """Rendered images on disk, keyed by content hash"""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(definition: str, format: str, width: int = 4800) -> str:
+        size = width if format == 'png' else ''
+        return hashlib.sha256(f"{format}\0{size}\0{definition}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str, format: str) -> Path:
+        return self.directory / key[:2] / f"{key}.{format}"
+
+    def get(self, key: str, format: str) -> Optional[bytes]:
+        path = self._path(key, format)
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, format: str, data: bytes):
+        path = self._path(key, format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic: other processes may render the same diagram
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+class _Backoff:
+    """Request spacing shared by all threads: doubles when throttled, halves on success"""
+
+    def __init__(self, interval: float, initial: float = 1.0, maximum: float = 60.0):
+        self.interval = interval
+        self.initial = initial
+        self.maximum = maximum
+        self.delay = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this thread may send its next request"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+    def throttled(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self.delay = min(self.maximum, max(self.delay * 2, self.interval, self.initial))
+            pause = max(self.delay, retry_after or 0.0)
+            self._next = max(self._next, time.monotonic() + pause)
+
+    def succeeded(self):
+        with self._lock:
+            self.delay = max(self.interval, self.delay / 2)
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return min(float(value), 300.0) if value else None
+    except ValueError:
+        return None  # HTTP-date form: fall back to our own backoff
+
+
+class MermaidInkClient:
+    """
+    Thread-safe mermaid.ink client with connection reuse, bounded
+    concurrency, adaptive backoff and a content-hash render cache
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_in_flight: Optional[int] = None,
+        interval: Optional[float] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_retries: int = 3,
+        timeout: float = 30,
+        backoff: float = 1.0
+    ):
+        """
+        Args:
+            base_url: API base URL (default: NETSEG_MERMAID_INK_URL or mermaid.ink)
+            max_in_flight: Concurrent requests (default: NETSEG_MERMAID_INK_WORKERS or 4)
+            interval: Minimum seconds between requests (default: NETSEG_MERMAID_INK_INTERVAL or 0.2)
+            cache_dir: Render cache directory ('' disables; default: NETSEG_MERMAID_INK_CACHE)
+            max_retries: Attempts per diagram on throttling or invalid output
+            timeout: Socket timeout per request in seconds
+            backoff: First delay after a throttled response (doubles while throttled)
+        """
+        self.base_url = (base_url or os.environ.get('NETSEG_MERMAID_INK_URL') or MERMAID_INK_URL).rstrip('/')
+        parts = urlsplit(self.base_url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            raise ValueError(f"Invalid mermaid.ink URL: {self.base_url}")
+        self._scheme, self._host, self._base_path = parts.scheme, parts.netloc, parts.path
+
+        self.max_in_flight = max(1, max_in_flight or int(os.environ.get('NETSEG_MERMAID_INK_WORKERS', 4)))
+        if interval is None:
+            interval = float(os.environ.get('NETSEG_MERMAID_INK_INTERVAL', 0.2))
+        if cache_dir is None:
+            cache_dir = os.environ.get('NETSEG_MERMAID_INK_CACHE', DEFAULT_CACHE_DIR)
+        self.cache = RenderCache(cache_dir) if cache_dir else None
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.stats = Counter()
+        self._backoff = _Backoff(interval, backoff)
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        logger.info(f"MermaidInkClient: {self.base_url} ({self.max_in_flight} in flight, "
+                    f"cache: {self.cache.directory if self.cache else 'off'})")
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """This thread's keep-alive connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self._scheme == 'https' else http.client.HTTPConnection
+            connection = connection_class(self._host, timeout=self.timeout)
+            self._local.connection = connection
+            self._local.used = False
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _drop_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            with self._lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+        self._local.connection = None
+
+    def _get(self, path: str) -> Tuple[int, bytes, Optional[str]]:
+        """GET over this thread's connection (one reconnect if the server closed it)"""
+        for attempt in range(2):
+            connection = self._connection()
+            reused = self._local.used
+            try:
+                connection.request('GET', self._base_path + path, headers={'User-Agent': USER_AGENT})
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError):
+                self._drop_connection()
+                if reused and attempt == 0:
+                    continue  # Idle keep-alive connection closed by the server
+                raise
+            self._local.used = True
+            if response.will_close:
+                self._drop_connection()
+            self._count('requests')
+            return response.status, data, response.getheader('Retry-After')
+
+    def _fetch(self, definition: str, format: str, width: int) -> Optional[bytes]:
+        """Request one rendering, retrying on throttling and invalid output"""
+        path = diagram_path(definition, format, width)
+        for attempt in range(1, self.max_retries + 1):
+            self._backoff.wait()
+            try:
+                with self._slots:
+                    status, data, retry_after = self._get(path)
+            except (http.client.HTTPException, OSError) as e:
+                logger.warning(f"  mermaid.ink request failed: {e}")
+                return None
+
+            if status == 200 and valid_image(data, format):
+                self._backoff.succeeded()
+                return data
+            if status in RETRY_STATUSES:
+                self._count('throttled')
+                logger.warning(f"  mermaid.ink returned {status}, backing off (retry {attempt})")
+                self._backoff.throttled(_retry_after(retry_after))
+            elif status == 200:
+                logger.warning(f"  Invalid {format.upper()} data received (retry {attempt})")
+            else:
+                logger.warning(f"  mermaid.ink returned {status}: {data[:200]!r}")
+                return None
+        return None
+
+    def render(self, definition: str, format: str = 'png', width: int = 4800) -> Optional[bytes]:
+        """
+        Rendered image bytes (None if the API could not render it)
+
+        Args:
+            definition: Mermaid definition (without ```mermaid fences)
+            format: 'png' or 'svg'
+            width: PNG width in pixels
+        """
+        key = RenderCache.key(definition, format, width)
+        if self.cache:
+            data = self.cache.get(key, format)
+            if data is not None:
+                self._count('cache_hits')
+                return data
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                self._inflight[key] = future = Future()
+        if pending is not None:
+            self._count('shared')
+            return pending.result()
+
+        data = None
+        try:
+            data = self._fetch(definition, format, width)
+            if data is not None and self.cache:
+                self.cache.put(key, format, data)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            future.set_result(data)
+        return data
+
+    def render_to_file(self, definition: str, output_path: Union[str, Path],
+                       format: Optional[str] = None, width: int = 4800) -> bool:
+        """Render to a file (format from the suffix unless given)"""
+        output_path = Path(output_path)
+        data = self.render(definition, format or output_path.suffix.lstrip('.').lower(), width)
+        if data is None:
+            return False
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(data)
+        return True
+
+    def render_many(self, jobs: Iterable[Tuple[str, Union[str, Path]]], width: int = 4800) -> List[bool]:
+        """
+        Render (definition, output_path) jobs concurrently
+
+        Each distinct (definition, format) is rendered once and written to
+        all of its output paths.
+
+        Returns:
+            Success per job, in input order
+        """
+        jobs = [(definition, Path(path)) for definition, path in jobs]
+        unique = list(dict.fromkeys((definition, path.suffix.lstrip('.').lower()) for definition, path in jobs))
+
+        def render(item):
+            return self.render(item[0], item[1], width)
+
+        if len(unique) <= 1:
+            rendered = [render(item) for item in unique]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(unique))) as executor:
+                rendered = list(executor.map(render, unique))
+        images = dict(zip(unique, rendered))
+
+        results = []
+        for definition, path in jobs:
+            data = images[(definition, path.suffix.lstrip('.').lower())]
+            if data is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+            results.append(data is not None)
+        return results
+
+    def close(self):
+        """Close all keep-alive connections"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+
+_client: Optional[MermaidInkClient] = None
+_client_lock = threading.Lock()
+
+
+def get_mermaid_ink_client(**client_options) -> MermaidInkClient:
+    """
+    Process-wide client (created on first use, closed at exit)
+
+    client_options (see MermaidInkClient) only apply to the call that creates it.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = MermaidInkClient(**client_options)
+            atexit.register(_client.close)
+        return _client
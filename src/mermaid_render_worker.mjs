@@ -0,0 +1,94 @@
+#!/usr/bin/env node
+/**
+ * Mermaid render worker
+ * =====================
+ * Long-lived renderer used by src/mermaid_renderer.py. Keeps one headless
+ * Chromium open and renders diagrams with mermaid-cli's renderMermaid()
+ * API, so each diagram costs a page render instead of a browser start.
+ *
+ * Protocol: one JSON request per line on stdin, one JSON reply per line on
+ * stdout.
+ *   request: {id, definition, output, format, width, height, scale, background, theme}
+ *   reply:   {id, ok, error?}
+ *   first line written after start-up: {ready: true} or {ready: false, error}
+ *
+ * Usage: node mermaid_render_worker.mjs <mermaid-cli package dir> [puppeteer-config.json] [renders per browser]
+ */
+
+import { createRequire } from 'node:module';
+import { readFile, writeFile } from 'node:fs/promises';
+import { join } from 'node:path';
+import { pathToFileURL } from 'node:url';
+import readline from 'node:readline';
+
+const [packageDir, puppeteerConfigPath, recycleArg] = process.argv.slice(2);
+const rendersPerBrowser = Number(recycleArg || 200);
+
+function reply(message) {
+  process.stdout.write(JSON.stringify(message) + '\n');
+}
+
+async function loadModules() {
+  const requireFromCli = createRequire(join(packageDir, 'package.json'));
+  const { renderMermaid } = await import(pathToFileURL(join(packageDir, 'src', 'index.js')).href);
+  const puppeteerModule = await import(pathToFileURL(requireFromCli.resolve('puppeteer')).href);
+  return { renderMermaid, puppeteer: puppeteerModule.default || puppeteerModule };
+}
+
+async function main() {
+  let modules;
+  let launchOptions = { headless: 'shell' };
+  try {
+    modules = await loadModules();
+    if (puppeteerConfigPath) {
+      const config = JSON.parse(await readFile(puppeteerConfigPath, 'utf8'));
+      for (const [key, value] of Object.entries(config)) {
+        if (value !== null) launchOptions[key] = value;
+      }
+    }
+  } catch (error) {
+    reply({ ready: false, error: String(error && error.message || error) });
+    process.exit(1);
+  }
+
+  const { renderMermaid, puppeteer } = modules;
+  let browser = await puppeteer.launch(launchOptions);
+  let renders = 0;
+  reply({ ready: true });
+
+  // Requests are handled one at a time; the Python pool sends one per worker
+  const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of lines) {
+    if (!line.trim()) continue;
+    let request;
+    try {
+      request = JSON.parse(line);
+      if (renders >= rendersPerBrowser) {
+        await browser.close();
+        browser = await puppeteer.launch(launchOptions);
+        renders = 0;
+      }
+      const { data } = await renderMermaid(browser, request.definition, request.format || 'png', {
+        viewport: {
+          width: request.width || 800,
+          height: request.height || 600,
+          deviceScaleFactor: request.scale || 1,
+        },
+        backgroundColor: request.background || 'white',
+        mermaidConfig: { theme: request.theme || 'default' },
+      });
+      await writeFile(request.output, data);
+      renders += 1;
+      reply({ id: request.id, ok: true });
+    } catch (error) {
+      reply({ id: request && request.id, ok: false, error: String(error && error.message || error) });
+    }
+  }
+
+  await browser.close();
+}
+
+main().catch((error) => {
+  reply({ ready: false, error: String(error && error.message || error) });
+  process.exit(1);
+});
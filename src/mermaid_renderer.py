@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mermaid Renderer
+================
+Shared PNG/SVG rendering of Mermaid diagrams for all report generators.
+
+`mmdc` starts a fresh Node.js process and headless Chromium for every
+diagram, which dominates report runs with hundreds of diagrams. This module
+keeps a small pool of warm render workers instead:
+
+- Each worker is a long-lived Node process (mermaid_render_worker.mjs) with
+  one open browser, driving mermaid-cli's renderMermaid() API
+- Requests and replies are JSON lines over the worker's stdin/stdout
+- The pool is thread-safe; a worker that times out or dies is replaced
+- Without Node or mermaid-cli's package directory, rendering falls back to
+  one `mmdc` subprocess per diagram (the previous behaviour)
+
+render_mermaid() first tries the in-process renderer (mermaid_svg_renderer)
+for SVG/PNG; only definitions outside its flowchart subset reach the pool.
+
+Usage:
+    from mermaid_renderer import render_mermaid, render_mermaid_file
+
+    render_mermaid(definition, 'out/app.png', width=4800, background='transparent')
+    render_mermaid_file('out/app.mmd', 'out/app.svg')
+
+Environment:
+    NETSEG_MERMAID_WORKERS  Pool size (default: min(4, CPU count))
+    NETSEG_MMDC             mmdc executable (default: searched on PATH)
+    NETSEG_MERMAID_ENGINE   auto (native, then mmdc), native or mmdc (default: auto)
+
+Author: Enterprise Security Team
+Version: 1.0
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+try:
+    from src.mermaid_svg_renderer import MermaidSyntaxError, render_to_file as render_native
+except ImportError:
+    from mermaid_svg_renderer import MermaidSyntaxError, render_to_file as render_native
+
+logger = logging.getLogger(__name__)
+
+RENDER_ENGINES = ('auto', 'native', 'mmdc')
+WORKER_SCRIPT = Path(__file__).parent / 'mermaid_render_worker.mjs'
+DEFAULT_PUPPETEER_CONFIG = Path(__file__).parent.parent / 'puppeteer-config.json'
+MERMAID_CLI_PACKAGE = '@mermaid-js/mermaid-cli'
+RENDER_FORMATS = ('png', 'svg', 'pdf')
+
+
+def strip_mermaid_fences(content: str) -> str:
+    """
+    Diagram definition from raw Mermaid or markdown
+
+    Only the first ```mermaid block is kept when there is one (titles and
+    legends around it are dropped); otherwise stray fence lines are removed.
+    """
+    lines = content.split('\n')
+    starts = [i for i, line in enumerate(lines) if line.strip().startswith('```mermaid')]
+    if starts:
+        graph_lines = []
+        for line in lines[starts[0] + 1:]:
+            if line.strip() == '```':
+                break
+            graph_lines.append(line)
+        return '\n'.join(graph_lines).strip()
+    return '\n'.join(line for line in lines if not line.strip().startswith('```')).strip()
+
+
+def find_mmdc() -> Optional[str]:
+    """mmdc executable from NETSEG_MMDC or PATH (None if not installed)"""
+    configured = os.environ.get('NETSEG_MMDC')
+    if configured:
+        return configured
+    project_root = Path(__file__).parent.parent
+    for candidate in (shutil.which('mmdc'),
+                      project_root / 'node_modules' / '.bin' / 'mmdc',
+                      project_root / 'nodeenv' / 'Scripts' / 'mmdc.cmd'):
+        if candidate and Path(candidate).exists():
+            return str(candidate)
+    return None
+
+
+def find_mermaid_cli_package(mmdc: Optional[str] = None) -> Optional[Path]:
+    """
+    Installation directory of @mermaid-js/mermaid-cli
+
+    Resolved from the mmdc executable: the real path of a POSIX bin symlink
+    lies inside the package, a Windows .cmd shim sits next to node_modules.
+    """
+    mmdc = mmdc or find_mmdc()
+    if not mmdc:
+        return None
+
+    mmdc_path = Path(shutil.which(mmdc) or mmdc)
+    candidates = list(mmdc_path.resolve().parents)
+    candidates += [parent / 'node_modules' / MERMAID_CLI_PACKAGE for parent in mmdc_path.parents[:3]]
+    for directory in candidates:
+        package_json = directory / 'package.json'
+        if not package_json.exists():
+            continue
+        try:
+            with open(package_json, 'r', encoding='utf-8') as f:
+                if json.load(f).get('name') == MERMAID_CLI_PACKAGE:
+                    return directory
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def _render_format(output_path: Path, format: Optional[str]) -> str:
+    format = (format or output_path.suffix.lstrip('.') or 'png').lower()
+    if format not in RENDER_FORMATS:
+        raise ValueError(f"Unknown Mermaid output format '{format}' (expected one of {RENDER_FORMATS})")
+    return format
+
+
+class _RenderWorker:
+    """One long-lived render process and the thread reading its replies"""
+
+    def __init__(self, command: List[str], startup_timeout: float):
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            bufsize=1
+        )
+        self.replies: 'queue.Queue[Optional[Dict]]' = queue.Queue()
+        self.reader = threading.Thread(target=self._read_replies, daemon=True)
+        self.reader.start()
+
+        ready = self._next_reply(startup_timeout)
+        if not ready or not ready.get('ready'):
+            self.close()
+            error = (ready or {}).get('error', 'worker exited during start-up')
+            raise RuntimeError(f"Mermaid render worker failed to start: {error}")
+
+    def _read_replies(self):
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                self.replies.put(json.loads(line))
+            except ValueError:
+                logger.debug(f"Ignoring render worker output: {line[:100]}")
+        self.replies.put(None)  # EOF
+
+    def _next_reply(self, timeout: float) -> Optional[Dict]:
+        try:
+            return self.replies.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(self, payload: Dict, timeout: float) -> Dict:
+        """Send one render request and wait for its reply"""
+        self.process.stdin.write(json.dumps(payload) + '\n')
+        self.process.stdin.flush()
+        while True:
+            reply = self._next_reply(timeout)
+            if reply is None:
+                raise TimeoutError(f"No reply from render worker within {timeout}s")
+            if reply.get('id') == payload['id']:
+                return reply
+
+    def close(self, force: bool = False):
+        """Stop the worker; force skips the graceful end-of-input shutdown (hung worker)"""
+        try:
+            if force:
+                self.process.terminate()  # lets puppeteer close its browser
+                self.process.wait(timeout=2)
+                return
+            if self.process.stdin and not self.process.stdin.closed:
+                self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+
+
+class MermaidRenderPool:
+    """
+    Pool of warm Mermaid render workers
+
+    Workers are started on first use, up to `size`; concurrent render() calls
+    each take an idle worker. If no worker can be started, every render goes
+    through a one-off `mmdc` subprocess.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        mmdc: Optional[str] = None,
+        puppeteer_config: Optional[Union[str, Path]] = None,
+        worker_command: Optional[List[str]] = None,
+        renders_per_browser: int = 200,
+        startup_timeout: float = 60
+    ):
+        """
+        Args:
+            size: Maximum number of worker processes
+            mmdc: mmdc executable (worker package lookup and fallback)
+            puppeteer_config: Browser launch options (JSON file)
+            worker_command: Worker process command line (default: node + mermaid_render_worker.mjs)
+            renders_per_browser: Browser restart interval inside each worker
+            startup_timeout: Seconds to wait for a worker's ready message
+        """
+        self.size = max(1, size or int(os.environ.get('NETSEG_MERMAID_WORKERS', 0)) or min(4, os.cpu_count() or 1))
+        self.mmdc = mmdc or find_mmdc()
+        if puppeteer_config is None and DEFAULT_PUPPETEER_CONFIG.exists():
+            puppeteer_config = DEFAULT_PUPPETEER_CONFIG
+        self.puppeteer_config = str(puppeteer_config) if puppeteer_config else None
+        self.worker_command = worker_command or self._default_worker_command(renders_per_browser)
+        self.startup_timeout = startup_timeout
+
+        self._idle: 'queue.Queue[_RenderWorker]' = queue.Queue()
+        self._workers: List[_RenderWorker] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._closed = False
+        self.available = self.worker_command is not None
+        self.stats = {'worker_renders': 0, 'mmdc_renders': 0, 'failures': 0, 'workers_started': 0}
+
+    def _default_worker_command(self, renders_per_browser: int) -> Optional[List[str]]:
+        node = shutil.which('node')
+        package_dir = find_mermaid_cli_package(self.mmdc)
+        if not node or not package_dir:
+            return None
+        return [node, str(WORKER_SCRIPT), str(package_dir), self.puppeteer_config or '', str(renders_per_browser)]
+
+    def _acquire(self) -> Optional[_RenderWorker]:
+        """Idle worker, a newly started one, or None when workers are unavailable"""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if self.available and not self._closed and len(self._workers) < self.size:
+                    try:
+                        worker = _RenderWorker(self.worker_command, self.startup_timeout)
+                    except (OSError, RuntimeError) as e:
+                        logger.warning(f"Mermaid render workers unavailable, using mmdc per diagram: {e}")
+                        self.available = False
+                        return None
+                    self._workers.append(worker)
+                    self.stats['workers_started'] += 1
+                    return worker
+                if not self._workers:
+                    return None
+
+            # All workers busy; a replaced worker frees a slot, so poll
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    def _release(self, worker: _RenderWorker, healthy: bool):
+        if healthy and worker.alive and not self._closed:
+            self._idle.put(worker)
+            return
+        worker.close(force=not healthy)
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def render(
+        self,
+        definition: str,
+        output_path: Union[str, Path],
+        format: Optional[str] = None,
+        width: int = 800,
+        height: int = 600,
+        scale: float = 1,
+        background: str = 'white',
+        theme: str = 'default',
+        timeout: float = 60
+    ) -> bool:
+        """
+        Render a Mermaid definition to PNG, SVG or PDF
+
+        Args:
+            definition: Mermaid source (without markdown fences)
+            output_path: Output file
+            format: 'png', 'svg' or 'pdf' (default: from the file suffix)
+            width, height: Viewport size in pixels
+            scale: Device scale factor
+            background: Background colour ('transparent' allowed)
+            theme: Mermaid theme
+            timeout: Seconds allowed for this diagram
+
+        Returns:
+            True if the output file was written
+        """
+        output_path = Path(output_path)
+        format = _render_format(output_path, format)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        options = {'format': format, 'width': width, 'height': height, 'scale': scale,
+                   'background': background, 'theme': theme}
+
+        worker = self._acquire()
+        if worker is None:
+            return self._render_with_mmdc(definition, output_path, options, timeout)
+
+        payload = {'id': next(self._ids), 'definition': definition,
+                   'output': str(output_path.resolve()), **options}
+        healthy = True
+        try:
+            reply = worker.request(payload, timeout)
+        except (OSError, ValueError, TimeoutError) as e:
+            healthy = False
+            reply = {'ok': False, 'error': str(e)}
+        finally:
+            self._release(worker, healthy)
+
+        if reply.get('ok'):
+            self.stats['worker_renders'] += 1
+            return True
+        self.stats['failures'] += 1
+        logger.debug(f"Mermaid render failed for {output_path.name}: {str(reply.get('error'))[:200]}")
+        return False
+
+    def _render_with_mmdc(self, definition: str, output_path: Path, options: Dict, timeout: float) -> bool:
+        """One-off mmdc process for a single diagram"""
+        if not self.mmdc:
+            logger.warning("mmdc not installed (install with: npm install -g @mermaid-js/mermaid-cli)")
+            self.stats['failures'] += 1
+            return False
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False, encoding='utf-8') as tmp:
+            tmp.write(definition)
+            tmp_path = tmp.name
+
+        cmd = [self.mmdc, '-i', tmp_path, '-o', str(output_path),
+               '-e', options['format'],
+               '-w', str(options['width']), '-H', str(options['height']),
+               '-s', str(options['scale']), '-b', options['background'], '-t', options['theme']]
+        if self.puppeteer_config:
+            cmd += ['-p', self.puppeteer_config]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"mmdc failed for {output_path.name}: {e}")
+            result = None
+        finally:
+            Path(tmp_path).unlink(missing_ok=True)
+
+        if result is not None and result.returncode == 0 and output_path.exists():
+            self.stats['mmdc_renders'] += 1
+            return True
+        if result is not None:
+            logger.debug(f"mmdc error for {output_path.name}: {result.stderr[:200]}")
+        self.stats['failures'] += 1
+        return False
+
+    def close(self):
+        """Stop all workers"""
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_pool: Optional[MermaidRenderPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool(**pool_options) -> MermaidRenderPool:
+    """
+    Process-wide render pool (created on first use, closed at exit)
+
+    pool_options (see MermaidRenderPool) only apply to the call that creates it.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = MermaidRenderPool(**pool_options)
+            atexit.register(_pool.close)
+        return _pool
+
+
+def render_mermaid(definition: str, output_path: Union[str, Path], engine: Optional[str] = None, **options) -> bool:
+    """
+    Render a Mermaid definition (options: see MermaidRenderPool.render)
+
+    Args:
+        engine: 'auto' (in-process renderer, mmdc for unsupported syntax),
+                'native' (in-process only) or 'mmdc' (render pool only);
+                default from NETSEG_MERMAID_ENGINE
+    """
+    engine = engine or os.environ.get('NETSEG_MERMAID_ENGINE', 'auto')
+    if engine not in RENDER_ENGINES:
+        raise ValueError(f"Unknown Mermaid render engine '{engine}' (expected one of {RENDER_ENGINES})")
+
+    output_path = Path(output_path)
+    format = _render_format(output_path, options.get('format'))
+    if engine != 'mmdc' and format in ('svg', 'png'):
+        try:
+            render_native(
+                definition, output_path, format=format,
+                width=options.get('width'), scale=options.get('scale', 1),
+                background=options.get('background', 'white'), theme=options.get('theme', 'default')
+            )
+            return True
+        except (MermaidSyntaxError, ImportError) as e:
+            if engine == 'native':
+                logger.warning(f"Native Mermaid rendering failed for {output_path.name}: {e}")
+                return False
+            logger.debug(f"Native Mermaid rendering unavailable for {output_path.name}, using mmdc: {e}")
+
+    return get_render_pool().render(definition, output_path, **options)
+
+
+def render_mermaid_file(mmd_path: Union[str, Path], output_path: Union[str, Path], **options) -> bool:
+    """Render a .mmd/.md file, stripping ```mermaid fences"""
+    with open(mmd_path, 'r', encoding='utf-8') as f:
+        definition = strip_mermaid_fences(f.read())
+    return render_mermaid(definition, output_path, **options)
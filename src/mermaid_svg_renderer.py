@@ -0,0 +1,1358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mermaid SVG Renderer
+====================
+In-process renderer for the Mermaid flowchart subset emitted by the diagram
+generators - no Node.js, Chromium or mermaid.ink.
+
+Supported syntax:
+- graph/flowchart TB|TD|BT|LR|RL, %% comments, ';' separators
+- Nodes: id, id[..], id(..), id((..)), id(((..))), id([..]), id[(..)],
+  id[[..]], id{..}, id{{..}}, id[/../], id[\\..\\], id[/..\\], id>..],
+  quoted labels, <br/> line breaks, :::class suffix
+- Links: -->, ---, -.->, -.-, .->, .-, ==>, ===, ~~~, <-->, |label| and inline
+  (-- label -->, -. label .->, == label ==>) forms, chains, & groups
+- subgraph id["title"] ... end (nested, direction, usable as link endpoints)
+- classDef, class, style, linkStyle; click statements are ignored
+
+Pipeline:
+    parse_flowchart() -> layout_flowchart() -> to_svg() / to_png()
+
+Layout is layered (Sugiyama): cycle breaking, longest-path ranking, dummy
+nodes on long edges, barycenter crossing reduction and order-preserving
+coordinate assignment. Each subgraph is laid out recursively as one block
+of its parent. Anything outside the subset raises MermaidSyntaxError, which
+mermaid_renderer uses to fall back to mmdc.
+
+PNG output rasterizes the same layout with Pillow (optional dependency).
+
+Author: Enterprise Security Team
+Version: 1.0
+"""
+
+import html
+import logging
+import math
+import re
+from bisect import bisect_right, insort
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image, ImageColor, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+ROOT = ''
+FONT_FAMILY = '"trebuchet ms", verdana, arial, sans-serif'
+FONT_SIZE = 16
+LINE_HEIGHT = 1.5
+NODE_PADDING = (15, 10)          # x, y
+NODE_SEP = 50                    # Between neighbours in a layer
+RANK_SEP = 50                    # Between layers
+CLUSTER_PADDING = 15
+CLUSTER_TITLE_HEIGHT = 32
+MARGIN = 8
+DUMMY_SIZE = 10
+SORT_ITERATIONS = 8
+SORT_PATIENCE = 2                # Stop after this many sweeps without fewer crossings
+POSITION_ITERATIONS = 4
+LAYOUT_WORK = 50_000             # Vertex visits per refinement phase; bounds sweeps on large diagrams
+MAX_PNG_PIXELS = 50_000_000
+
+THEMES = {
+    'default': {'node_fill': '#ECECFF', 'node_stroke': '#9370DB', 'cluster_fill': '#FFFFDE',
+                'cluster_stroke': '#AAAA33', 'line': '#333333', 'text': '#333333', 'label_bg': '#E8E8E8'},
+    'neutral': {'node_fill': '#EEEEEE', 'node_stroke': '#999999', 'cluster_fill': '#F8F8F8',
+                'cluster_stroke': '#BBBBBB', 'line': '#666666', 'text': '#333333', 'label_bg': '#FFFFFF'},
+    'forest': {'node_fill': '#CDE498', 'node_stroke': '#13540C', 'cluster_fill': '#E6F2CB',
+               'cluster_stroke': '#6EAA49', 'line': '#008000', 'text': '#333333', 'label_bg': '#E8E8E8'},
+    'dark': {'node_fill': '#1F2020', 'node_stroke': '#CCCCCC', 'cluster_fill': '#333333',
+             'cluster_stroke': '#888888', 'line': '#D3D3D3', 'text': '#CCCCCC', 'label_bg': '#585858'},
+}
+
+
+class MermaidSyntaxError(ValueError):
+    """Definition uses Mermaid syntax outside the supported flowchart subset"""
+
+
+# ============================================================================
+# Model
+# ============================================================================
+
+@dataclass
+class Node:
+    """Flowchart node"""
+    id: str
+    label: str
+    shape: str = 'rect'
+    explicit: bool = False
+
+
+@dataclass
+class Edge:
+    """Flowchart link"""
+    source: str
+    target: str
+    label: str = ''
+    stroke: str = 'normal'       # normal, dotted, thick, invisible
+    arrow_end: bool = True
+    arrow_start: bool = False
+
+
+@dataclass
+class Subgraph:
+    """Flowchart subgraph (cluster)"""
+    id: str
+    title: str
+    parent: str = ROOT
+    direction: Optional[str] = None
+
+
+@dataclass
+class Flowchart:
+    """Parsed flowchart"""
+    direction: str = 'TB'
+    nodes: Dict[str, Node] = field(default_factory=dict)
+    edges: List[Edge] = field(default_factory=list)
+    subgraphs: Dict[str, Subgraph] = field(default_factory=dict)
+    parents: Dict[str, str] = field(default_factory=dict)                 # node/subgraph id -> container
+    children: Dict[str, Dict[str, None]] = field(default_factory=lambda: {ROOT: {}})
+    class_defs: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    classes: Dict[str, List[str]] = field(default_factory=dict)           # id -> class names
+    styles: Dict[str, Dict[str, str]] = field(default_factory=dict)       # id -> style statement
+    link_styles: Dict[Union[int, str], Dict[str, str]] = field(default_factory=dict)
+
+
+# ============================================================================
+# Parser
+# ============================================================================
+
+HEADER_RE = re.compile(r'^(?:graph|flowchart)(?:\s+(TB|TD|BT|LR|RL))?\s*$')
+DIRECTION_RE = re.compile(r'^direction\s+(TB|TD|BT|LR|RL)$')
+SUBGRAPH_RE = re.compile(r'^subgraph(?:\s+(.*))?$')
+CLASSDEF_RE = re.compile(r'^classDef\s+([\w,-]+)\s+(.+)$')
+CLASS_RE = re.compile(r'^class\s+([\w,\s-]+?)\s+([\w-]+)$')
+STYLE_RE = re.compile(r'^style\s+([\w-]+)\s+(.+)$')
+LINKSTYLE_RE = re.compile(r'^linkStyle\s+(default|[\d,\s]+?)\s+(.+)$')
+IGNORED_RE = re.compile(r'^(?:click|accTitle|accDescr)\b')
+ID_RE = re.compile(r'\w+(?:-\w+)*')
+CLASS_SUFFIX_RE = re.compile(r':::([\w-]+)')
+GROUP_SEPARATOR_RE = re.compile(r'\s*&\s*')
+SIMPLE_LINK_RE = re.compile(r'\s*(<?)(-?\.+->|-?\.+-|-{2,}>|-{3,}|={2,}>|={3,}|~~~)(?:\s*\|([^|]*)\|)?')
+INLINE_LINK_RE = re.compile(r'\s*(<?)(--|==|-\.)(?![->=.])\s*(.+?)\s*(-{2,}>|-{3,}|\.-+>|\.-+|={2,}>|={3,})')
+BR_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+ENTITY_RE = re.compile(r'#(\w+);')
+
+# (opener, closers, shape) - longest openers first; a closer may select the shape
+NODE_SHAPES = [
+    ('(((', {')))': 'doublecircle'}),
+    ('((', {'))': 'circle'}),
+    ('([', {'])': 'stadium'}),
+    ('[(', {')]': 'cylinder'}),
+    ('[[', {']]': 'subroutine'}),
+    ('[/', {'/]': 'parallelogram', '\\]': 'trapezoid'}),
+    ('[\\', {'\\]': 'parallelogram_alt', '/]': 'trapezoid_alt'}),
+    ('{{', {'}}': 'hexagon'}),
+    ('[', {']': 'rect'}),
+    ('(', {')': 'round'}),
+    ('{', {'}': 'rhombus'}),
+    ('>', {']': 'asymmetric'}),
+]
+
+
+def _clean_label(text: str) -> str:
+    """Display text: <br/> -> newline, tags stripped, Mermaid (#quot;) and HTML entities decoded"""
+    text = text.strip()
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        text = text[1:-1]
+    text = BR_RE.sub('\n', text)
+    text = TAG_RE.sub('', text)
+
+    def entity(match):
+        name = match.group(1)
+        if name.isdigit():
+            return chr(int(name))
+        decoded = html.unescape(f'&{name};')
+        return decoded if decoded != f'&{name};' else match.group(0)
+
+    text = ENTITY_RE.sub(entity, text)
+    return html.unescape(text)
+
+
+def _parse_style(text: str) -> Dict[str, str]:
+    """'fill:#fff,stroke:#333,stroke-width:2px' -> dict (commas inside parentheses kept)"""
+    props, depth, current = {}, 0, ''
+    for ch in text.strip().rstrip(';') + ',':
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        if ch == ',' and depth == 0:
+            key, _, value = current.partition(':')
+            if key.strip() and value.strip():
+                props[key.strip()] = value.strip()
+            current = ''
+        else:
+            current += ch
+    return props
+
+
+def _split_statements(line: str) -> List[str]:
+    """Split a line on ';' outside quotes and brackets"""
+    if ';' not in line:
+        return [line]
+    parts, current, quoted, depth = [], '', False, 0
+    for ch in line:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch in '[({':
+            depth += 1
+        elif not quoted and ch in '])}':
+            depth = max(0, depth - 1)
+        if ch == ';' and not quoted and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += ch
+    parts.append(current)
+    return [part for part in parts if part.strip()]
+
+
+class _FlowchartParser:
+    """Line-oriented parser for the supported flowchart subset"""
+
+    def __init__(self):
+        self.chart = Flowchart()
+        self.stack: List[str] = [ROOT]
+        self.anonymous = 0
+
+    def parse(self, definition: str) -> Flowchart:
+        header_seen = False
+        for number, raw in enumerate(definition.split('\n'), 1):
+            line = raw.strip()
+            if not line or line.startswith('%%'):
+                continue
+            if not header_seen:
+                match = HEADER_RE.match(line.rstrip(';').strip())
+                if not match:
+                    raise MermaidSyntaxError(f"Line {number}: unsupported diagram type '{line[:40]}'")
+                self.chart.direction = _normalize_direction(match.group(1) or 'TB')
+                header_seen = True
+                continue
+            for statement in _split_statements(line):
+                try:
+                    self._statement(statement.strip())
+                except MermaidSyntaxError as e:
+                    raise MermaidSyntaxError(f"Line {number}: {e}") from None
+
+        if not header_seen:
+            raise MermaidSyntaxError("Empty Mermaid definition")
+        if len(self.stack) > 1:
+            raise MermaidSyntaxError(f"Unclosed subgraph '{self.stack[-1]}'")
+        self._resolve_subgraph_references()
+        return self.chart
+
+    # -- statements ----------------------------------------------------------
+
+    def _statement(self, statement: str):
+        if not statement:
+            return
+        if statement == 'end':
+            if len(self.stack) == 1:
+                raise MermaidSyntaxError("'end' without subgraph")
+            self.stack.pop()
+            return
+
+        match = SUBGRAPH_RE.match(statement)
+        if match:
+            self._subgraph(match.group(1) or '')
+            return
+
+        match = DIRECTION_RE.match(statement)
+        if match:
+            direction = _normalize_direction(match.group(1))
+            if self.stack[-1] == ROOT:
+                self.chart.direction = direction
+            else:
+                self.chart.subgraphs[self.stack[-1]].direction = direction
+            return
+
+        match = CLASSDEF_RE.match(statement)
+        if match:
+            props = _parse_style(match.group(2))
+            for name in match.group(1).split(','):
+                self.chart.class_defs[name.strip()] = props
+            return
+
+        match = CLASS_RE.match(statement)
+        if match:
+            for target in match.group(1).split(','):
+                self.chart.classes.setdefault(target.strip(), []).append(match.group(2))
+            return
+
+        match = STYLE_RE.match(statement)
+        if match:
+            self.chart.styles.setdefault(match.group(1), {}).update(_parse_style(match.group(2)))
+            return
+
+        match = LINKSTYLE_RE.match(statement)
+        if match:
+            props = _parse_style(match.group(2))
+            targets = match.group(1)
+            keys = ['default'] if targets == 'default' else [int(i) for i in re.split(r'[,\s]+', targets) if i]
+            for key in keys:
+                self.chart.link_styles.setdefault(key, {}).update(props)
+            return
+
+        if IGNORED_RE.match(statement):
+            return
+
+        self._links(statement)
+
+    def _subgraph(self, spec: str):
+        spec = spec.strip()
+        match = re.match(r'^([\w-]+)\s*\[(.*)\]$', spec)
+        if match:
+            sg_id, title = match.group(1), _clean_label(match.group(2))
+        elif spec.startswith('"') and spec.endswith('"') and len(spec) >= 2:
+            self.anonymous += 1
+            sg_id, title = f'subGraph{self.anonymous}', _clean_label(spec)
+        elif spec and ID_RE.fullmatch(spec):
+            sg_id = title = spec
+        else:
+            self.anonymous += 1
+            sg_id, title = f'subGraph{self.anonymous}', _clean_label(spec)
+
+        parent = self.stack[-1]
+        if sg_id in self.chart.subgraphs:
+            raise MermaidSyntaxError(f"Subgraph '{sg_id}' defined twice")
+        self.chart.subgraphs[sg_id] = Subgraph(sg_id, title, parent)
+        self.chart.children.setdefault(sg_id, {})
+        self._attach(sg_id, parent)
+        self.stack.append(sg_id)
+
+    def _links(self, statement: str):
+        pos, left = self._node_group(statement, 0)
+        while True:
+            match = SIMPLE_LINK_RE.match(statement, pos)
+            if match:
+                start, link, label = match.group(1), match.group(2), match.group(3) or ''
+            else:
+                match = INLINE_LINK_RE.match(statement, pos)
+                if not match:
+                    break
+                start, link, label = match.group(1), match.group(2) + match.group(4), match.group(3)
+            pos, right = self._node_group(statement, match.end())
+            stroke = ('invisible' if '~' in link else 'thick' if '=' in link
+                      else 'dotted' if '.' in link else 'normal')
+            for source in left:
+                for target in right:
+                    self.chart.edges.append(Edge(
+                        source, target, _clean_label(label), stroke,
+                        arrow_end=link.endswith('>'), arrow_start=bool(start)
+                    ))
+            left = right
+
+        if statement[pos:].strip():
+            raise MermaidSyntaxError(f"unsupported syntax near '{statement[pos:pos + 30].strip()}'")
+
+    def _node_group(self, statement: str, pos: int) -> Tuple[int, List[str]]:
+        pos, node_id = self._node(statement, pos)
+        group = [node_id]
+        while True:
+            match = GROUP_SEPARATOR_RE.match(statement, pos)
+            if not match or match.end() == len(statement):
+                return pos, group
+            pos, node_id = self._node(statement, match.end())
+            group.append(node_id)
+
+    def _node(self, statement: str, pos: int) -> Tuple[int, str]:
+        while pos < len(statement) and statement[pos].isspace():
+            pos += 1
+        match = ID_RE.match(statement, pos)
+        if not match:
+            raise MermaidSyntaxError(f"expected node id near '{statement[pos:pos + 30]}'")
+        node_id, pos = match.group(), match.end()
+
+        label = shape = None
+        for opener, closers in NODE_SHAPES:
+            if not statement.startswith(opener, pos):
+                continue
+            start = pos + len(opener)
+            if statement.startswith('"', start):
+                quote_end = statement.find('"', start + 1)
+                if quote_end < 0:
+                    raise MermaidSyntaxError(f"unterminated label for '{node_id}'")
+                candidates = [(quote_end + 1, c) for c in closers if statement.startswith(c, quote_end + 1)]
+            else:
+                candidates = [(statement.find(c, start), c) for c in closers]
+                candidates = [(i, c) for i, c in candidates if i >= 0]
+            if not candidates:
+                continue
+            end, closer = min(candidates)
+            label, shape = _clean_label(statement[start:end]), closers[closer]
+            pos = end + len(closer)
+            break
+
+        node_classes = []
+        match = CLASS_SUFFIX_RE.match(statement, pos)
+        if match:
+            node_classes.append(match.group(1))
+            pos = match.end()
+
+        self._touch(node_id, label, shape, node_classes)
+        return pos, node_id
+
+    def _touch(self, node_id: str, label: Optional[str], shape: Optional[str], node_classes: List[str]):
+        container = self.stack[-1]
+        if node_classes:
+            self.chart.classes.setdefault(node_id, []).extend(node_classes)
+        if node_id in self.chart.subgraphs and label is None:
+            return
+
+        node = self.chart.nodes.get(node_id)
+        if node is None:
+            node = self.chart.nodes[node_id] = Node(node_id, node_id)
+            self._attach(node_id, container)
+        elif self._is_ancestor(self.chart.parents[node_id], container):
+            # Mentioned inside a nested subgraph: innermost subgraph claims it
+            self._attach(node_id, container)
+        if label is not None:
+            node.label, node.shape, node.explicit = label, shape, True
+
+    def _attach(self, item_id: str, container: str):
+        previous = self.chart.parents.get(item_id)
+        if previous is not None:
+            self.chart.children[previous].pop(item_id, None)
+        self.chart.parents[item_id] = container
+        self.chart.children[container][item_id] = None
+
+    def _is_ancestor(self, candidate: str, container: str) -> bool:
+        """True if candidate strictly encloses container"""
+        while container != ROOT:
+            container = self.chart.subgraphs[container].parent
+            if container == candidate:
+                return True
+        return False
+
+    def _resolve_subgraph_references(self):
+        """Implicit nodes named like a subgraph defined later refer to the subgraph"""
+        for sg_id in self.chart.subgraphs:
+            node = self.chart.nodes.get(sg_id)
+            if node is None:
+                continue
+            if node.explicit:
+                raise MermaidSyntaxError(f"'{sg_id}' is both a node and a subgraph")
+            del self.chart.nodes[sg_id]
+            self.chart.children[self.chart.parents[sg_id]].pop(sg_id, None)
+            self.chart.parents[sg_id] = self.chart.subgraphs[sg_id].parent
+            self.chart.children[self.chart.parents[sg_id]][sg_id] = None
+
+
+def _normalize_direction(direction: str) -> str:
+    return 'TB' if direction == 'TD' else direction
+
+
+def parse_flowchart(definition: str) -> Flowchart:
+    """Parse a Mermaid flowchart definition (raises MermaidSyntaxError outside the subset)"""
+    return _FlowchartParser().parse(definition)
+
+
+# ============================================================================
+# Layout
+# ============================================================================
+
+def _char_width(ch: str) -> float:
+    """Approximate advance width in em for the default sans-serif font"""
+    code = ord(ch)
+    if code in (0xFE0F, 0x200D) or 0x300 <= code < 0x370:
+        return 0.0
+    if code >= 0x1F000 or 0x2600 <= code < 0x27C0 or 0x2B00 <= code < 0x2C00:
+        return 1.25
+    if code >= 0x2E80:
+        return 1.0
+    if ch == ' ':
+        return 0.3
+    if ch in 'il.,:;|!\'`[]()':
+        return 0.3
+    if ch in 'mwMW@%':
+        return 0.9
+    if ch.isupper() or ch.isdigit() or ch in '#&_':
+        return 0.65
+    return 0.55
+
+
+@lru_cache(maxsize=65536)
+def text_size(text: str, font_size: float = FONT_SIZE) -> Tuple[float, float]:
+    """Estimated (width, height) of a possibly multi-line label"""
+    lines = text.split('\n')
+    width = max(sum(_char_width(ch) for ch in line) for line in lines) * font_size
+    return width, len(lines) * font_size * LINE_HEIGHT
+
+
+def node_size(node: Node) -> Tuple[float, float]:
+    """(width, height) of a node's shape around its label"""
+    text_w, text_h = text_size(node.label) if node.label else (0.0, FONT_SIZE * LINE_HEIGHT)
+    pad_x, pad_y = NODE_PADDING
+    w, h = text_w + 2 * pad_x, text_h + 2 * pad_y
+    shape = node.shape
+    if shape in ('circle', 'doublecircle'):
+        d = max(text_w, text_h) + 2 * pad_y + (10 if shape == 'doublecircle' else 0)
+        return d, d
+    if shape == 'rhombus':
+        side = text_w + text_h + 2 * pad_y
+        return side, side
+    if shape == 'hexagon':
+        w += h / 2
+    elif shape in ('stadium', 'parallelogram', 'parallelogram_alt', 'trapezoid', 'trapezoid_alt'):
+        w += h / 2
+    elif shape == 'asymmetric':
+        w += h / 4
+    elif shape == 'subroutine':
+        w += 16
+    elif shape == 'cylinder':
+        h += 2 * min(12.0, w / 8)
+    return max(w, 40.0), h
+
+
+def _isotonic(values: List[float]) -> List[float]:
+    """Least-squares non-decreasing fit (pool adjacent violators)"""
+    if all(a <= b for a, b in zip(values, values[1:])):
+        return values
+    sums: List[float] = []
+    counts: List[int] = []
+    for value in values:
+        total, count = value, 1
+        while sums and sums[-1] / counts[-1] > total / count:
+            total += sums.pop()
+            count += counts.pop()
+        sums.append(total)
+        counts.append(count)
+    fitted = []
+    for total, count in zip(sums, counts):
+        fitted.extend([total / count] * count)
+    return fitted
+
+
+def _count_crossings(layers: List[List[int]], down: List[List[int]], pos: List[int]) -> int:
+    """
+    Edge crossings between adjacent layers (inversion count)
+
+    Layers must be in position order. Edges are visited by source position;
+    each crosses the earlier edges that end further along the next layer.
+    """
+    crossings = 0
+    for layer in layers[:-1]:
+        ends: List[int] = []
+        for u in layer:
+            targets = down[u]
+            if len(targets) == 1:          # Dummy vertices: the common case
+                p = pos[targets[0]]
+                crossings += len(ends) - bisect_right(ends, p)
+                insort(ends, p)
+                continue
+            targets = [pos[v] for v in targets]
+            for p in targets:
+                crossings += len(ends) - bisect_right(ends, p)
+            for p in targets:
+                insort(ends, p)
+    return crossings
+
+
+def _barycenters(layer: List[int], neighbours: List[List[int]], coordinate: List[float]) -> List[float]:
+    """Mean neighbour coordinate per vertex (own coordinate without neighbours)"""
+    # Dummy vertices (one neighbour) are the common case
+    return [coordinate[adjacent[0]] if len(adjacent) == 1
+            else sum(coordinate[u] for u in adjacent) / len(adjacent) if adjacent
+            else coordinate[v]
+            for v, adjacent in zip(layer, map(neighbours.__getitem__, layer))]
+
+
+def _layered_layout(
+    sizes: List[Tuple[float, float]],
+    edges: List[Tuple[int, int, int, Tuple[float, float]]]
+) -> Tuple[List[Tuple[float, float]], Dict[int, List[Tuple[float, float]]], Dict[int, Tuple[float, float]], Tuple[float, float]]:
+    """
+    Sugiyama layout in (cross, rank) coordinates
+
+    Args:
+        sizes: (cross_size, rank_size) per item
+        edges: (source, target, edge_key, (label_cross, label_rank)) between items
+
+    Returns:
+        (item centers, waypoints per edge key, label anchors per edge key, (cross extent, rank extent))
+    """
+    n = len(sizes)
+    adjacency = [[] for _ in range(n)]
+    for u, v, _, _ in edges:
+        if u != v:
+            adjacency[u].append(v)
+
+    # 1. Cycle breaking: reverse DFS back edges
+    state = [0] * n
+    back_edges = set()
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(adjacency[root]))]
+        while stack:
+            node, successors = stack[-1]
+            for succ in successors:
+                if state[succ] == 0:
+                    state[succ] = 1
+                    stack.append((succ, iter(adjacency[succ])))
+                    break
+                if state[succ] == 1:
+                    back_edges.add((node, succ))
+            else:
+                state[node] = 2
+                stack.pop()
+
+    oriented = []
+    for u, v, key, label in edges:
+        if u == v:
+            continue
+        reverse = (u, v) in back_edges
+        oriented.append((v, u, key, label, True) if reverse else (u, v, key, label, False))
+
+    # 2. Longest-path ranking, then sources pulled next to their successors
+    succs = [set() for _ in range(n)]
+    preds = [set() for _ in range(n)]
+    for a, b, _, _, _ in oriented:
+        succs[a].add(b)
+        preds[b].add(a)
+    indegree = [len(p) for p in preds]
+    order = [v for v in range(n) if indegree[v] == 0]
+    for v in order:
+        for s in sorted(succs[v]):
+            indegree[s] -= 1
+            if indegree[s] == 0:
+                order.append(s)
+    rank = [0] * n
+    for v in order:
+        for s in succs[v]:
+            rank[s] = max(rank[s], rank[v] + 1)
+    for v in reversed(order):
+        if not preds[v] and succs[v]:
+            rank[v] = min(rank[s] for s in succs[v]) - 1
+    # With edge labels, every edge spans two layers and its label becomes the
+    # middle dummy vertex, so labels take part in ordering and spacing
+    labelled_block = any(label[0] > 0 for _, _, _, label, _ in oriented)
+    if labelled_block:
+        rank = [2 * r for r in rank]
+
+    # 3. Dummy vertices on edges spanning several layers
+    vertex_rank = list(rank)
+    cross_size = [s[0] for s in sizes]
+    rank_size = [s[1] for s in sizes]
+    real = [True] * n
+    down: List[List[int]] = [[] for _ in range(n)]
+    up: List[List[int]] = [[] for _ in range(n)]
+    chains = []
+    for a, b, key, (label_cross, label_rank), reverse in oriented:
+        chain, label_vertex = [a], None
+        span = rank[b] - rank[a]
+        middle = rank[a] + span // 2
+        for r in range(rank[a] + 1, rank[b]):
+            labelled = r == middle and label_cross > 0
+            vertex_rank.append(r)
+            cross_size.append(label_cross if labelled else DUMMY_SIZE)
+            rank_size.append(label_rank if labelled else 0.0)
+            real.append(False)
+            down.append([])
+            up.append([])
+            chain.append(len(vertex_rank) - 1)
+            if labelled:
+                label_vertex = chain[-1]
+        chain.append(b)
+        for p, q in zip(chain, chain[1:]):
+            down[p].append(q)
+            up[q].append(p)
+        chains.append((key, chain, reverse, label_vertex))
+
+    num_layers = max(vertex_rank) + 1 if vertex_rank else 0
+    layers: List[List[int]] = [[] for _ in range(num_layers)]
+    for v, r in enumerate(vertex_rank):
+        layers[r].append(v)
+
+    # Every sweep below visits each vertex (mostly dummies on long diagrams),
+    # so large diagrams get fewer sweeps
+    vertex_count = max(len(vertex_rank), 1)
+    sort_sweeps = min(SORT_ITERATIONS, max(2, LAYOUT_WORK // vertex_count))
+    position_iterations = min(POSITION_ITERATIONS, max(1, LAYOUT_WORK // (2 * vertex_count)))
+
+    # 4. Crossing reduction: alternating barycenter sweeps, best ordering kept;
+    #    stops early once SORT_PATIENCE sweeps in a row bring no improvement
+    pos = [0] * len(vertex_rank)
+    for layer in layers:
+        for i, v in enumerate(layer):
+            pos[v] = i
+    best = [list(layer) for layer in layers]
+    best_crossings = _count_crossings(layers, down, pos)
+    stale = 0
+    for iteration in range(sort_sweeps):
+        if best_crossings == 0 or stale >= SORT_PATIENCE:
+            break
+        downward = iteration % 2 == 0
+        sweep = range(1, num_layers) if downward else range(num_layers - 2, -1, -1)
+        neighbours = up if downward else down
+        for r in sweep:
+            layer = layers[r]
+            keys = _barycenters(layer, neighbours, pos)
+            order = sorted(range(len(layer)), key=keys.__getitem__)
+            layer[:] = [layer[i] for i in order]
+            for i, v in enumerate(layer):
+                pos[v] = i
+        crossings = _count_crossings(layers, down, pos)
+        if crossings < best_crossings:
+            best, best_crossings, stale = [list(layer) for layer in layers], crossings, 0
+        else:
+            stale += 1
+    layers = best
+
+    # 5. Cross-axis coordinates: neighbour averages, order kept with minimum gaps
+    x = [0.0] * len(vertex_rank)
+    layer_offsets = []                    # Minimum-gap offset of each vertex from its layer's first
+    for layer in layers:
+        offsets = [0.0]
+        for a, b in zip(layer, layer[1:]):
+            spacing = NODE_SEP if real[a] and real[b] else NODE_SEP / 2 if real[a] or real[b] else DUMMY_SIZE
+            offsets.append(offsets[-1] + (cross_size[a] + cross_size[b]) / 2 + spacing)
+        layer_offsets.append(offsets)
+        for v, offset in zip(layer, offsets):
+            x[v] = offset
+
+    def place(r: int, neighbours: List[List[int]]):
+        layer, offsets = layers[r], layer_offsets[r]
+        desired = [center - offset for center, offset in zip(_barycenters(layer, neighbours, x), offsets)]
+        for v, value, offset in zip(layer, _isotonic(desired), offsets):
+            x[v] = value + offset
+
+    both = [up[v] + down[v] for v in range(len(vertex_rank))]
+    for _ in range(position_iterations):
+        for r in range(1, num_layers):
+            place(r, up)
+        for r in range(num_layers - 2, -1, -1):
+            place(r, down)
+    for r in range(num_layers):
+        place(r, both)
+
+    left = min((x[v] - cross_size[v] / 2 for v in range(len(x))), default=0.0)
+    x = [value - left for value in x]
+    cross_extent = max((x[v] + cross_size[v] / 2 for v in range(len(x))), default=0.0)
+
+    # 6. Rank-axis coordinates
+    thickness = [max((rank_size[v] for v in layer), default=0.0) for layer in layers]
+    rank_center, offset = [], 0.0
+    for r in range(num_layers):
+        rank_center.append(offset + thickness[r] / 2)
+        offset += thickness[r]
+        if r < num_layers - 1:
+            offset += RANK_SEP / 2 if labelled_block else RANK_SEP
+    rank_extent = offset
+
+    centers = [(x[v], rank_center[vertex_rank[v]]) for v in range(n)]
+    routes, anchors = {}, {}
+    for key, chain, reverse, label_vertex in chains:
+        waypoints = [(x[v], rank_center[vertex_rank[v]]) for v in chain[1:-1]]
+        routes[key] = list(reversed(waypoints)) if reverse else waypoints
+        if label_vertex is not None:
+            anchors[key] = (x[label_vertex], rank_center[vertex_rank[label_vertex]])
+    return centers, routes, anchors, (cross_extent, rank_extent)
+
+
+@dataclass
+class Layout:
+    """Absolute geometry of a laid-out flowchart"""
+    chart: Flowchart
+    width: float
+    height: float
+    nodes: Dict[str, Tuple[float, float, float, float]]             # id -> (cx, cy, w, h)
+    clusters: Dict[str, Tuple[float, float, float, float]]          # id -> (x, y, w, h)
+    edges: List[Tuple[Edge, List[Tuple[float, float]], Tuple[float, float]]]  # edge, points, label center
+
+
+class _Block:
+    """Relative layout of one container's direct children"""
+
+    def __init__(self, width, height, centers, sizes, routes, anchors):
+        self.width, self.height = width, height
+        self.centers, self.sizes = centers, sizes
+        self.routes, self.anchors = routes, anchors
+
+
+def _edge_container(chart: Flowchart, source: str, target: str) -> Optional[Tuple[str, str, str]]:
+    """(container, source item, target item) where the edge is laid out, or None"""
+    def chain(item):
+        path = [item]
+        while item != ROOT:
+            item = chart.parents[item]
+            path.append(item)
+        return path[::-1]
+
+    a, b = chain(source), chain(target)
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if i == len(a) or i == len(b):
+        return None      # Same item, or an edge between a subgraph and its own contents
+    return a[i - 1], a[i], b[i]
+
+
+def layout_flowchart(chart: Flowchart) -> Layout:
+    """Compute node, cluster and edge geometry"""
+    sizes = {node_id: node_size(node) for node_id, node in chart.nodes.items()}
+    block_edges: Dict[str, List[Tuple[str, str, int]]] = {}
+    for k, edge in enumerate(chart.edges):
+        placement = _edge_container(chart, edge.source, edge.target)
+        if placement:
+            container, source_item, target_item = placement
+            block_edges.setdefault(container, []).append((source_item, target_item, k))
+
+    blocks: Dict[str, _Block] = {}
+
+    def layout_block(container: str, inherited: str) -> Tuple[float, float]:
+        subgraph = chart.subgraphs.get(container)
+        direction = (subgraph.direction if subgraph and subgraph.direction else inherited)
+        items = list(chart.children.get(container, {}))
+        item_sizes = []
+        for item in items:
+            if item in chart.subgraphs:
+                inner_w, inner_h = layout_block(item, direction)
+                title_w = text_size(chart.subgraphs[item].title)[0] if chart.subgraphs[item].title else 0
+                sizes[item] = (max(inner_w, title_w) + 2 * CLUSTER_PADDING,
+                               inner_h + 2 * CLUSTER_PADDING + CLUSTER_TITLE_HEIGHT)
+            item_sizes.append(sizes[item])
+
+        horizontal = direction in ('LR', 'RL')
+        index = {item: i for i, item in enumerate(items)}
+        layer_edges = []
+        for source_item, target_item, k in block_edges.get(container, []):
+            label = chart.edges[k].label
+            label_w, label_h = (text_size(label)[0] + 8, text_size(label)[1] + 4) if label else (0.0, 0.0)
+            label_dims = (label_h, label_w) if horizontal else (label_w, label_h)
+            layer_edges.append((index[source_item], index[target_item], k, label_dims))
+
+        oriented_sizes = [(h, w) if horizontal else (w, h) for w, h in item_sizes]
+        centers, routes, anchors, (cross, along) = _layered_layout(oriented_sizes, layer_edges)
+
+        def transform(point):
+            c, r = point
+            if direction == 'TB':
+                return c, r
+            if direction == 'BT':
+                return c, along - r
+            if direction == 'LR':
+                return r, c
+            return along - r, c
+
+        width, height = (along, cross) if horizontal else (cross, along)
+        blocks[container] = _Block(
+            width, height,
+            {item: transform(centers[i]) for i, item in enumerate(items)},
+            dict(zip(items, item_sizes)),
+            {k: [transform(p) for p in points] for k, points in routes.items()},
+            {k: transform(p) for k, p in anchors.items()}
+        )
+        return width, height
+
+    root_w, root_h = layout_block(ROOT, chart.direction)
+
+    node_boxes: Dict[str, Tuple[float, float, float, float]] = {}
+    cluster_boxes: Dict[str, Tuple[float, float, float, float]] = {}
+    routes: Dict[int, List[Tuple[float, float]]] = {}
+    anchors: Dict[int, Tuple[float, float]] = {}
+
+    def place(container: str, ox: float, oy: float):
+        block = blocks[container]
+        for k, points in block.routes.items():
+            routes[k] = [(px + ox, py + oy) for px, py in points]
+        for k, (px, py) in block.anchors.items():
+            anchors[k] = (px + ox, py + oy)
+        for item, (cx, cy) in block.centers.items():
+            w, h = block.sizes[item]
+            cx, cy = cx + ox, cy + oy
+            if item in chart.subgraphs:
+                x, y = cx - w / 2, cy - h / 2
+                cluster_boxes[item] = (x, y, w, h)
+                inner = blocks[item]
+                place(item, x + (w - inner.width) / 2, y + CLUSTER_TITLE_HEIGHT + CLUSTER_PADDING)
+            else:
+                node_boxes[item] = (cx, cy, w, h)
+
+    place(ROOT, MARGIN, MARGIN)
+
+    def box_of(item):
+        if item in node_boxes:
+            return node_boxes[item], chart.nodes[item].shape
+        x, y, w, h = cluster_boxes[item]
+        return (x + w / 2, y + h / 2, w, h), 'rect'
+
+    edges = []
+    for k, edge in enumerate(chart.edges):
+        (sx, sy, sw, sh), s_shape = box_of(edge.source)
+        (tx, ty, tw, th), t_shape = box_of(edge.target)
+        if edge.source == edge.target:
+            loop = [(sx + sw / 2, sy - sh / 4), (sx + sw / 2 + 25, sy - sh / 4),
+                    (sx + sw / 2 + 25, sy + sh / 4), (sx + sw / 2, sy + sh / 4)]
+            edges.append((edge, loop, (sx + sw / 2 + 25, sy)))
+            continue
+        points = [(sx, sy)] + routes.get(k, []) + [(tx, ty)]
+        points[0] = _clip(points[0], points[1], sw, sh, s_shape)
+        points[-1] = _clip(points[-1], points[-2], tw, th, t_shape)
+        edges.append((edge, points, anchors.get(k) or _midpoint(points)))
+
+    return Layout(chart, root_w + 2 * MARGIN, root_h + 2 * MARGIN, node_boxes, cluster_boxes, edges)
+
+
+def _clip(center: Tuple[float, float], toward: Tuple[float, float], w: float, h: float, shape: str) -> Tuple[float, float]:
+    """Point where the segment center -> toward leaves the shape"""
+    dx, dy = toward[0] - center[0], toward[1] - center[1]
+    if dx == 0 and dy == 0:
+        return center
+    hw, hh = w / 2, h / 2
+    if shape in ('circle', 'doublecircle'):
+        t = hw / math.hypot(dx, dy)
+    elif shape == 'rhombus':
+        t = 1 / (abs(dx) / hw + abs(dy) / hh)
+    else:
+        t = min(hw / abs(dx) if dx else math.inf, hh / abs(dy) if dy else math.inf)
+    t = min(t, 1.0)
+    return center[0] + dx * t, center[1] + dy * t
+
+
+def _midpoint(points: List[Tuple[float, float]]) -> Tuple[float, float]:
+    """Point halfway along a polyline"""
+    lengths = [math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(points, points[1:])]
+    remaining = sum(lengths) / 2
+    for (a, b), length in zip(zip(points, points[1:]), lengths):
+        if remaining <= length and length > 0:
+            t = remaining / length
+            return a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t
+        remaining -= length
+    return points[-1]
+
+
+# ============================================================================
+# Styling and shapes
+# ============================================================================
+
+def _px(value: Optional[str], default: float) -> float:
+    try:
+        return float(str(value).strip().rstrip('px'))
+    except (TypeError, ValueError):
+        return default
+
+
+def _item_style(chart: Flowchart, item_id: str, theme: Dict[str, str], cluster: bool = False) -> Dict[str, str]:
+    """Theme defaults, then classDef default, assigned classes and style statements"""
+    style = {'fill': theme['cluster_fill' if cluster else 'node_fill'],
+             'stroke': theme['cluster_stroke' if cluster else 'node_stroke'],
+             'stroke-width': '1px', 'color': theme['text']}
+    if not cluster:
+        style.update(chart.class_defs.get('default', {}))
+    for name in chart.classes.get(item_id, []):
+        style.update(chart.class_defs.get(name, {}))
+    style.update(chart.styles.get(item_id, {}))
+    return style
+
+
+def _edge_style(chart: Flowchart, k: int, edge: Edge, theme: Dict[str, str]) -> Dict[str, str]:
+    style = {'stroke': theme['line'], 'stroke-width': '3.5px' if edge.stroke == 'thick' else '2px',
+             'color': theme['text']}
+    if edge.stroke == 'dotted':
+        style['stroke-dasharray'] = '3'
+    style.update(chart.link_styles.get('default', {}))
+    style.update(chart.link_styles.get(k, {}))
+    return style
+
+
+def _shape_primitives(shape: str, box: Tuple[float, float, float, float]) -> List[Tuple]:
+    """Drawing primitives for a node shape: rect, ellipse, polygon, line, cylinder"""
+    cx, cy, w, h = box
+    x, y = cx - w / 2, cy - h / 2
+    if shape == 'round':
+        return [('rect', x, y, w, h, 5)]
+    if shape == 'stadium':
+        return [('rect', x, y, w, h, h / 2)]
+    if shape == 'circle':
+        return [('ellipse', cx, cy, w / 2, h / 2)]
+    if shape == 'doublecircle':
+        return [('ellipse', cx, cy, w / 2, h / 2), ('ellipse', cx, cy, w / 2 - 5, h / 2 - 5)]
+    if shape == 'subroutine':
+        return [('rect', x, y, w, h, 0), ('line', x + 8, y, x + 8, y + h), ('line', x + w - 8, y, x + w - 8, y + h)]
+    if shape == 'cylinder':
+        return [('cylinder', x, y, w, h, min(12.0, w / 8))]
+    if shape == 'rhombus':
+        return [('polygon', [(cx, y), (x + w, cy), (cx, y + h), (x, cy)])]
+    if shape == 'hexagon':
+        m = h / 4
+        return [('polygon', [(x + m, y), (x + w - m, y), (x + w, cy), (x + w - m, y + h), (x + m, y + h), (x, cy)])]
+    s = h / 4
+    if shape == 'parallelogram':
+        return [('polygon', [(x + s, y), (x + w, y), (x + w - s, y + h), (x, y + h)])]
+    if shape == 'parallelogram_alt':
+        return [('polygon', [(x, y), (x + w - s, y), (x + w, y + h), (x + s, y + h)])]
+    if shape == 'trapezoid':
+        return [('polygon', [(x + s, y), (x + w - s, y), (x + w, y + h), (x, y + h)])]
+    if shape == 'trapezoid_alt':
+        return [('polygon', [(x, y), (x + w, y), (x + w - s, y + h), (x + s, y + h)])]
+    if shape == 'asymmetric':
+        return [('polygon', [(x, y), (x + w, y), (x + w, y + h), (x, y + h), (x + s, cy)])]
+    return [('rect', x, y, w, h, 0)]
+
+
+def _arrow_head(tip: Tuple[float, float], tail: Tuple[float, float], size: float = 10) -> List[Tuple[float, float]]:
+    dx, dy = tip[0] - tail[0], tip[1] - tail[1]
+    length = math.hypot(dx, dy) or 1.0
+    ux, uy = dx / length, dy / length
+    bx, by = tip[0] - ux * size, tip[1] - uy * size
+    return [tip, (bx - uy * size / 2, by + ux * size / 2), (bx + uy * size / 2, by - ux * size / 2)]
+
+
+# ============================================================================
+# SVG
+# ============================================================================
+
+def _attr(value: str) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def _fmt(value: float) -> str:
+    return f'{value:.1f}'.rstrip('0').rstrip('.')
+
+
+def _svg_text(text: str, cx: float, cy: float, color: str, extra: str = '') -> str:
+    lines = text.split('\n')
+    line_h = FONT_SIZE * LINE_HEIGHT
+    first = cy - (len(lines) - 1) * line_h / 2
+    spans = ''.join(
+        f'<tspan x="{_fmt(cx)}" y="{_fmt(first + i * line_h)}">{html.escape(line)}</tspan>'
+        for i, line in enumerate(lines)
+    )
+    return f'<text text-anchor="middle" dominant-baseline="central" fill="{_attr(color)}"{extra}>{spans}</text>'
+
+
+def _svg_paint(style: Dict[str, str]) -> str:
+    attrs = [f'fill="{_attr(style.get("fill", "none"))}"',
+             f'stroke="{_attr(style.get("stroke", "none"))}"',
+             f'stroke-width="{_fmt(_px(style.get("stroke-width"), 1))}"']
+    if style.get('stroke-dasharray'):
+        attrs.append(f'stroke-dasharray="{_attr(style["stroke-dasharray"])}"')
+    if style.get('opacity'):
+        attrs.append(f'opacity="{_attr(style["opacity"])}"')
+    return ' '.join(attrs)
+
+
+def _svg_primitive(primitive: Tuple, paint: str) -> str:
+    kind = primitive[0]
+    if kind == 'rect':
+        _, x, y, w, h, rx = primitive
+        return (f'<rect x="{_fmt(x)}" y="{_fmt(y)}" width="{_fmt(w)}" height="{_fmt(h)}" '
+                f'rx="{_fmt(rx)}" {paint}/>')
+    if kind == 'ellipse':
+        _, cx, cy, rx, ry = primitive
+        return f'<ellipse cx="{_fmt(cx)}" cy="{_fmt(cy)}" rx="{_fmt(rx)}" ry="{_fmt(ry)}" {paint}/>'
+    if kind == 'polygon':
+        points = ' '.join(f'{_fmt(px)},{_fmt(py)}' for px, py in primitive[1])
+        return f'<polygon points="{points}" {paint}/>'
+    if kind == 'line':
+        _, x1, y1, x2, y2 = primitive
+        return f'<line x1="{_fmt(x1)}" y1="{_fmt(y1)}" x2="{_fmt(x2)}" y2="{_fmt(y2)}" {paint}/>'
+    _, x, y, w, h, ry = primitive      # cylinder
+    rx = w / 2
+    body = (f'M{_fmt(x)},{_fmt(y + ry)} a{_fmt(rx)},{_fmt(ry)} 0 0 0 {_fmt(w)},0 '
+            f'a{_fmt(rx)},{_fmt(ry)} 0 0 0 {_fmt(-w)},0 l0,{_fmt(h - 2 * ry)} '
+            f'a{_fmt(rx)},{_fmt(ry)} 0 0 0 {_fmt(w)},0 l0,{_fmt(-(h - 2 * ry))}')
+    return f'<path d="{body}" {paint}/>'
+
+
+def _svg_path(points: List[Tuple[float, float]]) -> str:
+    """Polyline with corners rounded through quadratic curves"""
+    d = f'M{_fmt(points[0][0])},{_fmt(points[0][1])}'
+    for i in range(1, len(points) - 1):
+        (px, py), (qx, qy) = points[i], points[i + 1]
+        mx, my = (px + qx) / 2, (py + qy) / 2
+        d += f' Q{_fmt(px)},{_fmt(py)} {_fmt(mx)},{_fmt(my)}' if i < len(points) - 2 else \
+             f' Q{_fmt(px)},{_fmt(py)} {_fmt(qx)},{_fmt(qy)}'
+    if len(points) == 2:
+        d += f' L{_fmt(points[1][0])},{_fmt(points[1][1])}'
+    return d
+
+
+def to_svg(layout: Layout, background: str = 'white', theme: str = 'default') -> str:
+    """SVG document for a layout"""
+    colors = THEMES.get(theme, THEMES['default'])
+    chart = layout.chart
+    w, h = layout.width, layout.height
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_fmt(w)}" height="{_fmt(h)}" '
+        f'viewBox="0 0 {_fmt(w)} {_fmt(h)}" font-family="{_attr(FONT_FAMILY)}" font-size="{FONT_SIZE}">'
+    ]
+    if background and background != 'transparent':
+        out.append(f'<rect x="0" y="0" width="100%" height="100%" fill="{_attr(background)}"/>')
+
+    def depth(sg_id):
+        d = 0
+        while sg_id != ROOT:
+            sg_id = chart.subgraphs[sg_id].parent
+            d += 1
+        return d
+
+    for sg_id in sorted(layout.clusters, key=depth):
+        x, y, cw, ch = layout.clusters[sg_id]
+        style = _item_style(chart, sg_id, colors, cluster=True)
+        out.append(_svg_primitive(('rect', x, y, cw, ch, 0), _svg_paint(style)))
+        title = chart.subgraphs[sg_id].title
+        if title:
+            out.append(_svg_text(title, x + cw / 2, y + CLUSTER_TITLE_HEIGHT / 2 + 4, style.get('color', colors['text'])))
+
+    markers: Dict[str, str] = {}
+    edge_parts, label_parts = [], []
+    for k, (edge, points, label_center) in enumerate(layout.edges):
+        if edge.stroke == 'invisible':
+            continue
+        style = _edge_style(chart, k, edge, colors)
+        stroke = style['stroke']
+        if stroke not in markers:
+            markers[stroke] = f'arrow{len(markers)}'
+        attrs = _svg_paint({**style, 'fill': 'none'})
+        if edge.arrow_end:
+            attrs += f' marker-end="url(#{markers[stroke]})"'
+        if edge.arrow_start:
+            attrs += f' marker-start="url(#{markers[stroke]})"'
+        edge_parts.append(f'<path d="{_svg_path(points)}" {attrs}/>')
+        if edge.label:
+            lw, lh = text_size(edge.label)
+            lx, ly = label_center
+            label_parts.append(
+                f'<rect x="{_fmt(lx - lw / 2 - 4)}" y="{_fmt(ly - lh / 2 - 2)}" width="{_fmt(lw + 8)}" '
+                f'height="{_fmt(lh + 4)}" fill="{_attr(colors["label_bg"])}" opacity="0.85"/>'
+            )
+            label_parts.append(_svg_text(edge.label, lx, ly, style.get('color', colors['text'])))
+
+    if markers:
+        out.append('<defs>')
+        for stroke, marker_id in markers.items():
+            out.append(
+                f'<marker id="{marker_id}" viewBox="0 0 10 10" refX="9" refY="5" markerUnits="userSpaceOnUse" '
+                f'markerWidth="10" markerHeight="10" orient="auto-start-reverse">'
+                f'<path d="M0,0 L10,5 L0,10 z" fill="{_attr(stroke)}"/></marker>'
+            )
+        out.append('</defs>')
+    out.extend(edge_parts)
+    out.extend(label_parts)
+
+    for node_id, box in layout.nodes.items():
+        node = chart.nodes[node_id]
+        style = _item_style(chart, node_id, colors)
+        paint = _svg_paint(style)
+        out.extend(_svg_primitive(p, paint) for p in _shape_primitives(node.shape, box))
+        weight = f' font-weight="{_attr(style["font-weight"])}"' if style.get('font-weight') else ''
+        out.append(_svg_text(node.label, box[0], box[1], style.get('color', colors['text']), weight))
+
+    out.append('</svg>')
+    return '\n'.join(out)
+
+
+# ============================================================================
+# PNG (Pillow)
+# ============================================================================
+
+@lru_cache(maxsize=16)
+def _font(size: int):
+    for name in ('DejaVuSans.ttf', 'Arial.ttf', 'arial.ttf', 'LiberationSans-Regular.ttf'):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:          # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def _rgba(value: Optional[str], fallback: Optional[str] = None):
+    if not value or value in ('none', 'transparent'):
+        return None
+    try:
+        return ImageColor.getrgb(value)
+    except ValueError:
+        return ImageColor.getrgb(fallback) if fallback else None
+
+
+def _dashed(draw, points, fill, width, dash):
+    """Dashed polyline"""
+    on, gap = dash
+    drawing, left = True, on
+    for (ax, ay), (bx, by) in zip(points, points[1:]):
+        length = math.hypot(bx - ax, by - ay)
+        travelled = 0.0
+        while travelled < length:
+            step = min(left, length - travelled)
+            t0, t1 = travelled / length, (travelled + step) / length
+            if drawing:
+                draw.line([(ax + (bx - ax) * t0, ay + (by - ay) * t0), (ax + (bx - ax) * t1, ay + (by - ay) * t1)],
+                          fill=fill, width=width)
+            travelled += step
+            left -= step
+            if left <= 0:
+                drawing = not drawing
+                left = on if drawing else gap
+
+
+def _draw_primitive(draw, primitive, scale, fill, outline, width):
+    kind = primitive[0]
+    if kind == 'rect':
+        _, x, y, w, h, rx = primitive
+        draw.rounded_rectangle([x * scale, y * scale, (x + w) * scale, (y + h) * scale],
+                               radius=rx * scale, fill=fill, outline=outline, width=width)
+    elif kind == 'ellipse':
+        _, cx, cy, rx, ry = primitive
+        draw.ellipse([(cx - rx) * scale, (cy - ry) * scale, (cx + rx) * scale, (cy + ry) * scale],
+                     fill=fill, outline=outline, width=width)
+    elif kind == 'polygon':
+        draw.polygon([(px * scale, py * scale) for px, py in primitive[1]], fill=fill, outline=outline, width=width)
+    elif kind == 'line':
+        _, x1, y1, x2, y2 = primitive
+        draw.line([(x1 * scale, y1 * scale), (x2 * scale, y2 * scale)], fill=outline, width=width)
+    else:
+        _, x, y, w, h, ry = primitive
+        box = [x * scale, (y + ry) * scale, (x + w) * scale, (y + h - ry) * scale]
+        draw.rectangle(box, fill=fill)
+        draw.ellipse([x * scale, (y + h - 2 * ry) * scale, (x + w) * scale, (y + h) * scale],
+                     fill=fill, outline=outline, width=width)
+        if outline:
+            draw.line([(box[0], box[1]), (box[0], box[3])], fill=outline, width=width)
+            draw.line([(box[2], box[1]), (box[2], box[3])], fill=outline, width=width)
+        draw.ellipse([x * scale, y * scale, (x + w) * scale, (y + 2 * ry) * scale],
+                     fill=fill, outline=outline, width=width)
+
+
+def to_png(layout: Layout, output_path: Union[str, Path], background: str = 'white',
+           theme: str = 'default', width: Optional[int] = None, scale: float = 1) -> Path:
+    """
+    Rasterize a layout with Pillow
+
+    The diagram keeps its natural size up to `width` (like mmdc's viewport
+    width) and is then multiplied by `scale`.
+    """
+    if not PIL_AVAILABLE:
+        raise ImportError("PNG rendering requires Pillow: pip install Pillow")
+
+    colors = THEMES.get(theme, THEMES['default'])
+    chart = layout.chart
+    factor = scale * (min(1.0, width / layout.width) if width else 1.0)
+    pixels = layout.width * layout.height * factor * factor
+    if pixels > MAX_PNG_PIXELS:
+        factor *= math.sqrt(MAX_PNG_PIXELS / pixels)
+    size = (max(1, int(math.ceil(layout.width * factor))), max(1, int(math.ceil(layout.height * factor))))
+    fill = _rgba(background, 'white')
+    image = Image.new('RGB', size, fill) if fill else Image.new('RGBA', size, (255, 255, 255, 0))
+    draw = ImageDraw.Draw(image)
+    font = _font(max(6, int(round(FONT_SIZE * factor * 0.9))))
+    spacing = FONT_SIZE * (LINE_HEIGHT - 1) * factor
+
+    def stroke_width(style, default):
+        return max(1, int(round(_px(style.get('stroke-width'), default) * factor)))
+
+    def text(value, cx, cy, color):
+        draw.multiline_text((cx * factor, cy * factor), value, fill=_rgba(color, colors['text']),
+                            font=font, anchor='mm', align='center', spacing=spacing)
+
+    for sg_id, (x, y, cw, ch) in sorted(layout.clusters.items(), key=lambda item: item[1][2] * item[1][3], reverse=True):
+        style = _item_style(chart, sg_id, colors, cluster=True)
+        _draw_primitive(draw, ('rect', x, y, cw, ch, 0), factor, _rgba(style.get('fill')),
+                        _rgba(style.get('stroke')), stroke_width(style, 1))
+        if chart.subgraphs[sg_id].title:
+            text(chart.subgraphs[sg_id].title, x + cw / 2, y + CLUSTER_TITLE_HEIGHT / 2 + 4, style.get('color'))
+
+    for k, (edge, points, label_center) in enumerate(layout.edges):
+        if edge.stroke == 'invisible':
+            continue
+        style = _edge_style(chart, k, edge, colors)
+        color = _rgba(style['stroke'], colors['line'])
+        line_width = stroke_width(style, 2)
+        scaled = [(px * factor, py * factor) for px, py in points]
+        dash = style.get('stroke-dasharray')
+        if dash:
+            parts = [_px(p, 3) for p in re.split(r'[,\s]+', dash.strip()) if p] or [3.0]
+            _dashed(draw, scaled, color, line_width, (parts[0] * factor, parts[-1] * factor))
+        else:
+            draw.line(scaled, fill=color, width=line_width, joint='curve')
+        if edge.arrow_end:
+            draw.polygon(_arrow_head(scaled[-1], scaled[-2], 10 * factor), fill=color)
+        if edge.arrow_start:
+            draw.polygon(_arrow_head(scaled[0], scaled[1], 10 * factor), fill=color)
+        if edge.label:
+            lw, lh = text_size(edge.label)
+            lx, ly = label_center
+            draw.rectangle([(lx - lw / 2 - 4) * factor, (ly - lh / 2 - 2) * factor,
+                            (lx + lw / 2 + 4) * factor, (ly + lh / 2 + 2) * factor],
+                           fill=_rgba(colors['label_bg']))
+            text(edge.label, lx, ly, style.get('color'))
+
+    for node_id, box in layout.nodes.items():
+        node = chart.nodes[node_id]
+        style = _item_style(chart, node_id, colors)
+        fill, outline = _rgba(style.get('fill')), _rgba(style.get('stroke'))
+        for primitive in _shape_primitives(node.shape, box):
+            _draw_primitive(draw, primitive, factor, fill, outline, stroke_width(style, 1))
+        text(node.label, box[0], box[1], style.get('color'))
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    image.save(output_path, 'PNG', compress_level=3)     # zlib dominates on large diagrams
+    return output_path
+
+
+# ============================================================================
+# Entry points
+# ============================================================================
+
+def render_svg(definition: str, background: str = 'white', theme: str = 'default') -> str:
+    """Mermaid definition -> SVG document"""
+    return to_svg(layout_flowchart(parse_flowchart(definition)), background=background, theme=theme)
+
+
+def render_to_file(
+    definition: str,
+    output_path: Union[str, Path],
+    format: str = 'svg',
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    scale: float = 1,
+    background: str = 'white',
+    theme: str = 'default'
+) -> Path:
+    """
+    Render a Mermaid definition to an SVG or PNG file
+
+    Raises:
+        MermaidSyntaxError: Definition outside the supported subset
+        ImportError: PNG requested without Pillow
+        ValueError: Unsupported format
+    """
+    if format not in ('svg', 'png'):
+        raise ValueError(f"Native Mermaid rendering supports svg and png, not '{format}'")
+    if format == 'png' and not PIL_AVAILABLE:
+        raise ImportError("PNG rendering requires Pillow: pip install Pillow")
+
+    layout = layout_flowchart(parse_flowchart(definition))
+    output_path = Path(output_path)
+    if format == 'png':
+        return to_png(layout, output_path, background=background, theme=theme, width=width, scale=scale)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(to_svg(layout, background=background, theme=theme))
+    return output_path
@@ -15,12 +15,107 @@ import numpy as np
 import pandas as pd
 import networkx as nx
 import logging
+import re
+from functools import lru_cache
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, Counter
 from typing import Dict, List, Tuple, Set
 
+import scipy.sparse as sp
+
+try:
+    from src.feature_store import FeatureStore, flows_to_frame
+    from src.similarity_index import SimilarAppIndex
+except ImportError:
+    from feature_store import FeatureStore, flows_to_frame
+    from similarity_index import SimilarAppIndex
+
 logger = logging.getLogger(__name__)
 
+# Name keywords -> tier for apps without data (first match wins, default 'app')
+TARGET_TIER_KEYWORDS = [
+    ('web', ('web', 'frontend', 'ui')),
+    ('app', ('api', 'service', 'backend')),
+    ('data', ('db', 'database', 'sql')),
+    ('cache', ('cache', 'redis')),
+    ('messaging', ('queue', 'kafka', 'mq')),
+]
+
+# Name keywords marking an observed app as a member of a tier (an app can be in several)
+OBSERVED_TIER_KEYWORDS = {
+    'web': ('web', 'frontend'),
+    'app': ('api', 'service'),
+    'data': ('db', 'database'),
+    'cache': ('cache', 'redis'),
+    'messaging': ('queue', 'kafka'),
+}
+
+
+@lru_cache(maxsize=4096)
+def _name_trigrams(name: str) -> frozenset:
+    """Character trigrams of an app name (case and separators ignored)"""
+    text = f" {re.sub(r'[^a-z0-9]+', ' ', name.lower()).strip()} "
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _name_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of two app names' trigrams"""
+    grams_a, grams_b = _name_trigrams(a), _name_trigrams(b)
+    union = len(grams_a | grams_b)
+    return len(grams_a & grams_b) / union if union else 0.0
+
+
+class PeerCorrelationIndex:
+    """
+    Sparse peer correlation structure
+
+    - app_similarity: Jaccard similarity of app peer sets [apps x apps] (symmetric, no diagonal)
+    - transitive: two-hop node correlations [nodes x nodes] (A -> B -> C correlates A with C)
+
+    Only entries above the thresholds are stored. Iterating yields the same
+    ((a, b), score) pairs the old dict held, app pairs first.
+    """
+
+    def __init__(self, apps: List[str], app_similarity: 'sp.csr_matrix',
+                 nodes: List[str], transitive: 'sp.csr_matrix'):
+        self.apps = list(apps)
+        self.app_position = {app: i for i, app in enumerate(self.apps)}
+        self.app_similarity = app_similarity.tocsr()
+        self.nodes = list(nodes)
+        self.transitive = transitive.tocsr()
+
+    @classmethod
+    def empty(cls) -> 'PeerCorrelationIndex':
+        return cls([], sp.csr_matrix((0, 0)), [], sp.csr_matrix((0, 0)))
+
+    def __len__(self) -> int:
+        return self.app_similarity.nnz + self.transitive.nnz
+
+    def items(self):
+        """((a, b), score) pairs - app correlations, then transitive node correlations"""
+        for names, matrix in ((self.apps, self.app_similarity), (self.nodes, self.transitive)):
+            coo = matrix.tocoo()
+            for i, j, score in zip(coo.row, coo.col, coo.data):
+                yield (names[i], names[j]), float(score)
+
+    def app_weights(self, apps: List[str]) -> np.ndarray:
+        """Summed similarity rows for the given apps (repeats count again) -> float[num_apps]"""
+        rows = [self.app_position[app] for app in apps if app in self.app_position]
+        weights = np.zeros(len(self.apps))
+        if rows:
+            counts = np.bincount(rows, minlength=len(self.apps))
+            weights = self.app_similarity.T @ counts.astype(np.float64)
+        return weights
+
+    def correlated_apps(self, app: str) -> Dict[str, float]:
+        """Apps whose peer sets overlap with app's -> {app: jaccard}"""
+        row = self.app_position.get(app)
+        if row is None:
+            return {}
+        start, end = self.app_similarity.indptr[row:row + 2]
+        return {self.apps[j]: float(score) for j, score in zip(self.app_similarity.indices[start:end],
+                                                                self.app_similarity.data[start:end])}
+
 
 class MLNetworkPredictor:
     """
@@ -35,13 +130,14 @@ class MLNetworkPredictor:
     For the remaining 90 apps (260 total - 170 with data)
     """
 
-    def __init__(self, persistence_manager, ensemble_model):
+    def __init__(self, persistence_manager, ensemble_model, similarity_backend: str = 'exact'):
         """
         Initialize ML predictor
 
         Args:
             persistence_manager: PersistenceManager from enterprise_network_analyzer.py
             ensemble_model: EnsembleNetworkModel from enterprise_network_analyzer.py
+            similarity_backend: SimilarAppIndex backend ('exact' or 'lsh')
         """
         self.pm = persistence_manager
         self.ensemble = ensemble_model
@@ -49,6 +145,13 @@ class MLNetworkPredictor:
         # Trained application features
         self.app_features = {}
         self.app_embeddings = {}
+        self.feature_store = None  # FeatureStore over the observed flows
+
+        # Similar-app search over observed app vectors
+        self.similarity_backend = similarity_backend
+        self.similarity_index = None  # SimilarAppIndex
+        self.tier_apps = defaultdict(list)  # tier -> observed apps whose names match it
+        self._tier_centroids = {}  # tier -> mean indexed vector (cleared on insert)
 
         # Network graph
         self.G = nx.DiGraph()
@@ -60,7 +163,10 @@ class MLNetworkPredictor:
 
         # Markov chain for peer correlation
         self.markov_chain = {}  # app -> {next_app -> transition_probability}
-        self.peer_correlation_matrix = {}  # (app_a, app_b) -> correlation_score
+        self.markov_apps = []  # Row labels of transition_matrix
+        self.markov_peers = []  # Column labels of transition_matrix
+        self.transition_matrix = sp.csr_matrix((0, 0))  # P(peer | app) [apps x peers]
+        self.peer_correlation_matrix = PeerCorrelationIndex.empty()
 
         logger.info(f"MLNetworkPredictor initialized with Markov chain support")
 
@@ -78,6 +184,7 @@ class MLNetworkPredictor:
 
         # Build network graph from observed flows
         self._build_network_graph(parsed_records)
+        self.feature_store = FeatureStore(parsed_records)
 
         # Extract features for each app
         app_data = self._extract_app_features(parsed_records)
@@ -91,6 +198,7 @@ class MLNetworkPredictor:
         graph_data = self._prepare_graph_data()
         sequences = self._prepare_temporal_sequences(parsed_records)
         traffic_matrices = self._prepare_traffic_matrices(app_data)
+        self.index_app_vectors(list(app_data.keys()), traffic_matrices)
 
         # Train ensemble
         logger.info(f"  Training GNN, RNN, CNN, Attention, Meta models...")
@@ -237,21 +345,9 @@ class MLNetworkPredictor:
 
     def _prepare_graph_data(self) -> Tuple[np.ndarray, np.ndarray]:
         """Prepare graph data for GNN"""
-        # Node features matrix
+        # Node features matrix (degree, traffic, port and time profiles - see FeatureStore)
         nodes = list(self.G.nodes())
-        n_nodes = len(nodes)
-
-        node_features = np.zeros((n_nodes, 64))
-
-        for i, node in enumerate(nodes):
-            node_data = self.G.nodes[node]
-            # Simple feature encoding
-            node_features[i, 0] = self.G.degree(node)  # Degree
-            node_features[i, 1] = self.G.in_degree(node)  # In-degree
-            node_features[i, 2] = self.G.out_degree(node)  # Out-degree
-            node_features[i, 3] = 1 if node_data.get('is_observed') else 0
-            # Add random features for now (in production, use real features)
-            node_features[i, 4:] = np.random.randn(60) * 0.1
+        node_features = self.feature_store.node_features(nodes)
 
         # Adjacency matrix
         adj_matrix = nx.to_numpy_array(self.G)
@@ -259,59 +355,12 @@ class MLNetworkPredictor:
         return node_features, adj_matrix
 
     def _prepare_temporal_sequences(self, records: List) -> np.ndarray:
-        """Prepare temporal sequences for RNN"""
-        # Group flows by app and time
-        app_sequences = defaultdict(list)
-
-        for record in records:
-            if record.timestamp:
-                app_sequences[record.app_name].append((
-                    record.timestamp,
-                    record.bytes,
-                    record.packets
-                ))
-
-        # Create sequences (batch_size, seq_len, features)
-        n_apps = len(app_sequences)
-        max_seq_len = 50
-        n_features = 32
-
-        sequences = np.zeros((n_apps, max_seq_len, n_features))
-
-        for i, (app, seq) in enumerate(app_sequences.items()):
-            # Sort by time
-            seq = sorted(seq, key=lambda x: x[0] if x[0] else datetime.now())
-
-            # Take last max_seq_len flows
-            seq = seq[-max_seq_len:]
-
-            for j, (ts, bytes_val, packets_val) in enumerate(seq):
-                # Simple feature encoding
-                sequences[i, j, 0] = bytes_val / 1000000  # Normalize bytes
-                sequences[i, j, 1] = packets_val / 1000  # Normalize packets
-                # Random features
-                sequences[i, j, 2:] = np.random.randn(30) * 0.1
-
-        return sequences
+        """Prepare temporal sequences for RNN (last 50 timestamped flows per app)"""
+        return self.feature_store.app_sequences(seq_len=50)
 
     def _prepare_traffic_matrices(self, app_data: Dict) -> np.ndarray:
-        """Prepare traffic matrices for CNN"""
-        n_apps = len(app_data)
-        matrix_size = 128
-
-        traffic_matrices = np.zeros((n_apps, matrix_size))
-
-        for i, (app, data) in enumerate(app_data.items()):
-            # Encode app traffic patterns
-            traffic_matrices[i, 0] = data['total_flows'] / 10000  # Normalize
-            traffic_matrices[i, 1] = data['total_bytes'] / 1e9  # Normalize to GB
-            traffic_matrices[i, 2] = data['num_sources'] / 100
-            traffic_matrices[i, 3] = data['num_destinations'] / 100
-            traffic_matrices[i, 4] = 1 if data['is_external_facing'] else 0
-            # Random patterns
-            traffic_matrices[i, 5:] = np.random.randn(matrix_size - 5) * 0.1
-
-        return traffic_matrices
+        """Prepare traffic matrices for CNN (per-app traffic profile - see FeatureStore)"""
+        return self.feature_store.app_features(list(app_data.keys()))
 
     def _generate_app_embedding(self, app_name: str, graph_data, sequences, traffic_matrices) -> np.ndarray:
         """Generate embedding for an application using ensemble"""
@@ -366,8 +415,16 @@ class MLNetworkPredictor:
         # Use ensemble to refine predictions
         # Create synthetic features for this app
         synthetic_graph_data = self._create_synthetic_graph_data(app_name, similar_apps)
-        synthetic_sequences = np.random.randn(1, 50, 32) * 0.1
-        synthetic_traffic_matrix = np.random.randn(1, 128) * 0.1
+        observed_similar = [app for app in similar_apps if app in self.apps_with_data]
+        if self.feature_store is not None and observed_similar:
+            # Average profile of the observed similar apps
+            synthetic_sequences = self.feature_store.app_sequences(observed_similar, seq_len=50)
+            synthetic_sequences = synthetic_sequences.mean(axis=0, keepdims=True)
+            synthetic_traffic_matrix = self.feature_store.app_features(observed_similar)
+            synthetic_traffic_matrix = synthetic_traffic_matrix.mean(axis=0, keepdims=True)
+        else:
+            synthetic_sequences = np.zeros((1, 50, 32), dtype=np.float32)
+            synthetic_traffic_matrix = np.zeros((1, 128), dtype=np.float32)
 
         ensemble_pred = self.ensemble.predict(
             synthetic_graph_data,
@@ -409,44 +466,69 @@ class MLNetworkPredictor:
 
         return prediction
 
-    def _find_similar_apps(self, app_name: str) -> List[str]:
-        """Find similar apps based on naming patterns"""
-        similar = []
+    def index_app_vectors(self, app_names: List[str], vectors: np.ndarray):
+        """
+        Insert (or replace) observed apps in the similar-app index
+
+        Called with FeatureStore app features during training; can also be
+        called with VAE latent codes (ApplicationBehaviorAnalyzer.encode_behaviors)
+        to search in latent space. Vectors of a new dimension replace the index.
+
+        Args:
+            app_names: Observed app names
+            vectors: Per-app vectors [len(app_names), dim]
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.similarity_index is None or self.similarity_index.dim != vectors.shape[1]:
+            self.similarity_index = SimilarAppIndex(vectors.shape[1], backend=self.similarity_backend)
+            self.tier_apps = defaultdict(list)
+
+        for app in app_names:
+            if app in self.similarity_index:
+                continue
+            app_lower = app.lower()
+            for tier, keywords in OBSERVED_TIER_KEYWORDS.items():
+                if any(keyword in app_lower for keyword in keywords):
+                    self.tier_apps[tier].append(app)
+
+        self.similarity_index.add(app_names, vectors)
+        self._tier_centroids = {}
 
+    def _find_similar_apps(self, app_name: str, k: int = 5) -> List[str]:
+        """
+        Find similar apps for an app without data
+
+        The name picks a tier. The query vector is the tier centroid of the
+        observed members, pulled toward the members whose names share
+        character trigrams with the app, so each app gets its own neighbours.
+        The k members of that tier nearest to it (by traffic features) are
+        returned; with the 'lsh' backend, candidates come from LSH buckets.
+        """
         # Extract patterns from app name
         app_lower = app_name.lower()
+        target_tier = next(
+            (tier for tier, keywords in TARGET_TIER_KEYWORDS
+             if any(keyword in app_lower for keyword in keywords)),
+            'app'  # Default
+        )
 
-        # Common patterns
-        if 'web' in app_lower or 'frontend' in app_lower or 'ui' in app_lower:
-            target_tier = 'web'
-        elif 'api' in app_lower or 'service' in app_lower or 'backend' in app_lower:
-            target_tier = 'app'
-        elif 'db' in app_lower or 'database' in app_lower or 'sql' in app_lower:
-            target_tier = 'data'
-        elif 'cache' in app_lower or 'redis' in app_lower:
-            target_tier = 'cache'
-        elif 'queue' in app_lower or 'kafka' in app_lower or 'mq' in app_lower:
-            target_tier = 'messaging'
-        else:
-            target_tier = 'app'  # Default
-
-        # Find apps with similar tier
-        for observed_app in self.apps_with_data:
-            observed_lower = observed_app.lower()
-
-            if target_tier == 'web' and ('web' in observed_lower or 'frontend' in observed_lower):
-                similar.append(observed_app)
-            elif target_tier == 'app' and ('api' in observed_lower or 'service' in observed_lower):
-                similar.append(observed_app)
-            elif target_tier == 'data' and ('db' in observed_lower or 'database' in observed_lower):
-                similar.append(observed_app)
-            elif target_tier == 'cache' and ('cache' in observed_lower or 'redis' in observed_lower):
-                similar.append(observed_app)
-            elif target_tier == 'messaging' and ('queue' in observed_lower or 'kafka' in observed_lower):
-                similar.append(observed_app)
-
-        # Return top 5 similar apps
-        return similar[:5] if similar else []
+        members = self.tier_apps.get(target_tier, [])
+        if not members or self.similarity_index is None:
+            return members[:k]
+
+        rows = [self.similarity_index.position[app] for app in members]
+        centroid = self._tier_centroids.get(target_tier)
+        if centroid is None:
+            centroid = self.similarity_index.vectors[rows].mean(axis=0)
+            self._tier_centroids[target_tier] = centroid
+
+        query = centroid
+        weights = np.array([_name_similarity(app_name, app) for app in members])
+        if weights.sum() > 0:
+            query = centroid + weights @ self.similarity_index.vectors[rows] / weights.sum()
+
+        similar = [app for app, _ in self.similarity_index.query(query, k=k, within=members)]
+        return similar if similar else members[:k]
 
     def _create_synthetic_graph_data(self, app_name: str, similar_apps: List[str]) -> Tuple:
         """Create synthetic graph data for prediction"""
@@ -524,24 +606,39 @@ class MLNetworkPredictor:
 
         Models state transitions: if app A connects to B, what's the probability
         that an app similar to A will connect to apps similar to B?
+
+        Transition probabilities are kept as a sparse app x peer matrix;
+        markov_chain mirrors it as nested dicts for callers that want lookups.
         """
         logger.info("    Building Markov transition matrix...")
 
-        # Track app -> peer connections
-        app_peers = defaultdict(Counter)
-
-        for record in records:
-            # Source app -> destination IP transitions
-            app_peers[record.app_name][record.dst_ip] += 1
-
-        # Calculate transition probabilities
-        for app, peer_counts in app_peers.items():
-            total = sum(peer_counts.values())
-            self.markov_chain[app] = {}
+        frame = self.feature_store.frame if self.feature_store is not None else flows_to_frame(records)
+        app_codes, apps = pd.factorize(frame['app'], sort=False)
+        peer_codes, peers = pd.factorize(frame['dst'], sort=False)
+        self.markov_apps = [str(a) for a in apps]
+        self.markov_peers = [str(p) for p in peers]
 
-            for peer, count in peer_counts.items():
-                # Transition probability: P(peer | app)
-                self.markov_chain[app][peer] = count / total
+        # Source app -> destination IP transition counts (duplicates summed)
+        counts = sp.csr_matrix(
+            (np.ones(len(frame)), (app_codes, peer_codes)),
+            shape=(len(apps), len(peers))
+        )
+        counts.sum_duplicates()
+
+        # Transition probability: P(peer | app)
+        totals = np.asarray(counts.sum(axis=1)).ravel()
+        totals[totals == 0] = 1.0
+        self.transition_matrix = sp.diags(1.0 / totals) @ counts
+        self.transition_matrix = self.transition_matrix.tocsr()
+
+        matrix = self.transition_matrix
+        self.markov_chain = {}
+        for row, app in enumerate(self.markov_apps):
+            start, end = matrix.indptr[row:row + 2]
+            self.markov_chain[app] = {
+                self.markov_peers[j]: float(p)
+                for j, p in zip(matrix.indices[start:end], matrix.data[start:end])
+            }
 
         logger.info(f"    Markov chain built with {len(self.markov_chain)} states")
 
@@ -551,73 +648,56 @@ class MLNetworkPredictor:
 
         If app A talks to B, and B talks to C, we correlate A with C.
         This helps predict: "apps like A probably also need to talk to things like C"
+
+        Both passes are sparse matrix products: Jaccard from the app x peer
+        incidence B (intersections = B @ B.T), two-hop path counts from the
+        node adjacency A (A @ A).
         """
         logger.info("    Correlating peer patterns (transitive dependencies)...")
 
-        # For each pair of apps, calculate correlation score
-        for app_a in self.apps_with_data:
-            if app_a not in self.markov_chain:
-                continue
-
-            # Get A's direct peers
-            a_peers = set(self.markov_chain[app_a].keys())
-
-            for app_b in self.apps_with_data:
-                if app_a == app_b or app_b not in self.markov_chain:
-                    continue
-
-                # Get B's direct peers
-                b_peers = set(self.markov_chain[app_b].keys())
+        # Apps with observed peers (rows of the incidence matrix)
+        apps = [app for app in self.markov_apps if app in self.apps_with_data]
+        rows = np.array([i for i, app in enumerate(self.markov_apps) if app in self.apps_with_data],
+                        dtype=np.int64)
+        incidence = self.transition_matrix[rows].tocsr() if len(rows) else sp.csr_matrix((0, 0))
+        incidence.data = np.ones_like(incidence.data)
 
-                # Calculate Jaccard similarity of peer sets
-                intersection = len(a_peers & b_peers)
-                union = len(a_peers | b_peers)
+        # Jaccard similarity of peer sets: |A & B| / (|A| + |B| - |A & B|)
+        intersections = (incidence @ incidence.T).tocoo()
+        sizes = np.diff(incidence.indptr)
+        i, j, shared = intersections.row, intersections.col, intersections.data
+        jaccard = shared / (sizes[i] + sizes[j] - shared)
 
-                if union > 0:
-                    jaccard = intersection / union
-
-                    # Store if significant correlation
-                    if jaccard > 0.1:  # At least 10% overlap
-                        self.peer_correlation_matrix[(app_a, app_b)] = jaccard
+        # Store if significant correlation (at least 10% overlap)
+        keep = (i != j) & (jaccard > 0.1)
+        app_similarity = sp.csr_matrix((jaccard[keep], (i[keep], j[keep])), shape=(len(apps), len(apps)))
 
         # Build transitive correlations (second-order)
         # If A -> B and B -> C, then A might need C
-        transitive_correlations = {}
-
-        for node in self.G.nodes():
-            if self.G.out_degree(node) > 0:
-                # First-order neighbors (direct connections)
-                first_order = set(self.G.successors(node))
-
-                # Second-order neighbors (peers of peers)
-                second_order = set()
-                for neighbor in first_order:
-                    second_order.update(self.G.successors(neighbor))
-
-                # Remove self and first-order (we want transitive only)
-                second_order -= {node}
-                second_order -= first_order
-
-                if second_order:
-                    # Store transitive correlation with decay factor
-                    for transitive_peer in second_order:
-                        # Count paths to this transitive peer
-                        path_count = 0
-                        for intermediate in first_order:
-                            if self.G.has_edge(intermediate, transitive_peer):
-                                path_count += 1
-
-                        # Correlation strength based on path count
-                        strength = min(path_count / len(first_order), 1.0) * 0.7  # Max 0.7 (decay)
-
-                        if strength > 0.2:  # Threshold
-                            transitive_correlations[(node, transitive_peer)] = strength
+        nodes = list(self.G.nodes())
+        if nodes:
+            adjacency = sp.csr_matrix(
+                nx.to_scipy_sparse_array(self.G, nodelist=nodes, weight=None, format='csr'), dtype=np.float64
+            )
+        else:
+            adjacency = sp.csr_matrix((0, 0))
+
+        # Path counts through first-order neighbors; drop self and first-order (transitive only)
+        paths = (adjacency @ adjacency).tocsr()
+        path_counts = (paths - paths.multiply(adjacency)).tocoo()
+
+        # Correlation strength based on path count, max 0.7 (decay)
+        out_degree = np.diff(adjacency.indptr)
+        strength = np.minimum(path_counts.data / out_degree[path_counts.row], 1.0) * 0.7
+        keep = (path_counts.row != path_counts.col) & (strength > 0.2)
+        transitive = sp.csr_matrix(
+            (strength[keep], (path_counts.row[keep], path_counts.col[keep])), shape=adjacency.shape
+        )
 
-        # Merge transitive correlations
-        self.peer_correlation_matrix.update(transitive_correlations)
+        self.peer_correlation_matrix = PeerCorrelationIndex(apps, app_similarity, nodes, transitive)
 
         logger.info(f"    Found {len(self.peer_correlation_matrix)} peer correlations "
-                   f"({len(transitive_correlations)} transitive)")
+                   f"({transitive.nnz} transitive)")
 
     def _predict_with_markov(self, app_name: str, similar_apps: List[str]) -> List[str]:
         """
@@ -630,33 +710,28 @@ class MLNetworkPredictor:
         Returns:
             List of predicted peer IPs/hosts
         """
-        predicted_peers = Counter()
+        app_position = {app: i for i, app in enumerate(self.markov_apps)}
+        weights = np.zeros(len(self.markov_apps))
 
         # Aggregate transition probabilities from similar apps
+        # (apps earlier in similar_apps list are more similar)
         for similar_app in similar_apps:
-            if similar_app in self.markov_chain:
-                # Get transition probabilities for this similar app
-                transitions = self.markov_chain[similar_app]
+            if similar_app in app_position:
+                weights[app_position[similar_app]] += 1.0 / (similar_apps.index(similar_app) + 1)
 
-                # Weight by similarity (apps earlier in similar_apps list are more similar)
-                similarity_weight = 1.0 / (similar_apps.index(similar_app) + 1)
+        # Also add peers of correlated apps (shared-peer Jaccard), at half weight
+        correlations = self.peer_correlation_matrix
+        correlated = correlations.app_weights(similar_apps)
+        for app, weight in zip(correlations.apps, correlated):
+            if weight and app in app_position:
+                weights[app_position[app]] += weight * 0.5
 
-                for peer, prob in transitions.items():
-                    predicted_peers[peer] += prob * similarity_weight
+        scores = self.transition_matrix.T @ weights if len(weights) else np.zeros(0)
 
-        # Also check for correlated peers (transitive dependencies)
-        for similar_app in similar_apps:
-            for (app_a, app_b), correlation in self.peer_correlation_matrix.items():
-                if app_a == similar_app:
-                    # This similar app correlates with app_b
-                    # Check what app_b connects to
-                    if app_b in self.markov_chain:
-                        for peer, prob in self.markov_chain[app_b].items():
-                            # Add with correlation weight
-                            predicted_peers[peer] += prob * correlation * 0.5
-
-        # Return top predicted peers
-        top_peers = [peer for peer, _ in predicted_peers.most_common(10)]
+        # Return top predicted peers (ties keep first-seen peer order)
+        candidates = np.flatnonzero(scores > 0)
+        order = candidates[np.argsort(-scores[candidates], kind='stable')][:10]
+        top_peers = [self.markov_peers[j] for j in order]
 
         logger.info(f"    Markov prediction for {app_name}: {len(top_peers)} likely peers")
         return top_peers
@@ -674,25 +749,17 @@ class MLNetworkPredictor:
         # Base confidence from number of similar apps
         base_confidence = min(len(similar_apps) / 5.0, 1.0)  # Max at 5 similar apps
 
-        # Boost from strong Markov transitions
+        # Boost from strong Markov transitions (average transition probability)
         transition_strength = 0
         for similar_app in similar_apps:
-            if similar_app in self.markov_chain:
-                # Average transition probability
-                transitions = self.markov_chain[similar_app]
-                if transitions:
-                    avg_prob = sum(transitions.values()) / len(transitions)
-                    transition_strength += avg_prob
+            transitions = self.markov_chain.get(similar_app)
+            if transitions:
+                transition_strength += sum(transitions.values()) / len(transitions)
 
-        if similar_apps:
-            transition_strength /= len(similar_apps)
+        transition_strength /= len(similar_apps)
 
-        # Boost from peer correlations
-        correlation_boost = 0
-        for similar_app in similar_apps:
-            for (app_a, app_b), score in self.peer_correlation_matrix.items():
-                if app_a == similar_app or app_b == similar_app:
-                    correlation_boost += score
+        # Boost from peer correlations (app similarity is symmetric: each pair counts both ways)
+        correlation_boost = 2.0 * float(self.peer_correlation_matrix.app_weights(similar_apps).sum())
 
         correlation_boost = min(correlation_boost / 10.0, 0.2)  # Max 0.2 boost
 
@@ -731,8 +798,3 @@ class MLNetworkPredictor:
             json.dump(predictions_export, f, indent=2)
 
         logger.info(f"[SUCCESS] Predictions exported to {output_path}")
-
-
-# Import Counter
-from collections import Counter
-from datetime import datetime
@@ -0,0 +1,195 @@
+"""
+Per-Application Process Pool
+============================
+Runs independent per-application work (diagram string building, python-docx
+assembly, JSON exports) in a process pool.
+
+How it works:
+- Read-only inputs shared by every app (topology, zones, upstream index,
+  generator settings) are handed to each worker ONCE: inherited from the
+  parent when workers are forked, otherwise pickled into the pool
+  initializer - never per task
+- Each task runs in isolation: an exception fails that app only and is
+  returned as the app's error (callers report it)
+- Log records and stdout of a task are captured in the worker and replayed
+  by the parent in input order, so logs and stats merge deterministically
+  no matter which worker finished first
+- workers <= 1 runs everything in-process (live output, no pool)
+
+Task functions must be module-level (picklable) and take (item, shared).
+
+Usage:
+    results = run_per_app(build_docs, app_ids, shared={'topology': topology}, workers=8)
+    for result in results:
+        if result.ok:
+            outputs[result.item] = result.value
+
+    NETSEG_REPORT_WORKERS  Default worker count (default: CPU count)
+
+Author: Enterprise Security Team
+Version: 1.0
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AppTaskResult:
+    """Outcome of one per-app task"""
+    item: Any
+    ok: bool
+    value: Any = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+    output: str = ''  # Captured stdout (parallel mode)
+    records: List[logging.LogRecord] = field(default_factory=list, repr=False)  # Captured logs
+
+
+def default_workers() -> int:
+    """Worker count from NETSEG_REPORT_WORKERS (default: CPU count)"""
+    return max(1, int(os.environ.get('NETSEG_REPORT_WORKERS', 0)) or os.cpu_count() or 1)
+
+
+class _RecordCollector(logging.Handler):
+    """Collects log records of one task in picklable form"""
+
+    def __init__(self):
+        super().__init__(level=logging.NOTSET)
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord):
+        # Render message and traceback now: args and exc_info may not pickle
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+
+_task: Optional[Callable] = None
+_shared: Any = None
+
+
+def _init_worker(task: Optional[Callable], shared: Any, inherited: bool):
+    """Pool initializer: receive task and shared inputs, route logs to the collector"""
+    global _task, _shared
+    if not inherited:
+        _task, _shared = task, shared
+
+    # Parent handlers (log file, console) are replayed by the parent instead
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+
+def _run(task: Callable, item: Any, shared: Any) -> AppTaskResult:
+    """Run one task, isolating its failure"""
+    started = time.perf_counter()
+    try:
+        value = task(item, shared)
+        return AppTaskResult(item, True, value, seconds=time.perf_counter() - started)
+    except Exception as e:
+        logger.debug(f"Task for {item} failed", exc_info=True)
+        return AppTaskResult(item, False, error=str(e), seconds=time.perf_counter() - started)
+
+
+def _run_captured(item: Any) -> AppTaskResult:
+    """Worker entry point: run one task with stdout and logs captured"""
+    collector = _RecordCollector()
+    root = logging.getLogger()
+    root.addHandler(collector)
+    stdout = io.StringIO()
+    try:
+        with redirect_stdout(stdout):
+            result = _run(_task, item, _shared)
+    finally:
+        root.removeHandler(collector)
+
+    result.output = stdout.getvalue()
+    result.records = collector.records
+    return result
+
+
+def _replay(result: AppTaskResult):
+    """Emit a worker's captured output and logs in the parent"""
+    if result.output:
+        sys.stdout.write(result.output)
+        sys.stdout.flush()
+    for record in result.records:
+        logging.getLogger(record.name).handle(record)
+
+
+def run_per_app(
+    task: Callable[[Any, Any], Any],
+    items: Iterable[Any],
+    shared: Any = None,
+    workers: Optional[int] = None,
+    on_result: Optional[Callable[[AppTaskResult], None]] = None
+) -> List[AppTaskResult]:
+    """
+    Run task(item, shared) for every item
+
+    Args:
+        task: Module-level function (item, shared) -> value
+        items: Per-app work items (app IDs, paths or small tuples)
+        shared: Read-only inputs common to all items
+        workers: Worker processes (default: default_workers())
+        on_result: Called in the parent for each result, in input order,
+            right after its output and logs are replayed
+
+    Returns:
+        AppTaskResult per item, in input order
+    """
+    items = list(items)
+    workers = min(workers or default_workers(), len(items))
+
+    if workers <= 1:
+        results = []
+        for item in items:
+            result = _run(task, item, shared)
+            if on_result:
+                on_result(result)
+            results.append(result)
+        return results
+
+    global _task, _shared
+    context = multiprocessing.get_context()
+    inherited = context.get_start_method() == 'fork'
+    if inherited:
+        # Forked workers see these without pickling (copy-on-write)
+        _task, _shared = task, shared
+        initargs = (None, None, True)
+    else:
+        initargs = (task, shared, False)
+
+    logger.info(f"Dispatching {len(items)} applications to {workers} worker processes...")
+    results = []
+    pool = context.Pool(processes=workers, initializer=_init_worker, initargs=initargs)
+    try:
+        # imap keeps input order while workers run ahead
+        for result in pool.imap(_run_captured, items):
+            _replay(result)
+            if on_result:
+                on_result(result)
+            results.append(result)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+        if inherited:
+            _task, _shared = None, None
+
+    return results
@@ -0,0 +1,226 @@
+"""
+Similar-App Index
+=================
+Top-k cosine similarity search over per-app vectors (FeatureStore app
+features or VAE latent codes) for predicting apps without traffic data.
+
+Backends:
+- 'exact': brute-force NumPy scan (one matrix-vector product per query)
+- 'lsh':   random-hyperplane LSH; candidates from matching buckets are
+           re-ranked exactly, falling back to the exact scan when a query
+           lands in sparsely populated buckets
+
+Apps can be inserted incrementally; re-inserting a name replaces its vector.
+
+Author: Network Security Team
+Version: 1.0
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SimilarAppIndex:
+    """
+    Incremental top-k cosine similarity index keyed by app name
+
+    Vectors are L2-normalized on insert; all-zero vectors never match.
+    """
+
+    BACKENDS = ('exact', 'lsh')
+
+    def __init__(self, dim: int, backend: str = 'exact', num_tables: int = 8,
+                 num_bits: int = 10, seed: int = 0):
+        """
+        Args:
+            dim: Vector dimension
+            backend: 'exact' or 'lsh'
+            num_tables: LSH hash tables (more tables = higher recall)
+            num_bits: Hyperplanes per table (more bits = smaller buckets)
+            seed: Hyperplane seed (fixed so rebuilt indexes hash identically)
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}' (expected one of {self.BACKENDS})")
+
+        self.dim = dim
+        self.backend = backend
+        self.names: List[str] = []
+        self.position: Dict[str, int] = {}
+        self._vectors = np.zeros((16, dim), dtype=np.float32)
+
+        if backend == 'lsh':
+            rng = np.random.default_rng(seed)
+            self._planes = rng.standard_normal((dim, num_tables * num_bits)).astype(np.float32)
+            self._num_tables = num_tables
+            self._bit_weights = (1 << np.arange(num_bits, dtype=np.int64))
+            self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(num_tables)]
+            self._codes = np.zeros((16, num_tables), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.position
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Normalized vectors [len(self), dim] (view)"""
+        return self._vectors[:len(self.names)]
+
+    def vector(self, name: str) -> Optional[np.ndarray]:
+        """Normalized vector for an indexed app (None if unknown)"""
+        row = self.position.get(name)
+        return None if row is None else self._vectors[row]
+
+    def add(self, names: Iterable[str], vectors: np.ndarray):
+        """
+        Insert or replace apps
+
+        Args:
+            names: App names
+            vectors: Vectors [len(names), dim]
+        """
+        names = list(names)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(names), self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+        rows = np.empty(len(names), dtype=np.int64)
+        replaced = []
+        for i, name in enumerate(names):
+            row = self.position.get(name)
+            if row is None:
+                row = len(self.names)
+                self.position[name] = row
+                self.names.append(name)
+            else:
+                replaced.append(row)
+            rows[i] = row
+
+        if self.backend == 'lsh':
+            self._unbucket(replaced)
+        self._reserve(len(self.names))
+        self._vectors[rows] = vectors
+
+        if self.backend == 'lsh':
+            codes = self._hash(vectors)
+            self._codes[rows] = codes
+            for row, row_codes in zip(rows, codes):
+                if not self._vectors[row].any():
+                    continue
+                for table, code in enumerate(row_codes):
+                    self._buckets[table].setdefault(int(code), []).append(int(row))
+
+    def query(self, vector: np.ndarray, k: int = 5, exclude: Iterable[str] = (),
+              within: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Top-k most similar apps
+
+        Args:
+            vector: Query vector [dim]
+            k: Number of results
+            exclude: App names to skip (e.g. the query app itself)
+            within: Only rank these apps (e.g. the members of one tier); LSH
+                bucket candidates are restricted to them, with an exact scan
+                of them as the fallback
+
+        Returns:
+            [(app_name, cosine_similarity)] best first
+        """
+        vector = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        norm = np.linalg.norm(vector)
+        if norm == 0 or not self.names:
+            return []
+        vector = vector / norm
+
+        excluded = [self.position[name] for name in exclude if name in self.position]
+
+        allowed = None
+        if within is not None:
+            allowed = np.array(sorted({self.position[name] for name in within if name in self.position}),
+                               dtype=np.int64)
+
+        candidates = None
+        if self.backend == 'lsh':
+            candidates = self._candidates(vector)
+            if allowed is not None:
+                candidates = np.intersect1d(candidates, allowed)
+            if len(np.setdiff1d(candidates, excluded)) < k:
+                candidates = None  # Too few bucket hits - scan exactly
+
+        if candidates is None:
+            candidates = np.arange(len(self.names)) if allowed is None else allowed
+        scores = self._vectors[candidates] @ vector
+
+        keep = ~np.isin(candidates, excluded) & self._vectors[candidates].any(axis=1)
+        candidates, scores = candidates[keep], scores[keep]
+
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            candidates, scores = candidates[top], scores[top]
+        order = np.lexsort((candidates, -scores))  # Ties keep insertion order
+
+        return [(self.names[candidates[i]], float(scores[i])) for i in order]
+
+    def query_batch(self, vectors: np.ndarray, k: int = 5) -> List[List[Tuple[str, float]]]:
+        """Top-k for many queries (exact; one matrix product)"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if not self.names:
+            return [[] for _ in range(len(vectors))]
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        scores = vectors @ self.vectors.T
+        scores[:, ~self.vectors.any(axis=1)] = -np.inf
+
+        k = min(k, len(self.names))
+        top = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+        return [
+            [(self.names[j], float(scores[i, j])) for j in top[i] if np.isfinite(scores[i, j])]
+            if norms[i, 0] > 0 else []
+            for i in range(len(vectors))
+        ]
+
+    def _reserve(self, size: int):
+        """Grow storage geometrically so inserts stay amortized O(1)"""
+        capacity = len(self._vectors)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:len(self._vectors)] = self._vectors
+        self._vectors = vectors
+
+        if self.backend == 'lsh':
+            codes = np.zeros((capacity, self._num_tables), dtype=np.int64)
+            codes[:len(self._codes)] = self._codes
+            self._codes = codes
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Per-table bucket codes [n, num_tables]"""
+        bits = (vectors @ self._planes > 0).reshape(len(vectors), self._num_tables, -1)
+        return bits.astype(np.int64) @ self._bit_weights
+
+    def _unbucket(self, rows: List[int]):
+        """Drop replaced rows from their old buckets"""
+        for row in rows:
+            if not self._vectors[row].any():
+                continue
+            for table, code in enumerate(self._codes[row]):
+                bucket = self._buckets[table].get(int(code))
+                if bucket and row in bucket:
+                    bucket.remove(row)
+
+    def _candidates(self, vector: np.ndarray) -> np.ndarray:
+        """Union of rows sharing a bucket with the query in any table"""
+        codes = self._hash(vector[np.newaxis])[0]
+        hits = [self._buckets[table].get(int(code), ()) for table, code in enumerate(codes)]
+        if not any(hits):
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate([np.asarray(h, dtype=np.int64) for h in hits if h]))
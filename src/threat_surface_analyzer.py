@@ -8,6 +8,7 @@ Features:
 - Attack path discovery (Internet → Critical Assets)
 - Exposure scoring for all nodes
 - What-if scenario analysis
+- Incremental exposure refresh for nodes touched by new flows
 - Threat surface reduction recommendations
 - Attack chain visualization
 
@@ -106,7 +107,7 @@ class ThreatSurfaceAnalyzer:
         # Identify external-facing nodes
         external_nodes = []
         for ip in self.analyzer.graph.nodes():
-            tier = self.analyzer._classify_node_tier(ip)
+            tier = self.analyzer.node_tiers[ip]
             is_internal = self.analyzer.node_metadata.get(ip, {}).get('is_internal', True)
 
             if tier in self.EXTERNAL_TIERS or not is_internal:
@@ -115,7 +116,7 @@ class ThreatSurfaceAnalyzer:
         # Identify critical assets
         critical_nodes = []
         for ip in self.analyzer.graph.nodes():
-            tier = self.analyzer._classify_node_tier(ip)
+            tier = self.analyzer.node_tiers[ip]
             if tier in self.CRITICAL_TIERS:
                 critical_nodes.append(ip)
 
@@ -129,9 +130,9 @@ class ThreatSurfaceAnalyzer:
                 for path in paths[:10]:  # Limit paths per pair
                     attack_paths.append({
                         'source': ext_ip,
-                        'source_tier': self.analyzer._classify_node_tier(ext_ip),
+                        'source_tier': self.analyzer.node_tiers[ext_ip],
                         'target': crit_ip,
-                        'target_tier': self.analyzer._classify_node_tier(crit_ip),
+                        'target_tier': self.analyzer.node_tiers[crit_ip],
                         'path': path,
                         'path_length': len(path) - 1,
                         'risk_level': self._assess_path_risk(path),
@@ -156,60 +157,83 @@ class ThreatSurfaceAnalyzer:
         """
         logger.info("  Analyzing node exposure levels...")
 
-        exposure_analysis = {}
-
-        for ip in self.analyzer.graph.nodes():
-            tier = self.analyzer._classify_node_tier(ip)
-            is_internal = self.analyzer.node_metadata.get(ip, {}).get('is_internal', True)
-
-            # Calculate exposure factors
-            in_degree = self.analyzer.graph.in_degree(ip)
-            out_degree = self.analyzer.graph.out_degree(ip)
-
-            # Check if directly accessible from external
-            has_external_access = False
-            for predecessor in self.analyzer.graph.predecessors(ip):
-                pred_internal = self.analyzer.node_metadata.get(predecessor, {}).get('is_internal', True)
-                if not pred_internal:
-                    has_external_access = True
-                    break
-
-            # Calculate exposure score
-            exposure_score = 0
-
-            if not is_internal:
-                exposure_score += 10  # External node = max exposure
-            elif has_external_access:
-                exposure_score += 7   # One hop from external
-            elif tier in self.EXTERNAL_TIERS:
-                exposure_score += 6   # Internet-facing tier
-
-            # Add connectivity factor
-            exposure_score += min(out_degree / 10, 3)  # Max +3 for connectivity
-
-            # Determine exposure level
-            if exposure_score >= 8:
-                exposure_level = 'CRITICAL'
-            elif exposure_score >= 6:
-                exposure_level = 'HIGH'
-            elif exposure_score >= 4:
-                exposure_level = 'MEDIUM'
-            else:
-                exposure_level = 'LOW'
-
-            exposure_analysis[ip] = {
-                'exposure_score': round(exposure_score, 2),
-                'exposure_level': exposure_level,
-                'tier': tier,
-                'is_internal': is_internal,
-                'has_external_access': has_external_access,
-                'in_degree': in_degree,
-                'out_degree': out_degree
-            }
+        exposure_analysis = {
+            ip: self._score_exposure(ip) for ip in self.analyzer.graph.nodes()
+        }
 
         logger.info(f"    [OK] Analyzed exposure for {len(exposure_analysis)} nodes")
         return exposure_analysis
 
+    def _score_exposure(self, ip: str) -> Dict:
+        """Exposure analysis for a single node"""
+        tier = self.analyzer.node_tiers[ip]
+        is_internal = self.analyzer.node_metadata.get(ip, {}).get('is_internal', True)
+
+        # Calculate exposure factors
+        in_degree = self.analyzer.graph.in_degree(ip)
+        out_degree = self.analyzer.graph.out_degree(ip)
+
+        # Check if directly accessible from external
+        has_external_access = False
+        for predecessor in self.analyzer.graph.predecessors(ip):
+            pred_internal = self.analyzer.node_metadata.get(predecessor, {}).get('is_internal', True)
+            if not pred_internal:
+                has_external_access = True
+                break
+
+        # Calculate exposure score
+        exposure_score = 0
+
+        if not is_internal:
+            exposure_score += 10  # External node = max exposure
+        elif has_external_access:
+            exposure_score += 7   # One hop from external
+        elif tier in self.EXTERNAL_TIERS:
+            exposure_score += 6   # Internet-facing tier
+
+        # Add connectivity factor
+        exposure_score += min(out_degree / 10, 3)  # Max +3 for connectivity
+
+        # Determine exposure level
+        if exposure_score >= 8:
+            exposure_level = 'CRITICAL'
+        elif exposure_score >= 6:
+            exposure_level = 'HIGH'
+        elif exposure_score >= 4:
+            exposure_level = 'MEDIUM'
+        else:
+            exposure_level = 'LOW'
+
+        return {
+            'exposure_score': round(exposure_score, 2),
+            'exposure_level': exposure_level,
+            'tier': tier,
+            'is_internal': is_internal,
+            'has_external_access': has_external_access,
+            'in_degree': in_degree,
+            'out_degree': out_degree
+        }
+
+    def refresh_exposure(self, nodes: Optional[Set[str]] = None) -> Dict[str, Dict]:
+        """
+        Rescore exposure only for nodes affected by a graph delta
+
+        Args:
+            nodes: Nodes to rescore (default: 1-hop neighborhood of the
+                   analyzer's changed nodes, see GraphAnalyzer.apply_delta)
+
+        Returns:
+            Updated exposure scores for the rescored nodes
+        """
+        if nodes is None:
+            nodes = self.analyzer.affected_neighborhood(hops=1)
+
+        updated = {ip: self._score_exposure(ip) for ip in nodes if ip in self.analyzer.graph}
+        self.exposure_scores.update(updated)
+
+        logger.info(f"    [OK] Refreshed exposure for {len(updated)} affected nodes")
+        return updated
+
     def _calculate_threat_scores(self) -> Dict[str, float]:
         """
         Calculate comprehensive threat score for each node
@@ -223,7 +247,7 @@ class ThreatSurfaceAnalyzer:
         metrics = self.analyzer.calculate_centrality_metrics()
 
         for ip in self.analyzer.graph.nodes():
-            tier = self.analyzer._classify_node_tier(ip)
+            tier = self.analyzer.node_tiers[ip]
 
             # Base score from tier
             base_score = self.TIER_RISK_SCORES.get(tier, 5)
@@ -272,7 +296,7 @@ class ThreatSurfaceAnalyzer:
                 chokepoints.append({
                     'ip': ip,
                     'hostname': self.analyzer.node_metadata.get(ip, {}).get('hostname', ''),
-                    'tier': self.analyzer._classify_node_tier(ip),
+                    'tier': self.analyzer.node_tiers[ip],
                     'betweenness': round(betweenness, 4),
                     'paths_blocked': impact['paths_blocked'],
                     'reduction_percentage': impact['reduction_percentage'],
@@ -371,8 +395,8 @@ class ThreatSurfaceAnalyzer:
         if len(path) < 2:
             return 'Unknown'
 
-        source_tier = self.analyzer._classify_node_tier(path[0])
-        target_tier = self.analyzer._classify_node_tier(path[-1])
+        source_tier = self.analyzer.node_tiers[path[0]]
+        target_tier = self.analyzer.node_tiers[path[-1]]
 
         if source_tier in self.EXTERNAL_TIERS and target_tier == 'DATABASE':
             return 'External → Database (SQL Injection, Data Exfiltration)'
@@ -388,7 +412,7 @@ class ThreatSurfaceAnalyzer:
         # Sample attack paths to estimate impact
         sample_external = list(self.analyzer.graph.nodes())[:10]
         sample_critical = [ip for ip in self.analyzer.graph.nodes()
-                          if self.analyzer._classify_node_tier(ip) in self.CRITICAL_TIERS][:10]
+                          if self.analyzer.node_tiers[ip] in self.CRITICAL_TIERS][:10]
 
         paths_before = 0
         paths_after = 0
@@ -0,0 +1,216 @@
+"""
+Upstream Dependency Index
+=========================
+Reverse-dependency index over all applications' enriched flows.csv files:
+destination app -> the apps that send traffic to it, with their flow
+counts, server counts and source endpoints.
+
+Upstream, full-flow and architecture diagrams need "who sends TO this app".
+Answering that by concatenating every flows.csv per app makes a full report
+run O(apps²) in CSV reads; the index reads each file once and answers each
+lookup from the destination's own rows.
+
+The index is built once per run (from_apps_dir) and can be kept current as
+apps are ingested (add_app replaces one app's contribution).
+
+Usage:
+    index = UpstreamIndex.from_apps_dir('persistent_data/applications')
+    upstream = index.get('ACDA')
+    if upstream:
+        for source in upstream.sources.values():
+            print(source.app, source.flows, source.endpoints[:2])
+
+Author: Enterprise Security Team
+Version: 1.0
+"""
+
+import logging
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns of flows.csv the index needs
+UPSTREAM_COLUMNS = (
+    'App', 'Dest App',
+    'Source IP', 'Source Hostname', 'Source Is VMware',
+    'Dest IP', 'Dest Hostname', 'Dest Is VMware',
+)
+
+
+@dataclass
+class UpstreamSource:
+    """Traffic from one source application to the destination app"""
+    app: str
+    flows: int
+    servers: int
+    vmware_servers: int
+    endpoints: List[str] = field(default_factory=list)  # 'IP (hostname)', first-seen order
+
+
+@dataclass
+class UpstreamDependencies:
+    """Aggregated upstream traffic of one destination application"""
+    app: str
+    flows: int
+    servers: int
+    vmware_servers: int
+    endpoints: List[str] = field(default_factory=list)  # Destination-side 'IP (hostname)'
+    sources: Dict[str, UpstreamSource] = field(default_factory=dict)  # Sorted by source app
+
+    def to_dict(self) -> Dict:
+        """Plain dict (e.g. for build cache keys)"""
+        return asdict(self)
+
+
+def endpoint_labels(flows: pd.DataFrame, ip_column: str, hostname_column: str) -> List[str]:
+    """
+    Distinct 'IP (hostname)' labels in first-seen order
+
+    The hostname is omitted when it is missing, equal to the IP or 'Unknown'.
+    """
+    if hostname_column not in flows.columns:
+        return list(dict.fromkeys(flows[ip_column]))
+
+    labels = []
+    for ip, hostname in flows[[ip_column, hostname_column]].drop_duplicates().itertuples(index=False):
+        if hostname and hostname != ip and hostname != 'Unknown':
+            labels.append(f"{ip} ({hostname})")
+        else:
+            labels.append(ip)
+    return labels
+
+
+def _vmware_servers(flows: pd.DataFrame, ip_column: str, vmware_column: str) -> int:
+    """Distinct IPs flagged as VMware"""
+    if vmware_column not in flows.columns:
+        return 0
+    return flows[flows[vmware_column] == True][ip_column].nunique()
+
+
+class UpstreamIndex:
+    """
+    Destination app -> upstream dependencies
+
+    Rows are stored per (destination, contributing flows.csv), so replacing
+    one app's flows only touches the destinations it sends to. Aggregates
+    are computed on first lookup and memoized.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, pd.DataFrame]] = {}  # dest app -> {contributor: rows}
+        self._contributions: Dict[str, List[str]] = {}  # contributor -> dest apps
+        self._aggregates: Dict[str, Optional[UpstreamDependencies]] = {}
+
+    @classmethod
+    def from_apps_dir(cls, apps_dir: Union[str, Path]) -> 'UpstreamIndex':
+        """
+        Build the index from persistent_data/applications/*/flows.csv
+
+        Args:
+            apps_dir: Directory with one subdirectory (flows.csv) per app
+
+        Returns:
+            UpstreamIndex
+        """
+        index = cls()
+        apps_dir = Path(apps_dir)
+        if not apps_dir.exists():
+            return index
+
+        for app_dir in sorted(d for d in apps_dir.iterdir() if d.is_dir()):
+            flows_csv = app_dir / 'flows.csv'
+            if not flows_csv.exists():
+                continue
+            try:
+                flows_df = pd.read_csv(flows_csv, usecols=lambda column: column in UPSTREAM_COLUMNS)
+            except Exception as e:
+                logger.warning(f"Skipping {flows_csv} in upstream index: {e}")
+                continue
+            index.add_app(app_dir.name, flows_df)
+
+        logger.info(f"Upstream index: {len(index._contributions)} apps, {len(index._rows)} destinations")
+        return index
+
+    def add_app(self, app_id: str, flows_df: pd.DataFrame):
+        """
+        Add (or replace) one application's flows
+
+        Args:
+            app_id: Application whose flows.csv this is
+            flows_df: Its enriched flows (extra columns are ignored)
+        """
+        self.remove_app(app_id)
+        self._contributions[app_id] = []
+        if 'Dest App' not in flows_df.columns or 'App' not in flows_df.columns:
+            return
+
+        columns = [column for column in UPSTREAM_COLUMNS if column in flows_df.columns]
+        flows_df = flows_df.loc[flows_df['Dest App'].notna(), columns]
+
+        dests = []
+        for dest_app, rows in flows_df.groupby('Dest App', sort=False):
+            self._rows.setdefault(dest_app, {})[app_id] = rows
+            self._aggregates.pop(dest_app, None)
+            dests.append(dest_app)
+        self._contributions[app_id] = dests
+
+    def remove_app(self, app_id: str):
+        """Drop one application's flows from the index"""
+        for dest_app in self._contributions.pop(app_id, []):
+            contributors = self._rows[dest_app]
+            contributors.pop(app_id, None)
+            if not contributors:
+                del self._rows[dest_app]
+            self._aggregates.pop(dest_app, None)
+
+    def __contains__(self, app_id: str) -> bool:
+        return app_id in self._rows
+
+    def __len__(self) -> int:
+        """Number of applications whose flows are indexed"""
+        return len(self._contributions)
+
+    def get(self, app_id: str) -> Optional[UpstreamDependencies]:
+        """
+        Upstream dependencies of an application
+
+        Args:
+            app_id: Destination application
+
+        Returns:
+            UpstreamDependencies, or None if no flows have it as destination
+        """
+        if app_id not in self._aggregates:
+            self._aggregates[app_id] = self._aggregate(app_id)
+        return self._aggregates[app_id]
+
+    def _aggregate(self, app_id: str) -> Optional[UpstreamDependencies]:
+        contributors = self._rows.get(app_id)
+        if not contributors:
+            return None
+
+        rows = pd.concat([contributors[key] for key in sorted(contributors)], ignore_index=True)
+
+        sources = {}
+        for source_app in sorted(rows['App'].unique()):
+            app_rows = rows[rows['App'] == source_app]
+            sources[source_app] = UpstreamSource(
+                app=source_app,
+                flows=len(app_rows),
+                servers=app_rows['Source IP'].nunique(),
+                vmware_servers=_vmware_servers(app_rows, 'Source IP', 'Source Is VMware'),
+                endpoints=endpoint_labels(app_rows, 'Source IP', 'Source Hostname'),
+            )
+
+        return UpstreamDependencies(
+            app=app_id,
+            flows=len(rows),
+            servers=rows['Dest IP'].nunique(),
+            vmware_servers=_vmware_servers(rows, 'Dest IP', 'Dest Is VMware'),
+            endpoints=endpoint_labels(rows, 'Dest IP', 'Dest Hostname'),
+            sources=sources,
+        )
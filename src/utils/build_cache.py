@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental Build Cache
+=======================
+Content-addressed manifest of generated artifacts (MMD, HTML, PNG, SVG,
+DOCX, JSON) so report generators only rebuild what actually changed.
+
+Each artifact is recorded under a name (e.g. 'diagram/ACDA') together with
+a key - a SHA256 over everything that went into it: input file contents
+(flows.csv, topology JSON, .mmd source), generator source files and any
+options. On the next run the artifact is up to date when the key matches
+and every recorded output still exists with the size/mtime written at
+build time (so deleted or hand-edited outputs are rebuilt).
+
+File content hashes are memoized in the manifest by (size, mtime_ns), so
+checking 300 unchanged apps costs a stat() per input instead of re-reading
+every flows.csv.
+
+Usage:
+    cache = ArtifactCache('outputs_final/diagrams/.build_manifest.json')
+    key = cache.key(flows_csv, topology_json, GENERATOR_SOURCES)
+    if not cache.is_fresh(f'diagram/{app_id}', key):
+        generate(...)
+        cache.record(f'diagram/{app_id}', key, [mmd_path, html_path])
+    cache.save()
+
+Set NETSEG_BUILD_CACHE=0 (or pass force=True / --force) to rebuild
+everything; the manifest is still refreshed for the next run.
+
+Author: Enterprise Security Team
+Version: 1.0
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.build_manifest.json'
+MANIFEST_VERSION = 1
+
+
+def cache_enabled() -> bool:
+    """Whether incremental builds are enabled (NETSEG_BUILD_CACHE, default on)"""
+    return os.environ.get('NETSEG_BUILD_CACHE', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def _file_stat(path: Path) -> Optional[Dict]:
+    """Size and modification time used to detect changed files"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class ArtifactCache:
+    """
+    Manifest of built artifacts keyed by the hash of their inputs
+
+    Thread-safe: generators that build apps in parallel can share one
+    instance. Changes are kept in memory until save().
+    """
+
+    def __init__(self, manifest_path: Union[str, Path], force: bool = False):
+        """
+        Initialize build cache
+
+        Args:
+            manifest_path: Path to the JSON manifest (usually MANIFEST_NAME
+                inside the output directory)
+            force: Treat every artifact as stale (rebuild all)
+        """
+        self.manifest_path = Path(manifest_path)
+        self.force = force or not cache_enabled()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._files = {}
+        self._artifacts = {}
+        self.stats = {'fresh': 0, 'stale': 0}
+        self._load()
+
+    def _load(self):
+        """Load manifest from disk (a missing or incompatible manifest starts empty)"""
+        if not self.manifest_path.exists():
+            return
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load build manifest {self.manifest_path}: {e}")
+            return
+
+        if manifest.get('version') != MANIFEST_VERSION:
+            logger.info(f"Build manifest {self.manifest_path} has an old format - rebuilding all artifacts")
+            return
+        self._files = manifest.get('files', {})
+        self._artifacts = manifest.get('artifacts', {})
+
+    def save(self):
+        """Write the manifest atomically (no-op when nothing changed)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            manifest = {
+                'version': MANIFEST_VERSION,
+                'files': self._files,
+                'artifacts': self._artifacts,
+            }
+            self._dirty = False
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(f'{self.manifest_path.name}.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception as e:
+            logger.error(f"Failed to save build manifest {self.manifest_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def file_hash(self, path: Union[str, Path]) -> Optional[str]:
+        """
+        SHA256 of a file's content, memoized by size and mtime
+
+        Args:
+            path: File path
+
+        Returns:
+            Hex digest, or None if the file does not exist
+        """
+        path = Path(path)
+        stat = _file_stat(path)
+        if stat is None:
+            return None
+
+        entry_key = str(path.resolve())
+        with self._lock:
+            entry = self._files.get(entry_key)
+        if entry and entry['size'] == stat['size'] and entry['mtime_ns'] == stat['mtime_ns']:
+            return entry['sha256']
+
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+
+        with self._lock:
+            self._files[entry_key] = {**stat, 'sha256': digest}
+            self._dirty = True
+        return digest
+
+    def key(self, *inputs) -> str:
+        """
+        Build key over an artifact's inputs
+
+        Inputs may be file paths (content is hashed; a missing file hashes
+        as absent), strings, bytes, numbers, dicts/lists (canonical JSON)
+        or nested lists/tuples of these. Order matters.
+
+        Returns:
+            SHA256 hex digest
+        """
+        digest = hashlib.sha256()
+        self._update(digest, inputs)
+        return digest.hexdigest()
+
+    def _update(self, digest, value):
+        """Feed one input into the key digest (type-tagged, length-prefixed)"""
+        if isinstance(value, Path):
+            data = (self.file_hash(value) or '<missing>').encode('ascii')
+            tag = b'F'
+        elif isinstance(value, (list, tuple)):
+            digest.update(b'L%d:' % len(value))
+            for item in value:
+                self._update(digest, item)
+            return
+        elif isinstance(value, bytes):
+            data, tag = value, b'B'
+        elif isinstance(value, str):
+            data, tag = value.encode('utf-8'), b'S'
+        else:
+            data = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+            tag = b'J'
+        digest.update(tag + b'%d:' % len(data))
+        digest.update(data)
+
+    def is_fresh(self, name: str, key: str) -> bool:
+        """
+        Check whether an artifact is up to date
+
+        Args:
+            name: Artifact name
+            key: Current input key from key()
+
+        Returns:
+            True if the recorded key matches and all outputs are unchanged
+        """
+        with self._lock:
+            entry = self._artifacts.get(name)
+
+        fresh = (
+            not self.force
+            and entry is not None
+            and entry['key'] == key
+            and all(_file_stat(Path(path)) == stat for path, stat in entry['outputs'].items())
+        )
+        with self._lock:
+            self.stats['fresh' if fresh else 'stale'] += 1
+        return fresh
+
+    def outputs(self, name: str) -> List[str]:
+        """Output paths recorded for an artifact"""
+        with self._lock:
+            entry = self._artifacts.get(name)
+        return list(entry['outputs']) if entry else []
+
+    def record(self, name: str, key: str, outputs: Iterable[Union[str, Path]]):
+        """
+        Record a successfully built artifact
+
+        Args:
+            name: Artifact name
+            key: Input key the outputs were built from
+            outputs: Output files written by the build (missing files are not recorded)
+        """
+        stats = {}
+        for path in outputs:
+            stat = _file_stat(Path(path))
+            if stat is not None:
+                stats[str(path)] = stat
+
+        with self._lock:
+            self._artifacts[name] = {
+                'key': key,
+                'outputs': stats,
+                'built_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._dirty = True
+
+    def invalidate(self, name: str):
+        """Forget an artifact (e.g. after a failed build)"""
+        with self._lock:
+            if self._artifacts.pop(name, None) is not None:
+                self._dirty = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.save()
+        return False
@@ -16,6 +16,7 @@ Version: 1.0
 import socket
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Tuple, List
 from ipaddress import ip_address, IPv4Address, IPv6Address
 
@@ -28,6 +29,15 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Synthetic hostnames (e.g. web-1, mgmt-12, app-34) are displayed as the bare IP
+SYNTHETIC_HOSTNAME_PATTERN = re.compile(r'^(web|app|db|mgmt|cache|mq|api|server|ipv6)-\d+$')
+
+# Role suffixes stripped from real hostnames for display (e.g. -web21, -mgmt36)
+HOSTNAME_SUFFIX_PATTERN = re.compile(r'-(web|app|db|mgmt|cache|mq|api|server)\d+')
+
+# Concurrent DNS lookups in resolve_many_with_display
+DNS_BATCH_WORKERS = 16
+
 
 class HostnameResolver:
     """
@@ -290,47 +300,62 @@ class HostnameResolver:
             REQUIREMENT 9: Missing hostnames are indicated with red color coding
         """
         hostname = self.resolve(ip_address, zone)
+        return hostname, self._display_name(ip_address, hostname, format)
+
+    def resolve_many_with_display(self, ip_addresses, zone: Optional[str] = None,
+                                  format: str = 'mermaid') -> Dict[str, Tuple[str, str]]:
+        """
+        Resolve many IPs at once and return hostname and display name for each
+
+        Uncached IPs that need DNS are looked up concurrently, so a diagram
+        with thousands of peers waits for the slowest lookup instead of the
+        sum of all of them.
+
+        Args:
+            ip_addresses: IP addresses to resolve (duplicates are resolved once)
+            zone: Security zone hint
+            format: Display format ('mermaid', 'text', 'html')
+
+        Returns:
+            Dict of IP -> (hostname, display_name), as resolve_with_display
+        """
+        unique_ips = list(dict.fromkeys(ip_addresses))
+
+        pending = [ip for ip in unique_ips
+                   if ip not in self._cache and ip not in self._provided_hostnames]
+        if len(pending) > 1 and not self.demo_mode and (self.enable_dns_lookup or self.dc_server):
+            workers = min(DNS_BATCH_WORKERS, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda ip: self.resolve(ip, zone), pending))
 
+        results = {}
+        for ip in unique_ips:
+            hostname = self.resolve(ip, zone)
+            results[ip] = (hostname, self._display_name(ip, hostname, format))
+        return results
+
+    def _display_name(self, ip_address: str, hostname: str, format: str = 'mermaid') -> str:
+        """Display name for a resolved IP (see resolve_with_display)"""
         if hostname and hostname != ip_address:
             # Check if this hostname has multiple IPs (VM + ESXi scenario)
             if self.has_multiple_ips(hostname):
                 # Use multiple IP formatting
-                display_name = self.format_multiple_ips_display(hostname, ip_address)
-                return hostname, display_name
+                return self.format_multiple_ips_display(hostname, ip_address)
 
             # Check if this is a synthetic hostname (e.g., web-1, mgmt-12, app-34)
-            # Synthetic hostnames match pattern: (web|app|db|mgmt|cache|mq|api|server)-\d+
-            import re
-            synthetic_pattern = r'^(web|app|db|mgmt|cache|mq|api|server|ipv6)-\d+$'
-            if re.match(synthetic_pattern, hostname):
+            if SYNTHETIC_HOSTNAME_PATTERN.match(hostname):
                 # Synthetic hostname - just show IP address
-                display_name = ip_address
-                return hostname, display_name
+                return ip_address
 
             # Got a real hostname - strip suffixes like -web21, -mgmt36, etc.
-            # Pattern: remove -<type><digits> suffixes where type is web, app, db, mgmt, cache, mq, api, server
-            cleaned_hostname = re.sub(r'-(web|app|db|mgmt|cache|mq|api|server)\d+', '', hostname)
-
-            # Show "IP - Hostname" format with cleaned hostname
-            if format == 'mermaid':
-                display_name = f"{ip_address} - {cleaned_hostname}"
-            elif format == 'html':
-                display_name = f"{ip_address} - {cleaned_hostname}"
-            else:  # text
-                display_name = f"{ip_address} - {cleaned_hostname}"
-
-            return hostname, display_name
-        else:
-            # REQUIREMENT 9: No hostname found - indicate with ⚠️ marker
-            # This visual indicator helps identify nodes requiring manual investigation
-            if format == 'mermaid':
-                display_name = f"⚠️ {ip_address} [NO DNS]"
-            elif format == 'html':
-                display_name = f"⚠️ {ip_address} [NO DNS]"
-            else:  # text
-                display_name = f"⚠️ {ip_address} [NO DNS]"
-
-            return ip_address, display_name
+            cleaned_hostname = HOSTNAME_SUFFIX_PATTERN.sub('', hostname)
+
+            # Show "IP - Hostname" format with cleaned hostname (same for mermaid, html and text)
+            return f"{ip_address} - {cleaned_hostname}"
+
+        # REQUIREMENT 9: No hostname found - indicate with ⚠️ marker
+        # This visual indicator helps identify nodes requiring manual investigation
+        return f"⚠️ {ip_address} [NO DNS]"
 
     def _reverse_dns_lookup(self, ip_address: str) -> Optional[str]:
         """
@@ -0,0 +1,69 @@
+"""
+Unit Tests for the Per-Application Process Pool
+===============================================
+Tests for src/orchestration/app_pool.py - ordering, failure isolation,
+shared inputs and log/stdout merging
+"""
+
+import logging
+import os
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.orchestration.app_pool import run_per_app, default_workers
+
+logger = logging.getLogger('tests.app_pool')
+
+
+def _build(app_id, shared):
+    if app_id == 'FAIL':
+        raise RuntimeError("docx assembly failed")
+    print(f"building {app_id}")
+    logger.info(f"[{app_id}] built")
+    return {'app': app_id, 'zone': shared['zones'][app_id], 'pid': os.getpid()}
+
+
+SHARED = {'zones': {'ACDA': 'WEB_TIER', 'BLZE': 'DATA_TIER', 'CRMX': 'APP_TIER', 'DNSX': 'INFRASTRUCTURE_TIER'}}
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_results_in_input_order_with_failures_isolated(workers):
+    apps = ['DNSX', 'ACDA', 'FAIL', 'BLZE', 'CRMX']
+    seen = []
+
+    results = run_per_app(_build, apps, shared=SHARED, workers=workers, on_result=lambda r: seen.append(r.item))
+
+    assert [r.item for r in results] == apps
+    assert seen == apps
+    failed = [r for r in results if not r.ok]
+    assert [r.item for r in failed] == ['FAIL']
+    assert failed[0].error == "docx assembly failed"
+    assert [r.value['zone'] for r in results if r.ok] == ['INFRASTRUCTURE_TIER', 'WEB_TIER', 'DATA_TIER', 'APP_TIER']
+
+
+def test_parallel_runs_in_worker_processes():
+    results = run_per_app(_build, ['ACDA', 'BLZE', 'CRMX'], shared=SHARED, workers=2)
+    assert all(r.value['pid'] != os.getpid() for r in results)
+
+
+def test_worker_output_and_logs_replayed_in_order(capsys, caplog):
+    with caplog.at_level(logging.INFO, logger='tests.app_pool'):
+        run_per_app(_build, ['CRMX', 'ACDA', 'BLZE'], shared=SHARED, workers=3)
+
+    assert capsys.readouterr().out.splitlines() == ['building CRMX', 'building ACDA', 'building BLZE']
+    assert [r.getMessage() for r in caplog.records if r.name == 'tests.app_pool'] == \
+        ['[CRMX] built', '[ACDA] built', '[BLZE] built']
+
+
+def test_default_workers_from_environment(monkeypatch):
+    monkeypatch.setenv('NETSEG_REPORT_WORKERS', '3')
+    assert default_workers() == 3
+    monkeypatch.delenv('NETSEG_REPORT_WORKERS')
+    assert default_workers() == (os.cpu_count() or 1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,145 @@
+"""
+Unit Tests for the Build Cache
+==============================
+Tests for src/utils/build_cache.py - input keys, freshness checks and manifest persistence
+"""
+
+import json
+import os
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.build_cache import ArtifactCache, MANIFEST_NAME
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    flows = tmp_path / 'flows.csv'
+    flows.write_text('Source IP,Dest IP\n10.0.0.1,10.0.0.2\n')
+    output = tmp_path / 'out' / 'APP_diagram.mmd'
+    output.parent.mkdir()
+    output.write_text('graph TD\n A --> B')
+    return tmp_path, flows, output
+
+
+def _cache(tmp_path, **kwargs):
+    return ArtifactCache(tmp_path / 'out' / MANIFEST_NAME, **kwargs)
+
+
+class TestKeys:
+    def test_key_tracks_file_content(self, workspace):
+        tmp_path, flows, _ = workspace
+        cache = _cache(tmp_path)
+        key = cache.key(flows, {'theme': 'neutral'})
+
+        assert cache.key(flows, {'theme': 'neutral'}) == key
+        assert cache.key(flows, {'theme': 'dark'}) != key
+
+        flows.write_text('Source IP,Dest IP\n10.0.0.1,10.0.0.3\n')
+        assert cache.key(flows, {'theme': 'neutral'}) != key
+
+    def test_inputs_are_unambiguous(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache.key('ab', 'c') != cache.key('a', 'bc')
+        assert cache.key(['a', 'b']) != cache.key('a', 'b')
+        assert cache.key('1') != cache.key(1)
+        assert cache.key(tmp_path / 'missing.csv') != cache.key(None)
+
+    def test_file_hash_memoized(self, workspace, monkeypatch):
+        tmp_path, flows, _ = workspace
+        cache = _cache(tmp_path)
+        digest = cache.file_hash(flows)
+
+        # An unchanged file (same size and mtime) is not re-read
+        monkeypatch.setattr('builtins.open', None)
+        assert cache.file_hash(flows) == digest
+
+
+class TestFreshness:
+    def test_record_then_fresh(self, workspace):
+        tmp_path, flows, output = workspace
+        cache = _cache(tmp_path)
+        key = cache.key(flows)
+
+        assert not cache.is_fresh('diagram/APP', key)
+        cache.record('diagram/APP', key, [output, output.with_suffix('.html')])
+        assert cache.is_fresh('diagram/APP', key)
+        assert cache.outputs('diagram/APP') == [str(output)]
+
+    def test_changed_input_is_stale(self, workspace):
+        tmp_path, flows, output = workspace
+        cache = _cache(tmp_path)
+        cache.record('diagram/APP', cache.key(flows), [output])
+
+        flows.write_text('Source IP,Dest IP\n')
+        assert not cache.is_fresh('diagram/APP', cache.key(flows))
+
+    def test_modified_or_deleted_output_is_stale(self, workspace):
+        tmp_path, flows, output = workspace
+        cache = _cache(tmp_path)
+        key = cache.key(flows)
+        cache.record('diagram/APP', key, [output])
+
+        output.write_text('graph TD\n A --> C --> B')
+        assert not cache.is_fresh('diagram/APP', key)
+
+        cache.record('diagram/APP', key, [output])
+        output.unlink()
+        assert not cache.is_fresh('diagram/APP', key)
+
+    def test_force_and_environment_disable(self, workspace, monkeypatch):
+        tmp_path, flows, output = workspace
+        cache = _cache(tmp_path)
+        key = cache.key(flows)
+        cache.record('diagram/APP', key, [output])
+        cache.save()
+
+        assert not _cache(tmp_path, force=True).is_fresh('diagram/APP', key)
+        monkeypatch.setenv('NETSEG_BUILD_CACHE', '0')
+        assert not _cache(tmp_path).is_fresh('diagram/APP', key)
+
+
+class TestManifest:
+    def test_persisted_across_runs(self, workspace):
+        tmp_path, flows, output = workspace
+        with _cache(tmp_path) as cache:
+            key = cache.key(flows)
+            cache.record('diagram/APP', key, [output])
+
+        manifest = json.loads((tmp_path / 'out' / MANIFEST_NAME).read_text())
+        assert manifest['artifacts']['diagram/APP']['key'] == key
+        assert str(flows.resolve()) in manifest['files']
+
+        reloaded = _cache(tmp_path)
+        assert reloaded.is_fresh('diagram/APP', reloaded.key(flows))
+        assert reloaded.stats == {'fresh': 1, 'stale': 0}
+
+    def test_unreadable_or_old_manifest_starts_empty(self, workspace):
+        tmp_path, flows, output = workspace
+        manifest_path = tmp_path / 'out' / MANIFEST_NAME
+
+        manifest_path.write_text('{not json')
+        assert _cache(tmp_path).outputs('diagram/APP') == []
+
+        manifest_path.write_text(json.dumps({'version': 0, 'artifacts': {'diagram/APP': {}}}))
+        assert _cache(tmp_path).outputs('diagram/APP') == []
+
+    def test_save_is_atomic_and_skips_unchanged(self, workspace):
+        tmp_path, flows, output = workspace
+        cache = _cache(tmp_path)
+        cache.record('diagram/APP', cache.key(flows), [output])
+        cache.save()
+
+        manifest_path = tmp_path / 'out' / MANIFEST_NAME
+        mtime = manifest_path.stat().st_mtime_ns
+        os.utime(manifest_path, ns=(mtime - 10**9, mtime - 10**9))
+        cache.save()
+        assert manifest_path.stat().st_mtime_ns == mtime - 10**9
+        assert not list(manifest_path.parent.glob('*.tmp'))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
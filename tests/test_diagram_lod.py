@@ -0,0 +1,158 @@
+"""
+Unit Tests for Level-of-Detail Diagrams
+=======================================
+Tests for src/diagram_lod.py - aggregation levels, edge collapsing, the
+drill-down manifest and lazy group expansion
+"""
+
+import json
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.diagram_lod import (
+    NETWORK_LEVELS, DiagramBudget, LodEdge, LodNode, LodPartition,
+    aggregate, expand_group, hostname_pattern, network_keys, render_view, write_manifest
+)
+
+
+def _ip_node(ip, partition='APP', hostname=None):
+    return LodNode(ip.replace('.', '_'), ip, partition, network_keys(ip, hostname), flows=1)
+
+
+def _edge(src, dst, flows=1, labels=('TCP:443',)):
+    return LodEdge(src.replace('.', '_'), dst.replace('.', '_'), flows, set(labels))
+
+
+@pytest.fixture
+def servers():
+    """Two /24s of app servers (one host pattern in the first) calling one database"""
+    nodes = [_ip_node(f'10.1.{subnet}.{host}', hostname=f'api{host:02d}.corp' if subnet == 0 else None)
+             for subnet in range(2) for host in range(1, 31)]
+    nodes.append(_ip_node('10.9.0.1', 'DATABASE'))
+    edges = [_edge(node.label, '10.9.0.1', 2, ('TCP:5432',)) for node in nodes[:-1]]
+    return nodes, edges
+
+
+class TestKeys:
+    def test_hostname_pattern(self):
+        assert hostname_pattern('web-prod-01.corp.local') == 'web-prod-#'
+        assert hostname_pattern('10.1.1.1') is None
+        assert hostname_pattern('Unknown') is None
+        assert hostname_pattern('0042') is None
+
+    def test_network_keys(self):
+        assert network_keys('10.1.2.3', 'db07') == {'hostname': 'db#', 'subnet24': '10.1.2.0/24',
+                                                    'subnet16': '10.1.0.0/16'}
+        assert network_keys('2001:db8::1')['subnet24'] == '2001:db8::/64'
+        assert network_keys('not-an-ip') == {}
+
+    def test_budget(self, monkeypatch):
+        monkeypatch.setenv('NETSEG_DIAGRAM_MAX_NODES', '25')
+        assert DiagramBudget.from_env() == DiagramBudget(25, 150)
+        with pytest.raises(ValueError):
+            DiagramBudget(0, 10)
+
+
+class TestAggregate:
+    def test_within_budget_is_unchanged(self, servers):
+        nodes, edges = servers
+        view = aggregate(nodes, edges, NETWORK_LEVELS, DiagramBudget(100, 100))
+
+        assert view.level == 'node'
+        assert not view.aggregated
+        assert len(view.drawn()) == 61
+
+    def test_finest_level_that_fits(self, servers):
+        nodes, edges = servers
+        view = aggregate(nodes, edges, NETWORK_LEVELS, DiagramBudget(10, 10), unit='servers')
+
+        # Hostname pattern for the named /24, subnet for the unnamed one
+        assert view.level == 'hostname'
+        assert sorted((group.level, group.key, len(group.members)) for group in view.groups.values()) == [
+            ('hostname', 'api#', 30), ('subnet24', '10.1.1.0/24', 30)]
+        assert [(edge.flows, edge.labels) for edge in view.edges] == [(60, {'TCP:5432'})] * 2
+        assert '10_9_0_1' in view.drawn()  # Single-member groups stay plain nodes
+
+    def test_groups_stay_in_partition(self):
+        nodes = [_ip_node('10.1.0.1', 'WEB'), _ip_node('10.1.0.2', 'WEB'), _ip_node('10.1.0.3', 'APP'),
+                 _ip_node('10.1.0.4', 'APP')]
+        view = aggregate(nodes, [], NETWORK_LEVELS, DiagramBudget(2, 10))
+
+        assert sorted(group.partition for group in view.groups.values()) == ['APP', 'WEB']
+
+    def test_pinned_nodes_and_edge_budget(self):
+        nodes = [LodNode('CENTER', 'ACDA', '', pinned=True)]
+        nodes += [LodNode(f'APP_{i}', f'app {i}', 'downstream', {'volume': 'light'}) for i in range(5)]
+        edges = [LodEdge('CENTER', f'APP_{i}', i + 1) for i in range(5)]
+
+        view = aggregate(nodes, edges, ('volume',), DiagramBudget(3, 10))
+        assert view.drawn() == ['CENTER', 'G1']
+        assert view.edges[0].flows == 15
+
+        for node in nodes:
+            node.pinned = True
+        view = aggregate(nodes, edges, ('volume',), DiagramBudget(10, 2))
+        assert view.dropped_edges == 3
+        assert [edge.flows for edge in view.edges] == [5, 4]  # Heaviest kept
+
+    def test_render(self, servers):
+        nodes, edges = servers
+        view = aggregate(nodes, edges, NETWORK_LEVELS, DiagramBudget(10, 10), unit='servers')
+        partitions = {'APP': LodPartition('app_tier', 'App Tier', 'appTier')}
+
+        mermaid = render_view(view, partitions, class_defs=['classDef appTier fill:#cce5ff'])
+
+        assert mermaid.startswith('graph TB\n')
+        assert 'subgraph app_tier["App Tier"]' in mermaid
+        assert 'G1[["<b>api#</b><br/>30 servers | 30 flows"]]:::appTier' in mermaid
+        assert 'G1 -->|60 flows<br/>TCP:5432| 10_9_0_1' in mermaid
+
+
+class TestDrillDown:
+    def test_expand_group_lazily(self, servers, tmp_path):
+        nodes, edges = servers
+        view = aggregate(nodes, edges, NETWORK_LEVELS, DiagramBudget(10, 10), unit='servers')
+        manifest_path = write_manifest(view, tmp_path / 'ACDA_diagram.lod.json', 'ACDA_diagram.mmd')
+        manifest = json.loads(manifest_path.read_text())
+        assert manifest['groups']['G2']['members'][:2] == ['10_1_1_1', '10_1_1_2']
+        assert len(manifest['edges']) == 60
+
+        sub_diagram = expand_group(manifest_path, 'G2', DiagramBudget(100, 100))
+        assert sub_diagram == tmp_path / 'ACDA_diagram.lod' / 'G2.mmd'
+        text = sub_diagram.read_text()
+        assert text.count('-->|2 flows<br/>TCP:5432| 10_9_0_1') == 30
+
+        sub_diagram.write_text('cached')
+        assert expand_group(manifest_path, 'G2').read_text() == 'cached'
+
+        # A new manifest drops stale sub-diagrams
+        write_manifest(view, manifest_path, 'ACDA_diagram.mmd')
+        assert not sub_diagram.exists()
+
+        with pytest.raises(KeyError):
+            expand_group(manifest_path, 'G9')
+
+    def test_oversized_group_splits_into_subgroups(self, servers, tmp_path):
+        nodes, edges = servers
+        view = aggregate(nodes, edges, NETWORK_LEVELS, DiagramBudget(10, 10), unit='servers')
+        manifest_path = write_manifest(view, tmp_path / 'ACDA_diagram.lod.json', 'ACDA_diagram.mmd')
+
+        # 'api#' is already the finest level: split into ranges within the budget
+        text = expand_group(manifest_path, 'G1', DiagramBudget(5, 10)).read_text()
+        assert '<b>10.1.0.1 to 10.1.0.' in text
+
+        manifest = json.loads(manifest_path.read_text())
+        sub_groups = {group_id: group for group_id, group in manifest['groups'].items() if group['parent'] == 'G1'}
+        assert 2 <= len(sub_groups) <= 4
+        assert sum(len(group['members']) for group in sub_groups.values()) == 30
+
+        text = expand_group(manifest_path, 'G1_1', DiagramBudget(100, 100)).read_text()
+        assert '10_9_0_1["10.9.0.1"]' in text
+        assert 'G1_2' not in text  # Other sub-groups only appear when connected
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
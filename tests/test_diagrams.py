@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.parser import FlowRecord
 from src.diagrams import MermaidDiagramGenerator
 from src.analysis import NetworkZone
+from src.utils.hostname_resolver import HostnameResolver
 
 
 class TestMermaidDiagramGenerator:
@@ -134,6 +135,72 @@ class TestMermaidDiagramGenerator:
         assert '<!DOCTYPE html>' in content
         assert 'mermaid' in content.lower()
 
+    def test_app_diagram_classifies_nodes_from_flow_aggregates(self, sample_zones, tmp_path):
+        """Dependency types come from all ports/protocols a node receives"""
+        records = [
+            FlowRecord(src_ip='10.1.1.10', dst_ip='10.1.3.30', protocol='TCP', port=5432),
+            FlowRecord(src_ip='10.1.1.11', dst_ip='10.1.3.30', protocol='TCP', port=8080),
+            FlowRecord(src_ip='10.1.1.10', dst_ip='10.1.4.40', protocol='TDS'),
+            FlowRecord(src_ip='10.1.1.11', dst_ip='10.1.5.50', protocol='TCP', port=6379),
+            FlowRecord(src_ip='10.1.1.10', dst_ip='10.1.6.60', protocol='TCP', port=443),
+        ]
+        resolver = HostnameResolver(enable_dns_lookup=False, use_dns_cache=False)
+        resolver.add_known_hostname('10.1.3.30', 'orders-db01.corp')
+        generator = MermaidDiagramGenerator(records, sample_zones, hostname_resolver=resolver)
+
+        content = generator.generate_app_diagram('test_app', str(tmp_path / 'app.mmd'))
+
+        assert '10_1_3_30[("10.1.3.30 - orders.corp")]:::database' in content
+        assert '10_1_4_40[("⚠️ 10.1.4.40 [NO DNS]")]:::missingData' in content
+        assert 'subgraph cache_infra["Caches"]' in content
+        assert '10_1_6_60((' in content
+        assert '10_1_1_10["⚠️ 10.1.1.10 [NO DNS] [test_app]"]' in content
+
+    def test_app_diagram_aggregates_above_budget(self, sample_zones, tmp_path, monkeypatch):
+        """Over the node budget, servers are grouped and a drill-down manifest is written"""
+        records = [
+            FlowRecord(src_ip=f'10.1.{subnet}.{host}', dst_ip='10.9.0.1', protocol='TCP', port=5432)
+            for subnet in range(3) for host in range(1, 21)
+        ]
+        resolver = HostnameResolver(enable_dns_lookup=False, use_dns_cache=False)
+        generator = MermaidDiagramGenerator(records, sample_zones, hostname_resolver=resolver)
+        output = tmp_path / 'app.mmd'
+
+        monkeypatch.setenv('NETSEG_DIAGRAM_MAX_NODES', '10')
+        content = generator.generate_app_diagram('test_app', str(output))
+
+        assert '<b>10.1.0.0/24</b><br/>20 servers | 20 flows' in content
+        assert 'G1 -->|20 flows<br/>TCP:5432| 10_9_0_1' in content
+        assert content.count(' -->|') == 3
+        assert (tmp_path / 'app.lod.json').exists()
+
+        monkeypatch.delenv('NETSEG_DIAGRAM_MAX_NODES')
+        generator.generate_app_diagram('test_app', str(output))
+        assert not (tmp_path / 'app.lod.json').exists()
+
+
+class TestHostnameResolverBatch:
+    """Test HostnameResolver.resolve_many_with_display"""
+
+    def test_matches_single_resolution(self):
+        resolver = HostnameResolver(demo_mode=True, use_dns_cache=False)
+        resolver.add_known_hostname('172.16.0.5', 'billing-app07.corp')
+        ips = ['10.164.105.7', '172.16.0.5', '10.164.105.7', '2001:db8::1']
+
+        results = resolver.resolve_many_with_display(ips, 'EXTERNAL')
+
+        assert list(results) == ['10.164.105.7', '172.16.0.5', '2001:db8::1']
+        assert results['10.164.105.7'][0].startswith('web-')
+        assert results['10.164.105.7'][1] == '10.164.105.7'  # Synthetic names show the IP only
+        assert results['172.16.0.5'] == ('billing-app07.corp', '172.16.0.5 - billing.corp')
+        for ip in results:
+            assert results[ip] == resolver.resolve_with_display(ip, 'EXTERNAL')
+
+    def test_unresolved_ips_are_marked(self):
+        resolver = HostnameResolver(enable_dns_lookup=False, use_dns_cache=False)
+        results = resolver.resolve_many_with_display(['10.9.9.9'])
+        assert results['10.9.9.9'] == ('10.9.9.9', '⚠️ 10.9.9.9 [NO DNS]')
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,72 @@
+"""
+Unit Tests for the Ensemble Model
+==================================
+Tests for src/core/ensemble_model.py - EnsembleNetworkModel
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.ensemble_model import EnsembleNetworkModel
+
+
+class TestEnsembleNetworkModel:
+    """Test batched zone inference"""
+
+    @pytest.fixture
+    def model(self):
+        """Ensemble with classical models trained on separable zones"""
+        rng = np.random.default_rng(0)
+        y = np.repeat([0, 2, 4], 30)
+        X = rng.normal(size=(len(y), 4)) * 0.1 + y[:, np.newaxis]
+
+        ensemble = EnsembleNetworkModel(persistence_manager=None)
+        ensemble.train_classical_models(X, y)
+        return ensemble
+
+    def test_predict_zones_batch(self, model):
+        """Test one batched call labels every app"""
+        X = np.array([[0.0] * 4, [2.0] * 4, [4.0] * 4])
+
+        results = model.predict_zones(X, ['a', 'b', 'c'])
+
+        assert [r['predicted_zone'] for r in results] == ['WEB_TIER', 'DATA_TIER', 'CACHE_TIER']
+        assert all(r['method'] == 'ensemble' and r['num_models'] == 2 for r in results)
+        assert all(0.0 < r['confidence'] <= 1.0 for r in results)
+
+    def test_predict_zone_matches_batch(self, model):
+        """Test the single-app API returns the batched result"""
+        X = np.random.default_rng(1).normal(size=(5, 4)) * 2
+        names = [f'app{i}' for i in range(5)]
+
+        batch = model.predict_zones(X, names)
+
+        assert [model.predict_zone(X[i], names[i]) for i in range(5)] == batch
+
+    def test_weighted_votes(self, model):
+        """Test disagreeing models are resolved by model score"""
+        model.model_scores = {'random_forest': 0.9, 'svm': 0.4}
+        labels = np.array([[0, 2], [2, 2]])
+        confidences = np.array([[0.8, 0.6], [0.5, 0.7]])
+
+        results = model._ensemble_predictions(['random_forest', 'svm'], labels, confidences)
+
+        assert results[0]['predicted_zone'] == 'WEB_TIER'
+        assert results[0]['model_votes'] == {'WEB_TIER': 0.9, 'DATA_TIER': 0.4}
+        assert results[0]['confidence'] == pytest.approx(0.8 * 0.9)
+        assert results[1]['predicted_zone'] == 'DATA_TIER'
+        assert results[1]['confidence'] == pytest.approx((0.6 * 0.9 + 0.7 * 0.4) / 2)
+
+    def test_heuristic_fallback(self):
+        """Test untrained ensembles fall back to name heuristics"""
+        ensemble = EnsembleNetworkModel(persistence_manager=None)
+
+        results = ensemble.predict_zones(np.zeros((2, 4)), ['redis-cache', 'orders-db'])
+
+        assert [r['predicted_zone'] for r in results] == ['CACHE_TIER', 'DATA_TIER']
+        assert all(r['method'] == 'heuristic' for r in results)
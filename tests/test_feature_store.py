@@ -0,0 +1,154 @@
+"""
+Unit Tests for the Feature Store
+=================================
+Tests for src/feature_store.py - FeatureStore
+"""
+
+import gc
+import pytest
+from pathlib import Path
+from datetime import datetime, timedelta
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parser import FlowRecord
+from src.feature_store import (
+    FeatureStore, TimeBucketSeries, port_categories, PORT_CATEGORIES, NODE_FEATURE_DIM, APP_FEATURE_DIM,
+    SEQUENCE_FEATURE_DIM, BUCKET_FEATURE_DIM
+)
+
+
+def make_records():
+    """Two apps; web_app has timestamped flows, db_app has none"""
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    records = []
+    for i, (src, dst, port, size) in enumerate([
+        ('10.0.0.1', '10.0.0.2', 443, 100),
+        ('10.0.0.1', '10.0.0.3', 443, 300),
+        ('10.0.0.4', '10.0.0.2', 8080, 200),
+        ('10.0.0.1', '10.0.0.2', 443, 400),
+    ]):
+        records.append(FlowRecord(app_name='web_app', src_ip=src, dst_ip=dst, port=port,
+                                  transport='tcp', bytes=size, packets=size // 100,
+                                  timestamp=start + timedelta(minutes=10 * (3 - i))))
+    records.append(FlowRecord(app_name='db_app', src_ip='10.0.0.2', dst_ip='10.0.0.9', port=3306,
+                              transport='tcp', bytes=5000, packets=50))
+    return records
+
+
+class TestFeatureStore:
+    """Test vectorized features and per-app caching"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return FeatureStore(make_records(), cache_dir=str(tmp_path / 'features'))
+
+    def test_shapes_and_dtype(self, store):
+        """Test matrix shapes, float32 dtype and no random padding"""
+        nodes = store.node_features()
+        apps = store.app_features(['web_app', 'db_app', 'missing_app'])
+
+        assert nodes.shape == (5, NODE_FEATURE_DIM) and nodes.dtype == np.float32
+        assert apps.shape == (3, APP_FEATURE_DIM) and apps.dtype == np.float32
+        assert not apps[2].any()
+        assert np.array_equal(store.app_features(['web_app']), store.app_features(['web_app']))
+
+    def test_node_degrees(self, store):
+        """Test degree columns match a DiGraph over unique edges"""
+        rows = store.node_features(['10.0.0.1', '10.0.0.2', 'unknown'])
+
+        assert list(rows[0, :4]) == [2, 0, 2, 1]  # 10.0.0.1 -> .2, .3
+        assert list(rows[1, :4]) == [3, 2, 1, 1]  # .1/.4 -> .2 -> .9
+        assert not rows[2].any()
+
+    def test_app_aggregates(self, store):
+        """Test app totals, percentiles and port mix"""
+        web = store.app_features(['web_app'])[0]
+
+        assert web[0] == pytest.approx(4 / 10000)
+        assert web[2] == pytest.approx(2 / 100)  # Sources
+        assert web[3] == pytest.approx(2 / 100)  # Destinations
+        assert web[5] == pytest.approx(np.log1p(np.percentile([100, 300, 200, 400], 50)))
+        assert web[18 + PORT_CATEGORIES.index('web')] == pytest.approx(1.0)
+
+    def test_sequences_sorted_by_time(self, store):
+        """Test sequences keep the last flows in time order, left-aligned"""
+        sequences = store.app_sequences(seq_len=3)
+
+        assert store.timestamped_apps() == ['web_app']
+        assert sequences.shape == (1, 3, SEQUENCE_FEATURE_DIM)
+        # Flows were recorded newest first; the oldest (400 bytes) is dropped
+        assert list(np.round(sequences[0, :, 0] * 1e6)) == [200, 300, 100]
+        assert not store.app_sequences(['db_app'], seq_len=3).any()
+
+    def test_per_app_cache(self, store, tmp_path):
+        """Test unchanged apps keep their hash when other apps change"""
+        store.app_features()
+
+        records = make_records()
+        records[-1].bytes = 9999
+        updated = FeatureStore(records, cache_dir=str(tmp_path / 'features'))
+
+        assert updated.app_hashes['web_app'] == store.app_hashes['web_app']
+        assert updated.app_hashes['db_app'] != store.app_hashes['db_app']
+        assert updated._load_cached_apps(['web_app', 'db_app'], updated.seq_len) == ['db_app']
+        assert updated.app_features(['db_app'])[0, 1] == pytest.approx(9999 / 1e9)
+
+    def test_port_categories(self):
+        """Test named services, IANA ranges and missing ports"""
+        codes = port_categories(np.array([443, 3306, 111, 8000, 60000, -1]))
+
+        assert [PORT_CATEGORIES[c] for c in codes] == [
+            'web', 'mysql', 'well_known', 'registered', 'ephemeral', 'none'
+        ]
+
+
+class TestTimeBuckets:
+    """Test the memory-mapped time-bucket builder"""
+
+    def test_bucket_values(self, tmp_path):
+        """Test flows land in aligned buckets with summed volumes"""
+        store = FeatureStore(make_records(), cache_dir=str(tmp_path / 'features'))
+        series = store.time_buckets('15min', max_chunk_bytes=1)
+
+        assert series.apps == ['web_app'] and series.shape == (1, 3, BUCKET_FEATURE_DIM)
+        assert series.bucket_times()[0] == datetime(2024, 1, 1, 9, 0, 0)
+        values = series.values[0]
+        assert np.allclose(np.expm1(values[:, 0]), [2, 1, 1])
+        assert np.allclose(np.expm1(values[:, 1]), [600, 300, 100], rtol=1e-5)
+        assert values[0, 13 + PORT_CATEGORIES.index('web')] == pytest.approx(1.0)
+
+    def test_reopen_and_reuse(self, tmp_path):
+        """Test the sidecar reopens the array and unchanged flows reuse the file"""
+        store = FeatureStore(make_records(), cache_dir=str(tmp_path / 'features'))
+        series = store.time_buckets(900)
+        mtime = series.path.stat().st_mtime_ns
+
+        reopened = TimeBucketSeries.open(series.path)
+        again = FeatureStore(make_records(), cache_dir=str(tmp_path / 'features')).time_buckets('15min')
+
+        assert np.array_equal(reopened.values, series.values)
+        assert again.path == series.path and again.path.stat().st_mtime_ns == mtime
+        with pytest.raises(ValueError):
+            store.time_buckets(0)
+
+    def test_temp_dir_without_cache(self):
+        """Test a store without cache_dir reuses one temp dir and removes it when released"""
+        store = FeatureStore(make_records(), cache_dir=None)
+        series = store.time_buckets('15min')
+        hourly = store.time_buckets('1h')
+        directory = series.path.parent
+
+        assert hourly.path.parent == directory
+        assert store.time_buckets('15min').path == series.path
+
+        del store, hourly
+        gc.collect()
+        assert np.expm1(series.values[0, :, 0]).sum() == pytest.approx(4)  # Series keeps it alive
+
+        del series
+        gc.collect()
+        assert not directory.exists()
@@ -0,0 +1,211 @@
+"""
+Unit Tests for Graph Analysis
+==============================
+Tests for src/graph_analyzer.py - GraphAnalyzer
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parser import FlowRecord
+from src.graph_analyzer import GraphAnalyzer, DEFAULT_TIER_SUBNETS
+from src.graph_snapshot import hash_flow_records, hash_input_files
+
+
+class TestGraphAnalyzer:
+    """Test GraphAnalyzer class"""
+
+    @pytest.fixture
+    def sample_records(self):
+        """Create sample flow records across WEB -> APP -> DATABASE"""
+        return [
+            FlowRecord(
+                app_name='test_app',
+                src_ip='10.164.105.10',
+                dst_ip='10.100.246.20',
+                port=8080,
+                transport='tcp',
+                bytes=1000
+            ),
+            FlowRecord(
+                app_name='test_app',
+                src_ip='10.100.246.20',
+                dst_ip='10.164.116.30',
+                port=3306,
+                transport='tcp',
+                bytes=5000
+            ),
+            FlowRecord(
+                app_name='test_app',
+                src_ip='10.164.105.10',
+                dst_ip='10.164.116.30',
+                port=3306,
+                transport='tcp',
+                bytes=200
+            ),
+            FlowRecord(
+                app_name='test_app',
+                src_ip='10.164.105.10',
+                dst_ip='10.164.116.30',
+                port=3306,
+                transport='tcp',
+                bytes=300
+            )
+        ]
+
+    @pytest.fixture
+    def analyzer(self, sample_records):
+        """Create analyzer with the default tier mapping"""
+        return GraphAnalyzer(sample_records, tier_subnets=DEFAULT_TIER_SUBNETS)
+
+    def test_graph_build(self, analyzer):
+        """Test edges are aggregated per (src, dst)"""
+        assert analyzer.graph.number_of_nodes() == 3
+        assert analyzer.graph.number_of_edges() == 3
+        assert analyzer.graph['10.164.105.10']['10.164.116.30']['flows'] == 2
+        assert analyzer.graph['10.164.105.10']['10.164.116.30']['bytes'] == 500
+
+    def test_tier_index(self, analyzer):
+        """Test every node is classified once into the tier index"""
+        assert analyzer.node_tiers['10.164.105.10'] == 'WEB'
+        assert analyzer.node_tiers['10.100.246.20'] == 'APP'
+        assert analyzer.node_tiers['10.164.116.30'] == 'DATABASE'
+        assert len(analyzer.tier_codes) == analyzer.graph.number_of_nodes()
+
+        pos = analyzer.node_index['10.164.116.30']
+        assert analyzer.tier_names[analyzer.tier_codes[pos]] == 'DATABASE'
+
+    def test_classify_unseen_ip(self, analyzer):
+        """Test IPs outside the graph still fall back to prefix matching"""
+        assert analyzer._classify_node_tier('10.164.144.5') == 'CACHE'
+        assert analyzer._classify_node_tier('192.168.1.1') == 'UNKNOWN'
+
+    def test_custom_tier_subnets(self, sample_records):
+        """Test a custom subnet mapping, including a new tier name"""
+        analyzer = GraphAnalyzer(sample_records, tier_subnets=[('10.164.', 'CORE')])
+
+        assert analyzer.node_tiers['10.164.105.10'] == 'CORE'
+        assert analyzer.node_tiers['10.100.246.20'] == 'UNKNOWN'
+        assert 'CORE' in analyzer.tier_names
+
+    def test_detect_policy_violations(self, analyzer):
+        """Test DENY policies are matched against edge tier codes"""
+        policies = [
+            {'name': 'No WEB to DB', 'source_tier': 'WEB',
+             'destination_tier': 'DATABASE', 'action': 'DENY'},
+            {'name': 'Allow APP to DB', 'source_tier': 'APP',
+             'destination_tier': 'DATABASE', 'action': 'ALLOW'},
+            {'name': 'Unknown tier', 'source_tier': 'NOPE',
+             'destination_tier': 'DATABASE', 'action': 'DENY'}
+        ]
+
+        violations = analyzer.detect_policy_violations(policies)
+
+        assert len(violations) == 1
+        assert violations[0]['policy_name'] == 'No WEB to DB'
+        assert violations[0]['source_ip'] == '10.164.105.10'
+        assert violations[0]['destination_tier'] == 'DATABASE'
+        assert violations[0]['flows'] == 2
+
+    def test_apply_delta(self, analyzer):
+        """Test incremental merge updates aggregates and change tracking"""
+        delta = analyzer.apply_delta([
+            FlowRecord(
+                app_name='test_app',
+                src_ip='10.164.105.10',
+                dst_ip='10.164.116.30',
+                port=5432,
+                transport='tcp',
+                bytes=100
+            ),
+            FlowRecord(
+                app_name='new_app',
+                src_ip='10.164.144.40',
+                dst_ip='10.100.246.20',
+                port=6379,
+                transport='tcp',
+                bytes=50
+            )
+        ])
+
+        edge = analyzer.graph['10.164.105.10']['10.164.116.30']
+        assert edge['flows'] == 3
+        assert edge['bytes'] == 600
+        assert edge['ports'] == [3306, 5432]
+
+        assert delta['new_nodes'] == {'10.164.144.40'}
+        assert delta['new_edges'] == {('10.164.144.40', '10.100.246.20')}
+        assert analyzer.graph.in_degree('10.100.246.20') == 2
+
+        # Tier index extended for the new node
+        assert analyzer.node_tiers['10.164.144.40'] == 'CACHE'
+        assert len(analyzer.tier_codes) == analyzer.graph.number_of_nodes()
+
+        assert '10.100.246.20' in analyzer.affected_neighborhood(hops=1)
+        assert len(analyzer.touched_components()) == 1
+
+        analyzer.clear_changes()
+        assert not analyzer.changed_nodes
+
+    def test_apply_delta_does_not_retain_records(self, analyzer, sample_records):
+        """Test merged records are counted and hashed, not kept"""
+        new_records = [
+            FlowRecord(app_name='new_app', src_ip='10.164.144.40', dst_ip='10.100.246.20',
+                       port=6379, transport='tcp', bytes=50)
+        ]
+        analyzer.apply_delta(new_records)
+
+        assert not hasattr(analyzer, 'records')
+        assert analyzer.record_count == len(sample_records) + 1
+        assert analyzer._records_hash.hexdigest() == hash_flow_records(sample_records + new_records)
+
+    def test_snapshot_roundtrip(self, analyzer, tmp_path):
+        """Test snapshot reload reproduces graph, metadata and tier index"""
+        snapshot_path = tmp_path / 'network_graph.gsnap'
+        analyzer.save_snapshot(str(snapshot_path), content_hash='abc123')
+
+        loaded = GraphAnalyzer.from_snapshot(str(snapshot_path), content_hash='abc123',
+                                             tier_subnets=DEFAULT_TIER_SUBNETS)
+
+        assert loaded is not None
+        assert set(loaded.graph.edges()) == set(analyzer.graph.edges())
+        for src, dst, data in analyzer.graph.edges(data=True):
+            assert loaded.graph[src][dst] == data
+        assert loaded.node_metadata == analyzer.node_metadata
+        assert loaded.node_tiers == analyzer.node_tiers
+
+    def test_snapshot_stale_hash(self, analyzer, tmp_path):
+        """Test a changed input hash marks the snapshot stale"""
+        snapshot_path = tmp_path / 'network_graph.gsnap'
+        analyzer.save_snapshot(str(snapshot_path))
+
+        assert GraphAnalyzer.from_snapshot(str(snapshot_path), content_hash='other') is None
+        assert GraphAnalyzer.from_snapshot(str(tmp_path / 'missing.gsnap')) is None
+
+    def test_snapshot_stale_tier_mapping(self, analyzer, tmp_path):
+        """Test a changed subnet -> tier mapping marks the snapshot stale"""
+        snapshot_path = tmp_path / 'network_graph.gsnap'
+        analyzer.save_snapshot(str(snapshot_path), content_hash='abc123')
+        edited = [('10.164.116.', 'CACHE')] + list(DEFAULT_TIER_SUBNETS)
+
+        assert GraphAnalyzer.from_snapshot(str(snapshot_path), 'abc123', tier_subnets=edited) is None
+        assert GraphAnalyzer.from_snapshot(str(snapshot_path), 'abc123',
+                                           tier_subnets=DEFAULT_TIER_SUBNETS) is not None
+
+    def test_input_hash_keys_by_relative_path(self, tmp_path):
+        """Test per-app files with the same name are told apart"""
+        for app, content in (('APP1', 'a'), ('APP2', 'b')):
+            (tmp_path / app).mkdir()
+            (tmp_path / app / 'flows.csv').write_text(content)
+        files = list(tmp_path.glob('*/flows.csv'))
+        before = hash_input_files(files, root=tmp_path)
+
+        # Same file contents, swapped between apps
+        (tmp_path / 'APP1' / 'flows.csv').write_text('b')
+        (tmp_path / 'APP2' / 'flows.csv').write_text('a')
+
+        assert hash_input_files(files, root=tmp_path) != before
+        assert hash_input_files(files) == hash_input_files(files, root=tmp_path)
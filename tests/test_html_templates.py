@@ -0,0 +1,108 @@
+"""
+Unit Tests for HTML Page Templates
+==================================
+Tests for src/html_templates.py - compiled templates, versioned static
+bundles and embedded JSON payloads
+"""
+
+import json
+import re
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.html_templates import (
+    CompiledTemplate, SHELLS, copy_page, embed_json, get_bundle, static_references, write_page
+)
+
+
+def _payload(html: str) -> dict:
+    match = re.search(r'<script type="application/json" id="netseg-data">(.*?)</script>', html, re.S)
+    return json.loads(match.group(1))
+
+
+class TestCompiledTemplate:
+    def test_render(self):
+        template = CompiledTemplate('<title>${title}</title><p>${body}</p>${title}')
+        assert template.slots == ('title', 'body', 'title')
+        assert template.render(title='ACDA', body='x') == '<title>ACDA</title><p>x</p>ACDA'
+
+    def test_missing_value(self):
+        with pytest.raises(KeyError):
+            CompiledTemplate('${title}').render()
+
+
+class TestPages:
+    def test_pages_share_versioned_bundle(self, tmp_path):
+        first = write_page('network_diagram', tmp_path / 'ACDA.html', 'Application: ACDA',
+                           fields={'title': 'Application: ACDA'}, diagrams={'main': 'graph TB\n  A --> B'})
+        second = write_page('network_diagram', tmp_path / 'BLZE.html', 'Application: BLZE',
+                            fields={'title': 'Application: BLZE'}, diagrams={'main': 'graph TB\n  C --> D'})
+
+        bundle = get_bundle('network_diagram')
+        static_files = sorted(path.name for path in (tmp_path / 'static').iterdir())
+        assert static_files == sorted([Path(bundle.stylesheet).name, Path(bundle.bundle).name])
+        assert re.fullmatch(r'network_diagram\.[0-9a-f]{12}\.js', Path(bundle.bundle).name)
+
+        html = first.read_text(encoding='utf-8')
+        assert f'href="{bundle.stylesheet}"' in html
+        assert f'src="{bundle.bundle}"' in html
+        assert '<style>' not in html
+        assert _payload(second.read_text(encoding='utf-8'))['diagrams']['main'] == 'graph TB\n  C --> D'
+
+    def test_bundle_contains_shell(self):
+        for shell in SHELLS:
+            bundle = get_bundle(shell)
+            assert 'netsegMount(' in bundle.js
+            assert bundle.css
+
+        with pytest.raises(ValueError):
+            get_bundle('missing_shell')
+
+    def test_payload_is_script_safe(self, tmp_path):
+        page = write_page('application_report', tmp_path / 'ACDA.html', 'ACDA </script>',
+                          fields={'app_id': 'ACDA'},
+                          diagrams={'upstream': 'A["x<br/>y"] --> B["</script>"]'},
+                          data={'nodeDetails': {'SOURCE': {'items': [{'hostname': float('nan')}]}}})
+        html = page.read_text(encoding='utf-8')
+
+        assert html.count('</script>') == 3  # CDN script, payload, bundle
+        assert '<title>ACDA &lt;/script&gt;</title>' in html
+        payload = _payload(html)
+        assert payload['diagrams']['upstream'] == 'A["x<br/>y"] --> B["</script>"]'
+        assert payload['data']['nodeDetails']['SOURCE']['items'][0]['hostname'] is None
+
+    def test_copied_page_brings_its_bundle(self, tmp_path):
+        page = write_page('application_diagram', tmp_path / 'out' / 'ACDA_application_diagram.html',
+                          'ACDA', diagrams={'main': 'graph TB\n  A --> B'})
+        bundle = get_bundle('application_diagram')
+        assert static_references(page.read_text(encoding='utf-8')) == [bundle.stylesheet, bundle.bundle]
+
+        copied = copy_page(page, tmp_path / 'results' / 'ACDA' / 'diagrams')
+
+        assert copied.read_text(encoding='utf-8') == page.read_text(encoding='utf-8')
+        assert (copied.parent / bundle.bundle).read_text(encoding='utf-8') == bundle.js
+        assert (copied.parent / bundle.stylesheet).read_text(encoding='utf-8') == bundle.css
+
+    def test_copy_page_missing_bundle(self, tmp_path):
+        # Current shell bundles are re-published; unknown ones cannot be recovered
+        bundle = get_bundle('network_diagram')
+        current = tmp_path / 'current.html'
+        current.write_text(f'<script src="{bundle.bundle}"></script>', encoding='utf-8')
+        stale = tmp_path / 'stale.html'
+        stale.write_text('<script src="static/network_diagram.000000000000.js"></script>', encoding='utf-8')
+
+        copy_page(current, tmp_path / 'dest')
+        assert (tmp_path / 'dest' / bundle.bundle).exists()
+        with pytest.raises(FileNotFoundError):
+            copy_page(stale, tmp_path / 'dest')
+
+
+def test_embed_json_escapes_markup():
+    assert embed_json({'a': '<!-- </script>'}) == '{"a":"\\u003c!-- \\u003c/script>"}'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
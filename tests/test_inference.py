@@ -0,0 +1,117 @@
+"""
+Unit Tests for the Inference Path
+==================================
+Tests for src/deep_learning/inference.py - single-pass inference, int8 quantization, export
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+torch = pytest.importorskip('torch')
+sp = pytest.importorskip('scipy.sparse')
+
+from src.deep_learning.inference import inference_copy, benchmark_inference
+from src.deep_learning.gat_model import ApplicationTopologyGAT, GATApplicationAnalyzer
+from src.deep_learning.vae_model import ApplicationBehaviorVAE, ApplicationBehaviorAnalyzer
+
+
+@pytest.fixture
+def graph():
+    torch.manual_seed(0)
+    adj = sp.random(40, 40, density=0.1, format='csr', random_state=0)
+    return np.random.default_rng(0).random((40, 64)).astype(np.float32), adj
+
+
+class TestSinglePass:
+    """Test one forward pass serves both zones and embeddings"""
+
+    def test_infer_matches_separate_calls(self, graph):
+        features, adj = graph
+        model = ApplicationTopologyGAT()
+        x = torch.from_numpy(features)
+
+        embeddings, logits = model.infer(x, adj)
+
+        assert not embeddings.requires_grad and embeddings.is_inference()
+        assert np.allclose(embeddings.numpy(), model.get_embeddings(x, adj))
+        assert np.array_equal(logits.argmax(dim=1).numpy(), model.predict_zones(x, adj))
+
+    def test_analyze_topology_confidence(self, graph):
+        features, adj = graph
+        analyzer = GATApplicationAnalyzer()
+        names = [f'app_{i}' for i in range(40)]
+
+        results = analyzer.analyze_topology(features, adj, names)
+
+        _, logits = analyzer.model.infer(torch.from_numpy(features), adj)
+        expected = torch.softmax(logits, dim=1).max(dim=1).values.numpy()
+        confidences = [results['applications'][name]['zone_confidence'] for name in names]
+        assert np.allclose(confidences, expected, atol=1e-6)
+
+
+class TestQuantization:
+    """Test dynamic int8 copies leave the trained model untouched"""
+
+    def test_quantized_copy(self):
+        torch.manual_seed(0)
+        model = ApplicationBehaviorVAE()
+        x = torch.rand(16, model.input_dim)
+        quantized = inference_copy(model, quantize=True)
+
+        assert quantized is not model
+        assert isinstance(model.encoder.encoder[0], torch.nn.Linear)
+        assert not isinstance(quantized.encoder.encoder[0], torch.nn.Linear)
+        assert torch.allclose(quantized.encode(x), model.encode(x), atol=0.1)
+        assert inference_copy(model) is model
+
+    def test_gat_keeps_attention_in_float(self):
+        quantized = inference_copy(ApplicationTopologyGAT(), quantize=True)
+
+        assert isinstance(quantized.gat1.W[0], torch.nn.Linear)
+        assert not isinstance(quantized.classifier[0], torch.nn.Linear)
+
+    def test_analyzer_uses_quantized_copy(self):
+        torch.manual_seed(0)
+        analyzer = ApplicationBehaviorAnalyzer(quantize=True)
+        analyzer.model = ApplicationBehaviorVAE(input_dim=16, latent_dim=4)
+        behaviors = np.random.default_rng(0).random((20, 16))
+
+        anomalies = analyzer.detect_anomalies(behaviors, [str(i) for i in range(20)])
+
+        assert analyzer.inference_model is not analyzer.model
+        assert len(anomalies) == 1  # Above the 95th percentile of 20 errors
+        assert analyzer.encode_behaviors(behaviors).shape == (20, 4)
+
+
+class TestExport:
+    """Test exported models reproduce eager outputs on new input sizes"""
+
+    def test_gat_torchscript(self, graph, tmp_path):
+        analyzer = GATApplicationAnalyzer()
+        path = analyzer.export_model(str(tmp_path / 'gat.pt'))
+
+        features, adj = graph
+        x = torch.from_numpy(features)
+        edge_index = torch.from_numpy(np.vstack(adj.nonzero())).long()
+        embeddings, logits = torch.jit.load(str(path))(x, edge_index)
+        expected_embeddings, expected_logits = analyzer.model.infer(x, edge_index)
+
+        assert torch.allclose(embeddings, expected_embeddings, atol=1e-5)
+        assert torch.allclose(logits, expected_logits, atol=1e-5)
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            GATApplicationAnalyzer().export_model(str(tmp_path / 'gat.bin'), format='tflite')
+
+
+def test_benchmark_reports_per_1k():
+    results = benchmark_inference(num_nodes=50, num_sequences=4, seq_len=8, num_behaviors=50, repeats=1)
+
+    for name in ('gat', 'transformer', 'vae'):
+        assert results[name]['float32']['ms_per_1k'] > 0
+        assert results[name]['int8']['ms_per_1k'] > 0
@@ -0,0 +1,121 @@
+"""
+Unit Tests for the Mermaid.ink Client
+=====================================
+Tests for src/mermaid_ink_client.py against a local stand-in server -
+connection reuse, render cache, backoff on 429 and batch rendering
+"""
+
+import base64
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mermaid_ink_client import MermaidInkClient, RenderCache, diagram_path
+
+
+class _InkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.connections.add(self.client_address)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            status = server.statuses.pop(0) if server.statuses else 200
+        time.sleep(server.latency)
+
+        definition = base64.urlsafe_b64decode(self.path.split('/')[-1]).decode('utf-8')
+        body = f'<svg xmlns="http://www.w3.org/2000/svg"><!-- {definition} -->{" " * 100}</svg>'.encode()
+        if status != 200:
+            body = b'slow down'
+        self.send_response(status)
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ink_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _InkHandler)
+    server.lock = threading.Lock()
+    server.requests, server.connections, server.statuses = [], set(), []
+    server.active = server.peak = 0
+    server.latency = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, cache_dir='', **options):
+    return MermaidInkClient(f'http://127.0.0.1:{server.server_port}', interval=0, cache_dir=cache_dir, **options)
+
+
+def test_diagram_path():
+    assert diagram_path('graph LR', 'png', 800) == '/img/Z3JhcGggTFI=?type=png&width=800'
+    assert diagram_path('graph LR', 'svg') == '/svg/Z3JhcGggTFI='
+    with pytest.raises(ValueError):
+        diagram_path('graph LR', 'pdf')
+
+
+class TestMermaidInkClient:
+    def test_reuses_connection_and_caches(self, ink_server, tmp_path):
+        client = _client(ink_server, tmp_path / 'cache')
+
+        for i in range(3):
+            assert client.render_to_file(f'graph LR\n  A{i} --> B', tmp_path / f'd{i}.svg')
+        assert len(ink_server.connections) == 1
+        assert b'A2 --> B' in (tmp_path / 'd2.svg').read_bytes()
+
+        # Identical diagram: served from the cache, also by a new client
+        assert _client(ink_server, tmp_path / 'cache').render('graph LR\n  A0 --> B', 'svg')
+        assert len(ink_server.requests) == 3
+        key = RenderCache.key('graph LR\n  A0 --> B', 'svg')
+        assert (tmp_path / 'cache' / key[:2] / f'{key}.svg').exists()
+
+    def test_backs_off_and_retries_when_throttled(self, ink_server):
+        ink_server.statuses = [429, 503]
+        client = _client(ink_server, backoff=0.05)
+
+        assert client.render('graph TD\n  A --> B', 'svg')
+        assert len(ink_server.requests) == 3
+        assert client.stats['throttled'] == 2
+        assert client._backoff.delay == 0.05  # 0.05 -> 0.1, halved again on success
+
+    def test_gives_up_on_client_errors(self, ink_server):
+        ink_server.statuses = [400]
+        assert _client(ink_server).render('graph TD\n  A --> ', 'svg') is None
+        assert len(ink_server.requests) == 1
+
+    def test_render_many_bounded_and_deduplicated(self, ink_server, tmp_path):
+        ink_server.latency = 0.05
+        client = _client(ink_server, max_in_flight=2)
+        jobs = [(f'graph LR\n  N{i % 4} --> X', tmp_path / f'd{i}.svg') for i in range(8)]
+
+        assert client.render_many(jobs) == [True] * 8
+        assert ink_server.peak <= 2
+        assert len(set(ink_server.requests)) == len(ink_server.requests) == 4  # Same diagram rendered once
+        assert b'N3 --> X' in (tmp_path / 'd7.svg').read_bytes()
+
+    def test_invalid_url(self):
+        with pytest.raises(ValueError):
+            MermaidInkClient('mermaid.ink', cache_dir='')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,179 @@
+"""
+Unit Tests for the Mermaid Renderer
+====================================
+Tests for src/mermaid_renderer.py - render worker pool protocol and mmdc fallback
+"""
+
+import json
+import threading
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.mermaid_renderer as mermaid_renderer
+from src.mermaid_renderer import MermaidRenderPool, render_mermaid, strip_mermaid_fences
+
+# Speaks the worker protocol; writes the request itself as the rendered output
+FAKE_WORKER = '''
+import json, os, sys, time
+print(json.dumps({'ready': True}), flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if request['definition'] == 'HANG':
+        time.sleep(30)
+    if request['definition'] == 'BROKEN':
+        print(json.dumps({'id': request['id'], 'ok': False, 'error': 'Parse error'}), flush=True)
+        continue
+    request['pid'] = os.getpid()
+    with open(request['output'], 'w') as f:
+        json.dump(request, f)
+    print(json.dumps({'id': request['id'], 'ok': True}), flush=True)
+'''
+
+FAILING_WORKER = '''
+import json
+print(json.dumps({'ready': False, 'error': 'mermaid-cli not found'}), flush=True)
+'''
+
+# Records its command line into the output file
+FAKE_MMDC = '''
+import json, sys
+args = sys.argv[1:]
+with open(args[args.index('-o') + 1], 'w') as f:
+    json.dump({'args': args, 'definition': open(args[args.index('-i') + 1]).read()}, f)
+'''
+
+
+def _script(tmp_path, name, source):
+    path = tmp_path / name
+    path.write_text(source)
+    return [sys.executable, str(path)]
+
+
+@pytest.fixture
+def fake_mmdc(tmp_path):
+    path = tmp_path / 'mmdc'
+    path.write_text(f'#!{sys.executable}\n{FAKE_MMDC}')
+    path.chmod(0o755)
+    return str(path)
+
+
+class TestStripMermaidFences:
+    def test_markdown_block_only(self):
+        content = "# Title\n```mermaid\ngraph TD\n  A --> B\n```\n\nLegend text\n"
+        assert strip_mermaid_fences(content) == "graph TD\n  A --> B"
+
+    def test_raw_definition_unchanged(self):
+        assert strip_mermaid_fences("graph LR\n  A --> B\n") == "graph LR\n  A --> B"
+
+
+class TestMermaidRenderPool:
+    def test_warm_worker_reused(self, tmp_path):
+        with MermaidRenderPool(size=1, worker_command=_script(tmp_path, 'worker.py', FAKE_WORKER)) as pool:
+            outputs = [tmp_path / 'out' / f'd{i}.png' for i in range(3)]
+            assert all(pool.render(f'graph TD\n A{i}-->B', out, width=4800, theme='neutral')
+                       for i, out in enumerate(outputs))
+
+            requests = [json.loads(out.read_text()) for out in outputs]
+            assert len({r['pid'] for r in requests}) == 1
+            assert requests[0]['format'] == 'png'
+            assert requests[0]['width'] == 4800
+            assert requests[0]['theme'] == 'neutral'
+            assert requests[2]['definition'] == 'graph TD\n A2-->B'
+            assert pool.stats['workers_started'] == 1
+            assert pool.stats['worker_renders'] == 3
+
+    def test_concurrent_renders(self, tmp_path):
+        with MermaidRenderPool(size=2, worker_command=_script(tmp_path, 'worker.py', FAKE_WORKER)) as pool:
+            results = []
+            threads = [
+                threading.Thread(target=lambda i=i: results.append(
+                    pool.render('graph TD\n A-->B', tmp_path / f'd{i}.svg')))
+                for i in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert results == [True] * 8
+            assert 1 <= pool.stats['workers_started'] <= 2
+            assert json.loads((tmp_path / 'd0.svg').read_text())['format'] == 'svg'
+
+    def test_render_error_keeps_worker(self, tmp_path):
+        with MermaidRenderPool(size=1, worker_command=_script(tmp_path, 'worker.py', FAKE_WORKER)) as pool:
+            assert not pool.render('BROKEN', tmp_path / 'bad.png')
+            assert pool.render('graph TD\n A-->B', tmp_path / 'good.png')
+            assert pool.stats['workers_started'] == 1
+            assert pool.stats['failures'] == 1
+
+    def test_timed_out_worker_replaced(self, tmp_path):
+        with MermaidRenderPool(size=1, worker_command=_script(tmp_path, 'worker.py', FAKE_WORKER)) as pool:
+            assert not pool.render('HANG', tmp_path / 'slow.png', timeout=0.5)
+            assert pool.render('graph TD\n A-->B', tmp_path / 'next.png')
+            assert pool.stats['workers_started'] == 2
+
+    def test_falls_back_to_mmdc(self, tmp_path, fake_mmdc):
+        pool = MermaidRenderPool(
+            size=2, mmdc=fake_mmdc, puppeteer_config=tmp_path / 'puppeteer.json',
+            worker_command=_script(tmp_path, 'worker.py', FAILING_WORKER)
+        )
+        output = tmp_path / 'diagram.png'
+        assert pool.render('graph TD\n A-->B', output, width=2400, height=1800, background='transparent')
+        assert not pool.available
+
+        recorded = json.loads(output.read_text())
+        args = recorded['args']
+        assert recorded['definition'] == 'graph TD\n A-->B'
+        assert args[args.index('-w') + 1] == '2400'
+        assert args[args.index('-H') + 1] == '1800'
+        assert args[args.index('-b') + 1] == 'transparent'
+        assert args[args.index('-p') + 1] == str(tmp_path / 'puppeteer.json')
+        assert pool.stats['mmdc_renders'] == 1
+        pool.close()
+
+    def test_no_renderer_available(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('NETSEG_MMDC', raising=False)
+        pool = MermaidRenderPool(worker_command=_script(tmp_path, 'worker.py', FAILING_WORKER))
+        pool.mmdc = None
+        assert not pool.render('graph TD\n A-->B', tmp_path / 'diagram.png')
+
+    def test_unknown_format(self, tmp_path):
+        pool = MermaidRenderPool(worker_command=_script(tmp_path, 'worker.py', FAKE_WORKER))
+        with pytest.raises(ValueError):
+            pool.render('graph TD\n A-->B', tmp_path / 'diagram.gif')
+        pool.close()
+
+
+class TestRenderEngines:
+    @pytest.fixture
+    def pool(self, tmp_path, monkeypatch):
+        pool = MermaidRenderPool(size=1, worker_command=_script(tmp_path, 'worker.py', FAKE_WORKER))
+        monkeypatch.setattr(mermaid_renderer, '_pool', pool)
+        yield pool
+        pool.close()
+
+    def test_native_renderer_first(self, tmp_path, pool):
+        output = tmp_path / 'diagram.svg'
+        assert render_mermaid('graph LR\n A -->|tcp:443| B', output)
+        assert output.read_text().startswith('<svg')
+        assert pool.stats['workers_started'] == 0
+
+    def test_unsupported_syntax_uses_pool(self, tmp_path, pool):
+        output = tmp_path / 'sequence.svg'
+        assert render_mermaid('sequenceDiagram\n A->>B: hi', output)
+        assert json.loads(output.read_text())['definition'].startswith('sequenceDiagram')
+        assert pool.stats['worker_renders'] == 1
+
+    def test_engine_selection(self, tmp_path, pool):
+        assert not render_mermaid('sequenceDiagram\n A->>B: hi', tmp_path / 'a.svg', engine='native')
+        assert render_mermaid('graph TD\n A --> B', tmp_path / 'b.svg', engine='mmdc')
+        assert pool.stats['worker_renders'] == 1
+        with pytest.raises(ValueError):
+            render_mermaid('graph TD\n A --> B', tmp_path / 'c.svg', engine='browser')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,231 @@
+"""
+Unit Tests for the Mermaid SVG Renderer
+========================================
+Tests for src/mermaid_svg_renderer.py - flowchart parsing, layered layout and SVG/PNG output
+"""
+
+import random
+import time
+import xml.etree.ElementTree as ET
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mermaid_svg_renderer import (
+    MermaidSyntaxError, PIL_AVAILABLE, layout_flowchart, parse_flowchart, render_svg, render_to_file
+)
+
+GROUPED_DIAGRAM = '''graph TB
+    %% Application: ANSIBLE
+    subgraph WEB["ANSIBLE - Web Tier"]
+        direction TB
+        W0["web-01<br/>10.0.0.1"]:::redborder
+        W1[("WEB-VM-01<br/>10.0.0.2")]:::vmware
+    end
+    subgraph APP["App Tier"]
+        A0(("api"))
+    end
+    EXTERNAL{"Internet"}
+    W0 -->|internal| A0
+    W1 -.-> A0
+    A0 == 443 ==> EXTERNAL
+    APP --> EXTERNAL
+    classDef redborder fill:#ffebee,stroke:#f44336,stroke-width:3px
+    classDef vmware fill:#fff3e0,stroke:#ff9800
+    style A0 fill:#e3f2fd
+    linkStyle 0 stroke:#ff0000,stroke-width:4px
+    click A0 showDetails
+'''
+
+
+class TestParser:
+    def test_nodes_edges_and_subgraphs(self):
+        chart = parse_flowchart(GROUPED_DIAGRAM)
+
+        assert chart.direction == 'TB'
+        assert chart.nodes['W0'].label == 'web-01\n10.0.0.1'
+        assert chart.nodes['W1'].shape == 'cylinder'
+        assert chart.nodes['A0'].shape == 'circle'
+        assert chart.nodes['EXTERNAL'].shape == 'rhombus'
+        assert chart.parents['W0'] == 'WEB'
+        assert chart.parents['EXTERNAL'] == ''
+        assert chart.subgraphs['WEB'].title == 'ANSIBLE - Web Tier'
+        assert 'APP' not in chart.nodes
+
+        strokes = [(e.source, e.target, e.label, e.stroke) for e in chart.edges]
+        assert strokes == [
+            ('W0', 'A0', 'internal', 'normal'),
+            ('W1', 'A0', '', 'dotted'),
+            ('A0', 'EXTERNAL', '443', 'thick'),
+            ('APP', 'EXTERNAL', '', 'normal'),
+        ]
+        assert chart.classes['W0'] == ['redborder']
+        assert chart.class_defs['redborder']['stroke-width'] == '3px'
+        assert chart.styles['A0'] == {'fill': '#e3f2fd'}
+        assert chart.link_styles[0]['stroke'] == '#ff0000'
+
+    def test_chains_groups_and_inline_labels(self):
+        chart = parse_flowchart('flowchart LR\n  A & B --> C -- next --> D; D --- E\n  E -. maybe .-> A')
+        pairs = [(e.source, e.target) for e in chart.edges]
+        assert pairs == [('A', 'C'), ('B', 'C'), ('C', 'D'), ('D', 'E'), ('E', 'A')]
+        assert chart.edges[2].label == 'next'
+        assert not chart.edges[3].arrow_end
+        assert chart.edges[4].stroke == 'dotted'
+
+    @pytest.mark.parametrize('link', ['.->', '.-', '-.->', '-..->', '..-'])
+    def test_dotted_links(self, link):
+        chart = parse_flowchart(f'graph LR\n A {link}|x| B')
+        assert [(e.source, e.target, e.label, e.stroke) for e in chart.edges] == [('A', 'B', 'x', 'dotted')]
+        assert chart.edges[0].arrow_end == link.endswith('>')
+
+    def test_nested_subgraph_claims_node(self):
+        chart = parse_flowchart('graph TD\nsubgraph outer\n  X --> Y\n  subgraph inner\n    Y\n  end\nend')
+        assert chart.parents['X'] == 'outer'
+        assert chart.parents['Y'] == 'inner'
+        assert chart.parents['inner'] == 'outer'
+
+    @pytest.mark.parametrize('definition', [
+        'sequenceDiagram\n  A->>B: hi',
+        'graph TD\n  A --> B\n  subgraph S\n  C',
+        'graph TD\n  A --o B',
+        'graph TD\n  end',
+        '',
+    ])
+    def test_unsupported_syntax(self, definition):
+        with pytest.raises(MermaidSyntaxError):
+            parse_flowchart(definition)
+
+
+class TestLayout:
+    def test_ranks_follow_direction(self):
+        tb = layout_flowchart(parse_flowchart('graph TB\n A --> B --> C'))
+        assert tb.nodes['A'][1] < tb.nodes['B'][1] < tb.nodes['C'][1]
+
+        lr = layout_flowchart(parse_flowchart('graph LR\n A --> B --> C'))
+        assert lr.nodes['A'][0] < lr.nodes['B'][0] < lr.nodes['C'][0]
+
+        bt = layout_flowchart(parse_flowchart('graph BT\n A --> B'))
+        assert bt.nodes['A'][1] > bt.nodes['B'][1]
+
+    def test_clusters_contain_members_without_overlap(self):
+        layout = layout_flowchart(parse_flowchart(GROUPED_DIAGRAM))
+        for node_id, cluster in (('W0', 'WEB'), ('W1', 'WEB'), ('A0', 'APP')):
+            cx, cy, w, h = layout.nodes[node_id]
+            x, y, cw, ch = layout.clusters[cluster]
+            assert x <= cx - w / 2 and cx + w / 2 <= x + cw
+            assert y <= cy - h / 2 and cy + h / 2 <= y + ch
+
+        boxes = [(cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2) for cx, cy, w, h in layout.nodes.values()]
+        for i, a in enumerate(boxes):
+            for b in boxes[i + 1:]:
+                assert a[2] <= b[0] or b[2] <= a[0] or a[3] <= b[1] or b[3] <= a[1]
+
+    def test_cycles_and_self_loops(self):
+        layout = layout_flowchart(parse_flowchart('graph TD\n A --> B --> C --> A\n C --> C'))
+        assert len(layout.edges) == 4
+        assert all(len(points) >= 2 for _, points, _ in layout.edges)
+
+    def test_large_diagram(self):
+        lines = ['graph LR']
+        lines += [f'  N{i}["host-{i}<br/>10.0.{i // 250}.{i % 250}"]' for i in range(500)]
+        lines += [f'  N{i} -->|tcp:443| N{(i * 7 + 3) % 500}' for i in range(500)]
+        layout = layout_flowchart(parse_flowchart('\n'.join(lines)))
+        assert len(layout.nodes) == 500
+        assert layout.width > 0 and layout.height > 0
+
+    def test_large_random_diagram_is_fast(self):
+        # Random endpoints (not a permutation): long edges, thousands of dummy vertices
+        rng = random.Random(7)
+        lines = ['graph LR']
+        lines += [f'  N{i}["host-{i}<br/>10.0.{i // 250}.{i % 250}"]' for i in range(500)]
+        lines += [f'  N{rng.randrange(500)} -->|tcp:{rng.choice([22, 443, 8080])}| N{rng.randrange(500)}'
+                  for _ in range(800)]
+        chart = parse_flowchart('\n'.join(lines))
+
+        start = time.perf_counter()
+        layout = layout_flowchart(chart)
+        elapsed = time.perf_counter() - start
+
+        assert len(layout.edges) == 800
+        assert elapsed < 1.0, f"layout took {elapsed:.2f}s"
+
+
+class TestOutput:
+    def test_svg_document(self):
+        svg = render_svg(GROUPED_DIAGRAM, theme='neutral')
+        root = ET.fromstring(svg)
+        assert root.tag.endswith('svg')
+        texts = ''.join(root.itertext())
+        assert 'ANSIBLE - Web Tier' in texts and '10.0.0.1' in texts and 'internal' in texts
+        assert '#ffebee' in svg and '#ff0000' in svg
+        assert 'marker-end' in svg
+
+    def test_svg_file(self, tmp_path):
+        output = render_to_file('graph TD\n A["a & b"] --> B', tmp_path / 'out' / 'd.svg', 'svg', background='transparent')
+        assert ET.parse(output).getroot() is not None
+        assert 'a &amp; b' in output.read_text()
+
+    @pytest.mark.skipif(not PIL_AVAILABLE, reason="Pillow not installed")
+    def test_png_file(self, tmp_path):
+        output = render_to_file(GROUPED_DIAGRAM, tmp_path / 'd.png', 'png', scale=2)
+        assert output.read_bytes().startswith(b'\x89PNG')
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            render_to_file('graph TD\n A --> B', tmp_path / 'd.pdf', 'pdf')
+
+
+class TestGeneratedDiagrams:
+    """Diagrams emitted by CompleteReportGenerator render without the mmdc fallback"""
+
+    @pytest.fixture
+    def generator(self, tmp_path):
+        pd = pytest.importorskip('pandas')
+        from generate_complete_reports import CompleteReportGenerator
+
+        def flows(app, rows):
+            return pd.DataFrame([
+                {'App': app, 'Source IP': src, 'Source Hostname': f'{app.lower()}-web01',
+                 'Dest IP': dst, 'Dest Hostname': 'peer01', 'Dest App': dest_app, 'Port': port,
+                 'Protocol': 'TCP', 'Flow Direction': direction, 'Source Is VMware': False,
+                 'Dest Is VMware': False, 'Dest DNS Status': 'valid'}
+                for src, dst, dest_app, port, direction in rows
+            ])
+
+        apps_dir = tmp_path / 'applications'
+        light = [('10.0.0.1', '10.9.0.1', 'PAYM', 8443, 'outbound')] * 3  # < 10 flows: dotted edge
+        heavy = [('10.0.0.2', '10.8.0.1', 'LEDG', 5432, 'outbound')] * 150  # > 100 flows: thick edge
+        internal = [('10.0.0.1', '10.0.0.2', None, 8080, 'internal')] * 20
+        external = [('10.0.0.1', '8.8.8.8', None, 443, 'external')] * 2
+        app_flows = {
+            'ORDR': flows('ORDR', light + heavy + internal + external),
+            'WEBF': flows('WEBF', [('10.5.0.1', '10.0.0.1', 'ORDR', 443, 'outbound')] * 4),
+        }
+        for app, df in app_flows.items():
+            (apps_dir / app).mkdir(parents=True)
+            df.to_csv(apps_dir / app / 'flows.csv', index=False)
+
+        generator = CompleteReportGenerator(apps_dir=str(apps_dir), output_dir=str(tmp_path / 'out'))
+        return generator, app_flows['ORDR']
+
+    def test_complete_report_diagrams(self, generator):
+        generator, flows_df = generator
+        diagrams = {
+            'downstream': generator._generate_mermaid_diagram('ORDR', flows_df),
+            'upstream': generator._generate_upstream_diagram('ORDR'),
+            'fullflow': generator._generate_fullflow_diagram('ORDR', flows_df),
+            'architecture': generator._generate_architecture_diagram('ORDR', flows_df),
+        }
+
+        assert '.->' in diagrams['downstream'] and '.->' in diagrams['fullflow']
+        for name, definition in diagrams.items():
+            chart = parse_flowchart(definition)
+            assert chart.edges, name
+            assert ET.fromstring(render_svg(definition)).tag.endswith('svg'), name
+        assert 'dotted' in {e.stroke for e in parse_flowchart(diagrams['fullflow']).edges}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,194 @@
+"""
+Unit Tests for the ML Network Predictor
+========================================
+Tests for src/ml_predictor.py - sparse Markov chain and peer correlations
+"""
+
+import pytest
+from pathlib import Path
+from collections import Counter
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parser import FlowRecord
+from src.ml_predictor import MLNetworkPredictor
+
+
+def make_predictor(num_apps=12, num_flows=300, seed=0):
+    """Predictor with a random flow graph, Markov chain and correlations built"""
+    rng = np.random.default_rng(seed)
+    hosts = [f'10.0.0.{i}' for i in range(25)]
+    records = [
+        FlowRecord(app_name=f'app{rng.integers(num_apps)}', src_ip=hosts[rng.integers(25)],
+                   dst_ip=hosts[rng.integers(25)], port=443, transport='tcp', bytes=100, packets=1)
+        for _ in range(num_flows)
+    ]
+
+    predictor = MLNetworkPredictor(persistence_manager=None, ensemble_model=None)
+    predictor.apps_with_data = {r.app_name for r in records}
+    predictor._build_network_graph(records)
+    predictor._build_markov_chain(records)
+    predictor._correlate_peer_patterns()
+    return predictor
+
+
+def reference_correlations(predictor):
+    """Pairwise Jaccard + successor-walk transitive pass (the original loops)"""
+    chain, G = predictor.markov_chain, predictor.G
+    correlations = {}
+    for app_a in predictor.apps_with_data:
+        for app_b in predictor.apps_with_data:
+            if app_a == app_b:
+                continue
+            a_peers, b_peers = set(chain[app_a]), set(chain[app_b])
+            jaccard = len(a_peers & b_peers) / len(a_peers | b_peers)
+            if jaccard > 0.1:
+                correlations[(app_a, app_b)] = jaccard
+
+    for node in G.nodes():
+        first_order = set(G.successors(node))
+        if not first_order:
+            continue
+        second_order = set()
+        for neighbor in first_order:
+            second_order.update(G.successors(neighbor))
+        for peer in second_order - {node} - first_order:
+            path_count = sum(1 for k in first_order if G.has_edge(k, peer))
+            strength = min(path_count / len(first_order), 1.0) * 0.7
+            if strength > 0.2:
+                correlations[(node, peer)] = strength
+    return correlations
+
+
+def reference_markov(predictor, similar_apps):
+    """Peer scores from the original dict-scanning prediction"""
+    scores = Counter()
+    for similar_app in similar_apps:
+        for peer, prob in predictor.markov_chain.get(similar_app, {}).items():
+            scores[peer] += prob / (similar_apps.index(similar_app) + 1)
+    for similar_app in similar_apps:
+        for (app_a, app_b), correlation in reference_correlations(predictor).items():
+            if app_a == similar_app and app_b in predictor.markov_chain:
+                for peer, prob in predictor.markov_chain[app_b].items():
+                    scores[peer] += prob * correlation * 0.5
+    return scores
+
+
+class TestPeerCorrelation:
+    """Test sparse Markov transitions and correlations"""
+
+    @pytest.fixture
+    def predictor(self):
+        return make_predictor()
+
+    def test_transition_probabilities(self, predictor):
+        """Test rows are P(peer | app) and the dict view matches the matrix"""
+        sums = np.asarray(predictor.transition_matrix.sum(axis=1)).ravel()
+
+        assert np.allclose(sums, 1.0)
+        assert set(predictor.markov_chain) == predictor.apps_with_data
+        for app, transitions in predictor.markov_chain.items():
+            assert sum(transitions.values()) == pytest.approx(1.0)
+
+    def test_matches_pairwise_correlations(self, predictor):
+        """Test sparse Jaccard and two-hop counts equal the pairwise loops"""
+        expected = reference_correlations(predictor)
+        actual = dict(predictor.peer_correlation_matrix.items())
+
+        assert len(predictor.peer_correlation_matrix) == len(expected)
+        assert actual.keys() == expected.keys()
+        for key, score in expected.items():
+            assert actual[key] == pytest.approx(score)
+
+    def test_predict_with_markov(self, predictor):
+        """Test top peers follow the weighted transition + correlation scores"""
+        similar_apps = ['app3', 'app1', 'app3', 'app7']
+        scores = reference_markov(predictor, similar_apps)
+
+        peers = predictor._predict_with_markov('new_app', similar_apps)
+
+        assert len(peers) == 10
+        expected = sorted(scores.values(), reverse=True)[:10]
+        assert [scores[p] for p in peers] == pytest.approx(expected)
+
+    def test_markov_confidence(self):
+        """Test the correlation boost counts each pair in both directions"""
+        predictor = make_predictor(num_flows=40)  # Sparse enough that the boost is not capped
+        similar_apps = ['app2', 'app5']
+        correlations = reference_correlations(predictor)
+        boost = sum(score for app in similar_apps for (a, b), score in correlations.items()
+                    if app in (a, b))
+        strength = np.mean([1 / len(predictor.markov_chain[app]) for app in similar_apps])
+        expected = 0.4 * 0.5 + strength * 0.3 + min(boost / 10.0, 0.2)
+
+        assert predictor._calculate_markov_confidence('new_app', similar_apps) == pytest.approx(expected)
+        assert predictor._calculate_markov_confidence('new_app', []) == 0.3
+
+
+class TestSimilarApps:
+    """Test similar-app lookup through the index"""
+
+    def test_tier_centroid_neighbours(self):
+        """Test tier members nearest the tier centroid are returned, not just name matches"""
+        predictor = MLNetworkPredictor(persistence_manager=None, ensemble_model=None)
+        predictor.index_app_vectors(
+            ['orders-db', 'users-db', 'odd-db', 'ledger', 'web-portal'],
+            np.array([[1.0, 0.1, 0], [1.0, 0.0, 0], [0, 0, 1.0], [0.9, 0.1, 0], [0, 1.0, 0]])
+        )
+
+        similar = predictor._find_similar_apps('billing-database', k=2)
+
+        assert predictor.tier_apps['data'] == ['orders-db', 'users-db', 'odd-db']
+        assert set(similar) == {'orders-db', 'users-db'}  # odd-db is far from the centroid
+        assert predictor._find_similar_apps('kafka-bridge') == []
+
+    @pytest.mark.parametrize('backend', ['exact', 'lsh'])
+    def test_similar_apps_stay_in_target_tier(self, backend):
+        """Test apps of other tiers are never returned, even when closer to the centroid"""
+        predictor = MLNetworkPredictor(persistence_manager=None, ensemble_model=None,
+                                       similarity_backend=backend)
+        rng = np.random.default_rng(0)
+        shared = rng.standard_normal(8)
+        names = ['orders_db', 'web_portal', 'web_shop', 'users_api', 'billing_service', 'ledger_db']
+        # Web and app-tier apps sit right on the data-tier centroid; data apps are spread out
+        vectors = np.array([shared + rng.standard_normal(8) * (1.0 if name.endswith('_db') else 0.01)
+                            for name in names])
+        predictor.index_app_vectors(names, vectors)
+
+        similar = predictor._find_similar_apps('customer_database', k=3)
+
+        assert sorted(similar) == ['ledger_db', 'orders_db']
+        assert predictor._find_similar_apps('checkout_web', k=1)[0] in {'web_portal', 'web_shop'}
+
+    @pytest.mark.parametrize('backend', ['exact', 'lsh'])
+    def test_neighbours_follow_app_name(self, backend):
+        """Test apps of one tier get different neighbours, led by members named like them"""
+        predictor = MLNetworkPredictor(persistence_manager=None, ensemble_model=None,
+                                       similarity_backend=backend)
+        rng = np.random.default_rng(1)
+        orders, billing = rng.standard_normal(16), rng.standard_normal(16)
+        names = ['orders_db', 'orders_archive_db', 'orders_replica_db',
+                 'billing_db', 'billing_ledger_db', 'billing_audit_db']
+        vectors = [center + rng.standard_normal(16) * 0.05
+                   for center in (orders, orders, orders, billing, billing, billing)]
+        predictor.index_app_vectors(names, np.array(vectors))
+
+        orders_like = predictor._find_similar_apps('orders_reporting_database', k=3)
+        billing_like = predictor._find_similar_apps('billing_reporting_database', k=3)
+
+        assert sorted(orders_like) == ['orders_archive_db', 'orders_db', 'orders_replica_db']
+        assert sorted(billing_like) == ['billing_audit_db', 'billing_db', 'billing_ledger_db']
+
+    def test_latent_vectors_replace_index(self):
+        """Test indexing vectors of another dimension (e.g. VAE latents) rebuilds the index"""
+        predictor = MLNetworkPredictor(persistence_manager=None, ensemble_model=None,
+                                       similarity_backend='lsh')
+        predictor.index_app_vectors(['web-a', 'web-b'], np.eye(2))
+        predictor.index_app_vectors(['web-a', 'web-b', 'web-c'], np.eye(3))
+
+        assert predictor.similarity_index.dim == 3
+        assert predictor.tier_apps['web'] == ['web-a', 'web-b', 'web-c']
+        assert sorted(predictor._find_similar_apps('web-new')) == ['web-a', 'web-b', 'web-c']
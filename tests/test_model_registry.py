@@ -0,0 +1,210 @@
+"""
+Unit Tests for the Model Registry
+==================================
+Tests for src/core/model_registry.py - lazy loading, metrics and the model worker
+"""
+
+import importlib.util
+import json
+import socket
+import threading
+import pytest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.model_registry import ModelRegistry, ModelWorker, ModelWorkerClient, load_authkey
+from src.core.ensemble_model import EnsembleNetworkModel
+
+FAKE_BACKEND = '''
+CONSTRUCTED = []
+
+class FakeAnalyzer:
+    def __init__(self, device='cpu', scale=1):
+        self.device = device
+        self.scale = scale
+        CONSTRUCTED.append(scale)
+
+    def predict(self, x, offset=0):
+        return x * self.scale + offset
+
+    def save_checkpoint(self, path):
+        open(path, 'w').close()
+
+    def train_on_observed_data(self, node_features, adjacency_matrix, zone_labels):
+        self.scale = 10
+        return {'loss': [0.0]}
+'''
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """Registry with a fake backend module importable from tmp_path"""
+    (tmp_path / 'fake_backend.py').write_text(FAKE_BACKEND)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop('fake_backend', None)
+
+    registry = ModelRegistry(metrics_path=str(tmp_path / 'metrics.json'))
+    registry.register('fake', 'fake_backend', 'FakeAnalyzer')
+    return registry
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class TestModelRegistry:
+    """Test lazy construction, caching and metrics"""
+
+    def test_lazy_and_cached(self, registry, tmp_path):
+        """Test the backend is imported on first get and built once per kwargs"""
+        assert 'fake_backend' not in sys.modules
+
+        first = registry.get('fake')
+        assert registry.get('fake') is first
+        scaled = registry.get('fake', scale=3)
+
+        assert scaled is not first and scaled.scale == 3
+        assert sys.modules['fake_backend'].CONSTRUCTED == [1, 3]
+        metrics = registry.metrics()['fake']
+        assert metrics['loads'] == 2 and metrics['requests'] == 3
+        assert metrics['load_seconds'] >= metrics['import_seconds'] >= 0
+        assert json.loads((tmp_path / 'metrics.json').read_text())['models']['fake']['loads'] == 2
+
+    def test_unknown_and_missing(self, registry):
+        """Test unknown names raise and missing modules are not available"""
+        registry.register('ghost', 'no_such_backend_module', 'Nothing')
+
+        with pytest.raises(KeyError):
+            registry.get('nope')
+        with pytest.raises(ImportError):
+            registry.get('ghost')
+        assert not registry.available('ghost')
+
+    def test_worker_round_trip(self, registry, tmp_path):
+        """Test a client calls warm models in a worker and sees its metrics"""
+        address = ('127.0.0.1', free_port())
+        worker = ModelWorker(address, authkey=b'test', registry=registry, preload=['fake'])
+        thread = threading.Thread(target=worker.serve_forever, daemon=True)
+        thread.start()
+
+        client = ModelWorkerClient(address, authkey=b'test')
+        for _ in range(50):
+            if client.ping():
+                break
+            threading.Event().wait(0.05)
+
+        remote = client.get('fake', scale=2)
+        assert np.array_equal(remote.predict(np.arange(3), offset=1), [1, 3, 5])
+        assert client.metrics()['fake']['loads'] == 2
+        with pytest.raises(RuntimeError):
+            remote.missing_method()
+
+        # Methods outside the whitelist are refused, even if the model has them
+        with pytest.raises(RuntimeError, match='not allowed'):
+            remote.save_checkpoint(str(tmp_path / 'written'))
+        assert not (tmp_path / 'written').exists()
+
+        assert not ModelWorkerClient(address, authkey=b'wrong').ping()
+
+        client.shutdown()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+
+class TestWorkerAuthkey:
+    """Test the per-install worker secret"""
+
+    def test_generated_key_file(self, tmp_path, monkeypatch):
+        """Test the key is generated once with owner-only permissions"""
+        monkeypatch.delenv('NETSEG_MODEL_WORKER_AUTHKEY', raising=False)
+        key_file = tmp_path / 'netseg' / 'model_worker.key'
+
+        with pytest.raises(FileNotFoundError):
+            load_authkey(str(key_file))
+
+        key = load_authkey(str(key_file), create=True)
+
+        assert len(key) == 64
+        assert load_authkey(str(key_file)) == key
+        if sys.platform != 'win32':
+            assert key_file.stat().st_mode & 0o777 == 0o600
+            key_file.chmod(0o644)
+            with pytest.raises(PermissionError):
+                load_authkey(str(key_file))
+
+    def test_env_key_wins(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('NETSEG_MODEL_WORKER_AUTHKEY', 's3cret')
+        assert load_authkey(str(tmp_path / 'missing.key')) == b's3cret'
+
+
+class TestEnsembleLazyModels:
+    """Test the ensemble defers deep learning construction to the registry"""
+
+    def test_deep_learning_models_are_lazy(self, registry):
+        if importlib.util.find_spec('torch') is None:
+            pytest.skip('PyTorch not installed')
+        registry.register('gat', 'fake_backend', 'FakeAnalyzer')
+
+        ensemble = EnsembleNetworkModel(None, use_deep_learning=True, model_registry=registry)
+
+        assert ensemble.models['gat']['analyzer'] is None
+        assert not registry.is_loaded('gat')
+        assert ensemble._get_analyzer('gat') is registry.get('gat')
+
+    def test_training_with_model_worker(self, registry, tmp_path):
+        """Test training runs locally while a worker serves inference"""
+        if importlib.util.find_spec('torch') is None:
+            pytest.skip('PyTorch not installed')
+        registry.register('gat', 'fake_backend', 'FakeAnalyzer')
+        worker_registry = ModelRegistry()
+        worker_registry.register('gat', 'fake_backend', 'FakeAnalyzer')
+
+        address = ('127.0.0.1', free_port())
+        worker = ModelWorker(address, authkey=b'test', registry=worker_registry)
+        thread = threading.Thread(target=worker.serve_forever, daemon=True)
+        thread.start()
+        client = ModelWorkerClient(address, authkey=b'test')
+        for _ in range(50):
+            if client.ping():
+                break
+            threading.Event().wait(0.05)
+
+        try:
+            ensemble = EnsembleNetworkModel(None, use_deep_learning=True,
+                                            model_registry=client, local_registry=registry)
+            # Before training, inference goes through the worker
+            assert ensemble._get_analyzer('gat').predict(np.ones(2)).tolist() == [1, 1]
+
+            ensemble.train_deep_learning_models(np.zeros((3, 4)), np.eye(3), np.zeros(3))
+
+            assert ensemble.models['gat']['trained']
+            assert registry.get('gat').scale == 10
+            # Predictions now come from the locally trained instance
+            assert ensemble._get_analyzer('gat').predict(np.ones(2)).tolist() == [10, 10]
+            assert worker_registry.metrics()['gat']['requests'] == 1
+        finally:
+            client.shutdown()
+            thread.join(timeout=5)
+
+
+class TestMemoryMappedCheckpoint:
+    """Test pre-trained weights load through torch.load(mmap=True)"""
+
+    def test_gat_checkpoint(self, tmp_path):
+        torch = pytest.importorskip('torch')
+        from src.deep_learning.gat_model import ApplicationTopologyGAT, GATApplicationAnalyzer
+
+        model = ApplicationTopologyGAT()
+        path = tmp_path / 'gat.pt'
+        torch.save({'model_state_dict': model.state_dict()}, path)
+
+        loaded = GATApplicationAnalyzer(model_path=str(path)).model
+
+        for name, tensor in model.state_dict().items():
+            assert torch.equal(loaded.state_dict()[name], tensor)
@@ -0,0 +1,141 @@
+"""
+Unit Tests for the RL Segmentation Environment
+===============================================
+Tests for src/deep_learning/rl_segmentation_agent.py - compiled reward terms
+"""
+
+import pytest
+from pathlib import Path
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.deep_learning.rl_segmentation_agent import (
+    SegmentationEnvironment, VectorizedSegmentationEnvironment
+)
+
+
+def make_environment(num_apps=20, num_connections=120, seed=0):
+    """Random topology with non-app endpoints, duplicate and allowed policies"""
+    rng = random.Random(seed)
+    apps = [f'app{i}' for i in range(num_apps)]
+    endpoints = apps + ['external', 'unknown-host']
+    connections = [{'source': rng.choice(endpoints), 'destination': rng.choice(endpoints)}
+                   for _ in range(num_connections)]
+    volumes = {f"{c['source']}->{c['destination']}": rng.randint(1, 1000) for c in connections[::2]}
+    volumes['stale->entry'] = 500  # Counted in total traffic only
+    policies = [
+        {'source_zone': 0, 'destination_zone': 2, 'allowed': False},
+        {'source_zone': 0, 'destination_zone': 2, 'allowed': False},
+        {'source_zone': 1, 'destination_zone': 1, 'allowed': False},
+        {'source_zone': 2, 'destination_zone': 0, 'allowed': True},
+        {'source_zone': 'DMZ', 'destination_zone': 0, 'allowed': False},
+    ]
+    return SegmentationEnvironment(
+        {'applications': apps, 'connections': connections},
+        {'volumes': volumes},
+        {'zones': ['WEB', 'APP', 'DATA', 'MGMT'], 'policies': policies}
+    )
+
+
+def reference_terms(env):
+    """Cross-zone traffic and violations from the original per-connection loops"""
+    segmentation = env.current_segmentation
+    cross_zone, violations = 0.0, 0
+    for conn in env.topology['connections']:
+        src, dst = conn['source'], conn['destination']
+        if segmentation.get(src) != segmentation.get(dst):
+            cross_zone += env.traffic['volumes'].get(f"{src}->{dst}", 0)
+        for policy in env.security['policies']:
+            if (segmentation.get(src) == policy['source_zone']
+                    and segmentation.get(dst) == policy['destination_zone']
+                    and not policy.get('allowed', True)):
+                violations += 1
+    return cross_zone, violations
+
+
+class TestSegmentationEnvironment:
+    """Test incremental reward terms against the per-connection definitions"""
+
+    def test_incremental_terms_match_reference(self):
+        """Test running totals stay equal to a full recount across steps"""
+        random.seed(0)
+        env = make_environment()
+        state = env.reset()
+
+        for action in np.random.default_rng(0).integers(0, env.action_dim, size=200):
+            state, reward, done, info = env.step(int(action))
+            cross_zone, violations = reference_terms(env)
+
+            assert env._compute_cross_zone_traffic() == pytest.approx(cross_zone)
+            assert env._compute_security_violations() == violations
+            assert state[-3] == pytest.approx(cross_zone) and state[-2] == violations
+
+        zones_used = len(set(env.current_segmentation.values()))
+        assert info['complexity_score'] == pytest.approx(1 - zones_used / 4)
+        assert state.shape == (env.state_dim,)
+        assert state[:-3].reshape(20, 4).sum(axis=1).tolist() == [1.0] * 20
+
+    def test_vectorized_matches_single(self):
+        """Test each vectorized episode equals a single environment in the same zones"""
+        random.seed(1)
+        env = make_environment()
+        vector_env = VectorizedSegmentationEnvironment(env, num_envs=4)
+        vector_env.reset()
+
+        actions = np.random.default_rng(1).integers(0, env.action_dim, size=(30, 4))
+        for step_actions in actions:
+            states, rewards, dones, info = vector_env.step(step_actions)
+
+        for i in range(4):
+            env.reset()
+            for app_idx, zone in enumerate(vector_env.zone_codes[i, :-1]):
+                env.step(app_idx * env.num_zones + int(zone))
+
+            assert np.allclose(states[i], env._compute_state())
+            assert rewards[i] == pytest.approx(env._compute_reward())
+            assert info['security_score'][i] == pytest.approx(env._compute_security_score())
+        assert not dones.any()
+
+    def test_empty_topology(self):
+        """Test no connections or volumes gives full security and performance"""
+        env = SegmentationEnvironment({'applications': ['a', 'b']}, {}, {'zones': ['X', 'Y']})
+        env.reset()
+
+        state, reward, done, info = env.step(1)
+
+        assert info['security_score'] == 1.0 and info['performance_score'] == 1.0
+        assert state[:2].tolist() == [0, 1]  # app a moved to zone Y
+
+    def test_vectorized_training(self, tmp_path):
+        """Test DQN training over parallel environments records every episode"""
+        pytest.importorskip('torch')
+        from src.deep_learning.rl_segmentation_agent import RLSegmentationOptimizer
+
+        env = make_environment(num_apps=5, num_connections=20)
+        optimizer = RLSegmentationOptimizer(env.topology, env.traffic, env.security)
+
+        history = optimizer.train(num_episodes=3, max_steps_per_episode=10, batch_size=8,
+                                  checkpoint_path=str(tmp_path / 'rl.pt'), num_envs=4)
+
+        assert len(history['episode_rewards']) == 3
+        assert history['episode_lengths'] == [10, 10, 10]
+        assert len(optimizer.agent.replay_buffer) == 3 * 10 * 4
+
+    @pytest.mark.parametrize('num_envs', [1, 4])
+    def test_zero_step_episodes(self, tmp_path, num_envs):
+        """Test max_steps_per_episode=0 records empty episodes instead of failing"""
+        pytest.importorskip('torch')
+        from src.deep_learning.rl_segmentation_agent import RLSegmentationOptimizer
+
+        env = make_environment(num_apps=5, num_connections=20)
+        optimizer = RLSegmentationOptimizer(env.topology, env.traffic, env.security)
+
+        history = optimizer.train(num_episodes=2, max_steps_per_episode=0, batch_size=8,
+                                  checkpoint_path=str(tmp_path / 'rl.pt'), num_envs=num_envs)
+
+        assert history['episode_lengths'] == [0, 0]
+        assert history['episode_rewards'] == [0, 0]
@@ -0,0 +1,111 @@
+"""
+Unit Tests for What-If Segmentation Simulation
+===============================================
+Tests for src/segmentation_simulator.py - SegmentationSimulator
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parser import FlowRecord
+from src.graph_analyzer import GraphAnalyzer, DEFAULT_TIER_SUBNETS
+from src.segmentation_simulator import SegmentationSimulator
+
+
+class TestSegmentationSimulator:
+    """Test SegmentationSimulator class"""
+
+    @pytest.fixture
+    def simulator(self):
+        """WEB -> APP -> DATABASE plus a direct WEB -> QUEUE edge"""
+        records = [
+            FlowRecord(src_ip='10.164.105.10', dst_ip='10.100.246.20', port=8080),
+            FlowRecord(src_ip='10.100.246.20', dst_ip='10.164.116.30', port=3306),
+            FlowRecord(src_ip='10.164.105.10', dst_ip='10.164.145.40', port=5672),
+        ]
+        analyzer = GraphAnalyzer(records, tier_subnets=DEFAULT_TIER_SUBNETS)
+        return SegmentationSimulator(analyzer, max_hops=6)
+
+    def test_baseline_index(self, simulator):
+        """Test external source reaches both critical assets"""
+        assert len(simulator.sources) == 1
+        assert simulator.critical_reach.sum() == 2
+
+    def test_tier_rule_blocks_database(self, simulator):
+        """Test blocking APP -> DATABASE cuts the database only"""
+        result = simulator.evaluate([
+            {'name': 'No APP to DB', 'source_tier': 'APP',
+             'destination_tier': 'DATABASE', 'action': 'DENY'}
+        ])
+
+        assert result['blocked_edges'] == 1
+        assert result['affected_sources'] == 1
+        assert result['critical_pairs_removed'] == 1
+        assert result['newly_unreachable_critical'] == ['10.164.116.30']
+
+    def test_hop_bound(self, simulator):
+        """Test assets beyond max_hops are not counted as reachable"""
+        bounded = SegmentationSimulator(simulator.analyzer, max_hops=1)
+        assert bounded.critical_reach.sum() == 1  # QUEUE (1 hop) only, DB is 2 hops
+
+        result = bounded.evaluate([
+            {'name': 'No WEB to QUEUE', 'source_ip': '10.164.105.10',
+             'destination_ip': '10.164.145.40'}
+        ])
+
+        assert result['blocked_edges'] == 1
+        assert result['critical_pairs_after'] == 0
+        assert result['newly_unreachable_critical'] == ['10.164.145.40']
+
+    def test_score_rule_sets(self, simulator):
+        """Test candidates are ranked by critical assets cut"""
+        ranked = simulator.score_rule_sets({
+            'noop': [],
+            'block_all': [
+                {'name': 'a', 'source_tier': 'WEB', 'destination_tier': 'APP'},
+                {'name': 'b', 'source_tier': 'WEB', 'destination_tier': 'QUEUE'}
+            ]
+        })
+
+        assert ranked[0]['candidate'] == 'block_all'
+        assert ranked[0]['exposed_critical_after'] == 0
+        assert ranked[1]['blocked_edges'] == 0
+
+    def test_matches_bfs_on_random_graph(self):
+        """Test packed reachability matches a plain BFS over the unblocked edges"""
+        import random
+        import networkx as nx
+
+        rng = random.Random(7)
+        externals = [f'203.0.113.{i}' for i in range(1, 13)]  # > 8 sources spans two bytes
+        internals = [f'10.164.{rng.choice([105, 116, 145])}.{i}' for i in range(1, 40)]
+        records = [
+            FlowRecord(src_ip=rng.choice(externals + internals), dst_ip=rng.choice(internals),
+                       port=rng.choice([443, 3306, 5672]))
+            for _ in range(150)
+        ]
+        analyzer = GraphAnalyzer(records, tier_subnets=DEFAULT_TIER_SUBNETS)
+        simulator = SegmentationSimulator(analyzer, max_hops=3)
+        rules = [{'name': 'No WEB to DB', 'source_tier': 'WEB', 'destination_tier': 'DATABASE'}]
+        blocked = simulator.blocked_edges(rules)
+
+        def reachable_pairs(edges):
+            graph = nx.DiGraph(edges)
+            graph.add_nodes_from(simulator.nodes)
+            critical = {simulator.nodes[i] for i in simulator.critical_nodes}
+            return sum(
+                len(critical & set(nx.single_source_shortest_path_length(graph, simulator.nodes[s],
+                                                                         cutoff=3)))
+                for s in simulator.sources
+            )
+
+        kept = [edge for edge, cut in zip(simulator.edges, blocked) if not cut]
+        result = simulator.evaluate(rules)
+
+        assert len(simulator.sources) > 8
+        assert result['blocked_edges'] > 0
+        assert result['critical_pairs_before'] == reachable_pairs(simulator.edges)
+        assert result['critical_pairs_after'] == reachable_pairs(kept)
@@ -0,0 +1,101 @@
+"""
+Unit Tests for the Similar-App Index
+=====================================
+Tests for src/similarity_index.py - SimilarAppIndex
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.similarity_index import SimilarAppIndex
+
+
+def brute_force(vectors, query, k):
+    """Reference cosine top-k"""
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores, kind='stable')[:k])
+
+
+class TestSimilarAppIndex:
+    """Test exact and LSH top-k search with incremental inserts"""
+
+    @pytest.fixture
+    def data(self):
+        rng = np.random.default_rng(0)
+        return rng.standard_normal((300, 32)).astype(np.float32)
+
+    def test_exact_matches_brute_force(self, data):
+        """Test exact queries equal a full cosine ranking across inserts"""
+        index = SimilarAppIndex(32)
+        names = [f'app{i}' for i in range(len(data))]
+        for start in range(0, len(data), 70):  # Incremental batches (forces growth)
+            index.add(names[start:start + 70], data[start:start + 70])
+
+        query = data[5] + 0.1
+        results = index.query(query, k=5)
+
+        assert len(index) == 300
+        assert [name for name, _ in results] == [names[i] for i in brute_force(data, query, 5)]
+        assert results[0][1] >= results[-1][1]
+        assert 'app5' not in [name for name, _ in index.query(query, k=5, exclude=['app5'])]
+
+    def test_lsh_recall(self, data):
+        """Test LSH finds near-duplicates and falls back for empty buckets"""
+        index = SimilarAppIndex(32, backend='lsh', num_tables=8, num_bits=8)
+        index.add([f'app{i}' for i in range(len(data))], data)
+
+        hits = sum(index.query(data[i] + 0.01, k=1)[0][0] == f'app{i}' for i in range(50))
+        scores = [score for _, score in index.query(data[0], k=5)]
+
+        assert hits >= 48
+        assert len(scores) == 5 and scores == sorted(scores, reverse=True)
+
+    def test_lsh_within(self, data, monkeypatch):
+        """Test restricted LSH queries use bucket candidates and never leave the allowed set"""
+        index = SimilarAppIndex(32, backend='lsh', num_tables=8, num_bits=4)
+        index.add([f'app{i}' for i in range(len(data))], data)
+        allowed = [f'app{i}' for i in range(0, 300, 2)]
+        lookups = []
+        candidates = index._candidates
+        monkeypatch.setattr(index, '_candidates', lambda vector: lookups.append(1) or candidates(vector))
+
+        hits = sum(index.query(data[i] + 0.01, k=1, within=allowed)[0][0] == f'app{i}' for i in range(0, 40, 2))
+        results = index.query(data[1], k=5, within=allowed)
+
+        assert hits >= 19 and len(lookups) == 21
+        assert len(results) == 5 and {name for name, _ in results} <= set(allowed)
+        # Fewer allowed apps than k: exact scan of just those
+        assert [name for name, _ in index.query(data[3], k=5, within=['app3', 'app8'])][0] == 'app3'
+
+    def test_replace_and_zero_vectors(self):
+        """Test re-inserting a name moves it and zero vectors never match"""
+        for backend in SimilarAppIndex.BACKENDS:
+            index = SimilarAppIndex(2, backend=backend)
+            index.add(['a', 'b', 'empty'], np.array([[1, 0], [0, 1], [0, 0]]))
+            index.add(['a'], np.array([[0, 1]]))
+
+            results = index.query(np.array([0, 1]), k=3)
+
+            assert len(index) == 3
+            assert [name for name, _ in results] == ['a', 'b']
+            assert index.query(np.zeros(2)) == []
+
+    def test_query_batch(self, data):
+        """Test batched queries equal single queries on the exact backend"""
+        index = SimilarAppIndex(32)
+        index.add([f'app{i}' for i in range(len(data))], data)
+
+        batch = index.query_batch(data[:4], k=3)
+
+        assert [[n for n, _ in row] for row in batch] == \
+            [[n for n, _ in index.query(v, k=3)] for v in data[:4]]
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            SimilarAppIndex(4, backend='faiss')
@@ -0,0 +1,115 @@
+"""
+Unit Tests for the Stage Graph Executor
+=======================================
+Tests for src/orchestration/stage_graph.py - dependency order, value handoff,
+concurrency, failure handling and timing reports
+"""
+
+import threading
+import time
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.orchestration.stage_graph import (
+    StageGraph, STATUS_OK, STATUS_FAILED, STATUS_SKIPPED, group_timings, timing_report
+)
+
+
+class TestExecution:
+    def test_dependencies_receive_values(self):
+        graph = StageGraph()
+        graph.add('learn', lambda inputs: {'ACDA': 10, 'BLZE': 20})
+        graph.add('mmd:ACDA', lambda inputs: inputs['learn']['ACDA'] * 2, deps=['learn'])
+        graph.add('images:ACDA', lambda inputs: inputs['mmd:ACDA'] + 1, deps=['mmd:ACDA'])
+
+        results = graph.run(max_workers=2)
+
+        assert list(results) == ['learn', 'mmd:ACDA', 'images:ACDA']
+        assert all(result.status == STATUS_OK for result in results.values())
+        assert results['images:ACDA'].value == 21
+        assert results['mmd:ACDA'].group == 'mmd'
+
+    def test_independent_stages_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+        graph = StageGraph()
+        for app in ('A', 'B', 'C'):
+            graph.add(f'images:{app}', lambda inputs: barrier.wait())
+
+        results = graph.run(max_workers=3)
+        assert all(result.ok for result in results.values())
+
+    def test_ready_stages_run_in_insertion_order(self):
+        order = []
+        graph = StageGraph()
+        for app in ('C', 'A', 'B'):
+            graph.add(f'mmd:{app}', lambda inputs, app=app: order.append(app))
+
+        graph.run(max_workers=1)
+        assert order == ['C', 'A', 'B']
+
+    def test_failure_skips_dependents_only(self):
+        def fail(inputs):
+            raise RuntimeError("PNG not generated")
+
+        graph = StageGraph()
+        graph.add('images:ACDA', fail)
+        graph.add('docx:ACDA', lambda inputs: 'doc', deps=['images:ACDA'])
+        graph.add('summary', lambda inputs: 'done', deps=['docx:ACDA'])
+        graph.add('images:BLZE', lambda inputs: 'png')
+
+        results = graph.run()
+
+        assert results['images:ACDA'].status == STATUS_FAILED
+        assert results['images:ACDA'].error == "PNG not generated"
+        assert results['docx:ACDA'].status == STATUS_SKIPPED
+        assert results['summary'].status == STATUS_SKIPPED
+        assert results['images:BLZE'].value == 'png'
+
+
+class TestValidation:
+    def test_duplicate_stage(self):
+        graph = StageGraph()
+        graph.add('learn', lambda inputs: None)
+        with pytest.raises(ValueError):
+            graph.add('learn', lambda inputs: None)
+
+    def test_unknown_dependency(self):
+        graph = StageGraph()
+        graph.add('mmd:ACDA', lambda inputs: None, deps=['learn'])
+        with pytest.raises(ValueError, match='unknown'):
+            graph.run()
+
+    def test_cycle(self):
+        graph = StageGraph()
+        graph.add('a', lambda inputs: None, deps=['b'])
+        graph.add('b', lambda inputs: None, deps=['a'])
+        graph.add('c', lambda inputs: None)
+        with pytest.raises(ValueError, match='cycle'):
+            graph.run()
+
+
+class TestTimings:
+    def test_group_timings_and_report(self):
+        graph = StageGraph()
+        for app in ('A', 'B'):
+            graph.add(f'images:{app}', lambda inputs: time.sleep(0.05))
+        graph.add('lucid', lambda inputs: 1 / 0)
+
+        results = graph.run(max_workers=2)
+        timings = group_timings(results)
+
+        assert timings['images'].stages == 2
+        assert timings['images'].total_seconds >= 0.1
+        assert timings['images'].wall_seconds < timings['images'].total_seconds
+        assert timings['lucid'].failed == 1
+
+        report = timing_report(results)
+        assert report.splitlines()[0].startswith('Stage')
+        assert any(line.startswith('images') for line in report.splitlines())
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,121 @@
+"""
+Unit Tests for Streaming Anomaly Scoring
+=========================================
+Tests for P2Quantile, ApplicationBehaviorAnalyzer.score_incremental and the
+incremental learner's per-file anomaly scoring
+"""
+
+import json
+import pytest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.parser import FlowRecord
+from src.deep_learning.vae_model import P2Quantile, ApplicationBehaviorAnalyzer, ApplicationBehaviorVAE
+
+
+class TestP2Quantile:
+    """Test the five-marker streaming quantile"""
+
+    @pytest.mark.parametrize('q', [0.5, 0.95, 0.99])
+    def test_tracks_percentile(self, q):
+        values = np.random.default_rng(0).exponential(size=5000)
+        sketch = P2Quantile(q)
+        for value in values:
+            sketch.add(value)
+
+        assert sketch.count == 5000
+        assert sketch.value == pytest.approx(np.percentile(values, q * 100), rel=0.05)
+
+    def test_small_counts_and_state(self):
+        sketch = P2Quantile(0.5)
+        assert sketch.value is None
+        for value in [3.0, 1.0, 2.0]:
+            sketch.add(value)
+        assert sketch.value == 2.0
+
+        for value in range(100):
+            sketch.add(value)
+        restored = P2Quantile.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        for value in range(100, 150):
+            sketch.add(value)
+            restored.add(value)
+        assert restored.value == sketch.value and restored.count == sketch.count
+
+        with pytest.raises(ValueError):
+            P2Quantile(1.0)
+
+
+torch = pytest.importorskip('torch')
+
+
+@pytest.fixture
+def analyzer():
+    torch.manual_seed(0)
+    analyzer = ApplicationBehaviorAnalyzer()
+    analyzer.model = ApplicationBehaviorVAE(input_dim=128, latent_dim=4)
+    analyzer._compute_statistics(np.random.default_rng(0).random((40, 128)))
+    return analyzer
+
+
+class TestScoreIncremental:
+    """Test new apps are scored without re-encoding the fleet"""
+
+    def test_training_seeds_sketch(self, analyzer):
+        assert analyzer.error_sketch.count == 40
+        assert analyzer.error_sketch.value == pytest.approx(analyzer.reconstruction_threshold, rel=0.2)
+
+    def test_outlier_flagged_and_added(self, analyzer):
+        behaviors = np.random.default_rng(1).random((2, 128))
+        behaviors[1] *= 50
+
+        anomalies = analyzer.score_incremental(behaviors, ['normal_app', 'odd_app'])
+
+        assert [a['app_name'] for a in anomalies] == ['odd_app']
+        assert anomalies[0]['severity'] == 'HIGH' and anomalies[0]['observations'] == 41
+        assert analyzer.error_sketch.count == 42
+
+    def test_warmup(self):
+        analyzer = ApplicationBehaviorAnalyzer()
+        analyzer.model = ApplicationBehaviorVAE(input_dim=8, latent_dim=2)
+
+        assert analyzer.score_incremental(np.full((5, 8), 100.0), list('abcde'), min_observations=10) == []
+        assert analyzer.error_sketch.count == 5
+
+
+class TestIncrementalLearnerScoring:
+    """Test anomalies are emitted per ingested file and the sketch persists"""
+
+    def test_score_behavior(self, analyzer, tmp_path):
+        from src.core.incremental_learner import IncrementalLearningSystem, ContinuousLearner
+
+        analyzer.error_sketch = P2Quantile(0.95)
+        for _ in range(30):
+            analyzer.error_sketch.add(1e-9)
+
+        learner = IncrementalLearningSystem(
+            None, None, None, None, watch_dir=str(tmp_path / 'input'),
+            checkpoint_dir=str(tmp_path / 'models'), behavior_analyzer=analyzer
+        )
+        records = [FlowRecord(app_name='NEWAPP', src_ip='10.0.0.1', dst_ip='10.0.0.2', port='443',
+                              transport='tcp', bytes=5000, packets=5)]
+
+        anomalies = learner._score_behavior('NEWAPP', records)
+
+        assert [a['app_name'] for a in anomalies] == ['NEWAPP']
+        assert learner.stats['anomalies_detected'] == 1 and learner.stats['apps_scored'] == 1
+        assert json.loads(learner.anomaly_log.read_text().splitlines()[0])['app_name'] == 'NEWAPP'
+
+        emitted = []
+        ContinuousLearner(learner, on_anomaly=emitted.append)._emit_anomalies(anomalies)
+        assert emitted == anomalies
+
+        analyzer.error_sketch = None
+        IncrementalLearningSystem(None, None, None, None, watch_dir=str(tmp_path / 'input'),
+                                  checkpoint_dir=str(tmp_path / 'models'), behavior_analyzer=analyzer)
+        assert analyzer.error_sketch.count == 31
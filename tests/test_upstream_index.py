@@ -0,0 +1,95 @@
+"""
+Unit Tests for the Upstream Dependency Index
+============================================
+Tests for src/upstream_index.py - building from flows.csv files, lookups
+and replacing an app's flows
+"""
+
+import pandas as pd
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.upstream_index import UpstreamIndex, endpoint_labels
+
+
+def _flows(app, rows):
+    """rows: (source ip, source hostname, dest app, dest ip, source is vmware)"""
+    return pd.DataFrame([
+        {'App': app, 'Source IP': src_ip, 'Source Hostname': hostname, 'Dest App': dest_app,
+         'Dest IP': dest_ip, 'Dest Hostname': 'db01', 'Source Is VMware': vmware,
+         'Dest Is VMware': False, 'Port': 5432}
+        for src_ip, hostname, dest_app, dest_ip, vmware in rows
+    ])
+
+
+@pytest.fixture
+def apps_dir(tmp_path):
+    flows = {
+        'WEBX': _flows('WEBX', [
+            ('10.0.0.1', 'web01', 'DBAA', '10.9.0.1', True),
+            ('10.0.0.1', 'web01', 'DBAA', '10.9.0.1', True),
+            ('10.0.0.2', 'Unknown', 'DBAA', '10.9.0.2', False),
+            ('10.0.0.2', 'Unknown', 'CACH', '10.8.0.1', False),
+        ]),
+        'APIX': _flows('APIX', [
+            ('10.1.0.1', '10.1.0.1', 'DBAA', '10.9.0.1', False),
+            ('10.1.0.1', '10.1.0.1', None, '8.8.8.8', False),
+        ]),
+        'DBAA': _flows('DBAA', [('10.9.0.1', 'db01', None, '10.9.0.2', False)]),
+    }
+    for app, df in flows.items():
+        (tmp_path / app).mkdir()
+        df.to_csv(tmp_path / app / 'flows.csv', index=False)
+    (tmp_path / 'EMPTY').mkdir()
+    return tmp_path
+
+
+class TestUpstreamIndex:
+    def test_aggregates_upstream_by_source_app(self, apps_dir):
+        index = UpstreamIndex.from_apps_dir(apps_dir)
+        upstream = index.get('DBAA')
+
+        assert len(index) == 3
+        assert list(upstream.sources) == ['APIX', 'WEBX']
+        assert upstream.flows == 4
+        assert upstream.servers == 2
+
+        web = upstream.sources['WEBX']
+        assert (web.flows, web.servers, web.vmware_servers) == (3, 2, 1)
+        assert web.endpoints == ['10.0.0.1 (web01)', '10.0.0.2']
+        assert upstream.sources['APIX'].endpoints == ['10.1.0.1']
+
+    def test_unknown_destination(self, apps_dir):
+        index = UpstreamIndex.from_apps_dir(apps_dir)
+        assert index.get('WEBX') is None
+        assert 'WEBX' not in index
+        assert 'CACH' in index
+
+    def test_add_app_replaces_contribution(self, apps_dir):
+        index = UpstreamIndex.from_apps_dir(apps_dir)
+        assert index.get('DBAA').flows == 4
+
+        index.add_app('WEBX', _flows('WEBX', [('10.0.0.3', 'web03', 'CACH', '10.8.0.1', False)]))
+        assert list(index.get('DBAA').sources) == ['APIX']
+        assert index.get('CACH').sources['WEBX'].endpoints == ['10.0.0.3 (web03)']
+
+        index.remove_app('APIX')
+        assert index.get('DBAA') is None
+
+    def test_to_dict_is_stable_key_input(self, apps_dir):
+        first = UpstreamIndex.from_apps_dir(apps_dir).get('DBAA').to_dict()
+        second = UpstreamIndex.from_apps_dir(apps_dir).get('DBAA').to_dict()
+        assert first == second
+        assert first['sources']['WEBX']['flows'] == 3
+
+
+def test_endpoint_labels_without_hostname_column():
+    df = pd.DataFrame({'Dest IP': ['10.0.0.1', '10.0.0.2', '10.0.0.1']})
+    assert endpoint_labels(df, 'Dest IP', 'Dest Hostname') == ['10.0.0.1', '10.0.0.2']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])